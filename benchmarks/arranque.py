@@ -0,0 +1,68 @@
+"""Mide el arranque en frío de electrodomesticos.py contra su presupuesto.
+
+Uso:
+    python benchmarks/arranque.py [repeticiones]
+
+Lanza procesos nuevos de Python y reporta la mediana del tiempo total de:
+    - python -c pass (lo que cuesta el intérprete solo),
+    - python -c "import proyectoU4" (importar las clases sin abrir el menú),
+    - python electrodomesticos.py --version.
+
+También revisa que importar electrodomesticos no cargue módulos pesados.
+Termina con código 1 si --version pasa de PRESUPUESTO_ARRANQUE_MS o si se
+importó algún módulo pesado.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from electrodomesticos import PRESUPUESTO_ARRANQUE_MS
+
+PESADOS = ("numpy", "catalogo", "inventario", "instantanea", "importador", "renderizado",
+           "reglas_gama", "gama_vectorizada", "indice_espacial", "json", "csv", "mmap")
+
+
+def _mediana_ms(comando, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        subprocess.run(comando, cwd=RAIZ, check=True, stdout=subprocess.DEVNULL)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def main(repeticiones=15):
+    python = sys.executable
+    casos = (("intérprete", [python, "-c", "pass"]),
+             ("import proyectoU4", [python, "-c", "import proyectoU4"]),
+             ("--version", [python, "electrodomesticos.py", "--version"]))
+    resultados = {nombre: _mediana_ms(comando, repeticiones) for nombre, comando in casos}
+    for nombre, mediana in resultados.items():
+        print(f"{nombre:<18} {mediana:7.1f} ms")
+
+    cargados = subprocess.run(
+        [python, "-c", "import sys, electrodomesticos; "
+                       f"print(' '.join(m for m in {PESADOS!r} if m in sys.modules))"],
+        cwd=RAIZ, check=True, capture_output=True, text=True).stdout.split()
+    fallas = []
+    if cargados:
+        fallas.append(f"módulos pesados importados al arrancar: {', '.join(cargados)}")
+    if resultados["--version"] > PRESUPUESTO_ARRANQUE_MS:
+        fallas.append(f"--version tardó {resultados['--version']:.1f} ms, "
+                      f"presupuesto {PRESUPUESTO_ARRANQUE_MS} ms")
+    if fallas:
+        for falla in fallas:
+            print(f"*** {falla}", file=sys.stderr)
+        return 1
+    print(f"Dentro del presupuesto de {PRESUPUESTO_ARRANQUE_MS} ms.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(valor) for valor in sys.argv[1:]]))
@@ -0,0 +1,119 @@
+"""Escrituras por segundo de la bitácora con y sin commit en grupo.
+
+Uso:
+    python benchmarks/bench_bitacora.py [operaciones] [directorio]
+
+En un directorio temporal (o el indicado, para medir otro disco) compara:
+    - un fsync por operación desde un solo hilo,
+    - commit en grupo con varios hilos que esperan cada uno su registro,
+    - Almacen asíncrono que hace durable cada grupo de 256 operaciones,
+    - compactación a instantánea y el tiempo de recuperar al abrir, tanto
+      sólo desde la bitácora como desde la instantánea.
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bitacora import Almacen, Bitacora
+from proyectoU4 import Lavadora, Refrigerador
+
+HILOS = (4, 16, 64)
+GRUPO_ASINCRONO = 256
+
+
+def _operacion(i):
+    return ["alta", "Lavadora", [f"L{i}", "LG", f"W{i % 997}", 2000 + i % 38000, 18, 70, 12]]
+
+
+def _fsync_por_operacion(ruta, operaciones):
+    bitacora = Bitacora(ruta)
+    inicio = time.perf_counter()
+    for i in range(operaciones):
+        bitacora.registrar(_operacion(i))
+    segundos = time.perf_counter() - inicio
+    bitacora.cerrar()
+    return operaciones / segundos, bitacora.grupos
+
+
+def _grupo(ruta, operaciones, hilos):
+    bitacora = Bitacora(ruta)
+    por_hilo = operaciones // hilos
+
+    def escritor(numero):
+        for i in range(numero * por_hilo, (numero + 1) * por_hilo):
+            bitacora.registrar(_operacion(i))
+
+    trabajadores = [threading.Thread(target=escritor, args=(numero,)) for numero in range(hilos)]
+    inicio = time.perf_counter()
+    for trabajador in trabajadores:
+        trabajador.start()
+    for trabajador in trabajadores:
+        trabajador.join()
+    segundos = time.perf_counter() - inicio
+    bitacora.cerrar()
+    return por_hilo * hilos / segundos, bitacora.grupos
+
+
+def main(operaciones=20000, directorio=None):
+    raiz = tempfile.mkdtemp(prefix="bitacora-", dir=directorio)
+    try:
+        print(f"Operaciones: {operaciones:,}  directorio: {raiz}")
+        lentas = min(operaciones, 2000)
+        velocidad, grupos = _fsync_por_operacion(os.path.join(raiz, "uno.log"), lentas)
+        print(f"fsync por operación     {velocidad:>10,.0f} ops/s  ({grupos:,} fsync)")
+        for hilos in HILOS:
+            velocidad, grupos = _grupo(os.path.join(raiz, f"grupo{hilos}.log"), operaciones, hilos)
+            print(f"grupo, {hilos:>2} hilos          {velocidad:>10,.0f} ops/s  "
+                  f"({grupos:,} fsync, {operaciones / grupos:,.1f} ops por fsync)")
+
+        datos = os.path.join(raiz, "almacen")
+        rng = random.Random(3)
+        almacen = Almacen(datos, sincrono=False, compactar_bytes=None)
+        inicio = time.perf_counter()
+        for i in range(operaciones):
+            if i % 3 == 2:
+                almacen.actualizar(f"R{i - 1}", precio=rng.randint(2000, 40000))
+            elif i % 3 == 1:
+                almacen.agregar(Refrigerador(f"R{i}", "Mabe", f"F{i}", 15000, 2, 12.5, 18))
+            else:
+                almacen.agregar(Lavadora(f"L{i}", "LG", f"W{i}", 9000, 20, 80, 10))
+            if i % GRUPO_ASINCRONO == GRUPO_ASINCRONO - 1:
+                almacen.sincronizar()
+        almacen.sincronizar()
+        segundos = time.perf_counter() - inicio
+        print(f"Almacen, grupos de {GRUPO_ASINCRONO}  {operaciones / segundos:>10,.0f} ops/s  "
+              f"({almacen.bitacora.grupos:,} fsync, bitácora {almacen.bitacora.tamano / 2**20:,.1f} MiB)")
+        esperados = {obj.id: str(obj) for obj in almacen.inventario}
+        almacen.cerrar()
+
+        inicio = time.perf_counter()
+        almacen = Almacen(datos, compactar_bytes=None)
+        segundos = time.perf_counter() - inicio
+        assert {obj.id: str(obj) for obj in almacen.inventario} == esperados
+        print(f"recuperar de bitácora   {segundos * 1000:>10,.1f} ms  "
+              f"({almacen.recuperadas:,} operaciones, {almacen.recuperadas / segundos:,.0f} ops/s)")
+
+        inicio = time.perf_counter()
+        almacen.compactar()
+        print(f"compactar               {(time.perf_counter() - inicio) * 1000:>10,.1f} ms")
+        almacen.cerrar()
+        inicio = time.perf_counter()
+        almacen = Almacen(datos, compactar_bytes=None)
+        segundos = time.perf_counter() - inicio
+        assert {obj.id: str(obj) for obj in almacen.inventario} == esperados
+        print(f"recuperar de instantánea{segundos * 1000:>10,.1f} ms  ({len(almacen.inventario):,} objetos)")
+        almacen.cerrar()
+    finally:
+        shutil.rmtree(raiz)
+
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    main(*([int(argumentos[0])] if argumentos else []), *argumentos[1:])
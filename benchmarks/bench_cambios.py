@@ -0,0 +1,144 @@
+"""Rendimiento del flujo de cambios con muchos suscriptores.
+
+Uso:
+    python benchmarks/bench_cambios.py [cambios] [suscriptores...]
+
+Sobre un inventario de lavadoras, un productor asíncrono cambia precios y
+capacidades en grupos de 100 (esperando espacio en el flujo antes de cada
+grupo) mientras N suscriptores leen todos los eventos. Para cada N mide:
+    - eventos publicados por segundo y entregas por segundo (eventos x
+      suscriptores),
+    - tamaño promedio de los lotes entregados,
+    - lo mismo sin flujo conectado, para ver el costo de publicar.
+Al final repite con clientes que leen por un socket Unix.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cambios import FlujoCambios
+from inventario import Inventario
+from proyectoU4 import Lavadora
+
+ARTICULOS = 10000
+GRUPO = 100
+SUSCRIPTORES = (1, 10, 100, 1000)
+
+
+def _inventario():
+    rng = random.Random(5)
+    inventario = Inventario()
+    for i in range(ARTICULOS):
+        inventario.agregar(Lavadora(f"L{i}", "LG", f"W{i % 997}", rng.randint(4000, 25000),
+                                    rng.randint(5, 25), rng.randint(30, 90), rng.randint(1, 14)))
+    return inventario
+
+
+def _cambios(cantidad, semilla=9):
+    rng = random.Random(semilla)
+    return [(f"L{rng.randrange(ARTICULOS)}",
+             {"precio": rng.randint(4000, 25000)} if i % 4 else {"capacidad_carga": rng.randint(5, 25)})
+            for i in range(cantidad)]
+
+
+async def _producir(inventario, cambios, flujo=None):
+    for inicio in range(0, len(cambios), GRUPO):
+        if flujo is not None:
+            await flujo.esperar_espacio()
+        for id, valores in cambios[inicio:inicio + GRUPO]:
+            inventario.actualizar(id, **valores)
+        await asyncio.sleep(0)
+
+
+async def _con_suscriptores(cambios, cantidad):
+    inventario = _inventario()
+    flujo = FlujoCambios().conectar(inventario)
+    suscripciones = [flujo.suscribir() for _ in range(cantidad)]
+    lotes = [0]
+
+    async def consumir(suscripcion):
+        async for _ in suscripcion:
+            lotes[0] += 1
+
+    consumidores = [asyncio.create_task(consumir(suscripcion)) for suscripcion in suscripciones]
+    inicio = time.perf_counter()
+    await _producir(inventario, cambios, flujo)
+    # Los cambios que no modifican nada no generan evento: el total se
+    # conoce al terminar el productor
+    total = flujo.secuencia
+    while any(suscripcion.posicion < total for suscripcion in suscripciones):
+        await asyncio.sleep(0)
+    segundos = time.perf_counter() - inicio
+    await flujo.cerrar()
+    await asyncio.gather(*consumidores)
+    entregados = sum(suscripcion.entregados for suscripcion in suscripciones)
+    return total, entregados, lotes[0], segundos
+
+
+async def _por_socket(cambios, clientes):
+    inventario = _inventario()
+    flujo = FlujoCambios().conectar(inventario)
+    ruta = os.path.join(tempfile.mkdtemp(), "flujo.sock")
+    await flujo.servir(ruta)
+    conexiones = []
+    for _ in range(clientes):
+        lector, escritor = await asyncio.open_unix_connection(ruta, limit=1 << 20)
+        escritor.write(b"{}\n")
+        conexiones.append((lector, escritor))
+    while len(flujo.suscripciones) < clientes:
+        await asyncio.sleep(0.001)
+
+    leidas = [0] * clientes
+
+    async def leer(numero, lector):
+        while True:
+            datos = await lector.read(1 << 16)
+            if not datos:
+                break
+            leidas[numero] += datos.count(b"\n")
+
+    lectores = [asyncio.create_task(leer(numero, lector))
+                for numero, (lector, _) in enumerate(conexiones)]
+    inicio = time.perf_counter()
+    await _producir(inventario, cambios, flujo)
+    total = flujo.secuencia
+    while min(leidas) < total:
+        await asyncio.sleep(0.001)
+    segundos = time.perf_counter() - inicio
+    for _, escritor in conexiones:
+        escritor.close()
+    await flujo.cerrar()
+    await asyncio.gather(*lectores)
+    return total, segundos
+
+
+async def _principal(cantidad, suscriptores):
+    cambios = _cambios(cantidad)
+    inventario = _inventario()
+    inicio = time.perf_counter()
+    await _producir(inventario, cambios)
+    base = time.perf_counter() - inicio
+    print(f"{cantidad:,} actualizaciones sin flujo: {base:.3f} s ({cantidad / base:,.0f} por segundo)")
+    for numero in suscriptores:
+        total, entregados, lotes, segundos = await _con_suscriptores(cambios, numero)
+        print(f"  {numero:>5} suscriptores  {segundos:7.3f} s  "
+              f"{total / segundos:>10,.0f} eventos/s  {entregados / segundos:>12,.0f} entregas/s  "
+              f"lote promedio {entregados / lotes:6.1f}")
+    for clientes in (1, 10):
+        total, segundos = await _por_socket(cambios, clientes)
+        print(f"  {clientes:>5} sockets       {segundos:7.3f} s  "
+              f"{total / segundos:>10,.0f} eventos/s  {total * clientes / segundos:>12,.0f} entregas/s")
+
+
+def main(cantidad=100000, *suscriptores):
+    asyncio.run(_principal(cantidad, suscriptores or SUSCRIPTORES))
+
+
+if __name__ == "__main__":
+    main(*[int(valor) for valor in sys.argv[1:]])
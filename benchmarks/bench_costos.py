@@ -0,0 +1,128 @@
+"""Ranking por costo total con y sin el caché de MotorCostos.
+
+Uso:
+    python benchmarks/bench_costos.py [filas] [modelos]
+
+Genera un catálogo de lavadoras y microondas donde cada modelo se vende en
+varias tiendas (mismo consumo, distinto id y precio) y una rejilla de 24
+escenarios (tarifas de luz y agua, uso y vida útil). Mide las 5 opciones más
+baratas por tipo y gama en todos los escenarios:
+    - objeto por objeto: para cada objeto y escenario calcula el costo con
+      sus atributos y tipo_gama(), como se haría sin el motor,
+    - MotorCostos en frío, en caliente, después de cambiar el precio del
+      1% de las filas (no invalida nada), después de cambiar el consumo del
+      1% de los modelos y al agregar un escenario nuevo.
+Verifica que el motor elija los mismos artículos que el recorrido por objeto.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalogo import Catalogo
+from costos import MODELOS_COSTO, Escenario, MotorCostos, _por_unidad
+
+CANTIDAD = 5
+
+
+def generar(filas, modelos, semilla=4):
+    """Catálogo con `modelos` modelos por tipo repartidos en `filas` filas."""
+    rng = random.Random(semilla)
+    marcas = ("Whirlpool", "Samsung", "LG", "Mabe", "Bosch")
+    lavadoras = [(rng.choice(marcas), f"W{numero}", rng.randint(5, 25), rng.randint(30, 90),
+                  rng.randint(1, 14)) for numero in range(modelos)]
+    microondas = [(rng.choice(marcas), f"O{numero}", rng.randint(600, 2200), rng.randint(900, 2000))
+                  for numero in range(modelos)]
+    catalogo = Catalogo()
+    for i in range(filas):
+        precio = rng.randint(2000, 40000)
+        if i % 2:
+            marca, modelo, capacidad, agua, ciclos = rng.choice(lavadoras)
+            catalogo.agregar_valores("Lavadora", f"L{i}", marca, modelo, precio, capacidad, agua, ciclos)
+        else:
+            marca, modelo, potencia, energia = rng.choice(microondas)
+            catalogo.agregar_valores("Microondas", f"M{i}", marca, modelo, precio, potencia, energia,
+                                     "54x32.2x43.3")
+    return catalogo
+
+
+def escenarios():
+    resultado = []
+    for luz in (0.9, 1.6, 3.2):
+        for agua in (18, 40):
+            for ciclos, horas in ((200, 40), (400, 150)):
+                for anios in (8, 12):
+                    resultado.append(Escenario(f"luz {luz} agua {agua} uso {ciclos} vida {anios}",
+                                               luz, agua, ciclos, horas, anios, 0.04))
+    return resultado
+
+
+def _por_objeto(objetos, escenarios):
+    """Ranking calculando el costo de cada objeto en cada escenario."""
+    gamas = [(type(obj).__name__, obj.tipo_gama()) for obj in objetos]
+    ranking = {}
+    for escenario in escenarios:
+        factores = {tipo: _por_unidad(tipo, escenario) for tipo in MODELOS_COSTO}
+        grupos = {}
+        for posicion, (obj, (tipo, gama)) in enumerate(zip(objetos, gamas)):
+            total = obj.precio + getattr(obj, MODELOS_COSTO[tipo][0]) * factores[tipo]
+            grupos.setdefault((tipo, gama), []).append((total, posicion, obj.id))
+        ranking[escenario.nombre] = {clave: [id for _, _, id in sorted(valores)[:CANTIDAD]]
+                                     for clave, valores in grupos.items()}
+    return ranking
+
+
+def _ids(ranking):
+    return {nombre: {clave: [opcion.id for opcion in opciones] for clave, opciones in grupos.items()}
+            for nombre, grupos in ranking.items()}
+
+
+def _medir(nombre, funcion, motor=None):
+    antes = motor.calculados if motor else 0
+    inicio = time.perf_counter()
+    resultado = funcion()
+    segundos = time.perf_counter() - inicio
+    detalle = f"  ({motor.calculados - antes:,} calculados)" if motor else ""
+    print(f"{nombre:<34} {segundos * 1000:9.1f} ms{detalle}")
+    return resultado
+
+
+def main(filas=200000, modelos=2000):
+    catalogo = generar(filas, modelos)
+    lista = escenarios()
+    objetos = [tabla.esquema.clase(*[tabla.valor(campo, fila) for campo in tabla.esquema.campos])
+               for tabla in catalogo.tablas.values() for fila in range(len(tabla))]
+    print(f"Filas: {filas:,}  modelos por tipo: {modelos:,}  escenarios: {len(lista)}")
+    esperado = _medir("objeto por objeto", lambda: _por_objeto(objetos, lista))
+
+    motor = MotorCostos()
+    ranking = _medir("motor en frío", lambda: motor.mas_baratos(catalogo, lista, CANTIDAD), motor)
+    assert _ids(ranking) == esperado, "El ranking del motor no coincide"
+    _medir("motor en caliente", lambda: motor.mas_baratos(catalogo, lista, CANTIDAD), motor)
+
+    rng = random.Random(8)
+    lavadoras = catalogo.tablas["Lavadora"]
+    for fila in rng.sample(range(len(lavadoras)), len(lavadoras) // 100):
+        lavadoras.asignar("precio", fila, rng.randint(2000, 40000))
+    _medir("1% de precios cambiados", lambda: motor.mas_baratos(catalogo, lista, CANTIDAD), motor)
+
+    cambiados = {f"W{numero}" for numero in rng.sample(range(modelos), modelos // 100)}
+    modelos_columna = lavadoras.columna("modelo")
+    for fila in range(len(lavadoras)):
+        if modelos_columna[fila] in cambiados:
+            lavadoras.asignar("consumo_agua", fila, lavadoras.valor("consumo_agua", fila) - 5)
+    _medir("1% de modelos con otro consumo", lambda: motor.mas_baratos(catalogo, lista, CANTIDAD), motor)
+
+    nuevo = lista + [Escenario("sequía", 1.6, 95, 250, 60, 10, 0.08)]
+    ranking = _medir("un escenario nuevo", lambda: motor.mas_baratos(catalogo, nuevo, CANTIDAD), motor)
+    objetos = [tabla.esquema.clase(*[tabla.valor(campo, fila) for campo in tabla.esquema.campos])
+               for tabla in catalogo.tablas.values() for fila in range(len(tabla))]
+    assert _ids(ranking) == _por_objeto(objetos, nuevo), "El ranking del motor no coincide"
+    print(motor.estadisticas())
+
+
+if __name__ == "__main__":
+    main(*[int(valor) for valor in sys.argv[1:]])
@@ -0,0 +1,78 @@
+"""Lectura de archivos columnares con y sin poda de grupos.
+
+Uso:
+    python benchmarks/bench_exportacion.py [filas] [tamano_grupo]
+
+Exporta el catálogo de prueba de bench_pipeline.py dos veces: en el orden de
+alta y ordenado por precio (las dos sin comprimir y la ordenada también con
+zlib). Mide:
+    - escritura: filas/s y bytes del archivo,
+    - lectura completa: todas las columnas de todos los grupos,
+    - proyección: sólo id y precio,
+    - consulta con poda: refrigeradores Alta con precio entre 10000 y 12000,
+      leyendo id y precio; reporta grupos leídos y saltados,
+    - la misma consulta sin poda: leer todo y filtrar después en Python.
+Verifica que la consulta devuelva los mismos ids que filtrar_filas sobre el
+catálogo en memoria.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_pipeline import generar_catalogo
+from catalogo import filtrar_filas
+from exportacion import LectorColumnar, exportar
+
+CONDICIONES = [("precio", 10000, 12000)]
+
+
+def _cronometrar(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return resultado, time.perf_counter() - inicio
+
+
+def _sin_poda(lector):
+    columnas = lector.leer_columnas("Refrigerador")
+    return sorted(id for id, precio, gama in zip(columnas["id"], columnas["precio"], columnas["gama"])
+                  if 10000 <= precio <= 12000 and gama == "Alta")
+
+
+def _con_poda(lector):
+    columnas = lector.leer_columnas("Refrigerador", ("id", "precio"), gama="Alta", condiciones=CONDICIONES)
+    return sorted(columnas["id"])
+
+
+def main(filas=600000, tamano_grupo=16384):
+    catalogo = generar_catalogo(filas)
+    tabla = catalogo.tablas["Refrigerador"]
+    ids = tabla.columna("id")
+    esperado = sorted(ids[fila] for fila in filtrar_filas(tabla, gama="Alta", condiciones=CONDICIONES))
+    ruta = os.path.join(tempfile.mkdtemp(), "catalogo.elco")
+    print(f"Filas: {filas:,}  grupos de {tamano_grupo:,}  ({len(esperado):,} filas en la consulta)")
+    for ordenar_por, comprimir in ((None, False), ("precio", False), ("precio", True)):
+        escritos, segundos = _cronometrar(lambda: exportar(catalogo, ruta, tamano_grupo,
+                                                           ordenar_por=ordenar_por, comprimir=comprimir))
+        nombre = f"orden {ordenar_por or 'de alta'}{' + zlib' if comprimir else ''}"
+        print(f"{nombre}: escritura {filas / segundos:>10,.0f} filas/s, {escritos / 1e6:6.1f} MB")
+        with LectorColumnar(ruta) as lector:
+            _, completa = _cronometrar(lambda: [None for _ in lector.leer()])
+            _, proyeccion = _cronometrar(lambda: [None for _ in lector.leer(columnas=("id", "precio"))])
+            sin_poda, segundos_sin = _cronometrar(lambda: _sin_poda(lector))
+            lector.leidos = lector.saltados = 0
+            con_poda, segundos_con = _cronometrar(lambda: _con_poda(lector))
+            assert sin_poda == con_poda == esperado, "La consulta no coincide con filtrar_filas"
+            print(f"  lectura completa {completa * 1000:8.1f} ms   id+precio {proyeccion * 1000:8.1f} ms")
+            print(f"  consulta sin poda {segundos_sin * 1000:7.1f} ms   con poda {segundos_con * 1000:7.1f} ms "
+                  f"(x{segundos_sin / segundos_con:.1f}, grupos leídos {lector.leidos}, "
+                  f"saltados {lector.saltados})")
+    os.remove(ruta)
+
+
+if __name__ == "__main__":
+    main(*[int(valor) for valor in sys.argv[1:]])
@@ -0,0 +1,110 @@
+"""Escalamiento del catálogo fragmentado de 1 a N procesos.
+
+Uso:
+    python benchmarks/bench_fragmentos.py [filas] [fragmentos...]
+
+Reparte un catálogo de prueba (el de bench_pipeline.py) en 1, 2, 4 y
+os.cpu_count() fragmentos (o los indicados) y para cada número mide:
+    - carga: filas/s de agregar_catalogo(),
+    - consultas repartidas: contar() por precio y gama sobre todos los tipos
+      y estadisticas() de todo el catálogo, en consultas/s,
+    - búsquedas por id: obtener() de ids al azar, en búsquedas/s.
+Para las consultas repartidas reporta la aceleración contra 1 fragmento y la
+eficiencia (aceleración / fragmentos); con menos CPUs que fragmentos la
+eficiencia baja aunque el reparto sea correcto. Los resultados se comparan
+contra el catálogo en un solo proceso.
+
+Al final carga marcas con distribución sesgada (una marca con la mitad de
+las filas) y muestra la carga de cada fragmento antes y después de
+rebalancear.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_pipeline import generar_catalogo
+from catalogo import filtrar_filas
+from estadisticas import Estadisticas
+from fragmentos import CatalogoFragmentado
+
+CONDICIONES = [("precio", 10000, 30000)]
+REPETICIONES = 5
+BUSQUEDAS = 2000
+
+
+def _consultas(catalogo):
+    """Una ronda de consultas repartidas; devuelve los resultados para comparar."""
+    conteos = [catalogo.contar(condiciones=CONDICIONES, gama=gama) for gama in ("Baja", "Media", "Alta")]
+    return conteos, catalogo.estadisticas().como_dict()
+
+
+def _esperado(catalogo):
+    conteos = [sum(len(filtrar_filas(tabla, None, gama, CONDICIONES)) for tabla in catalogo.tablas.values())
+               for gama in ("Baja", "Media", "Alta")]
+    return conteos, Estadisticas.desde_catalogo(catalogo).consultar().como_dict()
+
+
+def _medir(catalogo, fragmentos, ids):
+    with CatalogoFragmentado(fragmentos=fragmentos, rebalanceo_automatico=False) as fragmentado:
+        inicio = time.perf_counter()
+        fragmentado.agregar_catalogo(catalogo)
+        carga = time.perf_counter() - inicio
+        resultado = _consultas(fragmentado)
+        inicio = time.perf_counter()
+        for _ in range(REPETICIONES):
+            _consultas(fragmentado)
+        consultas = (time.perf_counter() - inicio) / (REPETICIONES * 4)
+        inicio = time.perf_counter()
+        for id in ids:
+            fragmentado.obtener(id)
+        busquedas = (time.perf_counter() - inicio) / len(ids)
+    return resultado, carga, consultas, busquedas
+
+
+def _sesgado(filas, fragmentos):
+    rng = random.Random(7)
+    marcas = [f"Marca{numero}" for numero in range(30)]
+    with CatalogoFragmentado(fragmentos=fragmentos, rebalanceo_automatico=False) as fragmentado:
+        for i in range(filas):
+            marca = "Mabe" if i % 2 else rng.choice(marcas)
+            fragmentado.agregar_valores("Lavadora", f"L{i}", marca, f"W{i % 997}", rng.randint(2000, 40000),
+                                        rng.randint(5, 25), rng.randint(30, 90), rng.randint(1, 14))
+        fragmentado.vaciar()
+        antes = fragmentado.cargas()
+        desbalance = fragmentado.desbalance()
+        inicio = time.perf_counter()
+        movimientos = fragmentado.rebalancear()
+        segundos = time.perf_counter() - inicio
+        print(f"Marcas sesgadas, {fragmentos} fragmentos: cargas {antes} (x{desbalance:.2f})")
+        print(f"  rebalancear(): {len(movimientos)} particiones movidas en {segundos:.3f} s -> "
+              f"cargas {fragmentado.cargas()} (x{fragmentado.desbalance():.2f})")
+
+
+def main(filas=300000, opciones=None):
+    catalogo = generar_catalogo(filas)
+    esperado = _esperado(catalogo)
+    ids = random.Random(3).sample([id for tabla in catalogo.tablas.values() for id in tabla.columna("id")],
+                                  BUSQUEDAS)
+    opciones = opciones or sorted({2, 4, os.cpu_count() or 1})
+    print(f"Filas: {filas:,}  CPUs: {os.cpu_count()}")
+    base = None
+    for fragmentos in [1] + [n for n in opciones if n > 1]:
+        resultado, carga, consultas, busquedas = _medir(catalogo, fragmentos, ids)
+        assert resultado == esperado, "Las consultas repartidas no coinciden con el catálogo"
+        base = base or consultas
+        aceleracion = base / consultas
+        print(f"{fragmentos:>3} fragmentos: carga {filas / carga:>10,.0f} filas/s  "
+              f"consultas {1 / consultas:>7,.1f}/s  x{aceleracion:.2f} "
+              f"(eficiencia {aceleracion / fragmentos:4.0%})  "
+              f"obtener {1 / busquedas:>8,.0f}/s")
+    _sesgado(filas // 3, max(opciones))
+
+
+if __name__ == "__main__":
+    argumentos = [int(valor) for valor in sys.argv[1:]]
+    main(*argumentos[:1], opciones=argumentos[1:] or None)
@@ -0,0 +1,76 @@
+"""Compara tipo_gama() objeto por objeto contra la clasificación por lotes.
+
+Uso:
+    python benchmarks/bench_gama.py [filas]
+
+Por defecto se usan 10**6 lavadoras, refrigeradores y microondas generados
+con una semilla fija. Las columnas se guardan en array("d"), igual que en
+catalogo.TablaColumnar. Antes de medir se verifica que ambos caminos den
+exactamente las mismas etiquetas en las variantes U3 y U4. Se reporta el
+tiempo de obtener sólo los códigos y el de obtener las etiquetas de texto.
+"""
+
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gama_vectorizada
+import proyectoU3
+import proyectoU4
+
+
+def _medir(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return time.perf_counter() - inicio, resultado
+
+
+def _reporte(nombre, filas, escalar, codigos, lotes):
+    print(f"{nombre:<20} escalar {filas / escalar:>13,.0f} filas/s | "
+          f"códigos {filas / codigos:>13,.0f} filas/s x{escalar / codigos:<5.1f} | "
+          f"etiquetas {filas / lotes:>13,.0f} filas/s x{escalar / lotes:.1f}")
+
+
+def main(filas=10**6):
+    rng = random.Random(42)
+    carga = array("d", (rng.randint(5, 25) for _ in range(filas)))
+    ciclos = array("d", (rng.randint(1, 14) for _ in range(filas)))
+    puertas = array("d", (rng.randint(1, 4) for _ in range(filas)))
+    metros = array("d", (round(rng.uniform(0.2, 20), 3) for _ in range(filas)))
+    potencia = array("d", (rng.randint(600, 2200) for _ in range(filas)))
+
+    print(f"Filas: {filas:,}  NumPy: {'sí' if gama_vectorizada.np is not None else 'no'}")
+    for modulo, variante in ((proyectoU3, "U3"), (proyectoU4, "U4")):
+        lavadoras = [modulo.Lavadora("id", "marca", "modelo", 1, c, 10, k)
+                     for c, k in zip(carga, ciclos)]
+        escalar, esperadas = _medir(lambda: [l.tipo_gama() for l in lavadoras])
+        codigos, _ = _medir(lambda: gama_vectorizada.codigos_lavadoras(carga, ciclos, variante))
+        lotes, obtenidas = _medir(lambda: gama_vectorizada.gama_lavadoras(carga, ciclos, variante))
+        assert esperadas == obtenidas, f"Lavadora {variante}: los resultados no coinciden"
+        _reporte(f"Lavadora ({variante})", filas, escalar, codigos, lotes)
+        del lavadoras
+
+    refrigeradores = [proyectoU4.Refrigerador("id", "marca", "modelo", 1, p, m, 10)
+                      for p, m in zip(puertas, metros)]
+    escalar, esperadas = _medir(lambda: [r.tipo_gama() for r in refrigeradores])
+    codigos, _ = _medir(lambda: gama_vectorizada.codigos_refrigeradores(puertas, metros))
+    lotes, obtenidas = _medir(lambda: gama_vectorizada.gama_refrigeradores(puertas, metros))
+    assert esperadas == obtenidas, "Refrigerador: los resultados no coinciden"
+    _reporte("Refrigerador", filas, escalar, codigos, lotes)
+    del refrigeradores
+
+    microondas = [proyectoU4.Microondas("id", "marca", "modelo", 1, p, 1000, "1x1x1")
+                  for p in potencia]
+    escalar, esperadas = _medir(lambda: [m.tipo_gama() for m in microondas])
+    codigos, _ = _medir(lambda: gama_vectorizada.codigos_microondas(potencia))
+    lotes, obtenidas = _medir(lambda: gama_vectorizada.gama_microondas(potencia))
+    assert esperadas == obtenidas, "Microondas: los resultados no coinciden"
+    _reporte("Microondas", filas, escalar, codigos, lotes)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10**6)
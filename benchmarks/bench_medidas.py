@@ -0,0 +1,53 @@
+"""Compara las consultas de ajuste del árbol k-d contra revisar todas las filas.
+
+Uso:
+    python benchmarks/bench_medidas.py [filas]
+
+Genera microondas con medidas aleatorias (semilla fija), construye
+IndiceMedidas desde las columnas derivadas del catálogo y, para varios
+huecos, verifica que el índice devuelva las mismas filas que el recorrido
+completo y reporta el tiempo de cada uno.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalogo import Catalogo
+from medidas import IndiceMedidas
+
+HUECOS = ((40, 25, 30), (45, 30, 40), (55, 35, 45), (65, 45, 55), (45, None, None))
+
+
+def main(filas=500000):
+    rng = random.Random(5)
+    catalogo = Catalogo()
+    for i in range(filas):
+        medidas = f"{rng.uniform(30, 70):.1f}x{rng.uniform(20, 50):.1f}x{rng.uniform(25, 60):.1f}"
+        catalogo.agregar_valores("Microondas", f"M{i}", "LG", "NeoChef", 4700, 1200, 1350, medidas)
+    tabla = catalogo.tablas["Microondas"]
+
+    inicio = time.perf_counter()
+    indice = IndiceMedidas.desde_tabla(tabla)
+    print(f"Filas: {filas:,}  construcción del índice: {time.perf_counter() - inicio:.2f} s")
+
+    anchos, altos, profundidades = (tabla.derivados[campo] for campo in ("ancho", "alto", "profundidad"))
+    for hueco in HUECOS:
+        inicio = time.perf_counter()
+        encontradas = indice.cabe_en(*hueco)
+        arbol = time.perf_counter() - inicio
+        ancho, alto, profundidad = (float("inf") if valor is None else valor for valor in hueco)
+        inicio = time.perf_counter()
+        esperadas = [fila for fila in range(filas) if anchos[fila] <= ancho
+                     and altos[fila] <= alto and profundidades[fila] <= profundidad]
+        completo = time.perf_counter() - inicio
+        assert sorted(encontradas) == esperadas, f"El índice no coincide para {hueco}"
+        print(f"hueco {str(hueco):<22} {len(esperadas):>8,} filas  árbol {arbol * 1000:8.2f} ms  "
+              f"recorrido {completo * 1000:8.2f} ms  x{completo / arbol:.1f}")
+
+
+if __name__ == "__main__":
+    main(*[int(valor) for valor in sys.argv[1:]])
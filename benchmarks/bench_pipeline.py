@@ -0,0 +1,67 @@
+"""Mide procesar_catalogo con distinto número de trabajadores.
+
+Uso:
+    python benchmarks/bench_pipeline.py [filas] [trabajadores...]
+
+Genera un catálogo con semilla fija, lo procesa en el proceso actual y con
+cada número de trabajadores indicado (por defecto 2, 4 y os.cpu_count()),
+verifica que la salida sea idéntica a escribir_catalogo y reporta filas/s.
+"""
+
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalogo import Catalogo
+from pipeline import procesar_catalogo
+from renderizado import escribir_catalogo
+
+
+def generar_catalogo(filas, semilla=11):
+    """Catálogo de prueba con las tres clases repartidas por igual."""
+    rng = random.Random(semilla)
+    catalogo = Catalogo()
+    marcas = ("Whirlpool", "Samsung", "LG", "Mabe", "Bosch")
+    for i in range(filas):
+        marca = rng.choice(marcas)
+        precio = rng.randint(2000, 40000)
+        if i % 3 == 0:
+            catalogo.agregar_valores("Lavadora", f"L{i}", marca, f"W{i % 997}", precio,
+                                     rng.randint(5, 25), rng.randint(30, 90), rng.randint(1, 14))
+        elif i % 3 == 1:
+            catalogo.agregar_valores("Refrigerador", f"R{i}", marca, f"F{i % 997}", precio,
+                                     rng.randint(1, 4), round(rng.uniform(0.2, 20), 3),
+                                     rng.randint(5, 30))
+        else:
+            catalogo.agregar_valores("Microondas", f"M{i}", marca, f"O{i % 997}", precio,
+                                     rng.randint(600, 2200), rng.randint(900, 2000),
+                                     "54x32.2x43.3")
+    return catalogo
+
+
+def main(filas=600000, opciones=None):
+    catalogo = generar_catalogo(filas)
+    esperado = io.StringIO()
+    escribir_catalogo(catalogo, esperado)
+    esperado = esperado.getvalue()
+
+    opciones = opciones or sorted({2, 4, os.cpu_count() or 1})
+    base = None
+    print(f"Filas: {filas:,}  CPUs: {os.cpu_count()}")
+    for trabajadores in [1] + [n for n in opciones if n > 1]:
+        inicio = time.perf_counter()
+        resultado = procesar_catalogo(catalogo, trabajadores=trabajadores)
+        segundos = time.perf_counter() - inicio
+        assert resultado.texto() == esperado, "La salida del pipeline no coincide"
+        base = base or segundos
+        print(f"{trabajadores:>3} trabajadores: {filas / segundos:>12,.0f} filas/s  "
+              f"aceleración x{base / segundos:.2f}")
+
+
+if __name__ == "__main__":
+    argumentos = [int(valor) for valor in sys.argv[1:]]
+    main(*argumentos[:1], opciones=argumentos[1:] or None)
@@ -0,0 +1,116 @@
+"""Compara el motor de precios por lotes contra cambiar precio fila por fila.
+
+Uso:
+    python benchmarks/bench_precios.py [filas] [inventario]
+
+Sobre un catálogo columnar aplica un descuento del 12.5% a una marca en
+gama Alta, 99.99 pesos menos a los microondas y un tipo de cambio a otra
+marca:
+    - fila por fila con TablaColumnar.asignar() y aritmética Decimal,
+    - MotorPrecios con NumPy (si está instalado),
+    - MotorPrecios en Python puro.
+Verifica que los tres dejen los mismos precios. Después aplica las mismas
+reglas a un Inventario con estadísticas conectadas, uno por uno con
+actualizar() contra aplicar_inventario().
+"""
+
+import os
+import sys
+import time
+from decimal import Decimal, ROUND_HALF_EVEN
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import precios
+from bench_pipeline import generar_catalogo
+from catalogo import ESQUEMAS
+from estadisticas import Estadisticas
+from inventario import Inventario
+from precios import Conversion, Descuento, MotorPrecios
+
+REGLAS = (Descuento(porcentaje="12.5", marca="LG", gama="Alta"),
+          Descuento(monto="99.99", tipo="Microondas"),
+          Conversion("0.0583", marca="Bosch"))
+CENTAVO = Decimal("0.01")
+
+
+def _por_fila(catalogo):
+    for tipo, tabla in catalogo.tablas.items():
+        for fila, obj in enumerate(tabla):
+            gama = obj.tipo_gama()
+            precio = Decimal(repr(obj.precio))
+            for regla in REGLAS:
+                if regla.aplica(tipo, obj.marca, gama):
+                    precio = (precio * regla.factor.numerator / regla.factor.denominator).quantize(
+                        CENTAVO, ROUND_HALF_EVEN)
+                    precio = max(precio - Decimal(regla.resta) / 100, Decimal(0))
+            if precio == precio.to_integral_value() and isinstance(obj.precio, int):
+                tabla.asignar("precio", fila, int(precio))
+            else:
+                tabla.asignar("precio", fila, float(precio))
+
+
+def _precios(catalogo):
+    return {tipo: [tabla.valor("precio", fila) for fila in range(len(tabla))]
+            for tipo, tabla in catalogo.tablas.items()}
+
+
+def _inventario(catalogo):
+    inventario = Inventario()
+    for tipo, tabla in catalogo.tablas.items():
+        clase, campos = ESQUEMAS[tipo].clase, ESQUEMAS[tipo].campos
+        for fila in range(len(tabla)):
+            inventario.agregar(clase(*(tabla.valor(campo, fila) for campo in campos)))
+    Estadisticas().conectar(inventario)
+    return inventario
+
+
+def main(filas=600000, objetos=100000):
+    motor = MotorPrecios(REGLAS)
+    print(f"Catálogo: {filas:,} filas")
+    catalogo = generar_catalogo(filas)
+    inicio = time.perf_counter()
+    _por_fila(catalogo)
+    base = time.perf_counter() - inicio
+    esperado = _precios(catalogo)
+    print(f"fila por fila (Decimal)   {base:8.3f} s")
+
+    motores = [("Python puro", None)]
+    if precios.np is not None:
+        motores.insert(0, ("NumPy", precios.np))
+    for nombre, modulo in motores:
+        original, precios.np = precios.np, modulo
+        try:
+            catalogo = generar_catalogo(filas)
+            inicio = time.perf_counter()
+            cambiadas = motor.aplicar_catalogo(catalogo)
+            segundos = time.perf_counter() - inicio
+        finally:
+            precios.np = original
+        assert _precios(catalogo) == esperado, nombre
+        print(f"MotorPrecios {nombre:<12} {segundos:8.3f} s  ({base / segundos:5.1f}x, "
+              f"{sum(cambiadas.values()):,} precios cambiados)")
+
+    print(f"Inventario: {objetos:,} objetos con estadísticas conectadas")
+    catalogo = generar_catalogo(objetos)
+    inventario = _inventario(catalogo)
+    inicio = time.perf_counter()
+    for obj in list(inventario):
+        tipo, gama = inventario.tipos[obj.id]
+        nuevo = motor.cotizar(tipo, obj.marca, gama, obj.precio)
+        if nuevo != obj.precio:
+            inventario.actualizar(obj.id, precio=nuevo)
+    base = time.perf_counter() - inicio
+    esperado = {obj.id: obj.precio for obj in inventario}
+    print(f"actualizar() uno por uno  {base:8.3f} s")
+    inventario = _inventario(catalogo)
+    inicio = time.perf_counter()
+    cambiados = motor.aplicar_inventario(inventario)
+    segundos = time.perf_counter() - inicio
+    assert {obj.id: obj.precio for obj in inventario} == esperado
+    print(f"aplicar_inventario()      {segundos:8.3f} s  ({base / segundos:5.1f}x, "
+          f"{cambiados:,} precios cambiados)")
+
+
+if __name__ == "__main__":
+    main(*[int(valor) for valor in sys.argv[1:]])
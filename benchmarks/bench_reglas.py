@@ -0,0 +1,79 @@
+"""Compara tipo_gama() escrito a mano contra las reglas compiladas.
+
+Uso:
+    python benchmarks/bench_reglas.py [filas]
+
+Verifica que los conjuntos "U3" y "U4" de reglas_gama.json den las mismas
+etiquetas que proyectoU3.py y proyectoU4.py, mide el costo por objeto de
+ambos caminos y el tiempo de una recarga en caliente.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import proyectoU3
+import proyectoU4
+from catalogo import Catalogo
+from reglas_gama import MotorReglas
+
+
+def _objetos(modulo, filas, rng):
+    objetos = []
+    for _ in range(filas):
+        objetos.append(modulo.Lavadora("id", "m", "m", 1, rng.randint(5, 25), 10, rng.randint(1, 14)))
+        objetos.append(modulo.Refrigerador("id", "m", "m", 1, rng.randint(1, 4),
+                                           round(rng.uniform(0.2, 20), 3), 10))
+        objetos.append(modulo.Microondas("id", "m", "m", 1, rng.randint(600, 2200), 1000, "1x1x1"))
+    return objetos
+
+
+def _medir(objetos):
+    inicio = time.perf_counter()
+    resultado = [objeto.tipo_gama() for objeto in objetos]
+    return time.perf_counter() - inicio, resultado
+
+
+def main(filas=300000):
+    rng = random.Random(7)
+    manual_u3 = _objetos(proyectoU3, filas, rng)
+    rng = random.Random(7)
+    objetos = _objetos(proyectoU4, filas, rng)
+    total = len(objetos)
+
+    tiempo_manual, esperadas_u4 = _medir(objetos)
+    _, esperadas_u3 = _medir(manual_u3)
+
+    motor = MotorReglas(conjunto="U4")
+    inicio = time.perf_counter()
+    motor.instalar()
+    tiempo_instalar = time.perf_counter() - inicio
+    tiempo_compilado, obtenidas = _medir(objetos)
+    assert obtenidas == esperadas_u4, "Las reglas U4 no coinciden con proyectoU4.py"
+
+    catalogo = Catalogo()
+    for objeto in objetos:
+        catalogo.agregar(objeto)
+    lotes = []
+    for tabla in catalogo.tablas.values():
+        lotes.extend(motor.gama_tabla(tabla))
+    assert sorted(lotes) == sorted(esperadas_u4), "La versión por lotes no coincide"
+
+    motor.conjunto = "U3"
+    motor.recargar(forzar=True)
+    _, obtenidas = _medir(objetos)
+    assert obtenidas == esperadas_u3, "Las reglas U3 no coinciden con proyectoU3.py"
+    motor.restaurar()
+
+    print(f"Objetos: {total:,}")
+    print(f"tipo_gama a mano:     {total / tiempo_manual:>14,.0f} llamadas/s")
+    print(f"tipo_gama compilado:  {total / tiempo_compilado:>14,.0f} llamadas/s "
+          f"(relación {tiempo_compilado / tiempo_manual:.2f})")
+    print(f"Carga, compilación e instalación: {tiempo_instalar * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300000)
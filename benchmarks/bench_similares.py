@@ -0,0 +1,125 @@
+"""Latencia y recall de IndiceSimilares contra la fuerza bruta.
+
+Uso:
+    python benchmarks/bench_similares.py [consultas] [tamaños...]
+
+Para cada tamaño genera lavadoras con semilla fija, construye el índice y
+busca los 10 más parecidos a artículos al azar:
+    - recorriendo todas las filas en Python,
+    - con NumPy calculando todas las distancias (si está instalado),
+    - con el árbol k-d exacto y aproximado (epsilon 0.5 y 1).
+El recall es la fracción de los verdaderos 10 vecinos (los de la fuerza
+bruta) que devuelve el índice. También mide altas incrementales por
+segundo sobre el índice ya construido.
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+from math import dist
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalogo import Catalogo
+from similares import IndiceSimilares
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+K = 10
+TAMANOS = (10000, 50000, 200000)
+EPSILONS = (0.0, 0.5, 1.0)
+
+
+def _catalogo(filas, semilla=7):
+    rng = random.Random(semilla)
+    catalogo = Catalogo()
+    for i in range(filas):
+        capacidad = rng.randint(5, 25)
+        catalogo.agregar_valores("Lavadora", f"L{i}", "LG", f"W{i % 997}",
+                                 round(capacidad * 900 + rng.gauss(0, 2500)), capacidad,
+                                 rng.randint(30, 90), rng.randint(1, 14))
+    return catalogo
+
+
+def _fuerza_bruta_python(indice, id):
+    punto = indice.normalizar(indice.valores[id])
+    distancias = [(dist(punto, indice.normalizar(valores)), otro)
+                  for otro, valores in indice.valores.items() if otro != id]
+    distancias.sort()
+    return distancias[:K]
+
+
+def _fuerza_bruta_numpy(matriz, claves, posicion):
+    distancias = np.sqrt(((matriz - matriz[posicion]) ** 2).sum(axis=1))
+    distancias[posicion] = np.inf
+    mejores = np.argpartition(distancias, K)[:K]
+    mejores = mejores[np.argsort(distancias[mejores])]
+    return [(float(distancias[i]), claves[i]) for i in mejores]
+
+
+def _medir(funcion, consultas):
+    tiempos = []
+    resultados = []
+    for consulta in consultas:
+        inicio = time.perf_counter()
+        resultados.append(funcion(consulta))
+        tiempos.append(time.perf_counter() - inicio)
+    return resultados, statistics.median(tiempos) * 1e6, sorted(tiempos)[int(len(tiempos) * 0.99) - 1] * 1e6
+
+
+def _recall(obtenidos, esperados):
+    aciertos = 0
+    for obtenido, esperado in zip(obtenidos, esperados):
+        # Un empate en la distancia del décimo también cuenta como acierto
+        limite = esperado[-1][0] + 1e-9
+        verdaderos = {clave for _, clave in esperado}
+        aciertos += sum(1 for distancia, clave in obtenido
+                        if clave in verdaderos or distancia <= limite)
+    return aciertos / (K * len(esperados))
+
+
+def main(consultas=200, *tamanos):
+    rng = random.Random(3)
+    for filas in tamanos or TAMANOS:
+        catalogo = _catalogo(filas)
+        tabla = catalogo.tablas["Lavadora"]
+        inicio = time.perf_counter()
+        indice = IndiceSimilares.desde_tabla(tabla)
+        construccion = time.perf_counter() - inicio
+        ids = rng.sample(list(indice.valores), consultas)
+        print(f"Lavadoras: {filas:,}  construcción: {construccion:.2f} s  consultas: {consultas}")
+
+        muestra = ids[:max(1, min(consultas, 200000 // filas))]
+        _, mediana, p99 = _medir(lambda id: _fuerza_bruta_python(indice, id), muestra)
+        print(f"  fuerza bruta Python   p50 {mediana:>10,.0f} µs  p99 {p99:>10,.0f} µs")
+        if np is not None:
+            claves = list(indice.valores)
+            posiciones = {clave: posicion for posicion, clave in enumerate(claves)}
+            matriz = np.array([indice.normalizar(valores) for valores in indice.valores.values()])
+            esperados, mediana, p99 = _medir(
+                lambda id: _fuerza_bruta_numpy(matriz, claves, posiciones[id]), ids)
+            print(f"  fuerza bruta NumPy    p50 {mediana:>10,.0f} µs  p99 {p99:>10,.0f} µs")
+        else:
+            esperados = [_fuerza_bruta_python(indice, id) for id in ids]
+        for epsilon in EPSILONS:
+            obtenidos, mediana, p99 = _medir(lambda id: indice.similares(id, K, epsilon), ids)
+            print(f"  k-d epsilon {epsilon:<4}      p50 {mediana:>10,.0f} µs  p99 {p99:>10,.0f} µs  "
+                  f"recall@{K} {_recall(obtenidos, esperados):.3f}")
+
+        altas = min(filas // 10, 20000)
+        inicio = time.perf_counter()
+        for i in range(altas):
+            indice.agregar(f"N{i}", (rng.randint(4000, 25000), rng.randint(5, 25),
+                                     rng.randint(30, 90), rng.randint(1, 14)))
+        segundos = time.perf_counter() - inicio
+        print(f"  altas incrementales   {altas / segundos:>10,.0f} por segundo "
+              f"({len(indice.indice.arboles)} árboles)")
+
+
+if __name__ == "__main__":
+    main(*[int(valor) for valor in sys.argv[1:]])
@@ -0,0 +1,89 @@
+"""Compara las clases generadas por tipos.py contra las escritas a mano.
+
+Uso:
+    python benchmarks/bench_tipos.py [objetos] [repeticiones]
+
+Declara con registrar_tipo() un tipo con los mismos campos y reglas de gama
+que proyectoU4.Lavadora y mide, con los mismos argumentos:
+    - construcciones por segundo de Lavadora, del tipo generado con
+      validación y del tipo generado sin validación,
+    - __str__ por segundo de cada uno.
+Las clases se miden intercaladas en cada repetición. Verifica que el texto de __str__ sea idéntico.
+"""
+
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proyectoU4 import Lavadora
+from tipos import Campo, registrar_tipo
+
+CAMPOS = (Campo("capacidad_carga", int, "Capacidad De Carga: ", " kg"),
+          Campo("consumo_agua", int, "Consumo De Agua: ", " Litros"),
+          Campo("ciclos_lavado", int, "Ciclos De Lavado: "))
+# Las mismas reglas que Lavadora.tipo_gama
+GAMA = {"reglas": [{"gama": "Baja", "todas": [["capacidad_carga", "<=", 10], ["ciclos_lavado", "<=", 3]]},
+                   {"gama": "Media", "todas": [["capacidad_carga", "<=", 15], ["ciclos_lavado", "<=", 5]]}],
+        "defecto": "Alta"}
+
+
+def _argumentos(objetos, semilla=5):
+    rng = random.Random(semilla)
+    return [(f"L{i}", "LG", f"W{i % 997}", rng.randint(4000, 25000), rng.randint(5, 25),
+             rng.randint(30, 90), rng.randint(1, 14)) for i in range(objetos)]
+
+
+def _mejores(funciones, repeticiones):
+    """Mejor tiempo de cada función, alternándolas en cada repetición.
+
+    Se miden intercaladas para que los cambios de frecuencia de la CPU o de
+    memoria a lo largo de la corrida no favorezcan a la que va primero. Sin
+    el recolector de basura, como timeit.
+    """
+    gc.disable()
+    try:
+        mejores = [float("inf")] * len(funciones)
+        for _ in range(repeticiones):
+            for posicion, funcion in enumerate(funciones):
+                inicio = time.perf_counter()
+                funcion()
+                mejores[posicion] = min(mejores[posicion], time.perf_counter() - inicio)
+    finally:
+        gc.enable()
+    return mejores
+
+
+def _reportar(accion, clases, tiempos, objetos):
+    base = tiempos[0]
+    for (nombre, _), segundos in zip(clases, tiempos):
+        print(f"  {accion:<9} {nombre:<22} {objetos / segundos:>12,.0f} por segundo  "
+              f"({base / segundos:4.2f}x)")
+
+
+def main(objetos=200000, repeticiones=5):
+    generada = registrar_tipo("LavadoraGenerada", CAMPOS, GAMA)
+    sin_validar = registrar_tipo("LavadoraSinValidar", CAMPOS, GAMA, validar=False)
+    argumentos = _argumentos(objetos)
+    clases = (("Lavadora (a mano)", Lavadora), ("generada", generada),
+              ("generada sin validar", sin_validar))
+
+    print(f"{objetos:,} objetos, mejor de {repeticiones}")
+    tiempos = _mejores([lambda clase=clase: [clase(*fila) for fila in argumentos] for _, clase in clases],
+                       repeticiones)
+    _reportar("construir", clases, tiempos, objetos)
+
+    instancias = [[clase(*fila) for fila in argumentos] for _, clase in clases]
+    tiempos = _mejores([lambda lista=lista: [str(obj) for obj in lista] for lista in instancias],
+                       repeticiones)
+    _reportar("__str__", clases, tiempos, objetos)
+
+    textos = [[str(obj) for obj in lista] for lista in instancias]
+    assert textos[0] == textos[1] == textos[2], "El texto de __str__ no coincide"
+
+
+if __name__ == "__main__":
+    main(*[int(valor) for valor in sys.argv[1:]])
@@ -0,0 +1,95 @@
+"""Compara la validación por columnas contra convertir registro por registro.
+
+Uso:
+    python benchmarks/bench_validacion.py [filas] [porcentaje_invalidas]
+
+Genera filas de Refrigerador como texto (igual que las deja csv.DictReader)
+con una fracción de valores inválidos: precios negativos, puertas con
+decimales, textos no numéricos y volúmenes en unidades que no coinciden.
+Las mismas filas también se agrupan por columna, como las arma el
+importador para cada lote.
+Mide:
+    - registro por registro como U3.py: cada campo con int() o, para
+      conservar los enteros, int() y si falla float(), dentro de un
+      try/except ValueError, revisando rangos con if,
+    - validar_columnas() sobre las columnas.
+Verifica que los dos acepten las mismas filas.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from validacion import PIES_POR_METRO, TOLERANCIA_UNIDADES, validar_columnas
+
+CAMPOS = ("id", "marca", "modelo", "precio", "no_puertas", "metros_cubicos", "pies_capacidad")
+
+
+def generar_filas(filas, invalidas=5, semilla=3):
+    """Filas de texto con invalidas% de filas con algún error."""
+    rng = random.Random(semilla)
+    datos = []
+    for i in range(filas):
+        metros = round(rng.uniform(0.2, 1.2), 3)
+        fila = [f"R{i}", rng.choice(("Samsung", "LG", "Mabe")), f"F{i % 997}",
+                str(rng.randint(2000, 40000)), str(rng.randint(1, 4)), str(metros),
+                str(round(metros * PIES_POR_METRO))]
+        if rng.random() * 100 < invalidas:
+            posicion, valor = rng.choice(((3, "-150"), (4, "2.5"), (5, "abc"), (6, "300")))
+            fila[posicion] = valor
+        datos.append(fila)
+    return datos
+
+
+def _numero(texto):
+    """int() y si falla float(), como se convertía antes de validacion.py."""
+    try:
+        return int(texto)
+    except ValueError:
+        return float(texto)
+
+
+def _por_registro(datos):
+    aceptadas = []
+    for fila in datos:
+        try:
+            precio = _numero(fila[3])
+            no_puertas = int(fila[4])
+            metros_cubicos = _numero(fila[5])
+            pies_capacidad = _numero(fila[6])
+            if precio < 0 or not 1 <= no_puertas <= 8 or metros_cubicos < 0 or pies_capacidad < 0:
+                raise ValueError("fuera de rango")
+            esperado = metros_cubicos * PIES_POR_METRO
+            if abs(pies_capacidad - esperado) > TOLERANCIA_UNIDADES * esperado:
+                raise ValueError("unidades")
+            aceptadas.append(fila[0])
+        except ValueError:
+            pass
+    return aceptadas
+
+
+def _por_columnas(columnas):
+    return validar_columnas("Refrigerador", columnas).filtradas()["id"]
+
+
+def main(filas=300000, invalidas=5):
+    datos = generar_filas(filas, invalidas)
+    # El importador ya arma las columnas de cada lote al leer las filas
+    columnas = dict(zip(CAMPOS, map(list, zip(*datos))))
+    print(f"Refrigeradores: {filas:,} filas, {invalidas}% con errores")
+    inicio = time.perf_counter()
+    esperado = _por_registro(datos)
+    base = time.perf_counter() - inicio
+    print(f"registro por registro     {base:8.3f} s  ({len(esperado):,} aceptadas)")
+
+    inicio = time.perf_counter()
+    aceptadas = _por_columnas(columnas)
+    segundos = time.perf_counter() - inicio
+    assert aceptadas == esperado
+    print(f"validar_columnas()        {segundos:8.3f} s  ({base / segundos:4.1f}x)")
+
+if __name__ == "__main__":
+    main(*[int(valor) for valor in sys.argv[1:]])
@@ -0,0 +1,86 @@
+"""Prueba de carga del servicio HTTP contra un cliente local.
+
+Uso:
+    python benchmarks/carga_servicio.py [clientes] [peticiones_por_cliente] [filas]
+
+Levanta servicio.ServicioCatalogo en 127.0.0.1 con un inventario de prueba,
+abre varios clientes con keep-alive que mezclan consultas por id, filtros,
+consultas de gama y altas, y reporta peticiones/s con la latencia p50/p99
+de cada tipo de petición.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_pipeline import generar_catalogo
+from inventario import Inventario
+from servicio import ClienteHTTP, ServicioCatalogo
+
+_FILTROS = ("/electrodomesticos?tipo=Refrigerador&no_puertas=2&precio_max=15000",
+            "/electrodomesticos?tipo=Lavadora&marca=LG&capacidad_carga_min=20",
+            "/electrodomesticos?tipo=Microondas&potencia_min=2100",
+            "/gama/alta?tipo=Lavadora&precio_min=39000")
+
+
+def percentil(ordenados, fraccion):
+    """Percentil por rango más cercano de una lista ya ordenada."""
+    return ordenados[min(len(ordenados) - 1, int(fraccion * len(ordenados)))]
+
+
+async def _cliente(numero, puerto, peticiones, ids, latencias):
+    rng = random.Random(numero)
+    cliente = await ClienteHTTP("127.0.0.1", puerto).conectar()
+    try:
+        for i in range(peticiones):
+            eleccion = rng.random()
+            if eleccion < 0.6:
+                tipo, metodo, destino, datos = "id", "GET", f"/electrodomesticos/{rng.choice(ids)}", None
+            elif eleccion < 0.9:
+                tipo, metodo, destino, datos = "filtro", "GET", rng.choice(_FILTROS), None
+            else:
+                tipo, metodo, destino = "alta", "POST", "/electrodomesticos"
+                datos = {"tipo": "Lavadora", "id": f"C{numero}-{i}", "marca": "Mabe",
+                         "modelo": "X", "precio": rng.randint(2000, 40000),
+                         "capacidad_carga": 12, "consumo_agua": 50, "ciclos_lavado": 4}
+            inicio = time.perf_counter()
+            estado, _ = await cliente.pedir(metodo, destino, datos)
+            latencias.setdefault(tipo, []).append(time.perf_counter() - inicio)
+            if estado >= 400:
+                raise RuntimeError(f"{metodo} {destino} respondió {estado}")
+    finally:
+        await cliente.cerrar()
+
+
+async def principal(clientes=50, peticiones=200, filas=30000):
+    inventario = Inventario()
+    for obj in generar_catalogo(filas):
+        inventario.agregar(obj)
+    ids = list(inventario.objetos)
+    servicio = await ServicioCatalogo(inventario).iniciar("127.0.0.1", 0)
+    latencias = {}
+    inicio = time.perf_counter()
+    await asyncio.gather(*(_cliente(numero, servicio.puerto, peticiones, ids, latencias)
+                           for numero in range(clientes)))
+    segundos = time.perf_counter() - inicio
+    await servicio.detener()
+
+    total = clientes * peticiones
+    print(f"Inventario: {filas:,}  clientes: {clientes}  peticiones: {total:,}")
+    print(f"Rendimiento: {total / segundos:,.0f} peticiones/s  "
+          f"lotes de altas: {servicio.lotes_aplicados}  aciertos de caché: {servicio.aciertos_cache}")
+    todas = []
+    for tipo, valores in sorted(latencias.items()) + [("total", todas)]:
+        if tipo != "total":
+            todas.extend(valores)
+        valores.sort()
+        print(f"{tipo:>7}: p50 {percentil(valores, 0.50) * 1000:7.2f} ms  "
+              f"p99 {percentil(valores, 0.99) * 1000:7.2f} ms  ({len(valores):,})")
+
+
+if __name__ == "__main__":
+    asyncio.run(principal(*[int(valor) for valor in sys.argv[1:]]))
@@ -0,0 +1,87 @@
+"""Reporte de memoria de las columnas id, marca y modelo: listas de str contra codificadas.
+
+Uso:
+    python benchmarks/memoria_cadenas.py [filas] [modelos]
+
+Genera filas como las que deja un importador: cada texto es un objeto str
+nuevo, 12 marcas, un conjunto de modelos que se repiten entre filas y un id
+que en la mitad de las filas es igual al modelo (como en proyectoU3.py) y en
+la otra mitad es un SKU único. Se cuentan los bytes exactos con
+sys.getsizeof de las listas y de cada str distinto contra los de los
+códigos uint32 más el diccionario compartido. También se compara contar
+filas por marca y buscar una marca sobre str contra sobre códigos.
+"""
+
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cadenas import ColumnaCodificada, Diccionario
+
+MARCAS = ("Whirlpool", "Samsung", "LG", "Mabe", "Bosch", "Frigidaire", "GE", "Electrolux",
+          "Hisense", "Midea", "Panasonic", "Teka")
+
+
+def _bytes_listas(columnas):
+    distintas = {}
+    for columna in columnas:
+        for valor in columna:
+            distintas[id(valor)] = valor
+    return (sum(sys.getsizeof(columna) for columna in columnas)
+            + sum(sys.getsizeof(valor) for valor in distintas.values()))
+
+
+def main(filas=2000000, modelos=20000):
+    rng = random.Random(17)
+    catalogo_modelos = [f"{rng.choice('ABCDEFGHJKLMNPRSTW')}{rng.randint(10**6, 10**7)}"
+                        f"{rng.choice(('WJM', 'S9/EM', 'DIR', 'LX', ''))}" for _ in range(modelos)]
+    listas = {"id": [], "marca": [], "modelo": []}
+    diccionario = Diccionario()
+    codificadas = {campo: ColumnaCodificada(diccionario) for campo in listas}
+    anexar = {campo: columna.anexador() for campo, columna in codificadas.items()}
+    for fila in range(filas):
+        # "".join crea un str nuevo, como al leer cada línea de un CSV
+        indice = rng.randrange(modelos)
+        modelo = "".join(catalogo_modelos[indice])
+        marca = "".join(MARCAS[indice % len(MARCAS)])
+        ident = "".join(modelo) if fila % 2 else f"{modelo}-{fila}"
+        for campo, valor in (("id", ident), ("marca", marca), ("modelo", modelo)):
+            listas[campo].append(valor)
+            anexar[campo](valor)
+
+    planas = _bytes_listas(list(listas.values()))
+    codigos = sum(columna.codigos.itemsize * len(columna) for columna in codificadas.values())
+    comprimidas = codigos + diccionario.tamano_bytes()
+    print(f"Filas: {filas:,}  modelos distintos: {modelos:,}  textos en el diccionario: "
+          f"{len(diccionario):,}")
+    print(f"listas de str:        {planas / 2**20:>10,.1f} MiB")
+    print(f"códigos + diccionario:{comprimidas / 2**20:>10,.1f} MiB "
+          f"(códigos {codigos / 2**20:,.1f} MiB)")
+    print(f"ahorro:               {(planas - comprimidas) / 2**20:>10,.1f} MiB "
+          f"({1 - comprimidas / planas:.0%}, {(planas - comprimidas) / filas:.1f} bytes por fila)")
+
+    inicio = time.perf_counter()
+    esperado = Counter(listas["marca"])
+    texto = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    obtenido = codificadas["marca"].conteos()
+    codificado = time.perf_counter() - inicio
+    assert obtenido == dict(esperado)
+    print(f"conteo por marca:     str {texto * 1000:8.1f} ms  códigos {codificado * 1000:8.1f} ms")
+
+    inicio = time.perf_counter()
+    esperado = [fila for fila, marca in enumerate(listas["marca"]) if marca == "LG"]
+    texto = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    obtenido = codificadas["marca"].filas("LG")
+    codificado = time.perf_counter() - inicio
+    assert obtenido == esperado
+    print(f"filas de una marca:   str {texto * 1000:8.1f} ms  códigos {codificado * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*[int(valor) for valor in sys.argv[1:]])
@@ -0,0 +1,229 @@
+"""Suite de rendimiento reproducible para las clases de proyectoU4.py.
+
+Uso:
+    python benchmarks/suite.py [--tamanos 1000 10000 ...] [--salida resultados.json]
+                               [--base anterior.json] [--umbral 0.15]
+
+Para cada tamaño de catálogo (por defecto 10**3 a 10**5; la suite completa
+llega a 10**7 con --tamanos 1000 10000 100000 1000000 10000000) se mide:
+
+    construccion   crear Lavadora, Refrigerador y Microondas repartidos por igual
+    tipo_gama      clasificar todos los objetos
+    str            generar la ficha de texto de cada objeto
+    busqueda_id    buscar cada id en un dict en orden aleatorio
+
+Cada tamaño corre en un proceso aparte para que el pico de memoria (RSS) sea
+sólo suyo. Las operaciones se repiten y se reporta la mejor en ops/s. Las
+asignaciones por objeto se miden con tracemalloc sobre una muestra de
+construcción. Los datos se generan con una semilla fija.
+
+Con --base se compara contra un JSON anterior: si alguna operación pierde
+más del umbral de ops/s, o los bytes por objeto crecen más del umbral, se
+imprime la regresión y el programa termina con código 1.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proyectoU4 import Lavadora, Microondas, Refrigerador
+
+TAMANOS = (10**3, 10**4, 10**5)
+OPERACIONES = ("construccion", "tipo_gama", "str", "busqueda_id")
+UMBRAL = 0.15
+REPETICIONES = 3
+MUESTRA_ASIGNACIONES = 10000
+
+
+def generar_argumentos(tamano, semilla=7):
+    """Argumentos de construcción de cada objeto, con las clases intercaladas."""
+    rng = random.Random(semilla)
+    marcas = ("Whirlpool", "Samsung", "LG", "Mabe", "Bosch")
+    argumentos = []
+    for i in range(tamano):
+        base = (f"E{i}", rng.choice(marcas), f"M{i % 997}", rng.randint(2000, 40000))
+        if i % 3 == 0:
+            argumentos.append((Lavadora, base + (rng.randint(5, 25), rng.randint(30, 90),
+                                                 rng.randint(1, 14))))
+        elif i % 3 == 1:
+            argumentos.append((Refrigerador, base + (rng.randint(1, 4),
+                                                     round(rng.uniform(0.2, 20), 3),
+                                                     rng.randint(5, 30))))
+        else:
+            argumentos.append((Microondas, base + (rng.randint(600, 2200),
+                                                   rng.randint(900, 2000), "54x32.2x43.3")))
+    return argumentos
+
+
+def _construir(argumentos):
+    return [clase(*valores) for clase, valores in argumentos]
+
+
+def _mejor(funcion, repeticiones):
+    """Mejor tiempo de varias repeticiones, con el recolector apagado."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        gc.collect()
+        gc.disable()
+        try:
+            inicio = time.perf_counter()
+            funcion()
+            mejor = min(mejor, time.perf_counter() - inicio)
+        finally:
+            gc.enable()
+    return mejor
+
+
+def _asignaciones(argumentos):
+    """Bloques y bytes que siguen vivos por objeto tras construir la muestra."""
+    muestra = argumentos[:MUESTRA_ASIGNACIONES]
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.take_snapshot()
+    objetos = _construir(muestra)
+    despues = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    diferencias = despues.compare_to(antes, "filename")
+    bloques = sum(diferencia.count_diff for diferencia in diferencias)
+    tamano = sum(diferencia.size_diff for diferencia in diferencias)
+    del objetos
+    return bloques / len(muestra), tamano / len(muestra)
+
+
+def _rss_pico_mb():
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KiB y macOS bytes
+    return pico / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def medir(tamano, repeticiones=REPETICIONES):
+    """Mide todas las operaciones para un tamaño en el proceso actual.
+
+    Returns:
+        dict: ops/s por operación, rss_pico_mb, asignaciones_por_objeto y
+        bytes_por_objeto.
+    """
+    argumentos = generar_argumentos(tamano)
+    bloques, bytes_objeto = _asignaciones(argumentos)
+    resultado = {"asignaciones_por_objeto": round(bloques, 3),
+                 "bytes_por_objeto": round(bytes_objeto, 1)}
+
+    tiempos = {"construccion": _mejor(lambda: _construir(argumentos), repeticiones)}
+    objetos = _construir(argumentos)
+    del argumentos
+    tiempos["tipo_gama"] = _mejor(lambda: [obj.tipo_gama() for obj in objetos], repeticiones)
+    tiempos["str"] = _mejor(lambda: [str(obj) for obj in objetos], repeticiones)
+    por_id = {obj.id: obj for obj in objetos}
+    ids = list(por_id)
+    random.Random(3).shuffle(ids)
+    tiempos["busqueda_id"] = _mejor(lambda: [por_id[id] for id in ids], repeticiones)
+
+    for operacion in OPERACIONES:
+        resultado[operacion] = round(tamano / tiempos[operacion], 1)
+    resultado["rss_pico_mb"] = _rss_pico_mb()
+    return resultado
+
+
+def ejecutar(tamanos=TAMANOS, repeticiones=REPETICIONES):
+    """Corre cada tamaño en un proceso nuevo y junta los resultados.
+
+    Returns:
+        dict: Datos del entorno y resultados por tamaño.
+    """
+    resultados = {}
+    for tamano in tamanos:
+        proceso = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--interno", str(tamano),
+             "--repeticiones", str(repeticiones)],
+            check=True, capture_output=True, text=True)
+        resultados[str(tamano)] = json.loads(proceso.stdout)
+    return {"python": platform.python_version(), "implementacion": platform.python_implementation(),
+            "plataforma": platform.platform(), "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "resultados": resultados}
+
+
+def comparar(base, actual, umbral=UMBRAL):
+    """Busca regresiones entre dos corridas.
+
+    Args:
+        base (dict): Resultado anterior de ejecutar().
+        actual (dict): Resultado nuevo.
+        umbral (float): Fracción tolerada, por ejemplo 0.15 para un 15 %.
+
+    Returns:
+        list: Descripción de cada regresión encontrada.
+    """
+    regresiones = []
+    for tamano, nuevo in actual["resultados"].items():
+        anterior = base["resultados"].get(tamano)
+        if anterior is None:
+            continue
+        for operacion in OPERACIONES:
+            if operacion in anterior and nuevo[operacion] < anterior[operacion] * (1 - umbral):
+                regresiones.append(f"{operacion} con {int(tamano):,} objetos: "
+                                   f"{anterior[operacion]:,.0f} -> {nuevo[operacion]:,.0f} ops/s")
+        if nuevo["bytes_por_objeto"] > anterior["bytes_por_objeto"] * (1 + umbral):
+            regresiones.append(f"memoria con {int(tamano):,} objetos: {anterior['bytes_por_objeto']}"
+                               f" -> {nuevo['bytes_por_objeto']} bytes por objeto")
+    return regresiones
+
+
+def _imprimir(corrida):
+    print(f"Python {corrida['implementacion']} {corrida['python']}  {corrida['plataforma']}")
+    print(f"{'objetos':>12} " + " ".join(f"{op:>14}" for op in OPERACIONES)
+          + f" {'RSS MB':>8} {'bloq/obj':>8} {'B/obj':>7}")
+    for tamano, datos in corrida["resultados"].items():
+        rss = datos["rss_pico_mb"]
+        print(f"{int(tamano):>12,} " + " ".join(f"{datos[op]:>14,.0f}" for op in OPERACIONES)
+              + f" {rss if rss is None else round(rss, 1):>8} {datos['asignaciones_por_objeto']:>8}"
+              f" {datos['bytes_por_objeto']:>7}")
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanos", type=int, nargs="+", default=list(TAMANOS))
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES)
+    parser.add_argument("--salida", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--base", help="JSON de una corrida anterior para comparar")
+    parser.add_argument("--umbral", type=float, default=UMBRAL)
+    parser.add_argument("--interno", type=int, help=argparse.SUPPRESS)
+    opciones = parser.parse_args(argumentos)
+
+    if opciones.interno is not None:
+        print(json.dumps(medir(opciones.interno, opciones.repeticiones)))
+        return 0
+    corrida = ejecutar(opciones.tamanos, opciones.repeticiones)
+    _imprimir(corrida)
+    if opciones.salida:
+        with open(opciones.salida, "w", encoding="utf-8") as archivo:
+            json.dump(corrida, archivo, indent=2)
+    if opciones.base:
+        with open(opciones.base, encoding="utf-8") as archivo:
+            regresiones = comparar(json.load(archivo), corrida, opciones.umbral)
+        if regresiones:
+            print(f"\n*** REGRESIÓN DE RENDIMIENTO (umbral {opciones.umbral:.0%}) ***", file=sys.stderr)
+            for regresion in regresiones:
+                print(f"  {regresion}", file=sys.stderr)
+            return 1
+        print(f"\nSin regresiones contra {opciones.base} (umbral {opciones.umbral:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,345 @@
+"""Bitácora de escritura anticipada (write-ahead log) para el inventario.
+
+Los objetos creados en el menú se pierden al salir, y reescribir una
+instantánea completa en cada cambio no escala. Bitacora agrega cada alta,
+cambio y baja al final de un archivo; un cambio se considera guardado cuando
+su registro llegó al disco con fsync.
+
+Formato de cada registro:
+
+    <I largo> <I crc32> <largo bytes de JSON en UTF-8>
+
+    ["alta", tipo, [valores en el orden de ESQUEMAS[tipo].campos]]
+    ["cambio", id, {campo: valor, ...}]
+    ["baja", id]
+
+Commit en grupo: cada escritor deja su registro en memoria y espera a que
+sea durable. El primero que espera se vuelve líder, escribe todos los
+registros pendientes con un solo write y un solo fsync y despierta a los
+demás; los que llegan mientras tanto forman el siguiente grupo. Con muchos
+escritores concurrentes el costo de fsync se reparte entre todo el grupo.
+
+Almacen junta la bitácora con un Inventario y una instantánea (ver
+instantanea.py) en un directorio:
+
+    instantanea-000003.elec   estado con todos los segmentos anteriores al 3
+    bitacora-000003.log       operaciones posteriores a esa instantánea
+
+compactar() cierra el segmento actual, abre el siguiente, escribe la
+instantánea del estado y sólo entonces borra los archivos viejos; si el
+proceso muere a la mitad, al abrir se usa la instantánea anterior con todos
+sus segmentos. Al recuperar, un registro final incompleto o con crc
+inválido (escritura cortada por una caída) se descarta y el archivo se
+trunca en ese punto.
+
+Ejemplo:
+    with Almacen("datos") as almacen:
+        almacen.agregar(Lavadora("L1", "LG", "WM1", 9000, 20, 80, 10))
+        almacen.actualizar("L1", precio=8500)
+"""
+
+import json
+import os
+import re
+import struct
+import threading
+import zlib
+
+from catalogo import Catalogo, ESQUEMAS
+from inventario import Inventario
+
+_ENCABEZADO = struct.Struct("<II")
+_SEGMENTO = re.compile(r"bitacora-(\d{6})\.log$")
+_INSTANTANEA = re.compile(r"instantanea-(\d{6})\.elec$")
+COMPACTAR_BYTES = 64 * 2**20
+
+
+def codificar(operacion):
+    """Convierte una operación en los bytes de un registro."""
+    datos = json.dumps(operacion, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return _ENCABEZADO.pack(len(datos), zlib.crc32(datos)) + datos
+
+
+def leer_registros(datos):
+    """Decodifica los registros completos y válidos de una bitácora.
+
+    Args:
+        datos (bytes): Contenido del archivo.
+
+    Returns:
+        tuple: (lista de operaciones, bytes válidos). Si el último registro
+        está cortado o su crc no coincide, la lectura se detiene ahí.
+    """
+    operaciones = []
+    posicion = 0
+    tamano_encabezado = _ENCABEZADO.size
+    while posicion + tamano_encabezado <= len(datos):
+        largo, crc = _ENCABEZADO.unpack_from(datos, posicion)
+        inicio = posicion + tamano_encabezado
+        fin = inicio + largo
+        if fin > len(datos) or zlib.crc32(datos[inicio:fin]) != crc:
+            break
+        operaciones.append(json.loads(datos[inicio:fin]))
+        posicion = fin
+    return operaciones, posicion
+
+
+def aplicar(inventario, operacion):
+    """Aplica una operación leída de la bitácora a un Inventario."""
+    accion = operacion[0]
+    if accion == "alta":
+        _, tipo, valores = operacion
+        inventario.agregar(ESQUEMAS[tipo].clase(*valores))
+    elif accion == "cambio":
+        inventario.actualizar(operacion[1], **operacion[2])
+    elif accion == "baja":
+        inventario.eliminar(operacion[1])
+    else:
+        raise ValueError(f"Operación desconocida en la bitácora: {accion!r}")
+
+
+class Bitacora():
+    """Archivo de registros con commit en grupo.
+
+    Es seguro usarla desde varios hilos: escribir() sólo toma el cerrojo
+    para encolar y esperar() hace el fsync compartido.
+    """
+
+    def __init__(self, ruta):
+        """
+        Args:
+            ruta (str): Archivo de la bitácora; se abre para agregar al final.
+        """
+        self.ruta = ruta
+        self._archivo = open(ruta, "ab", buffering=0)
+        self._condicion = threading.Condition()
+        self._pendientes = []
+        self._escribiendo = False
+        self._error = None
+        # Bytes del segmento, incluidos los registros encolados que todavía
+        # no llegan al disco, para que la compactación automática también
+        # funcione sin commit síncrono
+        self.tamano = self._archivo.tell()
+        self.ultimo = 0
+        self.durable = 0
+        self.grupos = 0
+
+    def escribir(self, operacion):
+        """Encola una operación sin esperar a que llegue al disco.
+
+        Returns:
+            int: Número de secuencia del registro para esperar().
+        """
+        registro = codificar(operacion)
+        with self._condicion:
+            self._pendientes.append(registro)
+            self.tamano += len(registro)
+            self.ultimo += 1
+            return self.ultimo
+
+    def esperar(self, secuencia=None):
+        """Bloquea hasta que el registro (por defecto el último) sea durable.
+
+        Raises:
+            OSError: Si falló la escritura del grupo que contenía el registro.
+        """
+        with self._condicion:
+            if secuencia is None:
+                secuencia = self.ultimo
+            while self.durable < secuencia:
+                if self._error is not None:
+                    raise self._error
+                if self._escribiendo:
+                    self._condicion.wait()
+                    continue
+                self._escribiendo = True
+                grupo, self._pendientes = self._pendientes, []
+                hasta = self.ultimo
+                self._condicion.release()
+                try:
+                    datos = b"".join(grupo)
+                    self._archivo.write(datos)
+                    os.fsync(self._archivo.fileno())
+                except OSError as error:
+                    self._error = error
+                    raise
+                finally:
+                    self._condicion.acquire()
+                    self._escribiendo = False
+                    self._condicion.notify_all()
+                self.durable = hasta
+                self.grupos += 1
+
+    def registrar(self, operacion):
+        """Escribe una operación y espera a que sea durable."""
+        self.esperar(self.escribir(operacion))
+
+    def cerrar(self):
+        """Guarda lo pendiente y cierra el archivo."""
+        self.esperar()
+        self._archivo.close()
+
+
+class Almacen():
+    """Inventario persistente: instantánea más bitácora en un directorio.
+
+    Atributos:
+        inventario (Inventario): Estado en memoria; se modifica sólo por
+            medio de agregar(), actualizar() y eliminar() del almacén.
+        bitacora (Bitacora): Segmento de bitácora actual.
+        recuperadas (int): Operaciones aplicadas desde la bitácora al abrir.
+    """
+
+    def __init__(self, directorio, sincrono=True, compactar_bytes=COMPACTAR_BYTES):
+        """Abre el directorio, recuperando la instantánea y la bitácora.
+
+        Args:
+            directorio (str): Directorio de datos; se crea si no existe.
+            sincrono (bool): Si es True cada operación espera su fsync. Si
+                es False las operaciones sólo se encolan y se hacen durables
+                en grupo al llamar a sincronizar().
+            compactar_bytes (int): Tamaño del segmento a partir del cual se
+                compacta automáticamente; None para no hacerlo nunca.
+        """
+        os.makedirs(directorio, exist_ok=True)
+        self.directorio = directorio
+        self.sincrono = sincrono
+        self.compactar_bytes = compactar_bytes
+        self._cerrojo = threading.Lock()
+        self._secuencia = 0
+        self.inventario = Inventario()
+        self.segmento, self.recuperadas = self._recuperar()
+        self.bitacora = Bitacora(self._ruta("bitacora", self.segmento))
+        self.inventario.suscribir(self._anotar)
+
+    def _ruta(self, prefijo, numero):
+        extension = "log" if prefijo == "bitacora" else "elec"
+        return os.path.join(self.directorio, f"{prefijo}-{numero:06d}.{extension}")
+
+    def _archivos(self, patron):
+        numeros = []
+        for nombre in os.listdir(self.directorio):
+            encontrado = patron.match(nombre)
+            if encontrado:
+                numeros.append(int(encontrado.group(1)))
+        return sorted(numeros)
+
+    def _recuperar(self):
+        """Carga la instantánea más reciente y reaplica los segmentos posteriores.
+
+        Returns:
+            tuple: (número de segmento donde seguir escribiendo, operaciones
+            reaplicadas).
+        """
+        instantaneas = self._archivos(_INSTANTANEA)
+        base = instantaneas[-1] if instantaneas else 0
+        if instantaneas:
+            import instantanea
+            catalogo = instantanea.cargar(self._ruta("instantanea", base))
+            for tabla in catalogo.tablas.values():
+                clase, campos = tabla.esquema.clase, tabla.esquema.campos
+                for fila in range(len(tabla)):
+                    self.inventario.agregar(clase(*(tabla.valor(campo, fila) for campo in campos)))
+        segmentos = [numero for numero in self._archivos(_SEGMENTO) if numero >= base]
+        recuperadas = 0
+        for numero in segmentos:
+            ruta = self._ruta("bitacora", numero)
+            with open(ruta, "rb") as archivo:
+                datos = archivo.read()
+            operaciones, validos = leer_registros(datos)
+            for operacion in operaciones:
+                aplicar(self.inventario, operacion)
+            recuperadas += len(operaciones)
+            if validos < len(datos):
+                # Cola de un registro cortado por una caída
+                with open(ruta, "r+b") as archivo:
+                    archivo.truncate(validos)
+                    os.fsync(archivo.fileno())
+        return (segmentos[-1] if segmentos else base), recuperadas
+
+    def _anotar(self, operacion, tipo, gama, obj, anteriores):
+        """Oyente del inventario que traduce cada modificación a un registro."""
+        if operacion == "alta":
+            registro = ["alta", tipo, [getattr(obj, campo) for campo in ESQUEMAS[tipo].campos]]
+        elif operacion == "baja":
+            registro = ["baja", obj.id]
+        else:
+            cambios = {campo: getattr(obj, campo) for campo in anteriores if campo != "gama"}
+            if not cambios:
+                # Sólo cambió la gama por una reclasificación: no es un dato
+                return
+            registro = ["cambio", obj.id, cambios]
+        self._secuencia = self.bitacora.escribir(registro)
+
+    def _ejecutar(self, funcion, *argumentos, **cambios):
+        with self._cerrojo:
+            self._secuencia = 0
+            resultado = funcion(*argumentos, **cambios)
+            bitacora, secuencia = self.bitacora, self._secuencia
+        if self.sincrono and secuencia:
+            bitacora.esperar(secuencia)
+        if self.compactar_bytes is not None and self.bitacora.tamano >= self.compactar_bytes:
+            self.compactar()
+        return resultado
+
+    def agregar(self, obj):
+        """Agrega un electrodoméstico y lo registra en la bitácora."""
+        return self._ejecutar(self.inventario.agregar, obj)
+
+    def actualizar(self, id, **cambios):
+        """Modifica campos de un electrodoméstico y registra el cambio."""
+        return self._ejecutar(self.inventario.actualizar, id, **cambios)
+
+    def eliminar(self, id):
+        """Elimina un electrodoméstico y registra la baja."""
+        return self._ejecutar(self.inventario.eliminar, id)
+
+    def sincronizar(self):
+        """Hace durables todas las operaciones encoladas hasta ahora."""
+        self.bitacora.esperar()
+
+    def compactar(self):
+        """Guarda el estado actual en una instantánea y descarta la bitácora vieja.
+
+        Returns:
+            str: Ruta de la instantánea escrita.
+        """
+        import instantanea
+        with self._cerrojo:
+            self.bitacora.cerrar()
+            self.segmento = segmento = self.segmento + 1
+            self.bitacora = Bitacora(self._ruta("bitacora", segmento))
+            _sincronizar_directorio(self.directorio)
+            catalogo = Catalogo()
+            for obj in self.inventario:
+                catalogo.agregar(obj)
+        ruta = self._ruta("instantanea", segmento)
+        instantanea.guardar(catalogo, ruta)
+        _sincronizar_directorio(self.directorio)
+        for numero in self._archivos(_SEGMENTO):
+            if numero < segmento:
+                os.remove(self._ruta("bitacora", numero))
+        for numero in self._archivos(_INSTANTANEA):
+            if numero < segmento:
+                os.remove(self._ruta("instantanea", numero))
+        return ruta
+
+    def cerrar(self):
+        """Hace durable lo pendiente y cierra la bitácora."""
+        self.inventario.cancelar_suscripcion(self._anotar)
+        self.bitacora.cerrar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+def _sincronizar_directorio(directorio):
+    """fsync del directorio para que los archivos creados o renombrados persistan."""
+    descriptor = os.open(directorio, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
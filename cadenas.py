@@ -0,0 +1,129 @@
+"""Diccionario de cadenas compartido y columnas de texto codificadas.
+
+En un catálogo real las mismas marcas se repiten millones de veces y el id
+suele ser igual al modelo ("8MWTW2224WJM" en proyectoU3.py). Con una lista
+de str por columna cada fila guarda su propia copia. Aquí cada texto
+distinto se guarda una sola vez en un Diccionario compartido por todas las
+columnas del catálogo, y cada columna sólo guarda un código uint32 por fila.
+Comparar o agrupar por marca se hace sobre los códigos enteros.
+
+ColumnaCodificada se comporta como la lista que reemplaza (append, extend,
+índices, rebanadas, asignación e iteración) y expone codigos y cadenas igual
+que instantanea.ColumnaTexto, así que el resto del código no distingue
+entre una columna en memoria y una cargada de una instantánea.
+"""
+
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Diccionario():
+    """Tabla de textos distintos con su código.
+
+    Los códigos nunca se reasignan: un texto que deja de usarse se queda en
+    el diccionario.
+    """
+
+    def __init__(self):
+        self.valores = []
+        self.codigos = {}
+
+    def __len__(self):
+        return len(self.valores)
+
+    def __getitem__(self, codigo):
+        return self.valores[codigo]
+
+    def codificar(self, valor):
+        """Devuelve el código de un texto, agregándolo si es nuevo."""
+        codigo = self.codigos.get(valor)
+        if codigo is None:
+            codigo = self.codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+        return codigo
+
+    def compartida(self, valor):
+        """Devuelve la copia única del texto guardada en el diccionario."""
+        return self.valores[self.codificar(valor)]
+
+    def tamano_bytes(self):
+        """Bytes de la tabla hash, la lista y los textos guardados."""
+        return (sys.getsizeof(self.codigos) + sys.getsizeof(self.valores)
+                + sum(map(sys.getsizeof, self.valores)))
+
+
+class ColumnaCodificada():
+    """Columna de texto guardada como códigos uint32 de un Diccionario."""
+
+    def __init__(self, diccionario, valores=()):
+        """
+        Args:
+            diccionario (Diccionario): Diccionario compartido.
+            valores (iterable): Textos iniciales.
+        """
+        self.cadenas = diccionario
+        self.codigos = array("I")
+        self.extend(valores)
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def append(self, valor):
+        self.codigos.append(self.cadenas.codificar(valor))
+
+    def anexador(self):
+        """Función equivalente a append para cargas fila por fila.
+
+        Evita las búsquedas de atributos de append en cada llamada; cuando
+        el texto ya está en el diccionario sólo hace una consulta a la
+        tabla hash.
+        """
+        def anexar(valor, buscar=self.cadenas.codigos.get, codificar=self.cadenas.codificar,
+                   agregar=self.codigos.append):
+            codigo = buscar(valor)
+            agregar(codificar(valor) if codigo is None else codigo)
+        return anexar
+
+    def extend(self, valores):
+        self.codigos.extend(map(self.cadenas.codificar, valores))
+
+    def __getitem__(self, posicion):
+        if isinstance(posicion, slice):
+            return list(map(self.cadenas.valores.__getitem__, self.codigos[posicion]))
+        return self.cadenas.valores[self.codigos[posicion]]
+
+    def __setitem__(self, posicion, valor):
+        self.codigos[posicion] = self.cadenas.codificar(valor)
+
+    def __iter__(self):
+        return map(self.cadenas.valores.__getitem__, self.codigos)
+
+    def filas(self, valor):
+        """Posiciones de las filas con ese texto, comparando sólo códigos."""
+        codigo = self.cadenas.codigos.get(valor)
+        if codigo is None:
+            return []
+        if np is not None:
+            return np.flatnonzero(np.frombuffer(self.codigos, dtype=np.uint32) == codigo).tolist()
+        return [fila for fila, actual in enumerate(self.codigos) if actual == codigo]
+
+    def conteos(self):
+        """Filas por texto distinto de la columna.
+
+        Returns:
+            dict: Texto -> número de filas.
+        """
+        if np is not None and len(self.codigos):
+            conteo = np.bincount(np.frombuffer(self.codigos, dtype=np.uint32))
+            codigos = np.flatnonzero(conteo)
+            return dict(zip(map(self.cadenas.valores.__getitem__, codigos.tolist()),
+                            conteo[codigos].tolist()))
+        conteo = {}
+        for codigo in self.codigos:
+            conteo[codigo] = conteo.get(codigo, 0) + 1
+        return {self.cadenas.valores[codigo]: veces for codigo, veces in conteo.items()}
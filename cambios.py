@@ -0,0 +1,447 @@
+"""Flujo de cambios (change data capture) del inventario.
+
+Los sistemas que copian el catálogo (un índice de búsqueda, un caché en
+otro proceso) no tienen cómo enterarse de que una Lavadora, un Refrigerador
+o un Microondas cambió y tienen que volver a leerlo todo cada cierto tiempo.
+FlujoCambios se conecta como oyente de un Inventario y convierte cada
+modificación en un Evento compacto:
+
+    alta     todos los campos del objeto y su gama
+    cambio   sólo los campos cuyo valor cambió; si el cambio movió el
+             resultado de tipo_gama(), también la gama anterior
+    baja     sólo el id, el tipo y la última gama
+
+Los eventos se guardan una sola vez en un registro compartido y cada
+Suscripcion lleva su propia posición en él, así que agregar suscriptores no
+copia los eventos. Las suscripciones se leen con asyncio y entregan lotes:
+todo lo que se publicó desde la lectura anterior, hasta tamano_lote eventos.
+
+Contrapresión: capacidad es cuántos eventos puede quedarse atrás la
+suscripción más lenta. Un productor asíncrono espera con
+esperar_espacio() antes de modificar el inventario; si un productor no
+espera y una suscripción se atrasa más de maximo eventos, esa suscripción
+se da de baja y su siguiente lectura lanza FlujoDesbordado (tiene que
+volver a leer el catálogo completo).
+
+Los eventos también se pueden servir a otros procesos con servir(), por un
+socket local (Unix o TCP) en formato JSON por línea.
+
+El inventario se debe modificar desde el hilo del ciclo de asyncio, como lo
+hace servicio.py.
+
+Ejemplo:
+    flujo = FlujoCambios().conectar(inventario)
+    async for lote in flujo.suscribir(tipos=["Lavadora"]):
+        for evento in lote:
+            print(evento.a_dict())
+"""
+
+import asyncio
+import json
+
+from catalogo import ESQUEMAS
+from validacion import convertir_numero
+
+CAPACIDAD = 4096
+TAMANO_LOTE = 256
+
+
+class FlujoDesbordado(Exception):
+    """La suscripción se atrasó más de lo permitido y perdió eventos."""
+
+
+def _validar_lote(tamano_lote):
+    """Devuelve el tamaño de lote si es un entero positivo.
+
+    Raises:
+        ValueError: Si no es un int mayor que cero.
+    """
+    if type(tamano_lote) is not int or tamano_lote < 1:
+        raise ValueError(f"El tamaño de lote debe ser un entero positivo, se recibió {tamano_lote!r}")
+    return tamano_lote
+
+
+def _linea_error(error):
+    return (json.dumps({"error": str(error)}, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+async def _esperar_desconexion(lector, suscripcion):
+    """Cierra la suscripción cuando el cliente del socket se desconecta.
+
+    El cliente no vuelve a escribir después del filtro, así que el fin de
+    archivo avisa la desconexión aunque no haya eventos que enviarle.
+    """
+    try:
+        await lector.read()
+    except ConnectionError:
+        pass
+    suscripcion.cerrar()
+
+
+class Evento():
+    """Una modificación del inventario.
+
+    Atributos:
+        secuencia (int): Número consecutivo del evento en el flujo.
+        operacion (str): "alta", "cambio" o "baja".
+        tipo (str): Tipo del electrodoméstico.
+        id: Id del electrodoméstico.
+        valores (dict): Campos nuevos (todos en un alta, los que cambiaron
+            en un cambio); None en una baja.
+        gama (str): Gama actual (en una baja, la que tenía).
+        gama_anterior (str): Gama previa si el cambio la modificó, o None.
+    """
+    __slots__ = ("secuencia", "operacion", "tipo", "id", "valores", "gama", "gama_anterior",
+                 "_linea")
+
+    def __init__(self, secuencia, operacion, tipo, id, valores, gama, gama_anterior=None):
+        self.secuencia = secuencia
+        self.operacion = operacion
+        self.tipo = tipo
+        self.id = id
+        self.valores = valores
+        self.gama = gama
+        self.gama_anterior = gama_anterior
+        self._linea = None
+
+    @property
+    def cambio_gama(self):
+        """True si el evento movió el electrodoméstico de gama."""
+        return self.gama_anterior is not None
+
+    def a_dict(self):
+        """Representación JSON del evento, sin las llaves vacías."""
+        datos = {"secuencia": self.secuencia, "operacion": self.operacion, "tipo": self.tipo,
+                 "id": self.id, "gama": self.gama}
+        if self.valores is not None:
+            datos["valores"] = self.valores
+        if self.gama_anterior is not None:
+            datos["gama_anterior"] = self.gama_anterior
+        return datos
+
+    def linea(self):
+        """El evento como una línea JSON en bytes; se codifica una sola vez."""
+        if self._linea is None:
+            self._linea = (json.dumps(self.a_dict(), ensure_ascii=False) + "\n").encode("utf-8")
+        return self._linea
+
+    def __repr__(self):
+        return f"Evento({self.a_dict()!r})"
+
+
+class Suscripcion():
+    """Lector de un FlujoCambios con su propia posición.
+
+    Se usa con "async for lote in suscripcion" o con await siguiente().
+
+    Atributos:
+        posicion (int): Secuencia del siguiente evento por leer.
+        tipos (frozenset): Tipos que recibe, o None para todos.
+        solo_gama (bool): Si sólo recibe los eventos que cambian de gama.
+        tamano_lote (int): Máximo de eventos por lote.
+        entregados (int): Eventos entregados hasta ahora.
+    """
+
+    def __init__(self, flujo, posicion, tipos=None, solo_gama=False, tamano_lote=TAMANO_LOTE):
+        self.flujo = flujo
+        self.posicion = posicion
+        self.tipos = frozenset(tipos) if tipos is not None else None
+        self.solo_gama = solo_gama
+        self.tamano_lote = tamano_lote
+        self.entregados = 0
+        self.desbordada = False
+        self.cerrada = False
+
+    @property
+    def retraso(self):
+        """Eventos publicados que esta suscripción todavía no lee."""
+        return self.flujo.secuencia - self.posicion
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        lote = await self.siguiente()
+        if not lote:
+            raise StopAsyncIteration
+        return lote
+
+    async def siguiente(self):
+        """Espera y devuelve el siguiente lote de eventos.
+
+        Returns:
+            list: Eventos en orden de secuencia; lista vacía sólo si la
+                suscripción se cerró.
+
+        Raises:
+            FlujoDesbordado: Si la suscripción se atrasó más de
+                flujo.maximo eventos.
+        """
+        flujo = self.flujo
+        while True:
+            if self.desbordada:
+                raise FlujoDesbordado(f"La suscripción se atrasó más de {flujo.maximo} eventos")
+            if self.cerrada:
+                return []
+            if self.posicion < flujo.secuencia:
+                lote = self._leer()
+                if lote:
+                    return lote
+                continue
+            flujo._hay_eventos.clear()
+            await flujo._hay_eventos.wait()
+
+    def _leer(self):
+        flujo = self.flujo
+        eventos = flujo._eventos
+        inicio = self.posicion - flujo._base
+        if self.tipos is None and not self.solo_gama:
+            lote = eventos[inicio:inicio + self.tamano_lote]
+            fin = inicio + len(lote)
+        else:
+            lote = []
+            fin = inicio
+            while fin < len(eventos) and len(lote) < self.tamano_lote:
+                evento = eventos[fin]
+                fin += 1
+                if ((self.tipos is None or evento.tipo in self.tipos)
+                        and (not self.solo_gama or evento.gama_anterior is not None)):
+                    lote.append(evento)
+        anterior = self.posicion
+        self.posicion = flujo._base + fin
+        self.entregados += len(lote)
+        flujo._avanzo(anterior)
+        return lote
+
+    def cerrar(self):
+        """Deja de recibir eventos; un lector en espera recibe una lista vacía."""
+        self.flujo.cancelar(self)
+
+
+class FlujoCambios():
+    """Registro de eventos del inventario con suscripciones asíncronas.
+
+    Atributos:
+        capacidad (int): Eventos que la suscripción más lenta puede tener
+            pendientes antes de que esperar_espacio() detenga a los
+            productores.
+        maximo (int): Retraso con el que una suscripción se da de baja.
+        tamano_lote (int): Tamaño de lote por defecto de las suscripciones.
+        secuencia (int): Secuencia del siguiente evento que se publique.
+        suscripciones (set): Suscripciones activas.
+        desbordes (int): Suscripciones dadas de baja por atrasarse.
+    """
+
+    def __init__(self, capacidad=CAPACIDAD, maximo=None, tamano_lote=TAMANO_LOTE):
+        """
+        Args:
+            capacidad (int): Ver atributos.
+            maximo (int): Por defecto 8 veces la capacidad.
+            tamano_lote (int): Ver atributos.
+        """
+        if capacidad < 1:
+            raise ValueError("La capacidad debe ser al menos 1")
+        self.capacidad = capacidad
+        self.maximo = maximo if maximo is not None else 8 * capacidad
+        if self.maximo < capacidad:
+            raise ValueError("El máximo no puede ser menor que la capacidad")
+        self.tamano_lote = _validar_lote(tamano_lote)
+        self.secuencia = 0
+        self.suscripciones = set()
+        self.desbordes = 0
+        # Eventos desde la secuencia _base; la posición más atrasada es
+        # _minimo y hay _en_minimo suscripciones en ella
+        self._eventos = []
+        self._base = 0
+        self._minimo = 0
+        self._en_minimo = 0
+        self._hay_eventos = asyncio.Event()
+        self._hay_espacio = asyncio.Event()
+        self._servidores = []
+
+    def conectar(self, inventario):
+        """Se suscribe a las modificaciones de un inventario."""
+        inventario.suscribir(self.notificar)
+        return self
+
+    @property
+    def retraso(self):
+        """Eventos pendientes de la suscripción más atrasada."""
+        return self.secuencia - self._minimo if self.suscripciones else 0
+
+    def suscribir(self, tipos=None, solo_gama=False, tamano_lote=None):
+        """Crea una suscripción que recibe los eventos publicados desde ahora.
+
+        Args:
+            tipos (iterable): Tipos que se reciben; todos si es None.
+            solo_gama (bool): Recibir sólo los eventos que cambian de gama.
+            tamano_lote (int): Máximo de eventos por lote; el del flujo si
+                es None.
+
+        Returns:
+            Suscripcion: La nueva suscripción.
+
+        Raises:
+            ValueError: Si hay tipos desconocidos o tamano_lote no es un
+                entero positivo.
+        """
+        if tipos is not None:
+            desconocidos = set(tipos) - set(ESQUEMAS)
+            if desconocidos:
+                raise ValueError(f"Tipos desconocidos: {sorted(desconocidos)}")
+        if tamano_lote is None:
+            tamano_lote = self.tamano_lote
+        suscripcion = Suscripcion(self, self.secuencia, tipos, solo_gama, _validar_lote(tamano_lote))
+        if not self.suscripciones:
+            self._eventos = []
+            self._base = self._minimo = self.secuencia
+            self._en_minimo = 0
+        if self.secuencia == self._minimo:
+            self._en_minimo += 1
+        self.suscripciones.add(suscripcion)
+        return suscripcion
+
+    def cancelar(self, suscripcion):
+        """Da de baja una suscripción."""
+        if suscripcion in self.suscripciones:
+            self.suscripciones.discard(suscripcion)
+            suscripcion.cerrada = True
+            if suscripcion.posicion == self._minimo:
+                self._avanzo(self._minimo)
+            self._hay_eventos.set()
+
+    def notificar(self, operacion, tipo, gama, obj, anteriores):
+        """Oyente de Inventario.suscribir(): publica el evento."""
+        if not self.suscripciones:
+            self.secuencia += 1
+            return
+        if operacion == "alta":
+            valores = {campo: getattr(obj, campo) for campo in ESQUEMAS[tipo].campos}
+            evento = Evento(self.secuencia, operacion, tipo, obj.id, valores, gama)
+        elif operacion == "baja":
+            evento = Evento(self.secuencia, operacion, tipo, obj.id, None, gama)
+        else:
+            valores = {}
+            for campo, anterior in anteriores.items():
+                if campo != "gama":
+                    valor = getattr(obj, campo)
+                    if valor != anterior:
+                        valores[campo] = valor
+            anterior = anteriores.get("gama")
+            if not valores and anterior is None:
+                return
+            evento = Evento(self.secuencia, operacion, tipo, obj.id, valores, gama, anterior)
+        self._eventos.append(evento)
+        self.secuencia += 1
+        self._hay_eventos.set()
+        if self.secuencia - self._minimo > self.maximo:
+            self._desbordar()
+
+    def _calcular_minimo(self):
+        """Recalcula la posición más atrasada y descarta los eventos ya leídos."""
+        if self.suscripciones:
+            self._minimo = min(suscripcion.posicion for suscripcion in self.suscripciones)
+            self._en_minimo = sum(1 for suscripcion in self.suscripciones
+                                  if suscripcion.posicion == self._minimo)
+        else:
+            self._minimo = self.secuencia
+            self._en_minimo = 0
+        leidos = self._minimo - self._base
+        if leidos and leidos * 2 >= len(self._eventos):
+            del self._eventos[:leidos]
+            self._base = self._minimo
+        if self.secuencia - self._minimo < self.capacidad:
+            self._hay_espacio.set()
+
+    def _avanzo(self, anterior):
+        """Una suscripción dejó la posición anterior."""
+        if anterior == self._minimo:
+            self._en_minimo -= 1
+            if self._en_minimo <= 0:
+                self._calcular_minimo()
+
+    def _desbordar(self):
+        """Da de baja las suscripciones atrasadas más de maximo eventos."""
+        while self.suscripciones and self.secuencia - self._minimo > self.maximo:
+            for suscripcion in [s for s in self.suscripciones if s.posicion == self._minimo]:
+                self.suscripciones.discard(suscripcion)
+                suscripcion.desbordada = True
+                self.desbordes += 1
+            self._calcular_minimo()
+
+    async def esperar_espacio(self):
+        """Espera a que la suscripción más lenta tenga menos de capacidad pendientes.
+
+        Los productores asíncronos la llaman antes de modificar el
+        inventario para no atrasar a los suscriptores sin límite.
+        """
+        while self.suscripciones and self.secuencia - self._minimo >= self.capacidad:
+            self._hay_espacio.clear()
+            await self._hay_espacio.wait()
+
+    async def servir(self, ruta=None, anfitrion="127.0.0.1", puerto=0):
+        """Publica el flujo por un socket local, un evento JSON por línea.
+
+        Cada cliente envía primero una línea con su filtro en JSON, por
+        ejemplo {"tipos": ["Lavadora"], "solo_gama": true} o {}, y después
+        recibe los eventos. Si el cliente no lee, el socket se llena y su
+        suscripción se atrasa como cualquier otra. Si se desborda, recibe
+        una línea {"error": ...} y se cierra la conexión.
+
+        Args:
+            ruta (str): Ruta de un socket Unix; si es None se usa TCP.
+            anfitrion (str): Dirección TCP.
+            puerto (int): Puerto TCP; 0 elige uno libre.
+
+        Returns:
+            asyncio.Server: El servidor, ya escuchando.
+        """
+        if ruta is not None:
+            servidor = await asyncio.start_unix_server(self._atender, ruta)
+        else:
+            servidor = await asyncio.start_server(self._atender, anfitrion, puerto)
+        self._servidores.append(servidor)
+        return servidor
+
+    async def cerrar(self):
+        """Cierra los servidores y todas las suscripciones."""
+        for servidor in self._servidores:
+            servidor.close()
+            await servidor.wait_closed()
+        self._servidores = []
+        for suscripcion in list(self.suscripciones):
+            self.cancelar(suscripcion)
+
+    async def _atender(self, lector, escritor):
+        try:
+            filtro = json.loads(await lector.readline() or "{}")
+            if not isinstance(filtro, dict):
+                raise ValueError("El filtro debe ser un objeto JSON")
+            tamano_lote = filtro.get("tamano_lote")
+            if tamano_lote is not None:
+                tamano_lote = convertir_numero(tamano_lote, entero=True)
+            tipos = filtro.get("tipos")
+            if tipos is not None and (not isinstance(tipos, list)
+                                      or not all(isinstance(tipo, str) for tipo in tipos)):
+                raise ValueError("tipos debe ser una lista de nombres de tipo")
+            suscripcion = self.suscribir(tipos, bool(filtro.get("solo_gama")), tamano_lote)
+        except ValueError as error:
+            escritor.write(_linea_error(error))
+            escritor.close()
+            return
+        except ConnectionError:
+            escritor.close()
+            return
+        vigilante = asyncio.create_task(_esperar_desconexion(lector, suscripcion))
+        try:
+            async for lote in suscripcion:
+                escritor.write(b"".join(evento.linea() for evento in lote))
+                await escritor.drain()
+        except FlujoDesbordado as error:
+            escritor.write(_linea_error(error))
+        except ConnectionError:
+            pass
+        finally:
+            vigilante.cancel()
+            suscripcion.cerrar()
+            escritor.close()
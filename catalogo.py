@@ -0,0 +1,490 @@
+"""Almacén columnar de electrodomésticos.
+
+Guardar un objeto Lavadora, Refrigerador o Microondas por producto resulta
+muy costoso en memoria cuando el catálogo tiene millones de artículos. Este
+módulo guarda los campos de cada tipo en columnas: los campos numéricos en
+arreglos tipados (array("d")) y los campos de texto en listas. Cada fila se
+entrega como una vista ligera que hereda de la clase original, por lo que
+conserva el acceso por atributo, tipo_gama() y la salida de __str__.
+
+Algunos campos de texto se interpretan una sola vez al cargar la fila y el
+resultado se guarda en columnas numéricas derivadas; por ejemplo medidas de
+Microondas se guarda también como ancho, alto y profundidad (ver medidas.py).
+
+En un Catalogo los campos id, marca y modelo se guardan codificados contra
+un diccionario de cadenas compartido por todas sus tablas (ver cadenas.py).
+"""
+
+from array import array
+from operator import attrgetter
+
+from cadenas import ColumnaCodificada, Diccionario
+from medidas import CAMPOS as CAMPOS_MEDIDAS, medidas_o_nan
+from proyectoU4 import Lavadora, Refrigerador, Microondas
+
+CAMPOS_BASE = ("id", "marca", "modelo", "precio")
+CAMPOS_CODIFICADOS = ("id", "marca", "modelo")
+
+
+class Esquema():
+    """Describe los campos de un tipo de electrodoméstico.
+
+    Atributos:
+        nombre (str): Nombre del tipo ("Lavadora", "Refrigerador", ...).
+        clase (type): Clase original del tipo.
+        campos (tuple): Todos los campos en el orden del constructor.
+        textos (tuple): Campos que se guardan como texto.
+        numeros (tuple): Campos que se guardan como números.
+        derivados (tuple): (campo de origen, campos derivados, función) por
+            cada campo de texto que se interpreta al cargar.
+    """
+    __slots__ = ("nombre", "clase", "campos", "textos", "numeros", "derivados")
+
+    def __init__(self, nombre, clase, especificos, textos=(), derivados=()):
+        """Inicializa el esquema a partir de los campos específicos del tipo.
+
+        Args:
+            nombre (str): Nombre del tipo.
+            clase (type): Clase original del tipo.
+            especificos (tuple): Campos propios del tipo, en orden.
+            textos (tuple): Campos propios que son de texto.
+            derivados (tuple): Tuplas (origen, campos, función) donde la
+                función recibe el texto de origen y devuelve un float por
+                campo derivado.
+        """
+        self.nombre = nombre
+        self.clase = clase
+        self.campos = CAMPOS_BASE + tuple(especificos)
+        self.textos = ("id", "marca", "modelo") + tuple(textos)
+        self.numeros = tuple(c for c in self.campos if c not in self.textos)
+        self.derivados = tuple(derivados)
+
+
+ESQUEMAS = {
+    "Lavadora": Esquema("Lavadora", Lavadora,
+                        ("capacidad_carga", "consumo_agua", "ciclos_lavado")),
+    "Refrigerador": Esquema("Refrigerador", Refrigerador,
+                            ("no_puertas", "metros_cubicos", "pies_capacidad")),
+    "Microondas": Esquema("Microondas", Microondas,
+                          ("potencia", "consumo_energia", "medidas"),
+                          textos=("medidas",),
+                          derivados=(("medidas", CAMPOS_MEDIDAS, medidas_o_nan),)),
+}
+
+
+_NOMBRES = {nombre.lower(): nombre for nombre in ESQUEMAS}
+
+
+def registrar_esquema(esquema):
+    """Agrega un tipo nuevo a ESQUEMAS (ver tipos.py).
+
+    Los catálogos e inventarios crean sus tablas e índices con los tipos
+    registrados al construirse, así que los tipos nuevos se registran antes.
+
+    Raises:
+        ValueError: Si ya hay un tipo con ese nombre.
+    """
+    if esquema.nombre.lower() in _NOMBRES:
+        raise ValueError(f"Ya existe un tipo llamado {esquema.nombre!r}")
+    ESQUEMAS[esquema.nombre] = esquema
+    _NOMBRES[esquema.nombre.lower()] = esquema.nombre
+
+
+def quitar_esquema(nombre):
+    """Quita un tipo registrado con registrar_esquema()."""
+    del ESQUEMAS[nombre]
+    del _NOMBRES[nombre.lower()]
+
+
+def buscar_tipo(nombre):
+    """Nombre registrado de un tipo sin distinguir mayúsculas, o None."""
+    return _NOMBRES.get(str(nombre).strip().lower())
+
+
+def nombre_tipo(obj):
+    """Obtiene el nombre del esquema al que pertenece un objeto.
+
+    Se recorre la jerarquía de la clase, así que también se aceptan vistas y
+    objetos creados con las clases de proyectoU3.py o U3.py.
+
+    Args:
+        obj: Electrodoméstico o vista de fila.
+
+    Returns:
+        str: Nombre del tipo registrado en ESQUEMAS.
+
+    Raises:
+        TypeError: Si el objeto no corresponde a ningún tipo registrado.
+    """
+    for clase in type(obj).__mro__:
+        if clase.__name__ in ESQUEMAS:
+            return clase.__name__
+    raise TypeError(f"Tipo de electrodoméstico no soportado: {type(obj).__name__}")
+
+
+def _tipo_mascara(numeros):
+    """Elige el typecode más pequeño que alcanza para la máscara de enteros."""
+    if len(numeros) <= 8:
+        return "B"
+    if len(numeros) <= 16:
+        return "H"
+    return "L"
+
+
+class TablaColumnar():
+    """Columnas de un solo tipo de electrodoméstico.
+
+    Los números se guardan como float64. Para que __str__ muestre exactamente
+    lo mismo que el objeto original (22 contra 22.0), cada fila lleva una
+    máscara de bits que indica qué campos numéricos eran int.
+    """
+
+    def __init__(self, esquema, diccionario=None):
+        """Crea una tabla vacía para el esquema indicado.
+
+        Args:
+            esquema (Esquema): Esquema del tipo de electrodoméstico.
+            diccionario (cadenas.Diccionario): Si se indica, id, marca y
+                modelo se guardan como códigos de este diccionario en lugar
+                de listas de str.
+        """
+        self.esquema = esquema
+        self.diccionario = diccionario
+        self.textos = {campo: [] if diccionario is None or campo not in CAMPOS_CODIFICADOS
+                       else ColumnaCodificada(diccionario) for campo in esquema.textos}
+        self.numeros = {campo: array("d") for campo in esquema.numeros}
+        self.enteros = array(_tipo_mascara(esquema.numeros))
+        self.derivados = {campo: array("d") for _, campos, _ in esquema.derivados
+                          for campo in campos}
+        self.vista = _crear_vista(esquema)
+        self._leer_campos = attrgetter(*esquema.campos)
+        self._preparar()
+
+    def _preparar(self):
+        # (función que agrega a la columna, bit de la máscara o None si es
+        # texto) en orden del constructor
+        self._plan = [(_anexador(self.textos[campo]), None) if campo in self.textos
+                      else (_anexador(self.numeros[campo]), 1 << self.esquema.numeros.index(campo))
+                      for campo in self.esquema.campos]
+        # (posición del campo de origen, columnas derivadas, función)
+        self._plan_derivados = [(self.esquema.campos.index(origen),
+                                 [self.derivados[campo] for campo in campos], funcion)
+                                for origen, campos, funcion in self.esquema.derivados]
+
+    @classmethod
+    def desde_columnas(cls, esquema, numeros, textos, enteros, derivados=None):
+        """Crea una tabla que usa columnas ya existentes sin copiarlas.
+
+        Sirve para montar tablas sobre memoria mapeada (ver instantanea.py).
+        Las columnas pueden ser de sólo lectura; en ese caso agregar() y
+        asignar() fallan.
+
+        Args:
+            esquema (Esquema): Esquema del tipo.
+            numeros (dict): Campo -> secuencia de float (array, memoryview...).
+            textos (dict): Campo -> secuencia de str.
+            enteros: Máscara de enteros por fila.
+            derivados (dict): Campo derivado -> secuencia de float. Si se
+                omite se calculan a partir de los textos.
+        """
+        tabla = cls(esquema)
+        tabla.numeros = dict(numeros)
+        tabla.textos = dict(textos)
+        tabla.enteros = enteros
+        if derivados is not None:
+            tabla.derivados = dict(derivados)
+        tabla._preparar()
+        if derivados is None:
+            tabla.calcular_derivados()
+        return tabla
+
+    def calcular_derivados(self):
+        """Vuelve a calcular todas las columnas derivadas desde sus textos.
+
+        Sirve después de llenar las columnas de texto directamente, sin
+        pasar por agregar_valores().
+        """
+        for origen, campos, funcion in self.esquema.derivados:
+            columnas = [array("d") for _ in campos]
+            for valores in map(funcion, self.textos[origen]):
+                for columna, valor in zip(columnas, valores):
+                    columna.append(valor)
+            self.derivados.update(zip(campos, columnas))
+        self._preparar()
+
+    def __len__(self):
+        return len(self.enteros)
+
+    def agregar_valores(self, valores):
+        """Agrega una fila a partir de los valores en orden del constructor.
+
+        Args:
+            valores (sequence): Valores en el mismo orden que esquema.campos.
+
+        Returns:
+            int: Posición de la fila agregada.
+
+        Raises:
+            TypeError: Si un campo numérico no es int ni float o si la tabla
+                es de sólo lectura.
+        """
+        if len(valores) != len(self._plan):
+            raise TypeError(f"{self.esquema.nombre} espera {len(self._plan)} valores, "
+                            f"se recibieron {len(valores)}")
+        if any(anexar is None for anexar, _ in self._plan):
+            raise TypeError(f"La tabla de {self.esquema.nombre} es de sólo lectura")
+        mascara = 0
+        # Se valida toda la fila antes de escribir para no dejar columnas disparejas
+        for (_, bit), valor, campo in zip(self._plan, valores, self.esquema.campos):
+            if bit is None or type(valor) is float:
+                continue
+            if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+                raise TypeError(f"El campo {campo} debe ser numérico, se recibió {valor!r}")
+            if isinstance(valor, int):
+                mascara |= bit
+        for (anexar, _), valor in zip(self._plan, valores):
+            anexar(valor)
+        for posicion, columnas, funcion in self._plan_derivados:
+            for columna, valor in zip(columnas, funcion(valores[posicion])):
+                columna.append(valor)
+        self.enteros.append(mascara)
+        return len(self.enteros) - 1
+
+    def agregar(self, obj):
+        """Agrega un electrodoméstico copiando sus atributos a las columnas.
+
+        Args:
+            obj: Objeto del tipo de esta tabla.
+
+        Returns:
+            int: Posición de la fila agregada.
+        """
+        return self.agregar_valores(self._leer_campos(obj))
+
+    def valor(self, campo, fila):
+        """Lee un campo de una fila respetando si originalmente era int.
+
+        Args:
+            campo (str): Nombre del campo.
+            fila (int): Posición de la fila.
+        """
+        if campo in self.textos:
+            return self.textos[campo][fila]
+        valor = self.numeros[campo][fila]
+        if self.enteros[fila] >> self.esquema.numeros.index(campo) & 1:
+            return int(valor)
+        return valor
+
+    def asignar(self, campo, fila, valor):
+        """Cambia el valor de un campo en una fila existente."""
+        if campo in self.textos:
+            self.textos[campo][fila] = valor
+            for origen, campos, funcion in self.esquema.derivados:
+                if origen == campo:
+                    for derivado, numero in zip(campos, funcion(valor)):
+                        self.derivados[derivado][fila] = numero
+            return
+        if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+            raise TypeError(f"El campo {campo} debe ser numérico, se recibió {valor!r}")
+        bit = 1 << self.esquema.numeros.index(campo)
+        if isinstance(valor, int):
+            self.enteros[fila] |= bit
+        else:
+            self.enteros[fila] &= ~bit
+        self.numeros[campo][fila] = valor
+
+    def columna(self, campo):
+        """Devuelve la columna completa (array o lista) de un campo."""
+        if campo in self.textos:
+            return self.textos[campo]
+        if campo in self.derivados:
+            return self.derivados[campo]
+        return self.numeros[campo]
+
+    def fila(self, posicion):
+        """Devuelve la vista ligera de una fila."""
+        if not -len(self) <= posicion < len(self):
+            raise IndexError("Fila fuera de rango")
+        return self.vista(self, posicion % len(self))
+
+    def __iter__(self):
+        vista = self.vista
+        for posicion in range(len(self)):
+            yield vista(self, posicion)
+
+    def tamano_bytes(self):
+        """Estima los bytes ocupados por las columnas (sin contar las cadenas).
+
+        Returns:
+            int: Bytes de los arreglos numéricos y derivados, la máscara, los
+            códigos de las columnas codificadas y los apuntadores de las
+            listas de texto.
+        """
+        total = self.enteros.itemsize * len(self.enteros)
+        for columna in list(self.numeros.values()) + list(self.derivados.values()):
+            total += columna.itemsize * len(columna)
+        for columna in self.textos.values():
+            ancho = columna.codigos.itemsize if hasattr(columna, "codigos") else 8
+            total += ancho * len(columna)
+        return total
+
+
+def _anexador(columna):
+    """Función que agrega un valor al final de una columna, o None si es de sólo lectura."""
+    if hasattr(columna, "anexador"):
+        return columna.anexador()
+    return getattr(columna, "append", None)
+
+
+def _crear_vista(esquema):
+    """Genera la clase de vista de fila para un esquema.
+
+    La vista hereda de la clase original, así que tipo_gama() y __str__ son
+    los mismos métodos; sólo cambia de dónde se leen los atributos.
+    """
+    atributos = {"__slots__": ("_tabla", "_fila")}
+
+    def __init__(self, tabla, fila):
+        self._tabla = tabla
+        self._fila = fila
+
+    def __repr__(self):
+        return f"<{esquema.nombre} fila {self._fila}>"
+
+    atributos["__init__"] = __init__
+    atributos["__repr__"] = __repr__
+    for campo in esquema.campos:
+        atributos[campo] = _propiedad(campo)
+    for _, campos, _ in esquema.derivados:
+        for campo in campos:
+            atributos[campo] = _propiedad_derivada(campo)
+    return type(f"Vista{esquema.nombre}", (esquema.clase,), atributos)
+
+
+def _propiedad(campo):
+    """Crea la propiedad que lee y escribe un campo en la tabla de la vista."""
+    def leer(self):
+        return self._tabla.valor(campo, self._fila)
+
+    def escribir(self, valor):
+        self._tabla.asignar(campo, self._fila, valor)
+
+    return property(leer, escribir)
+
+
+def _propiedad_derivada(campo):
+    """Crea la propiedad de sólo lectura de un campo derivado."""
+    def leer(self):
+        return self._tabla.derivados[campo][self._fila]
+
+    return property(leer)
+
+
+class Catalogo():
+    """Catálogo columnar con una TablaColumnar por tipo de electrodoméstico.
+
+    Ejemplo:
+        catalogo = Catalogo()
+        catalogo.agregar(Lavadora("8MWTW2224WJM", "Whirlpool", "8MWTW2224WJM", 13999, 22, 15, 12))
+        print(catalogo.fila("Lavadora", 0))
+    """
+
+    def __init__(self, codificar=True):
+        """Crea un catálogo vacío con una tabla por cada esquema registrado.
+
+        Args:
+            codificar (bool): Si id, marca y modelo se guardan codificados
+                contra un diccionario compartido por todas las tablas.
+        """
+        self.diccionario = Diccionario() if codificar else None
+        self.tablas = {nombre: TablaColumnar(esquema, self.diccionario)
+                       for nombre, esquema in ESQUEMAS.items()}
+
+    def __len__(self):
+        return sum(len(tabla) for tabla in self.tablas.values())
+
+    def __iter__(self):
+        for tabla in self.tablas.values():
+            yield from tabla
+
+    def agregar(self, obj):
+        """Agrega un electrodoméstico al catálogo.
+
+        Args:
+            obj: Lavadora, Refrigerador o Microondas (o una vista de fila).
+
+        Returns:
+            tuple: (tipo, fila) con la ubicación del registro.
+        """
+        tipo = nombre_tipo(obj)
+        return tipo, self.tablas[tipo].agregar(obj)
+
+    def agregar_valores(self, tipo, *valores):
+        """Agrega un registro sin construir el objeto original.
+
+        Args:
+            tipo (str): Nombre del tipo ("Lavadora", "Refrigerador", "Microondas").
+            *valores: Valores en el orden del constructor de la clase.
+
+        Returns:
+            tuple: (tipo, fila) con la ubicación del registro.
+        """
+        return tipo, self.tablas[tipo].agregar_valores(valores)
+
+    def fila(self, tipo, posicion):
+        """Devuelve la vista de la fila indicada de un tipo."""
+        return self.tablas[tipo].fila(posicion)
+
+    def columna(self, tipo, campo):
+        """Devuelve la columna de un campo para un tipo."""
+        return self.tablas[tipo].columna(campo)
+
+    def filas_marca(self, tipo, marca):
+        """Posiciones de las filas de un tipo con esa marca."""
+        columna = self.tablas[tipo].columna("marca")
+        if hasattr(columna, "filas"):
+            return columna.filas(marca)
+        return [fila for fila, valor in enumerate(columna) if valor == marca]
+
+    def tamano_bytes(self):
+        """Estima los bytes ocupados por todas las columnas del catálogo."""
+        return sum(tabla.tamano_bytes() for tabla in self.tablas.values())
+
+
+def filtrar_filas(tabla, marca=None, gama=None, condiciones=(), reglas="U4"):
+    """Filas de una tabla que cumplen todos los filtros, sin crear objetos.
+
+    Args:
+        tabla (TablaColumnar): Tabla a revisar.
+        marca (str): Marca exacta.
+        gama (str): "Baja", "Media" o "Alta".
+        condiciones (list): Tuplas (campo, mínimo, máximo); None en un
+            límite significa sin límite.
+        reglas (str): "U3", "U4" o un conjunto de reglas_gama.json.
+
+    Returns:
+        list: Posiciones de las filas que cumplen.
+
+    Raises:
+        ValueError: Si una condición usa un campo que no es numérico.
+    """
+    if marca is not None:
+        columna = tabla.columna("marca")
+        if hasattr(columna, "filas"):
+            filas = columna.filas(marca)
+        else:
+            filas = [fila for fila, valor in enumerate(columna) if valor == marca]
+    else:
+        filas = range(len(tabla))
+    for campo, minimo, maximo in condiciones:
+        if campo not in tabla.esquema.numeros and campo not in tabla.derivados:
+            raise ValueError(f"{tabla.esquema.nombre} no tiene el campo numérico {campo!r}")
+        columna = tabla.columna(campo)
+        filas = [fila for fila in filas if (minimo is None or columna[fila] >= minimo)
+                 and (maximo is None or columna[fila] <= maximo)]
+    if gama is not None:
+        from gama_vectorizada import GAMAS, codigos_gama
+        codigo = GAMAS.index(gama.capitalize())
+        codigos = codigos_gama(tabla, reglas)
+        filas = [fila for fila in filas if codigos[fila] == codigo]
+    return list(filas)
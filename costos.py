@@ -0,0 +1,352 @@
+"""Proyección del costo de operación por escenarios de tarifa y uso.
+
+Para comparar electrodomésticos por lo que cuestan a lo largo de su vida y
+no sólo por su precio, el costo de operación de un modelo en un Escenario
+es:
+
+    Lavadora     consumo_agua (L por ciclo) x ciclos_anuales / 1000
+                 x tarifa_agua (pesos por m³)
+    Microondas   consumo_energia (W) x horas_anuales / 1000
+                 x tarifa_luz (pesos por kWh)
+
+por año, multiplicado por el factor de vida del escenario: la suma de
+(1 + incremento_anual) ** año para cada año de vida útil. El Refrigerador no
+tiene un campo de consumo, así que no se proyecta. MODELOS_COSTO se puede
+ampliar con otros tipos (por ejemplo los de tipos.py).
+
+MotorCostos evalúa catálogos columnares completos. El costo sólo depende del
+tipo, el modelo y su consumo, así que primero se agrupan las filas por
+(modelo, consumo) y se calcula una vez por modelo distinto, sobre arreglos
+de NumPy si está instalado. Los resultados se guardan por
+(tipo, modelo, consumo, escenario) en un caché LRU; al volver a proyectar o
+a ordenar sólo se calculan los modelos nuevos o con consumo cambiado y los
+escenarios nuevos. El precio no forma parte de la clave: cambiar precios no
+invalida nada.
+
+Ejemplo:
+    motor = MotorCostos()
+    escenarios = [Escenario("CDMX", tarifa_luz=1.1, tarifa_agua=25),
+                  Escenario("Uso intensivo", tarifa_luz=3.2, tarifa_agua=40,
+                            ciclos_anuales=400, horas_anuales=180)]
+    ranking = motor.mas_baratos(catalogo, escenarios, cantidad=3)
+    ranking["CDMX"]["Lavadora", "Alta"][0].como_dict()
+"""
+
+import heapq
+from collections import OrderedDict, deque
+from itertools import repeat
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import gama_vectorizada
+from catalogo import nombre_tipo
+from gama_vectorizada import GAMAS
+
+CAPACIDAD = 500000
+CANTIDAD_RANKING = 5
+
+
+class Escenario():
+    """Tarifas y uso con los que se proyecta el costo de operación.
+
+    Atributos:
+        nombre (str): Nombre para reportes.
+        tarifa_luz (float): Pesos por kWh.
+        tarifa_agua (float): Pesos por m³.
+        ciclos_anuales (float): Ciclos de lavado por año.
+        horas_anuales (float): Horas de uso del microondas por año.
+        anios (int): Años de vida útil.
+        incremento_anual (float): Aumento anual de las tarifas (0.04 = 4%).
+    """
+    __slots__ = ("nombre", "tarifa_luz", "tarifa_agua", "ciclos_anuales", "horas_anuales",
+                 "anios", "incremento_anual")
+
+    def __init__(self, nombre, tarifa_luz, tarifa_agua, ciclos_anuales=250, horas_anuales=60,
+                 anios=10, incremento_anual=0):
+        """
+        Raises:
+            ValueError: Si alguna tarifa o uso es negativo o la vida útil es
+                menor a un año.
+        """
+        for campo, valor in (("tarifa_luz", tarifa_luz), ("tarifa_agua", tarifa_agua),
+                             ("ciclos_anuales", ciclos_anuales), ("horas_anuales", horas_anuales)):
+            if valor < 0:
+                raise ValueError(f"{campo} no puede ser negativo, se recibió {valor!r}")
+        if anios < 1:
+            raise ValueError(f"La vida útil debe ser de al menos un año, se recibió {anios!r}")
+        if incremento_anual <= -1:
+            raise ValueError(f"Incremento anual inválido: {incremento_anual!r}")
+        self.nombre = nombre
+        self.tarifa_luz = tarifa_luz
+        self.tarifa_agua = tarifa_agua
+        self.ciclos_anuales = ciclos_anuales
+        self.horas_anuales = horas_anuales
+        self.anios = anios
+        self.incremento_anual = incremento_anual
+
+    def __repr__(self):
+        return f"Escenario({self.nombre!r})"
+
+    @property
+    def clave(self):
+        """Valores que determinan el costo; dos escenarios iguales comparten el caché."""
+        return (self.tarifa_luz, self.tarifa_agua, self.ciclos_anuales, self.horas_anuales,
+                self.anios, self.incremento_anual)
+
+    @property
+    def factor_vida(self):
+        """Años de vida ponderados por el aumento de tarifas."""
+        return sum((1 + self.incremento_anual) ** anio for anio in range(self.anios))
+
+
+# Tipo -> (campo de consumo, función escenario -> pesos por unidad de consumo al año)
+MODELOS_COSTO = {
+    "Lavadora": ("consumo_agua", lambda escenario: escenario.ciclos_anuales * escenario.tarifa_agua / 1000),
+    "Microondas": ("consumo_energia", lambda escenario: escenario.horas_anuales * escenario.tarifa_luz / 1000),
+}
+
+
+class Opcion():
+    """Un artículo del ranking con su costo proyectado.
+
+    Atributos:
+        tipo, id, marca, modelo, gama (str): Datos del artículo.
+        precio: Precio de compra.
+        operacion (float): Costo de operación en la vida útil.
+        total (float): precio + operacion.
+    """
+    __slots__ = ("tipo", "id", "marca", "modelo", "gama", "precio", "operacion", "total")
+
+    def __init__(self, tipo, id, marca, modelo, gama, precio, operacion):
+        self.tipo = tipo
+        self.id = id
+        self.marca = marca
+        self.modelo = modelo
+        self.gama = gama
+        self.precio = precio
+        self.operacion = round(operacion, 2)
+        self.total = round(precio + operacion, 2)
+
+    def __repr__(self):
+        return f"Opcion({self.id!r}, total={self.total:,.2f})"
+
+    def como_dict(self):
+        """Representación para JSON o tableros."""
+        return {campo: getattr(self, campo) for campo in self.__slots__}
+
+
+def _por_unidad(tipo, escenario):
+    """Costo de operación en la vida útil por unidad de consumo."""
+    return MODELOS_COSTO[tipo][1](escenario) * escenario.factor_vida
+
+
+class MotorCostos():
+    """Proyecta costos de operación con un caché LRU por (modelo, escenario).
+
+    Atributos:
+        capacidad (int): Máximo de resultados guardados.
+        aciertos (int): Resultados que se tomaron del caché.
+        calculados (int): Resultados que se tuvieron que calcular.
+        desalojos (int): Resultados descartados por falta de espacio.
+    """
+
+    def __init__(self, capacidad=CAPACIDAD, reglas="U4"):
+        """
+        Args:
+            capacidad (int): Máximo de (modelo, escenario) guardados.
+            reglas: "U3", "U4" o un reglas_gama.MotorReglas con sus
+                clasificadores cargados, para la gama del ranking.
+        """
+        if capacidad < 1:
+            raise ValueError("La capacidad debe ser al menos 1")
+        self.capacidad = capacidad
+        self.reglas = reglas
+        self.aciertos = 0
+        self.calculados = 0
+        self.desalojos = 0
+        self._resultados = OrderedDict()
+
+    def __len__(self):
+        return len(self._resultados)
+
+    def limpiar(self):
+        """Vacía el caché sin reiniciar los contadores."""
+        self._resultados.clear()
+
+    def estadisticas(self):
+        """Contadores del caché.
+
+        Returns:
+            dict: entradas, capacidad, aciertos, calculados, desalojos y tasa
+            de aciertos.
+        """
+        consultas = self.aciertos + self.calculados
+        return {"entradas": len(self._resultados), "capacidad": self.capacidad,
+                "aciertos": self.aciertos, "calculados": self.calculados,
+                "desalojos": self.desalojos,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0}
+
+    def costo(self, obj, escenario):
+        """Costo de operación de un solo electrodoméstico en la vida útil.
+
+        Raises:
+            TypeError: Si el tipo no tiene modelo de costo.
+        """
+        tipo = nombre_tipo(obj)
+        if tipo not in MODELOS_COSTO:
+            raise TypeError(f"No hay modelo de costo para {tipo}")
+        firma = (obj.modelo, float(getattr(obj, MODELOS_COSTO[tipo][0])))
+        return self._costos_modelos(tipo, [firma], escenario)[0]
+
+    def _costos_modelos(self, tipo, firmas, escenario):
+        """Costo de cada (modelo, consumo) en un escenario; sólo calcula los que faltan.
+
+        Returns:
+            list: Un costo por firma, en el mismo orden.
+        """
+        resultados = self._resultados
+        claves = list(zip(repeat(tipo), firmas, repeat(escenario.clave)))
+        costos = list(map(resultados.get, claves))
+        faltan = [posicion for posicion, costo in enumerate(costos) if costo is None]
+        if len(faltan) < len(claves):
+            # Renueva los aciertos en el orden LRU sin un ciclo de Python
+            deque(map(resultados.move_to_end, [clave for clave, costo in zip(claves, costos)
+                                               if costo is not None]), maxlen=0)
+        self.aciertos += len(claves) - len(faltan)
+        if not faltan:
+            return costos
+        factor = _por_unidad(tipo, escenario)
+        consumos = [firmas[posicion][1] for posicion in faltan]
+        if np is not None:
+            nuevos = (np.asarray(consumos, dtype=np.float64) * factor).tolist()
+        else:
+            nuevos = [consumo * factor for consumo in consumos]
+        for posicion, costo in zip(faltan, nuevos):
+            costos[posicion] = costo
+        resultados.update(zip([claves[posicion] for posicion in faltan], nuevos))
+        self.calculados += len(faltan)
+        while len(resultados) > self.capacidad:
+            resultados.popitem(last=False)
+            self.desalojos += 1
+        return costos
+
+    def _firmas(self, tabla):
+        """Código de firma por fila y las firmas (modelo, consumo) distintas."""
+        campo = MODELOS_COSTO[tabla.esquema.nombre][0]
+        modelos = tabla.columna("modelo")
+        consumos = tabla.columna(campo)
+        if np is not None and hasattr(modelos, "codigos"):
+            # Columna codificada: se agrupan los códigos del modelo junto con
+            # el consumo sin leer los textos fila por fila
+            valores, por_consumo = np.unique(gama_vectorizada.como_arreglo(consumos), return_inverse=True)
+            llaves = np.frombuffer(modelos.codigos, dtype=np.uint32).astype(np.int64) * len(valores)
+            distintas, codigos = np.unique(llaves + por_consumo, return_inverse=True)
+            modelo, consumo = np.divmod(distintas, len(valores))
+            cadenas = modelos.cadenas
+            return codigos, [(cadenas[m], c) for m, c in zip(modelo.tolist(), valores[consumo].tolist())]
+        distintas = {}
+        codigos = [distintas.setdefault(firma, len(distintas)) for firma in zip(modelos, consumos)]
+        return codigos, list(distintas)
+
+    def _tablas(self, catalogo):
+        return [tabla for tipo, tabla in catalogo.tablas.items() if tipo in MODELOS_COSTO and len(tabla)]
+
+    def proyectar_tabla(self, tabla, escenarios):
+        """Costo de operación de cada fila de una tabla en cada escenario.
+
+        Args:
+            tabla (catalogo.TablaColumnar): Tabla de un tipo con modelo de costo.
+            escenarios (list): Escenarios a evaluar.
+
+        Returns:
+            list: Por escenario, una secuencia con un costo por fila (arreglo
+            de NumPy si está instalado, lista si no).
+        """
+        tipo = tabla.esquema.nombre
+        if tipo not in MODELOS_COSTO:
+            raise TypeError(f"No hay modelo de costo para {tipo}")
+        codigos, firmas = self._firmas(tabla)
+        if np is not None:
+            codigos = np.asarray(codigos, dtype=np.intp)
+        resultado = []
+        for escenario in escenarios:
+            costos = self._costos_modelos(tipo, firmas, escenario)
+            if np is not None:
+                resultado.append(np.asarray(costos, dtype=np.float64)[codigos])
+            else:
+                resultado.append([costos[codigo] for codigo in codigos])
+        return resultado
+
+    def proyectar(self, catalogo, escenarios):
+        """Costo de operación de cada fila del catálogo en cada escenario.
+
+        Returns:
+            dict: Tipo -> {nombre del escenario: costos por fila}. Sólo los
+            tipos de MODELOS_COSTO.
+        """
+        return {tabla.esquema.nombre: dict(zip((escenario.nombre for escenario in escenarios),
+                                               self.proyectar_tabla(tabla, escenarios)))
+                for tabla in self._tablas(catalogo)}
+
+    def _codigos_gama(self, tabla):
+        if isinstance(self.reglas, str):
+            return gama_vectorizada.codigos_tabla(tabla, self.reglas)
+        return self.reglas.codigos_tabla(tabla)
+
+    def mas_baratos(self, catalogo, escenarios, cantidad=CANTIDAD_RANKING):
+        """Las opciones con menor costo total (precio + operación) por tipo y gama.
+
+        Args:
+            catalogo (catalogo.Catalogo): Catálogo o instantánea cargada.
+            escenarios (list): Escenarios a evaluar.
+            cantidad (int): Opciones por tipo y gama.
+
+        Returns:
+            dict: Nombre del escenario -> {(tipo, gama): [Opcion, ...]} de
+            menor a mayor costo total; los empates se ordenan por fila.
+        """
+        if cantidad < 1:
+            raise ValueError("La cantidad debe ser al menos 1")
+        ranking = {escenario.nombre: {} for escenario in escenarios}
+        for tabla in self._tablas(catalogo):
+            tipo = tabla.esquema.nombre
+            gamas = self._codigos_gama(tabla)
+            precios = tabla.columna("precio")
+            if np is not None:
+                gamas = np.asarray(gamas)
+                precios = gama_vectorizada.como_arreglo(precios)
+                filas_gama = [np.flatnonzero(gamas == codigo) for codigo in range(len(GAMAS))]
+            else:
+                filas_gama = [[fila for fila, gama in enumerate(gamas) if gama == codigo]
+                              for codigo in range(len(GAMAS))]
+            for escenario, costos in zip(escenarios, self.proyectar_tabla(tabla, escenarios)):
+                if np is not None:
+                    totales = precios + costos
+                else:
+                    totales = [precio + costo for precio, costo in zip(precios, costos)]
+                for gama, filas in zip(GAMAS, filas_gama):
+                    if not len(filas):
+                        continue
+                    elegidas = _menores(totales, filas, cantidad)
+                    ranking[escenario.nombre][tipo, gama] = [
+                        Opcion(tipo, tabla.valor("id", fila), tabla.valor("marca", fila),
+                               tabla.valor("modelo", fila), gama, tabla.valor("precio", fila),
+                               float(costos[fila]))
+                        for fila in elegidas]
+        return ranking
+
+
+def _menores(totales, filas, cantidad):
+    """Las `cantidad` filas con menor total, desempatando por fila."""
+    if np is not None and isinstance(filas, np.ndarray):
+        valores = totales[filas]
+        if len(filas) > cantidad:
+            # Todas las filas que empatan con el k-ésimo entran al desempate
+            limite = np.partition(valores, cantidad - 1)[cantidad - 1]
+            filas = filas[valores <= limite]
+            valores = totales[filas]
+        return filas[np.lexsort((filas, valores))][:cantidad].tolist()
+    return heapq.nsmallest(cantidad, filas, key=lambda fila: (totales[fila], fila))
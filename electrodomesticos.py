@@ -0,0 +1,256 @@
+"""Punto de entrada de línea de comandos para el catálogo de electrodomésticos.
+
+Los scripts U3.py, proyectoU3.py y proyectoU4.py sólo abren su menú cuando
+se ejecutan directamente, así que sus clases se pueden importar sin efectos
+secundarios. Este módulo agrega subcomandos no interactivos que trabajan en
+una sola invocación:
+
+    python electrodomesticos.py importar catalogo.csv --instantanea catalogo.elec
+    python electrodomesticos.py clasificar catalogo.elec [--reglas U3] [--detalle]
+    python electrodomesticos.py mostrar catalogo.elec --tipo Lavadora --limite 5
+    python electrodomesticos.py consultar catalogo.elec --tipo Refrigerador \\
+        --marca Samsung --gama Alta --donde precio=:30000 --donde no_puertas=2
+    python electrodomesticos.py exportar catalogo.elec catalogo.elco --ordenar precio
+    python electrodomesticos.py menu
+
+El origen de datos puede ser un CSV/JSONL (ver importador.py) o una
+instantánea binaria (ver instantanea.py), que se abre con mmap y es la forma
+más rápida de arrancar.
+
+Arranque en frío: el módulo sólo importa argparse y sys al cargarse; el
+catálogo, los índices, NumPy y los serializadores se importan dentro de cada
+subcomando. El presupuesto es PRESUPUESTO_ARRANQUE_MS para
+"python electrodomesticos.py --version" y se mide con
+benchmarks/arranque.py.
+"""
+
+import argparse
+import sys
+
+VERSION = "1.0"
+PRESUPUESTO_ARRANQUE_MS = 50
+_EXTENSIONES_TEXTO = (".csv", ".jsonl", ".ndjson")
+
+
+def cargar_catalogo(origen, rechazos=None):
+    """Abre un CSV/JSONL o una instantánea como Catalogo.
+
+    Args:
+        origen (str): Ruta del archivo.
+        rechazos: Flujo para las filas rechazadas al importar texto.
+
+    Returns:
+        catalogo.Catalogo: Catálogo con los datos.
+    """
+    if origen.endswith(_EXTENSIONES_TEXTO):
+        from catalogo import Catalogo
+        from importador import Importador
+        catalogo = Catalogo()
+        resumen = Importador(rechazos=rechazos).importar(origen, catalogo.agregar)
+        if resumen.rechazadas:
+            print(f"Aviso: {resumen.rechazadas:,} filas rechazadas", file=sys.stderr)
+        return catalogo
+    import instantanea
+    return instantanea.cargar(origen)
+
+
+def _tipo(nombre):
+    from catalogo import ESQUEMAS, buscar_tipo
+    tipo = buscar_tipo(nombre)
+    if tipo is not None:
+        return tipo
+    raise argparse.ArgumentTypeError(f"tipo desconocido: {nombre!r} (use {', '.join(ESQUEMAS)})")
+
+
+def _condicion(texto):
+    """Convierte "campo=valor" o "campo=min:max" en (campo, mínimo, máximo)."""
+    from validacion import convertir_numero
+    campo, separador, valor = texto.partition("=")
+    if not separador or not campo:
+        raise argparse.ArgumentTypeError(f"use campo=valor o campo=min:max, no {texto!r}")
+    try:
+        if ":" in valor:
+            minimo, maximo = (convertir_numero(parte) if parte else None
+                              for parte in valor.split(":", 1))
+        else:
+            minimo = maximo = convertir_numero(valor)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from None
+    return campo, minimo, maximo
+
+
+def _tablas(catalogo, tipo):
+    if tipo is None:
+        return list(catalogo.tablas.values())
+    return [catalogo.tablas[tipo]]
+
+
+def comando_importar(opciones):
+    from catalogo import Catalogo
+    from importador import Importador
+    catalogo = Catalogo()
+    rechazos = open(opciones.rechazos, "w", encoding="utf-8") if opciones.rechazos else None
+    try:
+        resumen = Importador(rechazos=rechazos).importar(opciones.archivo, catalogo.agregar)
+    finally:
+        if rechazos is not None:
+            rechazos.close()
+    print(resumen)
+    if opciones.instantanea:
+        import instantanea
+        escritos = instantanea.guardar(catalogo, opciones.instantanea)
+        print(f"Instantánea: {opciones.instantanea} ({escritos:,} bytes)")
+    return 0
+
+
+def comando_clasificar(opciones):
+    from gama_vectorizada import GAMAS, codigos_gama
+    catalogo = cargar_catalogo(opciones.origen)
+    salida = sys.stdout
+    for tabla in _tablas(catalogo, opciones.tipo):
+        codigos = codigos_gama(tabla, opciones.reglas)
+        nombre = tabla.esquema.nombre
+        if opciones.detalle:
+            salida.writelines(f"{ident}\t{nombre}\t{GAMAS[codigo]}\n"
+                              for ident, codigo in zip(tabla.columna("id"), codigos))
+            continue
+        conteo = [0, 0, 0]
+        for codigo in codigos:
+            conteo[codigo] += 1
+        resumen = "  ".join(f"{gama}: {cantidad:,}" for gama, cantidad in zip(GAMAS, conteo))
+        salida.write(f"{nombre:<13} {len(tabla):>10,}  {resumen}\n")
+    return 0
+
+
+def comando_mostrar(opciones):
+    import renderizado
+    catalogo = cargar_catalogo(opciones.origen)
+    restantes = opciones.limite
+    for tabla in _tablas(catalogo, opciones.tipo):
+        if restantes is None:
+            renderizado.escribir_tabla(tabla, sys.stdout)
+            continue
+        cantidad = min(restantes, len(tabla))
+        renderizado.escribir_objetos((tabla.fila(fila) for fila in range(cantidad)), sys.stdout)
+        restantes -= cantidad
+        if not restantes:
+            break
+    return 0
+
+
+def comando_consultar(opciones):
+    from catalogo import filtrar_filas
+    catalogo = cargar_catalogo(opciones.origen)
+    encontradas = 0
+    for tabla in _tablas(catalogo, opciones.tipo):
+        try:
+            filas = filtrar_filas(tabla, opciones.marca, opciones.gama, opciones.donde,
+                                  opciones.reglas)
+        except ValueError as error:
+            print(f"Error: {error}", file=sys.stderr)
+            return 2
+        if opciones.limite is not None:
+            filas = filas[:opciones.limite - encontradas]
+        encontradas += len(filas)
+        if opciones.json:
+            import json
+            campos = tabla.esquema.campos
+            sys.stdout.writelines(
+                json.dumps(dict(zip(("tipo",) + campos, (tabla.esquema.nombre,)
+                                    + tuple(tabla.valor(campo, fila) for campo in campos))),
+                           ensure_ascii=False) + "\n" for fila in filas)
+        else:
+            import renderizado
+            renderizado.escribir_objetos((tabla.fila(fila) for fila in filas), sys.stdout)
+        if opciones.limite is not None and encontradas >= opciones.limite:
+            break
+    print(f"{encontradas:,} encontrados", file=sys.stderr)
+    return 0
+
+
+def comando_exportar(opciones):
+    import exportacion
+    catalogo = cargar_catalogo(opciones.origen)
+    tamano_grupo = opciones.tamano_grupo
+    if tamano_grupo is None:
+        tamano_grupo = exportacion.TAMANO_GRUPO
+    escritos = exportacion.exportar(catalogo, opciones.destino, tamano_grupo, opciones.reglas,
+                                    opciones.ordenar, opciones.comprimir)
+    print(f"Archivo columnar: {opciones.destino} ({len(catalogo):,} filas, {escritos:,} bytes)")
+    return 0
+
+
+def comando_menu(opciones):
+    import runpy
+    runpy.run_module("proyectoU4", run_name="__main__")
+    return 0
+
+
+def crear_parser():
+    """Construye el parser de argumentos con todos los subcomandos."""
+    parser = argparse.ArgumentParser(prog="electrodomesticos",
+                                     description="Catálogo de electrodomésticos por lotes.")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {VERSION}")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    importar = subcomandos.add_parser("importar", help="importa un CSV o JSONL")
+    importar.add_argument("archivo")
+    importar.add_argument("--rechazos", help="archivo JSONL para las filas rechazadas")
+    importar.add_argument("--instantanea", help="guarda el catálogo en esta instantánea")
+    importar.set_defaults(funcion=comando_importar)
+
+    clasificar = subcomandos.add_parser("clasificar", help="cuenta o lista la gama de cada artículo")
+    clasificar.add_argument("origen", help="CSV, JSONL o instantánea")
+    clasificar.add_argument("--tipo", type=_tipo)
+    clasificar.add_argument("--reglas", default="U4",
+                            help="U3, U4 o un conjunto de reglas_gama.json (por defecto U4)")
+    clasificar.add_argument("--detalle", action="store_true", help="una línea id, tipo y gama por artículo")
+    clasificar.set_defaults(funcion=comando_clasificar)
+
+    mostrar = subcomandos.add_parser("mostrar", help="imprime las fichas como el menú")
+    mostrar.add_argument("origen")
+    mostrar.add_argument("--tipo", type=_tipo)
+    mostrar.add_argument("--limite", type=int)
+    mostrar.set_defaults(funcion=comando_mostrar)
+
+    consultar = subcomandos.add_parser("consultar", help="filtra por marca, gama y rangos")
+    consultar.add_argument("origen")
+    consultar.add_argument("--tipo", type=_tipo)
+    consultar.add_argument("--marca")
+    consultar.add_argument("--gama", choices=("Baja", "Media", "Alta", "baja", "media", "alta"))
+    consultar.add_argument("--donde", type=_condicion, action="append", default=[],
+                           metavar="CAMPO=MIN:MAX", help="rango (o valor exacto) de un campo numérico")
+    consultar.add_argument("--reglas", default="U4")
+    consultar.add_argument("--limite", type=int)
+    consultar.add_argument("--json", action="store_true", help="una línea JSON por artículo")
+    consultar.set_defaults(funcion=comando_consultar)
+
+    exportar = subcomandos.add_parser("exportar", help="escribe un archivo columnar para análisis")
+    exportar.add_argument("origen", help="CSV, JSONL o instantánea")
+    exportar.add_argument("destino")
+    exportar.add_argument("--tamano-grupo", type=int, help="filas por grupo (por defecto 65536)")
+    exportar.add_argument("--ordenar", metavar="CAMPO", help="ordena cada tipo por este campo")
+    exportar.add_argument("--reglas", default="U4", help="reglas para la columna gama")
+    exportar.add_argument("--comprimir", action="store_true", help="comprime cada columna con zlib")
+    exportar.set_defaults(funcion=comando_exportar)
+
+    menu = subcomandos.add_parser("menu", help="abre el menú interactivo de proyectoU4.py")
+    menu.set_defaults(funcion=comando_menu)
+    return parser
+
+
+def main(argumentos=None):
+    opciones = crear_parser().parse_args(argumentos)
+    try:
+        return opciones.funcion(opciones)
+    except BrokenPipeError:
+        # La salida se cerró antes de tiempo (por ejemplo con | head)
+        sys.stderr.close()
+        return 0
+    except (OSError, ValueError) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
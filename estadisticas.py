@@ -0,0 +1,273 @@
+"""Estadísticas agregadas por tipo, marca y gama que se actualizan en cada cambio.
+
+Para los tableros se necesitan, por tipo de electrodoméstico y por marca, el
+número de artículos, el precio promedio, mínimo y máximo, y cuántos hay de
+cada gama. En lugar de recorrer el inventario y llamar tipo_gama() en cada
+consulta, Estadisticas se suscribe a un Inventario y ajusta sus contadores
+en cada alta, cambio y baja. Leer cualquier agregado es O(1).
+
+Cada artículo cuenta en cuatro grupos: (tipo, marca), (tipo, None),
+(None, marca) y (None, None), donde None significa "todos". El mínimo y el
+máximo se mantienen con montículos de precios distintos y un conteo por
+precio, así que una baja del precio mínimo no obliga a recorrer el grupo.
+
+Desde una instantánea (instantanea.cargar) se reconstruye con
+desde_catalogo(), que clasifica por lotes con gama_vectorizada y agrupa las
+columnas directamente, con NumPy si está disponible.
+
+Ejemplo:
+    estadisticas = Estadisticas()
+    estadisticas.conectar(inventario)
+    estadisticas.consultar("Lavadora", "LG").promedio
+    estadisticas.consultar(marca="Mabe").gamas
+"""
+
+import heapq
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import gama_vectorizada
+from gama_vectorizada import GAMAS
+
+
+class Agregado():
+    """Contadores de un grupo de artículos.
+
+    Atributos:
+        cantidad (int): Artículos en el grupo.
+        suma (float): Suma de los precios.
+        gamas (dict): Gama -> artículos de esa gama.
+    """
+    __slots__ = ("cantidad", "suma", "gamas", "_precios", "_menores", "_mayores")
+
+    def __init__(self):
+        self.cantidad = 0
+        self.suma = 0
+        self.gamas = dict.fromkeys(GAMAS, 0)
+        self._precios = {}
+        self._menores = []
+        self._mayores = []
+
+    @property
+    def promedio(self):
+        """Precio promedio, o None si el grupo está vacío."""
+        return self.suma / self.cantidad if self.cantidad else None
+
+    @property
+    def minimo(self):
+        """Precio mínimo, o None si el grupo está vacío."""
+        return self._menores[0] if self._menores else None
+
+    @property
+    def maximo(self):
+        """Precio máximo, o None si el grupo está vacío."""
+        return -self._mayores[0] if self._mayores else None
+
+    def agregar(self, precio, gama, veces=1):
+        """Suma un artículo (o varios iguales) al grupo."""
+        self.cantidad += veces
+        self.suma += precio * veces
+        self.gamas[gama] += veces
+        anteriores = self._precios.get(precio, 0)
+        self._precios[precio] = anteriores + veces
+        if not anteriores:
+            heapq.heappush(self._menores, precio)
+            heapq.heappush(self._mayores, -precio)
+
+    def quitar(self, precio, gama):
+        """Resta un artículo del grupo.
+
+        Raises:
+            KeyError: Si el grupo no tiene ningún artículo con ese precio.
+        """
+        restantes = self._precios[precio] - 1
+        self.cantidad -= 1
+        self.suma -= precio
+        self.gamas[gama] -= 1
+        if restantes:
+            self._precios[precio] = restantes
+            return
+        del self._precios[precio]
+        # Los precios que ya no existen se sacan del tope de cada montículo
+        # aquí mismo, para que minimo y maximo sigan siendo O(1)
+        precios = self._precios
+        while self._menores and self._menores[0] not in precios:
+            heapq.heappop(self._menores)
+        while self._mayores and -self._mayores[0] not in precios:
+            heapq.heappop(self._mayores)
+        if len(self._menores) > 2 * len(precios) + 16:
+            self._compactar()
+        if not self.cantidad:
+            self.suma = 0
+
+    def _compactar(self):
+        """Quita de los montículos los precios que ya no están en el grupo."""
+        self._menores = sorted(self._precios)
+        self._mayores = [-precio for precio in reversed(self._menores)]
+
+    def fundir(self, otro):
+        """Suma los contadores de otro agregado a este."""
+        self.cantidad += otro.cantidad
+        self.suma += otro.suma
+        for gama, cantidad in otro.gamas.items():
+            self.gamas[gama] += cantidad
+        for precio, veces in otro._precios.items():
+            self._precios[precio] = self._precios.get(precio, 0) + veces
+        self._compactar()
+
+    def como_dict(self):
+        """Representación para JSON o tableros."""
+        return {"cantidad": self.cantidad, "promedio": self.promedio, "minimo": self.minimo,
+                "maximo": self.maximo, "gamas": dict(self.gamas)}
+
+
+class Estadisticas():
+    """Agregados por tipo y marca mantenidos de forma incremental.
+
+    Atributos:
+        grupos (dict): (tipo o None, marca o None) -> Agregado.
+    """
+
+    def __init__(self):
+        self.grupos = {}
+
+    def _grupo(self, clave):
+        grupo = self.grupos.get(clave)
+        if grupo is None:
+            grupo = self.grupos[clave] = Agregado()
+        return grupo
+
+    def registrar(self, tipo, marca, precio, gama):
+        """Suma un artículo a sus cuatro grupos."""
+        for clave in ((tipo, marca), (tipo, None), (None, marca), (None, None)):
+            self._grupo(clave).agregar(precio, gama)
+
+    def retirar(self, tipo, marca, precio, gama):
+        """Resta un artículo de sus cuatro grupos y borra los que quedan vacíos."""
+        for clave in ((tipo, marca), (tipo, None), (None, marca), (None, None)):
+            grupo = self.grupos[clave]
+            grupo.quitar(precio, gama)
+            if not grupo.cantidad:
+                del self.grupos[clave]
+
+    def consultar(self, tipo=None, marca=None):
+        """Agregado de un tipo, una marca, ambos o todo el inventario.
+
+        Returns:
+            Agregado: Contadores del grupo (vacío si no hay artículos).
+        """
+        return self.grupos.get((tipo, marca)) or Agregado()
+
+    def marcas(self, tipo=None):
+        """Agregado por marca, opcionalmente de un solo tipo."""
+        return {marca: grupo for (nombre, marca), grupo in self.grupos.items()
+                if nombre == tipo and marca is not None}
+
+    def conectar(self, inventario):
+        """Carga el contenido actual del inventario y se suscribe a sus cambios."""
+        for id, obj in inventario.objetos.items():
+            tipo, gama = inventario.tipos[id]
+            self.registrar(tipo, obj.marca, obj.precio, gama)
+        inventario.suscribir(self.notificar)
+        return self
+
+    def notificar(self, operacion, tipo, gama, obj, anteriores):
+        """Oyente de Inventario.suscribir().
+
+        Args:
+            operacion (str): "alta", "baja" o "cambio".
+            tipo (str): Tipo del electrodoméstico.
+            gama (str): Gama actual (en una baja, la que tenía).
+            obj: Electrodoméstico ya modificado.
+            anteriores (dict): En un cambio, los valores previos de los
+                campos que cambiaron, incluida "gama" si cambió.
+        """
+        if operacion == "alta":
+            self.registrar(tipo, obj.marca, obj.precio, gama)
+        elif operacion == "baja":
+            self.retirar(tipo, obj.marca, obj.precio, gama)
+        elif {"marca", "precio", "gama"}.intersection(anteriores):
+            self.retirar(tipo, anteriores.get("marca", obj.marca),
+                         anteriores.get("precio", obj.precio), anteriores.get("gama", gama))
+            self.registrar(tipo, obj.marca, obj.precio, gama)
+
+    @classmethod
+    def desde_catalogo(cls, catalogo, motor=None):
+        """Reconstruye las estadísticas desde un catálogo columnar o instantánea.
+
+        No se crean objetos ni se llama tipo_gama() fila por fila: la gama se
+        calcula por lotes y los precios se agrupan por marca sobre las
+        columnas.
+
+        Args:
+            catalogo (catalogo.Catalogo): Por ejemplo el de instantanea.cargar().
+            motor (reglas_gama.MotorReglas): Reglas de gama a usar; si se
+                omite, las U4 de proyectoU4.py.
+        """
+        estadisticas = cls()
+        for tipo, tabla in catalogo.tablas.items():
+            if not len(tabla):
+                continue
+            if motor is not None:
+                codigos = motor.codigos_tabla(tabla)
+            else:
+                codigos = gama_vectorizada.codigos_tabla(tabla, "U4")
+            for marca, grupo in _agrupar_por_marca(tabla, codigos):
+                estadisticas.grupos[tipo, marca] = grupo
+        # Los grupos por tipo, por marca y total se obtienen fundiendo los de (tipo, marca)
+        for (tipo, marca), grupo in list(estadisticas.grupos.items()):
+            for clave in ((tipo, None), (None, marca), (None, None)):
+                estadisticas._grupo(clave).fundir(grupo)
+        return estadisticas
+
+
+def _factorizar(columna):
+    """Códigos enteros y valores distintos de una columna de texto."""
+    if hasattr(columna, "codigos"):
+        # Columna de una instantánea: ya viene codificada contra su tabla de cadenas
+        distintos = {}
+        codigos = [distintos.setdefault(codigo, len(distintos)) for codigo in columna.codigos]
+        return codigos, [columna.cadenas[codigo] for codigo in distintos]
+    distintos = {}
+    codigos = [distintos.setdefault(valor, len(distintos)) for valor in columna]
+    return codigos, list(distintos)
+
+
+def _agrupar_por_marca(tabla, codigos_gama):
+    """Genera (marca, Agregado) para cada marca de una tabla."""
+    codigos_marca, marcas = _factorizar(tabla.columna("marca"))
+    precios = tabla.columna("precio")
+    enteros = tabla.enteros
+    bit = 1 << tabla.esquema.numeros.index("precio")
+    grupos = [Agregado() for _ in marcas]
+
+    if np is not None:
+        marca = np.asarray(codigos_marca, dtype=np.int64)
+        precio = gama_vectorizada.como_arreglo(precios)
+        gama = np.asarray(codigos_gama, dtype=np.int64)
+        conteo_gamas = np.bincount(marca * 3 + gama, minlength=3 * len(marcas)).reshape(-1, 3)
+        orden = np.lexsort((precio, marca))
+        marca, precio = marca[orden], precio[orden]
+        cortes = np.flatnonzero((np.diff(marca) != 0) | (np.diff(precio) != 0)) + 1
+        inicios = np.concatenate(([0], cortes))
+        veces = np.diff(np.concatenate((inicios, [len(marca)])))
+        todos_enteros = all(mascara & bit for mascara in enteros)
+        for codigo, valor, repeticiones in zip(marca[inicios].tolist(), precio[inicios].tolist(),
+                                               veces.tolist()):
+            grupo = grupos[codigo]
+            if todos_enteros:
+                valor = int(valor)
+            grupo._precios[valor] = repeticiones
+            grupo.cantidad += repeticiones
+            grupo.suma += valor * repeticiones
+        for grupo, conteo in zip(grupos, conteo_gamas.tolist()):
+            grupo.gamas = dict(zip(GAMAS, conteo))
+            grupo._compactar()
+        return zip(marcas, grupos)
+
+    for codigo, valor, mascara, gama in zip(codigos_marca, precios, enteros, codigos_gama):
+        grupos[codigo].agregar(int(valor) if mascara & bit else valor, GAMAS[gama])
+    return zip(marcas, grupos)
@@ -0,0 +1,554 @@
+"""Exportación del catálogo a archivos columnares con poda por estadísticas.
+
+Formato (versión 1, little endian):
+
+    cabecera     "ELCO", versión u16, reservado u16
+    grupos       grupos de filas de un solo tipo; por cada columna, sus
+                 secciones alineadas a 8 bytes (comprimidas con zlib si se
+                 pidió):
+                   - campos numéricos y derivados: float64
+                   - campos de texto: diccionario del grupo (desplazamientos
+                     uint32 en caracteres y los textos unidos en UTF-8) y un
+                     código uint32 por fila
+                   - "gama": un int8 por fila (0 Baja, 1 Media, 2 Alta)
+                     calculado al exportar
+    directorio   JSON con la posición de cada sección y, por grupo y
+                 columna, el mínimo, el máximo y los NaN
+    cola         largo del directorio u64 y "ELCO"
+
+Los números se guardan como float64, igual que en el catálogo columnar. En
+un equipo big endian las secciones se invierten al escribir y al leer.
+
+EscritorColumnar escribe cada grupo en cuanto se llena, así que la memoria
+queda acotada por tamano_grupo. LectorColumnar sólo lee el directorio al
+abrir; al consultar descarta por sus estadísticas los grupos que no pueden
+cumplir los filtros (tipo, marca, gama y rangos, como
+catalogo.filtrar_filas), se salta los filtros que un grupo cumple
+completo y decodifica sólo las columnas pedidas. La poda sirve más cuando el
+archivo se exporta ordenado por el campo que se filtra (ordenar_por).
+
+Ejemplo:
+    exportar(catalogo, "catalogo.elco", ordenar_por="precio")
+    with LectorColumnar("catalogo.elco") as lector:
+        for tipo, columnas in lector.leer(columnas=("id", "precio", "gama"),
+                                          condiciones=[("precio", None, 5000)]):
+            print(tipo, len(columnas["id"]))
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from itertools import accumulate
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import gama_vectorizada
+from catalogo import ESQUEMAS, TablaColumnar, nombre_tipo
+from gama_vectorizada import GAMAS
+
+MAGIA = b"ELCO"
+VERSION = 1
+TAMANO_GRUPO = 65536
+# magia, versión, reservado
+_CABECERA = struct.Struct("<4sHH")
+# largo del directorio, magia
+_COLA = struct.Struct("<Q4s")
+# Las secciones se guardan little endian; en un equipo big endian se invierten
+_INVERTIR = sys.byteorder == "big"
+
+
+def _alinear(posicion):
+    return (posicion + 7) & ~7
+
+
+def _little_endian(arreglo):
+    """Bytes de un array en orden little endian."""
+    if _INVERTIR and arreglo.itemsize > 1:
+        arreglo = array(arreglo.typecode, arreglo)
+        arreglo.byteswap()
+    return arreglo.tobytes()
+
+
+def _desde_little_endian(datos, formato):
+    """Vista en orden nativo de una sección little endian."""
+    if not _INVERTIR or formato in "bB":
+        return datos.cast(formato)
+    copia = array(formato, bytes(datos))
+    copia.byteswap()
+    return memoryview(copia)
+
+
+def _tomar(columna, filas):
+    """Valores de las filas indicadas (un range se toma como rebanada)."""
+    if isinstance(filas, range):
+        return columna[filas.start:filas.stop]
+    if np is not None and isinstance(filas, np.ndarray):
+        if isinstance(columna, (array, memoryview, np.ndarray)):
+            return np.asarray(columna)[filas]
+        filas = filas.tolist()
+    return [columna[fila] for fila in filas]
+
+
+def _rango(valores):
+    """(mínimo, máximo, NaN) de una columna float64, sin contar los NaN."""
+    if np is not None:
+        arreglo = np.frombuffer(valores, dtype=np.float64)
+        nulos = int(np.count_nonzero(np.isnan(arreglo)))
+        if nulos == len(arreglo):
+            return None, None, nulos
+        return float(np.nanmin(arreglo)), float(np.nanmax(arreglo)), nulos
+    validos = [valor for valor in valores if valor == valor]
+    if not validos:
+        return None, None, len(valores)
+    return min(validos), max(validos), len(valores) - len(validos)
+
+
+class EscritorColumnar():
+    """Escribe un archivo columnar grupo por grupo.
+
+    El archivo se escribe con otro nombre y se renombra al cerrar, así que un
+    lector nunca ve un archivo a medias.
+
+    Ejemplo:
+        with EscritorColumnar("catalogo.elco") as escritor:
+            for obj in objetos:
+                escritor.agregar(obj)
+    """
+
+    def __init__(self, ruta, tamano_grupo=TAMANO_GRUPO, reglas="U4", comprimir=False):
+        """Abre el archivo temporal y escribe la cabecera.
+
+        Args:
+            ruta (str): Archivo destino.
+            tamano_grupo (int): Filas por grupo.
+            reglas (str): "U3", "U4" o un conjunto de reglas_gama.json para
+                la columna gama.
+            comprimir (bool): Si cada sección se comprime con zlib.
+        """
+        if tamano_grupo < 1:
+            raise ValueError("El tamaño del grupo debe ser al menos 1")
+        self.ruta = ruta
+        self.tamano_grupo = tamano_grupo
+        self.reglas = reglas
+        self.comprimir = comprimir
+        self.grupos = []
+        self.filas = 0
+        self._clasificar = gama_vectorizada.clasificador(reglas)
+        self._espera = {}
+        self._temporal = f"{ruta}.tmp"
+        self._archivo = open(self._temporal, "wb")
+        self._archivo.write(_CABECERA.pack(MAGIA, VERSION, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is None:
+            self.cerrar()
+        else:
+            self.descartar()
+
+    def _seccion(self, datos):
+        archivo = self._archivo
+        archivo.write(b"\0" * (_alinear(archivo.tell()) - archivo.tell()))
+        if self.comprimir:
+            datos = zlib.compress(datos, 1)
+        posicion = archivo.tell()
+        archivo.write(datos)
+        return [posicion, len(datos)]
+
+    def agregar(self, obj):
+        """Agrega un electrodoméstico (o una vista de fila)."""
+        tipo = nombre_tipo(obj)
+        self.agregar_valores(tipo, *(getattr(obj, campo) for campo in ESQUEMAS[tipo].campos))
+
+    def agregar_valores(self, tipo, *valores):
+        """Agrega un registro; se escribe cuando su grupo se llena.
+
+        Args:
+            tipo (str): Nombre del tipo.
+            *valores: Valores en el orden del constructor de la clase.
+        """
+        tabla = self._espera.get(tipo)
+        if tabla is None:
+            tabla = self._espera[tipo] = TablaColumnar(ESQUEMAS[tipo])
+        tabla.agregar_valores(valores)
+        if len(tabla) >= self.tamano_grupo:
+            self.escribir_tabla(self._espera.pop(tipo))
+
+    def escribir_tabla(self, tabla, ordenar_por=None):
+        """Escribe una TablaColumnar completa en grupos de tamano_grupo filas.
+
+        Args:
+            tabla (catalogo.TablaColumnar): Tabla a escribir.
+            ordenar_por (str): Campo por el que se ordenan las filas antes
+                de agruparlas, para que los rangos de cada grupo no se
+                traslapen. Los NaN quedan al final.
+        """
+        if not len(tabla):
+            return
+        codigos = self._clasificar(tabla)
+        orden = range(len(tabla))
+        if ordenar_por is not None:
+            columna = tabla.columna(ordenar_por)
+            if ordenar_por in tabla.esquema.textos:
+                orden = sorted(orden, key=columna.__getitem__)
+            elif np is not None:
+                # argsort deja los NaN al final
+                orden = np.argsort(gama_vectorizada.como_arreglo(columna), kind="stable")
+            else:
+                orden = sorted(orden, key=lambda fila: (columna[fila] != columna[fila], columna[fila]))
+        for inicio in range(0, len(tabla), self.tamano_grupo):
+            self._escribir_grupo(tabla, orden[inicio:inicio + self.tamano_grupo], codigos)
+
+    def _escribir_grupo(self, tabla, filas, codigos):
+        esquema = tabla.esquema
+        columnas = {}
+        numericas = [(campo, tabla.columna(campo)) for campo in esquema.numeros]
+        numericas += list(tabla.derivados.items())
+        for campo, columna in numericas:
+            valores = _tomar(columna, filas)
+            if isinstance(valores, memoryview) or (np is not None and isinstance(valores, np.ndarray)):
+                # Columna de una instantánea mapeada o filas tomadas con NumPy
+                valores = array("d", valores.tobytes())
+            elif not (isinstance(valores, array) and valores.typecode == "d"):
+                valores = array("d", valores)
+            minimo, maximo, nulos = _rango(valores)
+            columnas[campo] = {"codificacion": "float64",
+                               "secciones": [self._seccion(_little_endian(valores))],
+                               "minimo": minimo, "maximo": maximo, "nulos": nulos}
+        for campo in esquema.textos:
+            distintos = {}
+            codigos_texto = array("I", [distintos.setdefault(valor, len(distintos))
+                                        for valor in _tomar(tabla.columna(campo), filas)])
+            desplazamientos = array("I", accumulate(map(len, distintos), initial=0))
+            columnas[campo] = {"codificacion": "diccionario",
+                               "secciones": [self._seccion(_little_endian(desplazamientos)),
+                                             self._seccion("".join(distintos).encode("utf-8")),
+                                             self._seccion(_little_endian(codigos_texto))],
+                               "minimo": min(distintos), "maximo": max(distintos), "nulos": 0}
+        gamas = _tomar(codigos, filas)
+        if np is not None and isinstance(gamas, np.ndarray):
+            gamas = array("b", np.asarray(gamas, dtype=np.int8).tobytes())
+        else:
+            gamas = array("b", gamas)
+        columnas["gama"] = {"codificacion": "int8", "secciones": [self._seccion(gamas.tobytes())],
+                            "minimo": min(gamas), "maximo": max(gamas), "nulos": 0}
+        self.grupos.append({"tipo": esquema.nombre, "filas": len(filas), "columnas": columnas})
+        self.filas += len(filas)
+
+    def cerrar(self):
+        """Escribe los grupos pendientes y el directorio, y renombra el archivo.
+
+        Returns:
+            int: Bytes escritos.
+        """
+        for tipo in list(self._espera):
+            self.escribir_tabla(self._espera.pop(tipo))
+        archivo = self._archivo
+        directorio = {"version": VERSION, "reglas": self.reglas, "comprimido": self.comprimir,
+                      "filas": self.filas, "grupos": self.grupos}
+        codificado = json.dumps(directorio, ensure_ascii=False).encode("utf-8")
+        archivo.write(codificado)
+        archivo.write(_COLA.pack(len(codificado), MAGIA))
+        total = archivo.tell()
+        archivo.flush()
+        os.fsync(archivo.fileno())
+        archivo.close()
+        os.replace(self._temporal, self.ruta)
+        return total
+
+    def descartar(self):
+        """Cierra y borra el archivo temporal sin tocar el destino."""
+        self._archivo.close()
+        os.remove(self._temporal)
+
+
+def exportar(catalogo, ruta, tamano_grupo=TAMANO_GRUPO, reglas="U4", ordenar_por=None,
+             comprimir=False):
+    """Exporta un catálogo columnar (o una instantánea cargada) tabla por tabla.
+
+    Args:
+        catalogo (catalogo.Catalogo): Catálogo a exportar.
+        ruta (str): Archivo destino.
+        tamano_grupo (int): Filas por grupo.
+        reglas (str): Reglas para la columna gama.
+        ordenar_por (str): Campo por el que se ordena cada tipo; los tipos
+            que no lo tienen se escriben en su orden.
+        comprimir (bool): Si cada sección se comprime con zlib.
+
+    Returns:
+        int: Bytes escritos.
+    """
+    with EscritorColumnar(ruta, tamano_grupo, reglas, comprimir) as escritor:
+        for tabla in catalogo.tablas.values():
+            campos = tabla.esquema.campos + tuple(tabla.derivados)
+            escritor.escribir_tabla(tabla, ordenar_por if ordenar_por in campos else None)
+    return os.path.getsize(ruta)
+
+
+class LectorColumnar():
+    """Lee un archivo de EscritorColumnar con poda de grupos y proyección.
+
+    Atributos:
+        directorio (dict): Directorio del archivo (grupos y estadísticas).
+        grupos (list): Por grupo: tipo, filas y estadísticas por columna.
+        leidos (int): Grupos leídos desde que se abrió el archivo.
+        saltados (int): Grupos descartados sólo con sus estadísticas.
+    """
+
+    def __init__(self, ruta):
+        """Mapea el archivo y lee su directorio.
+
+        Raises:
+            ValueError: Si el archivo no es columnar o su versión no es
+                compatible.
+        """
+        with open(ruta, "rb") as archivo:
+            tamano = os.fstat(archivo.fileno()).st_size
+            if tamano < _CABECERA.size + _COLA.size:
+                raise ValueError(f"{ruta!r} no es un archivo columnar del catálogo")
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self._memoria = memoryview(self._mapa)
+        magia, version, _ = _CABECERA.unpack_from(self._memoria)
+        largo, cola = _COLA.unpack_from(self._memoria, tamano - _COLA.size)
+        if magia != MAGIA or cola != MAGIA:
+            raise ValueError(f"{ruta!r} no es un archivo columnar del catálogo")
+        if version != VERSION:
+            raise ValueError(f"Versión de archivo columnar no soportada: {version}")
+        inicio = tamano - _COLA.size - largo
+        self.directorio = json.loads(str(self._memoria[inicio:inicio + largo], "utf-8"))
+        self.grupos = self.directorio["grupos"]
+        self._comprimido = self.directorio["comprimido"]
+        self.leidos = 0
+        self.saltados = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def __len__(self):
+        return self.directorio["filas"]
+
+    def cerrar(self):
+        """Libera el archivo mapeado."""
+        self._memoria.release()
+        try:
+            self._mapa.close()
+        except BufferError:
+            # Aún hay vistas vivas (por ejemplo en el rastreo de una
+            # excepción); el mapa se libera cuando se recolectan
+            pass
+
+    def tipos(self):
+        """Tipos presentes en el archivo, en orden de aparición."""
+        return list(dict.fromkeys(grupo["tipo"] for grupo in self.grupos))
+
+    def _seccion(self, ubicacion, formato):
+        posicion, largo = ubicacion
+        datos = self._memoria[posicion:posicion + largo]
+        if self._comprimido:
+            datos = memoryview(zlib.decompress(datos))
+        return _desde_little_endian(datos, formato)
+
+    def _numeros(self, grupo, campo):
+        return self._seccion(grupo["columnas"][campo]["secciones"][0], "d")
+
+    def _texto(self, grupo, campo):
+        """(valores distintos, códigos por fila) de una columna de texto."""
+        desplazamientos, datos, codigos = grupo["columnas"][campo]["secciones"]
+        desplazamientos = self._seccion(desplazamientos, "I")
+        texto = str(self._seccion(datos, "B"), "utf-8")
+        distintos = [texto[inicio:fin] for inicio, fin in zip(desplazamientos, desplazamientos[1:])]
+        return distintos, self._seccion(codigos, "I")
+
+    def _estadistica(self, grupo, campo, codificacion):
+        estadistica = grupo["columnas"].get(campo)
+        if estadistica is None or estadistica["codificacion"] != codificacion:
+            clase = "numérico" if codificacion == "float64" else "de texto"
+            raise ValueError(f"{grupo['tipo']} no tiene el campo {clase} {campo!r}")
+        return estadistica
+
+    def _filtros(self, grupo, marca, gama, condiciones):
+        """Filtros que hay que revisar fila por fila, o None si el grupo se descarta.
+
+        Un filtro que todas las filas del grupo cumplen según sus
+        estadísticas no se revisa.
+        """
+        pendientes = []
+        if marca is not None:
+            estadistica = self._estadistica(grupo, "marca", "diccionario")
+            if not estadistica["minimo"] <= marca <= estadistica["maximo"]:
+                return None
+            if estadistica["minimo"] != estadistica["maximo"]:
+                pendientes.append(("marca", marca, None))
+        if gama is not None:
+            estadistica = grupo["columnas"]["gama"]
+            if not estadistica["minimo"] <= gama <= estadistica["maximo"]:
+                return None
+            if estadistica["minimo"] != estadistica["maximo"]:
+                pendientes.append(("gama", gama, None))
+        for campo, minimo, maximo in condiciones:
+            estadistica = self._estadistica(grupo, campo, "float64")
+            menor, mayor = estadistica["minimo"], estadistica["maximo"]
+            if menor is None or (minimo is not None and mayor < minimo) \
+                    or (maximo is not None and menor > maximo):
+                return None
+            if estadistica["nulos"] or (minimo is not None and menor < minimo) \
+                    or (maximo is not None and mayor > maximo):
+                pendientes.append((campo, minimo, maximo))
+        return pendientes
+
+    def _seleccion(self, grupo, pendientes):
+        """Filas del grupo que cumplen los filtros pendientes (None si son todas)."""
+        if not pendientes:
+            return None
+        if np is not None:
+            mascara = np.ones(grupo["filas"], dtype=bool)
+            for campo, minimo, maximo in pendientes:
+                if campo == "marca":
+                    distintos, codigos = self._texto(grupo, campo)
+                    codigo = distintos.index(minimo) if minimo in distintos else -1
+                    mascara &= np.frombuffer(codigos, dtype=np.uint32) == codigo
+                elif campo == "gama":
+                    mascara &= np.frombuffer(self._seccion(grupo["columnas"]["gama"]["secciones"][0], "b"),
+                                             dtype=np.int8) == minimo
+                else:
+                    columna = np.frombuffer(self._numeros(grupo, campo), dtype=np.float64)
+                    if minimo is not None:
+                        mascara &= columna >= minimo
+                    if maximo is not None:
+                        mascara &= columna <= maximo
+            return np.flatnonzero(mascara)
+        filas = range(grupo["filas"])
+        for campo, minimo, maximo in pendientes:
+            if campo == "marca":
+                distintos, codigos = self._texto(grupo, campo)
+                if minimo not in distintos:
+                    return []
+                codigo = distintos.index(minimo)
+                filas = [fila for fila in filas if codigos[fila] == codigo]
+            elif campo == "gama":
+                codigos = self._seccion(grupo["columnas"]["gama"]["secciones"][0], "b")
+                filas = [fila for fila in filas if codigos[fila] == minimo]
+            else:
+                columna = self._numeros(grupo, campo)
+                filas = [fila for fila in filas if (minimo is None or columna[fila] >= minimo)
+                         and (maximo is None or columna[fila] <= maximo)]
+        return filas
+
+    def _columna(self, grupo, campo, filas):
+        """Decodifica una columna del grupo, sólo en las filas seleccionadas."""
+        estadistica = grupo["columnas"].get(campo)
+        if estadistica is None:
+            raise ValueError(f"{grupo['tipo']} no tiene la columna {campo!r}")
+        codificacion = estadistica["codificacion"]
+        if codificacion == "float64":
+            columna = self._numeros(grupo, campo)
+            valores = array("d")
+            if filas is None:
+                valores.frombytes(columna.cast("B"))
+            elif np is not None and isinstance(filas, np.ndarray):
+                valores.frombytes(np.frombuffer(columna, dtype=np.float64)[filas].tobytes())
+            else:
+                valores.extend(map(columna.__getitem__, filas))
+            return valores
+        if codificacion == "int8":
+            codigos = self._seccion(estadistica["secciones"][0], "b")
+            distintos = GAMAS
+        else:
+            distintos, codigos = self._texto(grupo, campo)
+        if filas is None:
+            return list(map(distintos.__getitem__, codigos))
+        if np is not None and isinstance(filas, np.ndarray):
+            tipo = np.int8 if codificacion == "int8" else np.uint32
+            return list(map(distintos.__getitem__, np.frombuffer(codigos, dtype=tipo)[filas].tolist()))
+        return [distintos[codigos[fila]] for fila in filas]
+
+    def _recorrer(self, tipo, marca, gama, condiciones):
+        """Genera (grupo, filtros pendientes) de los grupos que no se descartan."""
+        codigo = GAMAS.index(gama.capitalize()) if gama is not None else None
+        for grupo in self.grupos:
+            if tipo is not None and grupo["tipo"] != tipo:
+                continue
+            pendientes = self._filtros(grupo, marca, codigo, condiciones)
+            if pendientes is None:
+                self.saltados += 1
+                continue
+            self.leidos += 1
+            yield grupo, pendientes
+
+    def leer(self, tipo=None, columnas=None, marca=None, gama=None, condiciones=()):
+        """Genera las columnas pedidas de cada grupo, ya filtradas.
+
+        Args:
+            tipo (str): Tipo a leer, o None para todos.
+            columnas (sequence): Columnas a decodificar; None son todas (los
+                campos, los derivados y "gama").
+            marca (str): Marca exacta.
+            gama (str): "Baja", "Media" o "Alta".
+            condiciones (list): Tuplas (campo, mínimo, máximo); None en un
+                límite significa sin límite.
+
+        Yields:
+            tuple: (tipo, dict columna -> valores) por grupo con filas que
+            cumplen. Los números vienen en array("d"), los textos y la gama
+            en listas de str.
+
+        Raises:
+            ValueError: Si algún grupo no tiene un campo filtrado o pedido.
+        """
+        for grupo, pendientes in self._recorrer(tipo, marca, gama, condiciones):
+            filas = self._seleccion(grupo, pendientes)
+            if filas is not None and not len(filas):
+                continue
+            nombres = grupo["columnas"] if columnas is None else columnas
+            yield grupo["tipo"], {campo: self._columna(grupo, campo, filas) for campo in nombres}
+
+    def leer_columnas(self, tipo, columnas=None, marca=None, gama=None, condiciones=()):
+        """Como leer() pero junta todos los grupos de un tipo.
+
+        Returns:
+            dict: Columna -> valores de todas las filas que cumplen.
+        """
+        resultado = None
+        for _, valores in self.leer(tipo, columnas, marca, gama, condiciones):
+            if resultado is None:
+                resultado = valores
+                continue
+            for campo, columna in valores.items():
+                resultado[campo].extend(columna)
+        if resultado is None:
+            nombres = columnas
+            if nombres is None:
+                grupo = next((grupo for grupo in self.grupos if grupo["tipo"] == tipo), None)
+                nombres = grupo["columnas"] if grupo is not None else ()
+            resultado = {campo: array("d") if self._es_numerica(tipo, campo) else [] for campo in nombres}
+        return resultado
+
+    def _es_numerica(self, tipo, campo):
+        for grupo in self.grupos:
+            if grupo["tipo"] == tipo and campo in grupo["columnas"]:
+                return grupo["columnas"][campo]["codificacion"] == "float64"
+        return False
+
+    def contar(self, tipo=None, marca=None, gama=None, condiciones=()):
+        """Número de filas que cumplen los filtros.
+
+        Los grupos que cumplen todos los filtros según sus estadísticas se
+        cuentan sin leer ninguna columna.
+        """
+        total = 0
+        for grupo, pendientes in self._recorrer(tipo, marca, gama, condiciones):
+            filas = self._seleccion(grupo, pendientes)
+            total += grupo["filas"] if filas is None else len(filas)
+        return total
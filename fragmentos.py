@@ -0,0 +1,680 @@
+"""Catálogo repartido por tipo y marca entre varios procesos.
+
+Un solo proceso con todo el catálogo queda limitado por el GIL y por su
+memoria. CatalogoFragmentado reparte los registros en particiones
+(tipo, crc32(marca) % particiones) y asigna cada partición a un fragmento:
+un proceso trabajador que guarda una TablaColumnar por partición. El proceso
+principal sólo conserva un directorio id -> partición y el número de filas
+de cada partición.
+
+    - Las altas se acumulan en tablas de espera por partición y se envían
+      al fragmento por lotes como columnas serializadas
+      (pipeline.empaquetar_bloque), no como objetos.
+    - obtener() va directo al fragmento que tiene el id.
+    - consultar(), contar(), estadisticas() y marcas() se envían a la vez a
+      todos los fragmentos involucrados (si se indica la marca, sólo al que
+      tiene su partición) y se juntan las respuestas.
+    - rebalancear() mueve particiones completas del fragmento más cargado al
+      menos cargado cuando la carga se aleja del promedio; se llama sola
+      después de cada lote si rebalanceo_automatico es verdadero.
+
+Todas las filas de una marca de un mismo tipo quedan en la misma partición,
+así que una marca que sola supera la carga promedio no se puede repartir.
+Como Catalogo, no hay bajas ni cambios de filas.
+
+Ejemplo:
+    with CatalogoFragmentado(fragmentos=4) as catalogo:
+        catalogo.agregar_valores("Lavadora", "L1", "LG", "W1", 8999, 18, 60, 12)
+        catalogo.obtener("L1")
+        catalogo.contar("Lavadora", gama="Alta")
+        catalogo.estadisticas(marca="LG").como_dict()
+"""
+
+import multiprocessing
+import os
+import zlib
+from types import SimpleNamespace
+
+from catalogo import ESQUEMAS, TablaColumnar, filtrar_filas, nombre_tipo
+from estadisticas import Agregado, Estadisticas
+from gama_vectorizada import GAMAS, codigos_gama, version_reglas
+from pipeline import desempaquetar_bloque, empaquetar_bloque
+
+PARTICIONES = 16
+TAMANO_LOTE = 20000
+UMBRAL_DESBALANCE = 1.25
+
+
+def particion_marca(marca, particiones=PARTICIONES):
+    """Número de partición de una marca dentro de su tipo.
+
+    Se usa crc32 y no hash() porque el hash de las cadenas cambia entre
+    procesos.
+    """
+    return zlib.crc32(marca.encode("utf-8")) % particiones
+
+
+class _CodigosFijos():
+    """Motor para Estadisticas.desde_catalogo con los códigos ya calculados."""
+
+    def __init__(self, codigos):
+        self.codigos = codigos
+
+    def codigos_tabla(self, tabla):
+        return self.codigos
+
+
+class Fragmento():
+    """Particiones que guarda un proceso trabajador.
+
+    Sus métodos se llaman por nombre desde CatalogoFragmentado; también se
+    puede usar directamente en el proceso actual.
+
+    Atributos:
+        tablas (dict): Partición -> TablaColumnar.
+        ubicacion (dict): Id -> (partición, fila).
+    """
+
+    def __init__(self):
+        self.tablas = {}
+        self.ubicacion = {}
+        self._gamas = {}
+
+    def anexar(self, bloques):
+        """Agrega al final de sus particiones los bloques de empaquetar_bloque().
+
+        Args:
+            bloques (list): Tuplas (partición, bloque).
+        """
+        for particion, bloque in bloques:
+            tabla = self.tablas.get(particion)
+            if tabla is None:
+                tabla = self.tablas[particion] = TablaColumnar(ESQUEMAS[bloque[0]])
+            inicio = len(tabla)
+            desempaquetar_bloque(bloque, tabla)
+            ids = tabla.columna("id")
+            for fila in range(inicio, len(tabla)):
+                self.ubicacion[ids[fila]] = (particion, fila)
+
+    def extraer(self, particiones):
+        """Quita particiones completas para moverlas a otro fragmento.
+
+        Returns:
+            list: Tuplas (partición, bloque) para anexar() en el destino.
+        """
+        bloques = []
+        for particion in particiones:
+            tabla = self.tablas.pop(particion, None)
+            if tabla is None:
+                continue
+            for id in tabla.columna("id"):
+                del self.ubicacion[id]
+            for clave in [clave for clave in self._gamas if clave[1] == particion]:
+                del self._gamas[clave]
+            bloques.append((particion, empaquetar_bloque(tabla, 0, len(tabla))))
+        return bloques
+
+    def obtener(self, ids):
+        """Valores de cada id en el orden del constructor.
+
+        Returns:
+            list: Tuplas (tipo, valores) en el orden de ids.
+        """
+        resultado = []
+        for id in ids:
+            particion, fila = self.ubicacion[id]
+            resultado.append(self._valores(self.tablas[particion], fila))
+        return resultado
+
+    def _valores(self, tabla, fila):
+        esquema = tabla.esquema
+        return esquema.nombre, tuple(tabla.valor(campo, fila) for campo in esquema.campos)
+
+    def _codigos(self, particion, reglas):
+        """Códigos de gama de una partición.
+
+        Se calculan una vez por tamaño de tabla y versión de las reglas: si
+        se modifica el conjunto de reglas_gama.json con ese nombre, los
+        códigos se vuelven a calcular.
+        """
+        tabla = self.tablas[particion]
+        vigente = (len(tabla), version_reglas(reglas))
+        guardada, codigos = self._gamas.get((reglas, particion), (None, None))
+        if guardada != vigente:
+            codigos = codigos_gama(tabla, reglas)
+            self._gamas[reglas, particion] = (vigente, codigos)
+        return codigos
+
+    def _filtrar(self, particion, marca, gama, condiciones, reglas):
+        filas = filtrar_filas(self.tablas[particion], marca, None, condiciones)
+        if gama is not None:
+            codigo = GAMAS.index(gama.capitalize())
+            codigos = self._codigos(particion, reglas)
+            filas = [fila for fila in filas if codigos[fila] == codigo]
+        return filas
+
+    def consultar(self, particiones, marca=None, gama=None, condiciones=(), reglas="U4"):
+        """Registros de las particiones indicadas que cumplen los filtros.
+
+        Los argumentos de filtro son los de catalogo.filtrar_filas().
+
+        Returns:
+            list: Tuplas (partición, lista de (tipo, valores)).
+        """
+        resultado = []
+        for particion in particiones:
+            if particion not in self.tablas:
+                continue
+            tabla = self.tablas[particion]
+            filas = self._filtrar(particion, marca, gama, condiciones, reglas)
+            if filas:
+                resultado.append((particion, [self._valores(tabla, fila) for fila in filas]))
+        return resultado
+
+    def contar(self, particiones, marca=None, gama=None, condiciones=(), reglas="U4"):
+        """Número de registros de las particiones indicadas que cumplen los filtros."""
+        return sum(len(self._filtrar(particion, marca, gama, condiciones, reglas))
+                   for particion in particiones if particion in self.tablas)
+
+    def agregados(self, particiones, marca=None, reglas="U4"):
+        """Agregados por (tipo, marca) de las particiones indicadas.
+
+        Returns:
+            dict: (tipo, marca) -> estadisticas.Agregado.
+        """
+        resultado = {}
+        for particion in particiones:
+            tabla = self.tablas.get(particion)
+            if not tabla:
+                continue
+            tipo = tabla.esquema.nombre
+            vista = SimpleNamespace(tablas={tipo: tabla})
+            estadisticas = Estadisticas.desde_catalogo(vista, _CodigosFijos(self._codigos(particion, reglas)))
+            for nombre, grupo in estadisticas.marcas(tipo).items():
+                if marca is not None and nombre != marca:
+                    continue
+                if (tipo, nombre) in resultado:
+                    resultado[tipo, nombre].fundir(grupo)
+                else:
+                    resultado[tipo, nombre] = grupo
+        return resultado
+
+    def tamanos(self):
+        """Filas por partición."""
+        return {particion: len(tabla) for particion, tabla in self.tablas.items()}
+
+
+def _atender(conexion):
+    """Ciclo del proceso trabajador: ejecuta (operación, argumentos) sobre su Fragmento."""
+    fragmento = Fragmento()
+    while True:
+        mensaje = conexion.recv()
+        if mensaje is None:
+            break
+        operacion, argumentos = mensaje
+        try:
+            respuesta = (True, getattr(fragmento, operacion)(*argumentos))
+        except Exception as error:
+            respuesta = (False, error)
+        conexion.send(respuesta)
+    conexion.close()
+
+
+class _Local():
+    """Fragmento en el proceso actual con la misma interfaz que la conexión."""
+
+    def __init__(self):
+        self.fragmento = Fragmento()
+        self.respuestas = []
+
+    def send(self, mensaje):
+        if mensaje is None:
+            return
+        operacion, argumentos = mensaje
+        try:
+            self.respuestas.append((True, getattr(self.fragmento, operacion)(*argumentos)))
+        except Exception as error:
+            self.respuestas.append((False, error))
+
+    def recv(self):
+        return self.respuestas.pop(0)
+
+    def close(self):
+        pass
+
+
+class CatalogoFragmentado():
+    """Catálogo columnar repartido en fragmentos por tipo y hash de la marca.
+
+    Atributos:
+        tipos (tuple): Tipos registrados al crear el catálogo, en orden.
+        particiones (int): Particiones por tipo.
+        asignacion (list): Partición -> número de fragmento.
+        filas (list): Partición -> filas guardadas (incluidas las que esperan envío).
+        directorio (dict): Id -> partición.
+    """
+
+    def __init__(self, fragmentos=None, particiones=PARTICIONES, tamano_lote=TAMANO_LOTE,
+                 procesos=True, rebalanceo_automatico=True, umbral=UMBRAL_DESBALANCE):
+        """Arranca los fragmentos.
+
+        Args:
+            fragmentos (int): Número de fragmentos. None usa os.cpu_count().
+            particiones (int): Particiones por tipo; más particiones permiten
+                un reparto más fino al rebalancear.
+            tamano_lote (int): Filas que se acumulan por fragmento antes de
+                enviarlas.
+            procesos (bool): Si es falso los fragmentos viven en el proceso
+                actual (útil para depurar y como base de comparación).
+            rebalanceo_automatico (bool): Si se rebalancea al enviar cada lote.
+            umbral (float): Carga máxima permitida de un fragmento como
+                múltiplo de la carga promedio.
+        """
+        if fragmentos is None:
+            fragmentos = os.cpu_count() or 1
+        if fragmentos < 1 or particiones < 1:
+            raise ValueError("Se necesita al menos un fragmento y una partición por tipo")
+        if tamano_lote < 1:
+            raise ValueError("El tamaño del lote debe ser al menos 1")
+        if umbral < 1:
+            raise ValueError("El umbral de desbalance debe ser al menos 1")
+        self.tipos = tuple(ESQUEMAS)
+        self.particiones = particiones
+        self.tamano_lote = tamano_lote
+        self.rebalanceo_automatico = rebalanceo_automatico
+        self.umbral = umbral
+        total = len(self.tipos) * particiones
+        self.asignacion = [particion % fragmentos for particion in range(total)]
+        self.filas = [0] * total
+        self.directorio = {}
+        self._posiciones = {tipo: posicion for posicion, tipo in enumerate(self.tipos)}
+        self._espera = {}
+        self._por_enviar = [0] * fragmentos
+        self._pendientes = [0] * fragmentos
+        self._procesos = []
+        self._conexiones = []
+        for _ in range(fragmentos):
+            if not procesos:
+                self._conexiones.append(_Local())
+                continue
+            propia, remota = multiprocessing.Pipe()
+            proceso = multiprocessing.Process(target=_atender, args=(remota,), daemon=True)
+            proceso.start()
+            remota.close()
+            self._procesos.append(proceso)
+            self._conexiones.append(propia)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def __len__(self):
+        return len(self.directorio)
+
+    def __contains__(self, id):
+        return id in self.directorio
+
+    @property
+    def fragmentos(self):
+        """Número de fragmentos."""
+        return len(self._conexiones)
+
+    def cerrar(self):
+        """Detiene los procesos trabajadores; sus datos se pierden."""
+        for conexion in self._conexiones:
+            try:
+                conexion.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            conexion.close()
+        for proceso in self._procesos:
+            proceso.join()
+        self._procesos = []
+        self._conexiones = []
+
+    def _particion(self, tipo, marca):
+        return self._posiciones[tipo] * self.particiones + particion_marca(marca, self.particiones)
+
+    def _tipo(self, particion):
+        return self.tipos[particion // self.particiones]
+
+    # Comunicación con los fragmentos
+
+    def _enviar(self, fragmento, operacion, *argumentos):
+        """Envía una operación sin esperar la respuesta."""
+        self._conexiones[fragmento].send((operacion, argumentos))
+        self._pendientes[fragmento] += 1
+
+    def _recibir(self, fragmento):
+        """Espera todas las respuestas pendientes de un fragmento y devuelve la última.
+
+        Raises:
+            Exception: La primera que haya lanzado una operación en el
+                fragmento; antes se leen todas las respuestas pendientes.
+        """
+        resultado = error = None
+        while self._pendientes[fragmento]:
+            self._pendientes[fragmento] -= 1
+            correcto, resultado = self._conexiones[fragmento].recv()
+            if not correcto and error is None:
+                error = resultado
+        if error is not None:
+            raise error
+        return resultado
+
+    def _repartir(self, operaciones):
+        """Envía una operación a varios fragmentos a la vez y junta las respuestas.
+
+        Args:
+            operaciones (dict): Fragmento -> (operación, argumentos...).
+
+        Returns:
+            dict: Fragmento -> respuesta.
+        """
+        for fragmento, (operacion, *argumentos) in operaciones.items():
+            self._recibir(fragmento)
+            self._enviar(fragmento, operacion, *argumentos)
+        respuestas = {}
+        error = None
+        for fragmento in operaciones:
+            try:
+                respuestas[fragmento] = self._recibir(fragmento)
+            except Exception as excepcion:
+                error = error or excepcion
+        if error is not None:
+            raise error
+        return respuestas
+
+    # Altas
+
+    def agregar(self, obj):
+        """Agrega un electrodoméstico (o una vista de fila).
+
+        Returns:
+            tuple: (tipo, partición) donde quedó el registro.
+        """
+        tipo = nombre_tipo(obj)
+        return self.agregar_valores(tipo, *(getattr(obj, campo) for campo in ESQUEMAS[tipo].campos))
+
+    def agregar_valores(self, tipo, *valores):
+        """Agrega un registro sin construir el objeto original.
+
+        El registro queda en espera y se envía a su fragmento con el resto de
+        su lote; las consultas envían antes lo que esté en espera.
+
+        Args:
+            tipo (str): Nombre del tipo.
+            *valores: Valores en el orden del constructor de la clase.
+
+        Returns:
+            tuple: (tipo, partición) donde quedó el registro.
+
+        Raises:
+            KeyError: Si el tipo no estaba registrado al crear el catálogo.
+            ValueError: Si el id ya existe.
+            TypeError: Si los valores no corresponden al esquema.
+        """
+        if tipo not in self._posiciones:
+            raise KeyError(f"Tipo desconocido: {tipo!r}")
+        esquema = ESQUEMAS[tipo]
+        if len(valores) != len(esquema.campos):
+            raise TypeError(f"{tipo} espera {len(esquema.campos)} valores, se recibieron {len(valores)}")
+        id, marca = valores[0], valores[1]
+        if id in self.directorio:
+            raise ValueError(f"Ya existe un electrodoméstico con id {id!r}")
+        particion = self._particion(tipo, marca)
+        tabla = self._espera.get(particion)
+        if tabla is None:
+            tabla = self._espera[particion] = TablaColumnar(esquema)
+        # La tabla de espera valida la fila completa antes de escribirla
+        tabla.agregar_valores(valores)
+        self.directorio[id] = particion
+        self.filas[particion] += 1
+        fragmento = self.asignacion[particion]
+        self._por_enviar[fragmento] += 1
+        if self._por_enviar[fragmento] >= self.tamano_lote:
+            self._enviar_lote(fragmento)
+            if self.rebalanceo_automatico and self.desbalance() > self.umbral:
+                self.rebalancear()
+        return tipo, particion
+
+    def agregar_catalogo(self, catalogo):
+        """Agrega todas las filas de un catalogo.Catalogo.
+
+        Returns:
+            int: Filas agregadas.
+        """
+        agregadas = 0
+        for tipo, tabla in catalogo.tablas.items():
+            campos = tabla.esquema.campos
+            for fila in range(len(tabla)):
+                self.agregar_valores(tipo, *[tabla.valor(campo, fila) for campo in campos])
+            agregadas += len(tabla)
+        self.vaciar()
+        return agregadas
+
+    def _enviar_lote(self, fragmento):
+        """Envía las tablas en espera de un fragmento.
+
+        Deja la respuesta pendiente: mientras el fragmento guarda el lote, el
+        proceso principal sigue llenando el siguiente.
+        """
+        particiones = [particion for particion in self._espera if self.asignacion[particion] == fragmento]
+        if not particiones:
+            return
+        bloques = []
+        for particion in particiones:
+            tabla = self._espera.pop(particion)
+            bloques.append((particion, empaquetar_bloque(tabla, 0, len(tabla))))
+        self._recibir(fragmento)
+        self._enviar(fragmento, "anexar", bloques)
+        self._por_enviar[fragmento] = 0
+
+    def vaciar(self):
+        """Envía todo lo que está en espera y confirma que los fragmentos lo guardaron."""
+        for fragmento in range(self.fragmentos):
+            self._enviar_lote(fragmento)
+        for fragmento in range(self.fragmentos):
+            self._recibir(fragmento)
+
+    # Consultas
+
+    def obtener(self, id):
+        """Devuelve el electrodoméstico con ese id, consultando sólo su fragmento.
+
+        Raises:
+            KeyError: Si no existe.
+        """
+        return self.obtener_varios([id])[0]
+
+    def obtener_varios(self, ids):
+        """Devuelve varios electrodomésticos, una petición por fragmento.
+
+        Returns:
+            list: Objetos en el mismo orden que ids.
+
+        Raises:
+            KeyError: Si alguno no existe.
+        """
+        por_fragmento = {}
+        for posicion, id in enumerate(ids):
+            fragmento = self.asignacion[self.directorio[id]]
+            por_fragmento.setdefault(fragmento, ([], []))
+            por_fragmento[fragmento][0].append(posicion)
+            por_fragmento[fragmento][1].append(id)
+        self._vaciar_fragmentos(por_fragmento)
+        respuestas = self._repartir({fragmento: ("obtener", pedidos)
+                                     for fragmento, (_, pedidos) in por_fragmento.items()})
+        resultado = [None] * len(ids)
+        for fragmento, (posiciones, _) in por_fragmento.items():
+            for posicion, (tipo, valores) in zip(posiciones, respuestas[fragmento]):
+                resultado[posicion] = ESQUEMAS[tipo].clase(*valores)
+        return resultado
+
+    def _vaciar_fragmentos(self, fragmentos):
+        for fragmento in fragmentos:
+            self._enviar_lote(fragmento)
+
+    def _destinos(self, tipo, marca):
+        """Particiones a revisar agrupadas por fragmento."""
+        tipos = self.tipos if tipo is None else (tipo,)
+        destinos = {}
+        for nombre in tipos:
+            if nombre not in self._posiciones:
+                raise KeyError(f"Tipo desconocido: {nombre!r}")
+            if marca is not None:
+                particiones = [self._particion(nombre, marca)]
+            else:
+                inicio = self._posiciones[nombre] * self.particiones
+                particiones = range(inicio, inicio + self.particiones)
+            for particion in particiones:
+                if self.filas[particion]:
+                    destinos.setdefault(self.asignacion[particion], []).append(particion)
+        self._vaciar_fragmentos(destinos)
+        return destinos
+
+    def consultar(self, tipo=None, marca=None, gama=None, condiciones=(), reglas="U4"):
+        """Electrodomésticos que cumplen los filtros.
+
+        Con marca se consulta sólo el fragmento de su partición; sin ella,
+        todos los fragmentos trabajan a la vez.
+
+        Args:
+            tipo (str): Tipo a consultar, o None para todos.
+            marca (str): Marca exacta.
+            gama (str): "Baja", "Media" o "Alta".
+            condiciones (list): Tuplas (campo, mínimo, máximo) como en
+                catalogo.filtrar_filas().
+            reglas (str): "U3", "U4" o un conjunto de reglas_gama.json.
+
+        Returns:
+            list: Objetos ordenados por partición y, dentro de cada una, por
+            orden de alta.
+        """
+        destinos = self._destinos(tipo, marca)
+        respuestas = self._repartir({fragmento: ("consultar", particiones, marca, gama, condiciones, reglas)
+                                     for fragmento, particiones in destinos.items()})
+        partes = sorted((parte for respuesta in respuestas.values() for parte in respuesta),
+                        key=lambda parte: parte[0])
+        return [ESQUEMAS[nombre].clase(*valores)
+                for _, registros in partes for nombre, valores in registros]
+
+    def contar(self, tipo=None, marca=None, gama=None, condiciones=(), reglas="U4"):
+        """Número de electrodomésticos que cumplen los filtros (ver consultar())."""
+        destinos = self._destinos(tipo, marca)
+        respuestas = self._repartir({fragmento: ("contar", particiones, marca, gama, condiciones, reglas)
+                                     for fragmento, particiones in destinos.items()})
+        return sum(respuestas.values())
+
+    def _agregados(self, tipo, marca, reglas):
+        destinos = self._destinos(tipo, marca)
+        respuestas = self._repartir({fragmento: ("agregados", particiones, marca, reglas)
+                                     for fragmento, particiones in destinos.items()})
+        return [item for respuesta in respuestas.values() for item in respuesta.items()]
+
+    def estadisticas(self, tipo=None, marca=None, reglas="U4"):
+        """Agregado de un tipo, una marca, ambos o todo el catálogo.
+
+        Cada fragmento calcula los agregados de sus particiones y aquí se
+        funden con Agregado.fundir().
+
+        Returns:
+            estadisticas.Agregado: Contadores del grupo (vacío si no hay artículos).
+        """
+        total = Agregado()
+        for _, grupo in self._agregados(tipo, marca, reglas):
+            total.fundir(grupo)
+        return total
+
+    def marcas(self, tipo=None, reglas="U4"):
+        """Agregado por marca, opcionalmente de un solo tipo.
+
+        Returns:
+            dict: Marca -> estadisticas.Agregado.
+        """
+        resultado = {}
+        for (_, marca), grupo in self._agregados(tipo, None, reglas):
+            if marca in resultado:
+                resultado[marca].fundir(grupo)
+            else:
+                resultado[marca] = grupo
+        return resultado
+
+    # Reparto de la carga
+
+    def cargas(self):
+        """Filas por fragmento."""
+        cargas = [0] * self.fragmentos
+        for particion, filas in enumerate(self.filas):
+            cargas[self.asignacion[particion]] += filas
+        return cargas
+
+    def desbalance(self):
+        """Carga del fragmento más cargado entre la carga promedio (1.0 es parejo)."""
+        cargas = self.cargas()
+        total = sum(cargas)
+        return max(cargas) * len(cargas) / total if total else 1.0
+
+    def _plan_rebalanceo(self):
+        """Movimientos (partición, origen, destino) que bajan la carga máxima.
+
+        En cada paso se pasa del fragmento más cargado al menos cargado la
+        partición cuyo tamaño queda más cerca de la mitad de la diferencia
+        entre los dos; cada movimiento reduce la suma de cuadrados de las
+        cargas, así que el ciclo termina.
+        """
+        cargas = self.cargas()
+        limite = self.umbral * sum(cargas) / len(cargas)
+        asignacion = list(self.asignacion)
+        movimientos = []
+        while True:
+            mayor = max(range(len(cargas)), key=cargas.__getitem__)
+            menor = min(range(len(cargas)), key=cargas.__getitem__)
+            if cargas[mayor] <= limite:
+                break
+            diferencia = cargas[mayor] - cargas[menor]
+            candidatas = [particion for particion, fragmento in enumerate(asignacion)
+                          if fragmento == mayor and 0 < self.filas[particion] < diferencia]
+            if not candidatas:
+                break
+            particion = max(candidatas, key=lambda p: min(self.filas[p], diferencia - self.filas[p]))
+            asignacion[particion] = menor
+            cargas[mayor] -= self.filas[particion]
+            cargas[menor] += self.filas[particion]
+            movimientos.append((particion, mayor, menor))
+        return movimientos
+
+    def rebalancear(self):
+        """Mueve particiones hasta que ningún fragmento pase del umbral.
+
+        Las particiones viajan completas como columnas serializadas: primero
+        todos los orígenes extraen a la vez y después todos los destinos
+        anexan a la vez.
+
+        Returns:
+            list: Movimientos (partición, origen, destino) realizados.
+        """
+        # Una partición puede moverse dos veces en el plan; sólo importan el
+        # primer origen y el último destino
+        finales = {}
+        for particion, origen, destino in self._plan_rebalanceo():
+            finales[particion] = (finales.get(particion, (origen,))[0], destino)
+        movimientos = [(particion, origen, destino)
+                       for particion, (origen, destino) in finales.items() if origen != destino]
+        if not movimientos:
+            return movimientos
+        self.vaciar()
+        por_origen = {}
+        for particion, origen, destino in movimientos:
+            por_origen.setdefault(origen, []).append(particion)
+            self.asignacion[particion] = destino
+        extraidos = self._repartir({origen: ("extraer", particiones)
+                                    for origen, particiones in por_origen.items()})
+        por_destino = {}
+        for bloques in extraidos.values():
+            for particion, bloque in bloques:
+                por_destino.setdefault(self.asignacion[particion], []).append((particion, bloque))
+        self._repartir({destino: ("anexar", bloques) for destino, bloques in por_destino.items()})
+        return movimientos
@@ -0,0 +1,222 @@
+"""Clasificación de gama por lotes sobre columnas completas.
+
+Cada tipo_gama() clasifica un solo objeto con ramas de Python. Las funciones
+de este módulo reciben columnas completas (por ejemplo todas las capacidades
+de carga y todos los ciclos de lavado) y devuelven las etiquetas
+"Baja"/"Media"/"Alta" en una sola pasada. Si NumPy está instalado se usa
+para evaluar las condiciones sobre los arreglos; si no, se usa un recorrido
+en Python puro con el mismo resultado.
+
+Las reglas son exactamente las de los métodos escalares. La Lavadora tiene
+dos variantes:
+    "U3": proyectoU3.py y U3.py, "Media" si capacidad<=15 o ciclos<=3.
+    "U4": proyectoU4.py, "Media" si capacidad<=15 y ciclos<=5.
+
+Donde se elige la clasificación con un nombre ("U3", "U4" o un conjunto de
+reglas_gama.json, como en la línea de comandos, los fragmentos y la
+exportación) se usan clasificador(), codigos_gama() y version_reglas().
+"""
+
+import os
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+GAMAS = ("Baja", "Media", "Alta")
+_GAMAS_NP = np.array(GAMAS, dtype=object) if np is not None else None
+VARIANTES = ("U3", "U4")
+# Tipo -> función que recibe una TablaColumnar y devuelve sus códigos; la
+# usan los tipos declarados en tipos.py
+CLASIFICADORES = {}
+
+BAJA, MEDIA, ALTA = 0, 1, 2
+
+
+def como_arreglo(columna):
+    """Convierte una columna a arreglo float64 sin copiar cuando es posible."""
+    if hasattr(columna, "typecode") and columna.typecode == "d":
+        return np.frombuffer(columna, dtype=np.float64)
+    if isinstance(columna, memoryview) and columna.format == "d":
+        return np.frombuffer(columna, dtype=np.float64)
+    return np.asarray(columna, dtype=np.float64)
+
+
+def _validar_variante(variante):
+    if variante not in VARIANTES:
+        raise ValueError(f"Variante desconocida: {variante!r}, use 'U3' o 'U4'")
+
+
+def etiquetas(codigos):
+    """Convierte códigos de gama (0, 1, 2) a etiquetas.
+
+    Args:
+        codigos: Secuencia o arreglo de códigos BAJA, MEDIA o ALTA.
+
+    Returns:
+        list: Lista de cadenas "Baja", "Media" o "Alta".
+    """
+    if np is not None and isinstance(codigos, np.ndarray):
+        return _GAMAS_NP.take(codigos).tolist()
+    return [GAMAS[codigo] for codigo in codigos]
+
+
+def codigos_lavadoras(capacidad_carga, ciclos_lavado, variante="U4"):
+    """Calcula los códigos de gama de un lote de lavadoras.
+
+    Args:
+        capacidad_carga: Columna de capacidades de carga en kg.
+        ciclos_lavado: Columna de ciclos de lavado.
+        variante (str): "U3" o "U4" (ver la documentación del módulo).
+
+    Returns:
+        Arreglo int8 de NumPy, o lista de int si NumPy no está disponible.
+    """
+    _validar_variante(variante)
+    if np is None:
+        if variante == "U3":
+            return [BAJA if c <= 10 and k <= 3 else MEDIA if c <= 15 or k <= 3 else ALTA
+                    for c, k in zip(capacidad_carga, ciclos_lavado)]
+        return [BAJA if c <= 10 and k <= 3 else MEDIA if c <= 15 and k <= 5 else ALTA
+                for c, k in zip(capacidad_carga, ciclos_lavado)]
+    carga = como_arreglo(capacidad_carga)
+    ciclos = como_arreglo(ciclos_lavado)
+    pocos_ciclos = ciclos <= 3
+    if variante == "U3":
+        media = (carga <= 15) | pocos_ciclos
+    else:
+        media = (carga <= 15) & (ciclos <= 5)
+    codigos = np.full(carga.shape, ALTA, dtype=np.int8)
+    codigos[media] = MEDIA
+    codigos[(carga <= 10) & pocos_ciclos] = BAJA
+    return codigos
+
+
+def codigos_refrigeradores(no_puertas, metros_cubicos):
+    """Calcula los códigos de gama de un lote de refrigeradores.
+
+    Args:
+        no_puertas: Columna con el número de puertas.
+        metros_cubicos: Columna con la capacidad en metros cúbicos.
+
+    Returns:
+        Arreglo int8 de NumPy, o lista de int si NumPy no está disponible.
+    """
+    if np is None:
+        return [BAJA if p == 1 and m <= 10 else MEDIA if p == 2 and m <= 13 else ALTA
+                for p, m in zip(no_puertas, metros_cubicos)]
+    puertas = como_arreglo(no_puertas)
+    metros = como_arreglo(metros_cubicos)
+    codigos = np.full(puertas.shape, ALTA, dtype=np.int8)
+    codigos[(puertas == 2) & (metros <= 13)] = MEDIA
+    codigos[(puertas == 1) & (metros <= 10)] = BAJA
+    return codigos
+
+
+def codigos_microondas(potencia):
+    """Calcula los códigos de gama de un lote de microondas.
+
+    Args:
+        potencia: Columna con la potencia en watts.
+
+    Returns:
+        Arreglo int8 de NumPy, o lista de int si NumPy no está disponible.
+    """
+    if np is None:
+        return [BAJA if p < 1000 else MEDIA if p <= 1500 else ALTA for p in potencia]
+    watts = como_arreglo(potencia)
+    codigos = np.full(watts.shape, ALTA, dtype=np.int8)
+    codigos[watts <= 1500] = MEDIA
+    codigos[watts < 1000] = BAJA
+    return codigos
+
+
+def gama_lavadoras(capacidad_carga, ciclos_lavado, variante="U4"):
+    """Etiquetas de gama de un lote de lavadoras (ver codigos_lavadoras)."""
+    return etiquetas(codigos_lavadoras(capacidad_carga, ciclos_lavado, variante))
+
+
+def gama_refrigeradores(no_puertas, metros_cubicos):
+    """Etiquetas de gama de un lote de refrigeradores."""
+    return etiquetas(codigos_refrigeradores(no_puertas, metros_cubicos))
+
+
+def gama_microondas(potencia):
+    """Etiquetas de gama de un lote de microondas."""
+    return etiquetas(codigos_microondas(potencia))
+
+
+def codigos_tabla(tabla, variante="U4"):
+    """Calcula los códigos de gama de todas las filas de una TablaColumnar.
+
+    Args:
+        tabla (catalogo.TablaColumnar): Tabla de un solo tipo.
+        variante (str): Variante de reglas para Lavadora.
+
+    Returns:
+        Arreglo o lista de códigos, uno por fila.
+    """
+    tipo = tabla.esquema.nombre
+    if tipo == "Lavadora":
+        return codigos_lavadoras(tabla.columna("capacidad_carga"),
+                                 tabla.columna("ciclos_lavado"), variante)
+    if tipo == "Refrigerador":
+        return codigos_refrigeradores(tabla.columna("no_puertas"),
+                                      tabla.columna("metros_cubicos"))
+    if tipo == "Microondas":
+        return codigos_microondas(tabla.columna("potencia"))
+    if tipo in CLASIFICADORES:
+        return CLASIFICADORES[tipo](tabla)
+    raise TypeError(f"No hay clasificación por lotes para {tipo}")
+
+
+def gama_tabla(tabla, variante="U4"):
+    """Etiquetas de gama de todas las filas de una TablaColumnar."""
+    return etiquetas(codigos_tabla(tabla, variante))
+
+
+def clasificador(reglas="U4"):
+    """Función tabla -> códigos de gama para un nombre de reglas.
+
+    Args:
+        reglas (str): "U3", "U4" o un conjunto de reglas_gama.json, que se
+            lee y compila una vez al llamar esta función.
+
+    Returns:
+        Función que recibe una TablaColumnar y devuelve sus códigos.
+
+    Raises:
+        ValueError: Si el archivo de reglas no tiene ese conjunto o alguna
+            regla es inválida.
+    """
+    if reglas in VARIANTES:
+        return lambda tabla: codigos_tabla(tabla, reglas)
+    from reglas_gama import RUTA_POR_DEFECTO, MotorReglas, cargar_reglas
+    motor = MotorReglas(RUTA_POR_DEFECTO, conjunto=reglas)
+    try:
+        motor.clasificadores = motor.cargar()
+    except KeyError:
+        disponibles = sorted(set(VARIANTES) | set(cargar_reglas(RUTA_POR_DEFECTO)))
+        raise ValueError(f"Conjunto de reglas desconocido: {reglas!r} "
+                         f"(disponibles: {', '.join(disponibles)})") from None
+    return motor.codigos_tabla
+
+
+def codigos_gama(tabla, reglas="U4"):
+    """Códigos de gama de una tabla con las reglas U3/U4 o un conjunto de reglas_gama.json."""
+    return clasificador(reglas)(tabla)
+
+
+def version_reglas(reglas="U4"):
+    """Valor que cambia cuando cambian las reglas con ese nombre.
+
+    Sirve como parte de la clave de los cachés de códigos: las variantes
+    U3/U4 están en el código y no cambian; un conjunto de reglas_gama.json
+    cambia cuando se modifica el archivo, así que su versión es la fecha de
+    modificación.
+    """
+    if reglas in VARIANTES:
+        return 0
+    from reglas_gama import RUTA_POR_DEFECTO
+    return os.stat(RUTA_POR_DEFECTO).st_mtime_ns
@@ -0,0 +1,226 @@
+"""Importación masiva de electrodomésticos desde archivos CSV o JSONL.
+
+El menú interactivo de U3.py crea un objeto a la vez con input(). Este
+módulo lee archivos de catálogo de cualquier tamaño por lotes, así que la
+memoria usada depende del tamaño del lote y no del archivo. Cada fila lleva
+una columna "tipo" (Lavadora, Refrigerador o Microondas) que decide qué
+clase se construye; el resto de las columnas son los argumentos del
+constructor por nombre:
+
+    tipo,id,marca,modelo,precio,capacidad_carga,consumo_agua,ciclos_lavado
+    Lavadora,8MWTW2224WJM,Whirlpool,8MWTW2224WJM,13999,22,15,12
+
+Los números se convierten y revisan por columna dentro de cada lote (ver
+validacion.py). Las filas con errores no detienen la importación: se
+escriben en un flujo de rechazos como JSON con el número de línea y el
+motivo, igual que el manejador de ValueError del menú muestra el error y
+sigue adelante.
+"""
+
+import csv
+import json
+import sys
+import time
+
+from catalogo import ESQUEMAS, buscar_tipo
+# convertir_numero se publica también aquí, donde estaba antes de validacion.py
+from validacion import convertir_numero, validar_columnas
+
+TAMANO_LOTE = 10000
+
+
+class ResumenImportacion():
+    """Contadores de una importación.
+
+    Atributos:
+        filas (int): Filas leídas.
+        aceptadas (int): Filas convertidas en electrodomésticos.
+        rechazadas (int): Filas enviadas al flujo de rechazos.
+        segundos (float): Duración total.
+    """
+
+    def __init__(self):
+        self.filas = 0
+        self.aceptadas = 0
+        self.rechazadas = 0
+        self.segundos = 0.0
+
+    @property
+    def filas_por_segundo(self):
+        """Velocidad de la importación en filas por segundo."""
+        return self.filas / self.segundos if self.segundos else 0.0
+
+    def __str__(self):
+        return (f"Filas leídas: {self.filas:,}\n"
+                f"Aceptadas: {self.aceptadas:,}\n"
+                f"Rechazadas: {self.rechazadas:,}\n"
+                f"Tiempo: {self.segundos:.2f} s\n"
+                f"Velocidad: {self.filas_por_segundo:,.0f} filas/s")
+
+
+def _detectar_formato(ruta):
+    if ruta.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if ruta.endswith(".csv"):
+        return "csv"
+    raise ValueError(f"No se reconoce el formato de {ruta!r}, use formato='csv' o 'jsonl'")
+
+
+def _filas_csv(archivo):
+    lector = csv.DictReader(archivo)
+    for fila in lector:
+        yield lector.line_num, fila, None
+
+
+def _filas_jsonl(archivo):
+    for linea, texto in enumerate(archivo, 1):
+        if not texto.strip():
+            continue
+        try:
+            fila = json.loads(texto)
+        except json.JSONDecodeError as error:
+            yield linea, texto.rstrip("\n"), f"JSON inválido: {error}"
+            continue
+        if not isinstance(fila, dict):
+            yield linea, fila, "cada línea debe ser un objeto JSON"
+            continue
+        yield linea, fila, None
+
+
+class Importador():
+    """Lector por lotes de archivos de catálogo.
+
+    Ejemplo:
+        catalogo = Catalogo()
+        with open("rechazos.jsonl", "w") as rechazos:
+            resumen = Importador(rechazos=rechazos).importar("catalogo.csv", catalogo.agregar)
+        print(resumen)
+    """
+
+    def __init__(self, tamano_lote=TAMANO_LOTE, rechazos=None):
+        """Configura el importador.
+
+        Args:
+            tamano_lote (int): Filas que se procesan juntas.
+            rechazos: Archivo (o cualquier objeto con write) donde se escribe
+                una línea JSON por cada fila rechazada. Si es None sólo se
+                cuentan.
+        """
+        if tamano_lote < 1:
+            raise ValueError("El tamaño del lote debe ser al menos 1")
+        self.tamano_lote = tamano_lote
+        self.rechazos = rechazos
+        self.resumen = ResumenImportacion()
+
+    def _rechazar(self, linea, fila, motivo):
+        self.resumen.rechazadas += 1
+        if self.rechazos is not None:
+            self.rechazos.write(json.dumps({"linea": linea, "error": motivo, "fila": fila},
+                                           ensure_ascii=False) + "\n")
+
+    def _procesar_lote(self, lote):
+        """Convierte un lote de filas crudas en objetos, agrupando por tipo.
+
+        Los objetos se devuelven en el mismo orden que las filas del archivo.
+        """
+        por_tipo = {}
+        for indice, (linea, fila, error) in enumerate(lote):
+            if error is not None:
+                self._rechazar(linea, fila, error)
+                continue
+            tipo = buscar_tipo(fila.get("tipo", ""))
+            if tipo is None:
+                self._rechazar(linea, fila, f"tipo desconocido: {fila.get('tipo')!r}")
+                continue
+            por_tipo.setdefault(tipo, []).append((indice, linea, fila))
+
+        objetos = [None] * len(lote)
+        for tipo, filas in por_tipo.items():
+            esquema = ESQUEMAS[tipo]
+            resultado = validar_columnas(tipo, {campo: [fila.get(campo) for _, _, fila in filas]
+                                                for campo in esquema.campos})
+            invalidas = resultado.invalidas()
+            for posicion in invalidas:
+                _, linea, fila = filas[posicion]
+                self._rechazar(linea, fila, resultado.motivo(posicion))
+            if invalidas:
+                filas = [filas[posicion] for posicion in resultado.validas()]
+            construidos = map(esquema.clase, *resultado.filtradas().values())
+            for (indice, _, _), objeto in zip(filas, construidos):
+                objetos[indice] = objeto
+        objetos = [objeto for objeto in objetos if objeto is not None]
+        self.resumen.aceptadas += len(objetos)
+        return objetos
+
+    def lotes(self, archivo, formato):
+        """Genera listas de electrodomésticos, un lote a la vez.
+
+        Args:
+            archivo: Archivo de texto abierto.
+            formato (str): "csv" o "jsonl".
+
+        Yields:
+            list: Electrodomésticos construidos a partir de un lote.
+        """
+        filas = _filas_csv(archivo) if formato == "csv" else _filas_jsonl(archivo)
+        lote = []
+        for fila in filas:
+            lote.append(fila)
+            self.resumen.filas += 1
+            if len(lote) == self.tamano_lote:
+                yield self._procesar_lote(lote)
+                lote = []
+        if lote:
+            yield self._procesar_lote(lote)
+
+    def importar(self, origen, destino, formato=None):
+        """Importa un archivo completo y entrega cada objeto a destino.
+
+        Args:
+            origen: Ruta del archivo o archivo de texto ya abierto.
+            destino (callable): Recibe cada electrodoméstico construido, por
+                ejemplo Catalogo.agregar.
+            formato (str): "csv" o "jsonl"; si se omite se deduce de la
+                extensión de la ruta.
+
+        Returns:
+            ResumenImportacion: Contadores y velocidad de esta importación;
+            cada llamada empieza un resumen nuevo en self.resumen.
+        """
+        self.resumen = ResumenImportacion()
+        inicio = time.perf_counter()
+        if isinstance(origen, str):
+            formato = formato or _detectar_formato(origen)
+            with open(origen, encoding="utf-8", newline="") as archivo:
+                self._consumir(archivo, formato, destino)
+        else:
+            if formato is None:
+                raise ValueError("Indique formato='csv' o 'jsonl' al leer de un archivo abierto")
+            self._consumir(origen, formato, destino)
+        self.resumen.segundos = time.perf_counter() - inicio
+        return self.resumen
+
+    def _consumir(self, archivo, formato, destino):
+        for lote in self.lotes(archivo, formato):
+            for objeto in lote:
+                destino(objeto)
+
+
+def importar(origen, destino, formato=None, tamano_lote=TAMANO_LOTE, rechazos=None):
+    """Atajo para Importador(tamano_lote, rechazos).importar(origen, destino, formato)."""
+    return Importador(tamano_lote, rechazos).importar(origen, destino, formato)
+
+
+if __name__ == "__main__":
+    from catalogo import Catalogo
+
+    if len(sys.argv) < 2:
+        print("Uso: python importador.py archivo.csv|archivo.jsonl [rechazos.jsonl]")
+        sys.exit(1)
+    catalogo = Catalogo()
+    salida = open(sys.argv[2], "w", encoding="utf-8") if len(sys.argv) > 2 else None
+    try:
+        print(importar(sys.argv[1], catalogo.agregar, rechazos=salida))
+    finally:
+        if salida is not None:
+            salida.close()
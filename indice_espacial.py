@@ -0,0 +1,386 @@
+"""Árboles k-d para consultas sobre varias especificaciones numéricas a la vez.
+
+ArbolKD es un árbol estático y balanceado: los puntos se guardan en columnas
+array("d") ordenadas de modo que cada subárbol ocupa un tramo contiguo, y
+cada nodo guarda la caja mínima que contiene a sus puntos. Una consulta de
+caja descarta los subárboles que quedan fuera y copia de golpe los que
+quedan completamente dentro.
+
+IndiceKD admite altas y bajas con el método logarítmico: las altas van a un
+búfer pequeño y, cuando se llena, se funden con los árboles de tamaño menor
+o igual en un solo árbol nuevo, así que nunca hay más de O(log n) árboles.
+Las bajas sólo marcan el punto como muerto; cuando la mitad están muertos se
+reconstruye todo.
+
+Ambos responden también los k vecinos más cercanos (distancia euclidiana):
+se visitan primero los nodos cuya caja está más cerca del punto y se
+descartan los que quedan más lejos que el k-ésimo mejor encontrado.
+
+Ejemplo:
+    indice = IndiceKD(3)
+    indice.insertar((54, 32.2, 43.3), "MH1596DIR")
+    indice.en_caja((0, 0, 0), (60, 40, 50))  # ["MH1596DIR"]
+    indice.vecinos((50, 30, 40), 1)         # [(5.25..., "MH1596DIR")]
+"""
+
+from array import array
+from heapq import heappush, heapreplace
+from math import sqrt
+
+HOJA = 32
+
+_INFINITO = float("inf")
+
+
+class ArbolKD():
+    """Árbol k-d estático.
+
+    Atributos:
+        coordenadas (list): Una columna array("d") por dimensión, en el orden
+            del árbol.
+        claves (list): Clave de cada punto en el mismo orden.
+        fichas (array): Número de inserción de cada punto; IndiceKD lo usa
+            para distinguir los puntos dados de baja.
+    """
+
+    def __init__(self, columnas, claves, fichas=None, hoja=HOJA):
+        """Construye el árbol.
+
+        Args:
+            columnas (list): Una secuencia de números por dimensión, todas del
+                mismo largo. No deben contener NaN.
+            claves (list): Clave de cada punto.
+            fichas (sequence): Número de inserción de cada punto; por
+                defecto su posición.
+            hoja (int): Máximo de puntos en un nodo hoja.
+        """
+        self.dimensiones = len(columnas)
+        self.hoja = max(1, hoja)
+        self._inferior = []
+        self._superior = []
+        self._tramos = []
+        self._hijos = []
+        orden = list(range(len(claves)))
+        if orden:
+            self._construir(columnas, orden, 0, len(orden), 0)
+        self.coordenadas = [array("d", map(columna.__getitem__, orden)) for columna in columnas]
+        self.claves = list(map(claves.__getitem__, orden))
+        self.fichas = array("q", orden if fichas is None else map(fichas.__getitem__, orden))
+
+    def __len__(self):
+        return len(self.claves)
+
+    def _construir(self, columnas, orden, inicio, fin, profundidad):
+        """Ordena orden[inicio:fin] por la dimensión de corte y crea el nodo."""
+        nodo = len(self._tramos)
+        self._tramos.append((inicio, fin))
+        self._hijos.append(None)
+        self._inferior.append(None)
+        self._superior.append(None)
+        if fin - inicio <= self.hoja:
+            tramo = orden[inicio:fin]
+            valores = [[columna[i] for i in tramo] for columna in columnas]
+            self._inferior[nodo] = tuple(map(min, valores))
+            self._superior[nodo] = tuple(map(max, valores))
+            return nodo
+        eje = columnas[profundidad % len(columnas)]
+        orden[inicio:fin] = sorted(orden[inicio:fin], key=eje.__getitem__)
+        mitad = (inicio + fin) // 2
+        izquierdo = self._construir(columnas, orden, inicio, mitad, profundidad + 1)
+        derecho = self._construir(columnas, orden, mitad, fin, profundidad + 1)
+        self._hijos[nodo] = (izquierdo, derecho)
+        # La caja del nodo es la unión de las cajas de sus hijos
+        self._inferior[nodo] = tuple(map(min, self._inferior[izquierdo], self._inferior[derecho]))
+        self._superior[nodo] = tuple(map(max, self._superior[izquierdo], self._superior[derecho]))
+        return nodo
+
+    def en_caja(self, inferior, superior, vivas=None):
+        """Claves de los puntos con inferior[j] <= punto[j] <= superior[j].
+
+        Args:
+            inferior (tuple): Límite inferior por dimensión (-inf si no hay).
+            superior (tuple): Límite superior por dimensión (inf si no hay).
+            vivas: Si se indica, sólo se devuelven los puntos cuya ficha
+                está en este conjunto o diccionario.
+
+        Returns:
+            list: Claves encontradas, en el orden del árbol.
+        """
+        encontradas = []
+        if not self.claves:
+            return encontradas
+        claves = self.claves
+        fichas = self.fichas
+        coordenadas = self.coordenadas
+        limites = list(zip(inferior, superior))
+        pila = [0]
+        while pila:
+            nodo = pila.pop()
+            minimos = self._inferior[nodo]
+            maximos = self._superior[nodo]
+            if any(alto < bajo or minimo > tope
+                   for (bajo, tope), minimo, alto in zip(limites, minimos, maximos)):
+                continue
+            inicio, fin = self._tramos[nodo]
+            if all(bajo <= minimo and alto <= tope
+                   for (bajo, tope), minimo, alto in zip(limites, minimos, maximos)):
+                if vivas is None:
+                    encontradas.extend(claves[inicio:fin])
+                else:
+                    encontradas.extend(claves[i] for i in range(inicio, fin) if fichas[i] in vivas)
+                continue
+            hijos = self._hijos[nodo]
+            if hijos is not None:
+                pila.extend(hijos)
+                continue
+            # En la hoja sólo se revisan las dimensiones que la caja corta
+            candidatas = range(inicio, fin)
+            for columna, (bajo, tope), minimo, alto in zip(coordenadas, limites, minimos, maximos):
+                if bajo > minimo or alto > tope:
+                    candidatas = [i for i in candidatas if bajo <= columna[i] <= tope]
+            if vivas is not None:
+                candidatas = [i for i in candidatas if fichas[i] in vivas]
+            encontradas.extend(map(claves.__getitem__, candidatas))
+        return encontradas
+
+    def _distancia_caja(self, nodo, punto):
+        """Distancia al cuadrado del punto a la caja de un nodo."""
+        total = 0.0
+        for valor, bajo, alto in zip(punto, self._inferior[nodo], self._superior[nodo]):
+            if valor < bajo:
+                total += (bajo - valor) ** 2
+            elif valor > alto:
+                total += (valor - alto) ** 2
+        return total
+
+    def vecinos(self, punto, k, mejores, vivas=None, holgura=1.0):
+        """Agrega a mejores los puntos del árbol más cercanos al punto.
+
+        Args:
+            punto (tuple): Coordenadas de la consulta.
+            k (int): Cantidad de vecinos buscados.
+            mejores (list): Montículo de (-distancia², ficha, clave) con a lo
+                más k elementos; se comparte entre árboles para que cada uno
+                pode con lo que ya encontraron los anteriores.
+            vivas: Si se indica, sólo se consideran los puntos cuya ficha
+                está en este conjunto o diccionario.
+            holgura (float): (1 + epsilon)² para una búsqueda aproximada: un
+                nodo se descarta si su caja está a más de peor / holgura.
+                Con 1.0 el resultado es exacto.
+        """
+        if not self.claves or k <= 0:
+            return mejores
+        claves = self.claves
+        fichas = self.fichas
+        coordenadas = self.coordenadas
+        pila = [(self._distancia_caja(0, punto), 0)]
+        while pila:
+            cercania, nodo = pila.pop()
+            if len(mejores) == k and cercania * holgura >= -mejores[0][0]:
+                continue
+            hijos = self._hijos[nodo]
+            if hijos is not None:
+                izquierdo, derecho = hijos
+                distancia_izquierdo = self._distancia_caja(izquierdo, punto)
+                distancia_derecho = self._distancia_caja(derecho, punto)
+                # El más cercano va al final para visitarlo primero
+                if distancia_izquierdo <= distancia_derecho:
+                    pila.append((distancia_derecho, derecho))
+                    pila.append((distancia_izquierdo, izquierdo))
+                else:
+                    pila.append((distancia_izquierdo, izquierdo))
+                    pila.append((distancia_derecho, derecho))
+                continue
+            inicio, fin = self._tramos[nodo]
+            distancias = [0.0] * (fin - inicio)
+            for columna, valor in zip(coordenadas, punto):
+                distancias = [suma + (coordenada - valor) ** 2
+                              for suma, coordenada in zip(distancias, columna[inicio:fin])]
+            for i, distancia in enumerate(distancias, inicio):
+                if len(mejores) == k and distancia >= -mejores[0][0]:
+                    continue
+                if vivas is not None and fichas[i] not in vivas:
+                    continue
+                if len(mejores) < k:
+                    heappush(mejores, (-distancia, fichas[i], claves[i]))
+                else:
+                    heapreplace(mejores, (-distancia, fichas[i], claves[i]))
+        return mejores
+
+
+class IndiceKD():
+    """Índice k-d dinámico con altas, bajas y consultas de caja.
+
+    Cada clave puede estar a lo más una vez; insertar una clave existente
+    reemplaza su punto.
+    """
+
+    def __init__(self, dimensiones, hoja=HOJA):
+        """Crea un índice vacío.
+
+        Args:
+            dimensiones (int): Número de coordenadas de cada punto.
+            hoja (int): Máximo de puntos por hoja; también es el tamaño del
+                búfer de altas.
+        """
+        self.dimensiones = dimensiones
+        self.hoja = hoja
+        self.arboles = []
+        self._bufer = []
+        self._vivos = {}
+        self._fichas = {}
+        self._siguiente = 0
+        self._muertos = 0
+
+    def __len__(self):
+        return len(self._fichas)
+
+    def __contains__(self, clave):
+        return clave in self._fichas
+
+    @classmethod
+    def desde_columnas(cls, columnas, claves, hoja=HOJA):
+        """Construye el índice de una vez con un solo árbol.
+
+        Args:
+            columnas (list): Una secuencia de números por dimensión.
+            claves (list): Clave de cada punto, sin repetir.
+        """
+        indice = cls(len(columnas), hoja)
+        fichas = range(len(claves))
+        indice._vivos = dict(zip(fichas, claves))
+        indice._fichas = dict(zip(claves, fichas))
+        indice._siguiente = len(claves)
+        if claves:
+            indice.arboles.append(ArbolKD(columnas, claves, hoja=hoja))
+        return indice
+
+    def insertar(self, punto, clave):
+        """Agrega un punto, o lo reemplaza si la clave ya existe."""
+        if len(punto) != self.dimensiones:
+            raise ValueError(f"Se esperaban {self.dimensiones} coordenadas, se recibieron {len(punto)}")
+        if clave in self._fichas:
+            self.eliminar(clave)
+        ficha = self._siguiente
+        self._siguiente += 1
+        self._vivos[ficha] = clave
+        self._fichas[clave] = ficha
+        self._bufer.append((tuple(punto), clave, ficha))
+        if len(self._bufer) >= self.hoja:
+            self._fundir()
+
+    def eliminar(self, clave):
+        """Quita el punto de una clave.
+
+        Raises:
+            KeyError: Si la clave no está en el índice.
+        """
+        ficha = self._fichas.pop(clave)
+        del self._vivos[ficha]
+        self._muertos += 1
+        if self._muertos > len(self._fichas):
+            self.reconstruir()
+
+    def _puntos_vivos(self, arboles, bufer):
+        columnas = [[] for _ in range(self.dimensiones)]
+        claves = []
+        fichas = []
+        vivos = self._vivos
+        for arbol in arboles:
+            for i, ficha in enumerate(arbol.fichas):
+                if ficha in vivos:
+                    claves.append(arbol.claves[i])
+                    fichas.append(ficha)
+                    for columna, coordenadas in zip(columnas, arbol.coordenadas):
+                        columna.append(coordenadas[i])
+        for punto, clave, ficha in bufer:
+            if ficha in vivos:
+                claves.append(clave)
+                fichas.append(ficha)
+                for columna, valor in zip(columnas, punto):
+                    columna.append(valor)
+        return columnas, claves, fichas
+
+    def _fundir(self):
+        """Vacía el búfer en un árbol nuevo, fundiendo los árboles pequeños."""
+        tamano = len(self._bufer)
+        fundidos = []
+        while self.arboles and len(self.arboles[-1]) <= tamano:
+            arbol = self.arboles.pop()
+            tamano += len(arbol)
+            fundidos.append(arbol)
+        columnas, claves, fichas = self._puntos_vivos(fundidos, self._bufer)
+        self._muertos -= tamano - len(claves)
+        self._bufer = []
+        if claves:
+            self.arboles.append(ArbolKD(columnas, claves, fichas, self.hoja))
+
+    def reconstruir(self):
+        """Reconstruye un solo árbol con los puntos vivos."""
+        columnas, claves, fichas = self._puntos_vivos(self.arboles, self._bufer)
+        self.arboles = [ArbolKD(columnas, claves, fichas, self.hoja)] if claves else []
+        self._bufer = []
+        self._muertos = 0
+
+    def en_caja(self, inferior=None, superior=None):
+        """Claves de los puntos dentro de la caja [inferior, superior].
+
+        Args:
+            inferior (tuple): Límites inferiores; None en el argumento o en
+                una coordenada significa sin límite.
+            superior (tuple): Límites superiores, igual que inferior.
+
+        Returns:
+            list: Claves encontradas, sin orden particular.
+        """
+        inferior = tuple(-_INFINITO if valor is None else valor
+                         for valor in (inferior or (None,) * self.dimensiones))
+        superior = tuple(_INFINITO if valor is None else valor
+                         for valor in (superior or (None,) * self.dimensiones))
+        # Mientras no haya bajas pendientes no hace falta revisar cada ficha
+        vivas = self._vivos if self._muertos else None
+        encontradas = []
+        for arbol in self.arboles:
+            encontradas.extend(arbol.en_caja(inferior, superior, vivas))
+        for punto, clave, ficha in self._bufer:
+            if ficha in self._vivos and all(bajo <= valor <= tope for valor, bajo, tope
+                                            in zip(punto, inferior, superior)):
+                encontradas.append(clave)
+        return encontradas
+
+    def vecinos(self, punto, k=5, epsilon=0.0, excluir=None):
+        """Los k puntos más cercanos a un punto.
+
+        Args:
+            punto (tuple): Coordenadas de la consulta.
+            k (int): Cantidad de vecinos.
+            epsilon (float): Con 0 el resultado es exacto. Con epsilon > 0
+                cada vecino devuelto está a lo más (1 + epsilon) veces más
+                lejos que el verdadero de su posición, a cambio de visitar
+                menos nodos.
+            excluir: Clave que no se debe devolver (por ejemplo la del
+                propio punto de consulta).
+
+        Returns:
+            list: Tuplas (distancia, clave) de la más cercana a la más lejana.
+        """
+        if len(punto) != self.dimensiones:
+            raise ValueError(f"Se esperaban {self.dimensiones} coordenadas, se recibieron {len(punto)}")
+        if excluir is not None and excluir in self._fichas:
+            # Se pide uno más y se descarta la clave excluida
+            return [vecino for vecino in self.vecinos(punto, k + 1, epsilon)
+                    if vecino[1] != excluir][:k]
+        vivas = self._vivos if self._muertos else None
+        holgura = (1.0 + epsilon) ** 2
+        mejores = []
+        for arbol in self.arboles:
+            arbol.vecinos(punto, k, mejores, vivas, holgura)
+        for otro, clave, ficha in self._bufer:
+            if ficha not in self._vivos:
+                continue
+            distancia = sum((a - b) ** 2 for a, b in zip(otro, punto))
+            if len(mejores) < k:
+                heappush(mejores, (-distancia, ficha, clave))
+            elif distancia < -mejores[0][0]:
+                heapreplace(mejores, (-distancia, ficha, clave))
+        return [(sqrt(-distancia), clave) for distancia, _, clave in sorted(mejores, reverse=True)]
@@ -0,0 +1,278 @@
+"""Instantáneas binarias del catálogo con carga por memoria mapeada.
+
+Formato (versión 2, little endian):
+
+    cabecera     "ELEC", versión u16, reservado u16, posición u64 y largo
+                 u64 del directorio
+    secciones    alineadas a 8 bytes:
+                   - por tipo: una columna float64 por campo numérico y por
+                     campo derivado (ancho, alto y profundidad de
+                     Microondas), la máscara de enteros y una columna uint32
+                     de códigos por campo de texto
+                   - tabla de cadenas: desplazamientos uint64 (n + 1) y los
+                     textos UTF-8 concatenados
+    directorio   JSON en UTF-8 al final del archivo con la posición y el
+                 tamaño de cada sección
+
+Cada texto (marca, modelo, medidas, id) se guarda una sola vez en la tabla
+de cadenas y las columnas sólo guardan su código. cargar() mapea el archivo
+con mmap y monta las columnas como memoryview sin copiar nada, así que el
+arranque es casi inmediato y varios procesos que cargan el mismo archivo
+comparten las mismas páginas de sólo lectura. Las cadenas se decodifican
+la primera vez que se leen. En un equipo big endian las columnas se
+invierten al guardar y al cargar se copian invertidas, así que ahí la
+carga no es sin copia.
+
+Versiones:
+    1   sin columnas derivadas; al cargarla se recalculan.
+    2   agrega las columnas derivadas ("derivados" en el directorio).
+Un archivo con una versión que este lector no conoce se rechaza.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from cadenas import Diccionario
+from catalogo import ESQUEMAS, Catalogo, TablaColumnar
+
+MAGIA = b"ELEC"
+VERSION = 2
+# Versiones que cargar() sabe leer
+VERSIONES = (1, 2)
+# magia, versión, reservado, posición y largo del directorio
+_CABECERA = struct.Struct("<4sHHQQ")
+_FORMATOS_MASCARA = {1: "B", 2: "H", 4: "I", 8: "Q"}
+# Las columnas se guardan little endian; en un equipo big endian se invierten
+_INVERTIR = sys.byteorder == "big"
+
+
+def _alinear(posicion):
+    return (posicion + 7) & ~7
+
+
+def _little_endian(columna, formato):
+    """Bytes de una columna numérica en orden little endian."""
+    datos = bytes(columna)
+    if not _INVERTIR or formato in "bB":
+        return datos
+    copia = array(formato, datos)
+    copia.byteswap()
+    return copia.tobytes()
+
+
+def _desde_little_endian(datos, formato):
+    """Vista en orden nativo de una sección little endian."""
+    if not _INVERTIR or formato in "bB":
+        return datos.cast(formato)
+    copia = array(formato, bytes(datos))
+    copia.byteswap()
+    return memoryview(copia)
+
+
+class TablaCadenas():
+    """Tabla de cadenas sobre memoria mapeada con decodificación perezosa."""
+
+    def __init__(self, desplazamientos, datos):
+        """
+        Args:
+            desplazamientos (memoryview): uint64 con n + 1 posiciones.
+            datos (memoryview): Bytes UTF-8 de todas las cadenas.
+        """
+        self.desplazamientos = desplazamientos
+        self.datos = datos
+        self._decodificadas = [None] * (len(desplazamientos) - 1)
+
+    def __len__(self):
+        return len(self._decodificadas)
+
+    def __getitem__(self, codigo):
+        cadena = self._decodificadas[codigo]
+        if cadena is None:
+            inicio = self.desplazamientos[codigo]
+            fin = self.desplazamientos[codigo + 1]
+            cadena = self._decodificadas[codigo] = str(self.datos[inicio:fin], "utf-8")
+        return cadena
+
+
+class ColumnaTexto():
+    """Columna de texto de sólo lectura: códigos uint32 más la tabla de cadenas."""
+
+    def __init__(self, codigos, cadenas):
+        self.codigos = codigos
+        self.cadenas = cadenas
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def __getitem__(self, posicion):
+        if isinstance(posicion, slice):
+            cadenas = self.cadenas
+            return [cadenas[codigo] for codigo in self.codigos[posicion]]
+        return self.cadenas[self.codigos[posicion]]
+
+    def __iter__(self):
+        cadenas = self.cadenas
+        for codigo in self.codigos:
+            yield cadenas[codigo]
+
+
+def guardar(catalogo, ruta):
+    """Escribe una instantánea del catálogo.
+
+    El archivo se escribe primero con otro nombre y luego se renombra, así
+    que un lector nunca ve una instantánea a medias; si algo falla, el
+    archivo temporal se borra.
+
+    Args:
+        catalogo (catalogo.Catalogo): Catálogo a guardar.
+        ruta (str): Ruta del archivo destino.
+
+    Returns:
+        int: Bytes escritos.
+    """
+    temporal = f"{ruta}.tmp"
+    try:
+        total = _escribir(catalogo, temporal)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    return total
+
+
+def _escribir(catalogo, temporal):
+    """Escribe la instantánea completa en el archivo temporal.
+
+    Returns:
+        int: Bytes escritos.
+    """
+    codigos_cadena = {}
+    traducciones = {}
+    ubicaciones = []
+    directorio = {"tablas": {}, "secciones": ubicaciones}
+
+    with open(temporal, "wb") as archivo:
+        archivo.write(b"\0" * _CABECERA.size)
+
+        def seccion(datos):
+            archivo.write(b"\0" * (_alinear(archivo.tell()) - archivo.tell()))
+            ubicaciones.append([archivo.tell(), len(datos)])
+            archivo.write(datos)
+            return len(ubicaciones) - 1
+
+        for tipo, tabla in catalogo.tablas.items():
+            tamano_mascara = tabla.enteros.itemsize
+            enteros = _little_endian(tabla.enteros, _FORMATOS_MASCARA[tamano_mascara])
+            entrada = {"filas": len(tabla), "numeros": {}, "textos": {}, "derivados": {},
+                       "enteros": [tamano_mascara, seccion(enteros)]}
+            for campo in tabla.esquema.numeros:
+                entrada["numeros"][campo] = seccion(_little_endian(tabla.numeros[campo], "d"))
+            for campo, columna in tabla.derivados.items():
+                entrada["derivados"][campo] = seccion(_little_endian(columna, "d"))
+            for campo in tabla.esquema.textos:
+                columna = tabla.textos[campo]
+                diccionario = getattr(columna, "cadenas", None)
+                if isinstance(diccionario, Diccionario):
+                    # Columna ya codificada: basta traducir cada código del
+                    # diccionario una vez en lugar de buscar cada fila
+                    traduccion = traducciones.get(id(diccionario))
+                    if traduccion is None or len(traduccion) < len(diccionario):
+                        traduccion = traducciones[id(diccionario)] = array("I", (
+                            codigos_cadena.setdefault(valor, len(codigos_cadena))
+                            for valor in diccionario.valores))
+                    codigos = array("I", map(traduccion.__getitem__, columna.codigos))
+                else:
+                    codigos = array("I", (codigos_cadena.setdefault(valor, len(codigos_cadena))
+                                          for valor in columna))
+                entrada["textos"][campo] = seccion(_little_endian(codigos, "I"))
+            directorio["tablas"][tipo] = entrada
+
+        codificadas = [cadena.encode("utf-8") for cadena in codigos_cadena]
+        desplazamientos = array("Q", [0])
+        for codificada in codificadas:
+            desplazamientos.append(desplazamientos[-1] + len(codificada))
+        directorio["cadenas"] = [seccion(_little_endian(desplazamientos, "Q")),
+                                 seccion(b"".join(codificadas))]
+
+        codificado = json.dumps(directorio).encode("utf-8")
+        posicion = archivo.tell()
+        archivo.write(codificado)
+        total = archivo.tell()
+        archivo.seek(0)
+        archivo.write(_CABECERA.pack(MAGIA, VERSION, 0, posicion, len(codificado)))
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    return total
+
+
+def cargar(ruta, copiar=False):
+    """Carga una instantánea como Catalogo.
+
+    Args:
+        ruta (str): Archivo de instantánea.
+        copiar (bool): Si es False (por defecto) las columnas son vistas de
+            sólo lectura sobre el archivo mapeado. Si es True se copian a
+            arreglos normales y el catálogo se puede modificar.
+
+    Returns:
+        catalogo.Catalogo: Catálogo con los datos de la instantánea.
+
+    Raises:
+        ValueError: Si el archivo no es una instantánea o su versión no es
+            compatible.
+    """
+    with open(ruta, "rb") as archivo:
+        mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+    memoria = memoryview(mapa)
+    if len(memoria) < _CABECERA.size:
+        raise ValueError(f"{ruta!r} no es una instantánea del catálogo")
+    magia, version, _, posicion, largo = _CABECERA.unpack_from(memoria)
+    if magia != MAGIA:
+        raise ValueError(f"{ruta!r} no es una instantánea del catálogo")
+    if version not in VERSIONES:
+        raise ValueError(f"Versión de instantánea no soportada: {version}")
+    directorio = json.loads(str(memoria[posicion:posicion + largo], "utf-8"))
+    ubicaciones = directorio["secciones"]
+
+    def seccion(indice, formato):
+        inicio, tamano = ubicaciones[indice]
+        return _desde_little_endian(memoria[inicio:inicio + tamano], formato)
+
+    desplazamientos, datos = directorio["cadenas"]
+    cadenas = TablaCadenas(seccion(desplazamientos, "Q"), seccion(datos, "B"))
+
+    catalogo = Catalogo()
+    for tipo, entrada in directorio["tablas"].items():
+        esquema = ESQUEMAS[tipo]
+        tamano_mascara, indice_mascara = entrada["enteros"]
+        enteros = seccion(indice_mascara, _FORMATOS_MASCARA[tamano_mascara])
+        numeros = {campo: seccion(indice, "d") for campo, indice in entrada["numeros"].items()}
+        textos = {campo: ColumnaTexto(seccion(indice, "I"), cadenas)
+                  for campo, indice in entrada["textos"].items()}
+        # Las instantáneas de la versión 1 no traen los campos derivados
+        derivados = None
+        if version >= 2:
+            derivados = {campo: seccion(indice, "d") for campo, indice in entrada["derivados"].items()}
+        if not copiar:
+            catalogo.tablas[tipo] = TablaColumnar.desde_columnas(esquema, numeros, textos, enteros,
+                                                                 derivados)
+            continue
+        tabla = catalogo.tablas[tipo]
+        if tabla.enteros.itemsize != tamano_mascara:
+            raise ValueError(f"Máscara de enteros incompatible para {tipo}")
+        tabla.enteros.frombytes(enteros.cast("B"))
+        for campo, columna in numeros.items():
+            tabla.numeros[campo].frombytes(columna.cast("B"))
+        for campo, columna in textos.items():
+            tabla.textos[campo].extend(columna)
+        if derivados is None:
+            tabla.calcular_derivados()
+        else:
+            for campo, columna in derivados.items():
+                tabla.derivados[campo].frombytes(columna.cast("B"))
+    return catalogo
@@ -0,0 +1,214 @@
+"""Instrumentación opcional de __init__, tipo_gama y __str__ por clase.
+
+Al activarse, Instrumentacion reemplaza los métodos en las propias clases
+(Lavadora.tipo_gama = envoltura) y al desactivarse vuelve a poner los
+originales. Mientras está apagada el código corre exactamente igual que
+antes: no hay ninguna bandera que revisar en cada llamada.
+
+Por cada clase y método se registran:
+    - llamadas y tiempo total,
+    - un histograma de latencia con cubetas fijas (en nanosegundos),
+    - bloques de memoria netos por llamada: sys.getallocatedblocks() antes
+      y después de una de cada `muestreo` llamadas, porque medir cada
+      llamada cuesta más que el propio método.
+
+Los resultados se exportan como texto de Prometheus o como JSON.
+
+Ejemplo:
+    with Instrumentacion() as medicion:
+        catalogo_de_prueba()
+    print(medicion.como_prometheus())
+"""
+
+import json
+import sys
+import time
+from bisect import bisect_left
+from functools import wraps
+
+from proyectoU4 import Lavadora, Microondas, Refrigerador
+
+CLASES = (Lavadora, Refrigerador, Microondas)
+METODOS = ("__init__", "tipo_gama", "__str__")
+# Límites superiores de las cubetas en nanosegundos; la última es +Inf
+LIMITES_NS = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 100000, 1000000, 10000000)
+MUESTREO = 256
+
+
+class Medicion():
+    """Contadores de un método de una clase."""
+    __slots__ = ("clase", "metodo", "llamadas", "total_ns", "cubetas", "muestras", "bloques")
+
+    def __init__(self, clase, metodo):
+        self.clase = clase
+        self.metodo = metodo
+        self.llamadas = 0
+        self.total_ns = 0
+        self.cubetas = [0] * (len(LIMITES_NS) + 1)
+        self.muestras = 0
+        self.bloques = 0
+
+    @property
+    def bloques_por_llamada(self):
+        """Bloques netos por llamada estimados con las muestras, o None."""
+        return self.bloques / self.muestras if self.muestras else None
+
+    def como_dict(self):
+        return {"clase": self.clase, "metodo": self.metodo, "llamadas": self.llamadas,
+                "total_ns": self.total_ns,
+                "promedio_ns": self.total_ns / self.llamadas if self.llamadas else None,
+                "cubetas": dict(zip([str(limite) for limite in LIMITES_NS] + ["+Inf"], self.cubetas)),
+                "bloques_por_llamada": self.bloques_por_llamada}
+
+
+class Instrumentacion():
+    """Instala y retira envolturas de medición en las clases de electrodomésticos.
+
+    Si mientras está activa alguien más reemplaza el método (por ejemplo
+    reglas_gama.MotorReglas.instalar), desactivar() no lo toca.
+    """
+
+    def __init__(self, clases=CLASES, metodos=METODOS, muestreo=MUESTREO):
+        """Prepara la instrumentación sin activarla.
+
+        Args:
+            clases (tuple): Clases a instrumentar.
+            metodos (tuple): Nombres de los métodos a medir en cada clase.
+            muestreo (int): Se mide la memoria en una de cada tantas llamadas;
+                0 para no medirla.
+        """
+        self.clases = tuple(clases)
+        self.metodos = tuple(metodos)
+        self.muestreo = muestreo
+        self.mediciones = {(clase.__name__, metodo): Medicion(clase.__name__, metodo)
+                           for clase in self.clases for metodo in self.metodos}
+        self._instalados = []
+        self._base_bloques = 0
+        self._base_bloques = self._calibrar()
+
+    def _calibrar(self):
+        """Bloques que la propia medición deja vivos, para descontarlos."""
+        if not self.muestreo:
+            return 0
+        resultados = []
+        for _ in range(5):
+            medicion = Medicion("", "")
+            prueba = self._envolver(lambda: None, medicion)
+            for _ in range(self.muestreo):
+                prueba()
+            resultados.append(medicion.bloques)
+        return min(resultados)
+
+    @property
+    def activa(self):
+        return bool(self._instalados)
+
+    def activar(self):
+        """Reemplaza los métodos por sus envolturas."""
+        if self._instalados:
+            return self
+        for clase in self.clases:
+            for metodo in self.metodos:
+                propio = metodo in clase.__dict__
+                original = getattr(clase, metodo)
+                envoltura = self._envolver(original, self.mediciones[clase.__name__, metodo])
+                setattr(clase, metodo, envoltura)
+                self._instalados.append((clase, metodo, propio, original, envoltura))
+        return self
+
+    def desactivar(self):
+        """Restaura los métodos originales."""
+        for clase, metodo, propio, original, envoltura in reversed(self._instalados):
+            if clase.__dict__.get(metodo) is not envoltura:
+                continue
+            if propio:
+                setattr(clase, metodo, original)
+            else:
+                delattr(clase, metodo)
+        self._instalados = []
+
+    def __enter__(self):
+        return self.activar()
+
+    def __exit__(self, *excepcion):
+        self.desactivar()
+
+    def reiniciar(self):
+        """Pone todos los contadores en cero."""
+        for clave, medicion in self.mediciones.items():
+            self.mediciones[clave] = Medicion(medicion.clase, medicion.metodo)
+        if self._instalados:
+            self.desactivar()
+            self.activar()
+
+    def _envolver(self, original, medicion):
+        reloj = time.perf_counter_ns
+        cubetas = medicion.cubetas
+        muestreo = self.muestreo
+        bloques = sys.getallocatedblocks
+
+        @wraps(original)
+        def envoltura(*args, **kwargs):
+            llamada = medicion.llamadas = medicion.llamadas + 1
+            if muestreo and llamada % muestreo == 0:
+                inicio = reloj()
+                antes = bloques()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    despues = bloques()
+                    duracion = reloj() - inicio
+                    medicion.bloques += despues - antes - self._base_bloques
+                    medicion.muestras += 1
+                    medicion.total_ns += duracion
+                    cubetas[bisect_left(LIMITES_NS, duracion)] += 1
+            inicio = reloj()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                duracion = reloj() - inicio
+                medicion.total_ns += duracion
+                cubetas[bisect_left(LIMITES_NS, duracion)] += 1
+
+        return envoltura
+
+    def como_json(self, **opciones):
+        """Mediciones como texto JSON (las opciones se pasan a json.dumps)."""
+        return json.dumps([medicion.como_dict() for medicion in self.mediciones.values()],
+                          **opciones)
+
+    def como_prometheus(self, prefijo="electrodomestico"):
+        """Mediciones en el formato de texto de Prometheus.
+
+        Returns:
+            str: Un contador de llamadas, un histograma de duración en
+            segundos y un indicador de bloques por llamada.
+        """
+        lineas = [f"# HELP {prefijo}_llamadas_total Llamadas a cada método.",
+                  f"# TYPE {prefijo}_llamadas_total counter"]
+        etiquetas = {clave: f'clase="{medicion.clase}",metodo="{medicion.metodo}"'
+                     for clave, medicion in self.mediciones.items()}
+        for clave, medicion in self.mediciones.items():
+            lineas.append(f"{prefijo}_llamadas_total{{{etiquetas[clave]}}} {medicion.llamadas}")
+
+        lineas += [f"# HELP {prefijo}_duracion_segundos Duración de cada llamada.",
+                   f"# TYPE {prefijo}_duracion_segundos histogram"]
+        for clave, medicion in self.mediciones.items():
+            acumulado = 0
+            for limite, cantidad in zip(LIMITES_NS + (None,), medicion.cubetas):
+                acumulado += cantidad
+                le = "+Inf" if limite is None else repr(limite / 1e9)
+                lineas.append(f'{prefijo}_duracion_segundos_bucket{{{etiquetas[clave]},le="{le}"}} '
+                              f"{acumulado}")
+            lineas.append(f"{prefijo}_duracion_segundos_sum{{{etiquetas[clave]}}} "
+                          f"{medicion.total_ns / 1e9!r}")
+            lineas.append(f"{prefijo}_duracion_segundos_count{{{etiquetas[clave]}}} {acumulado}")
+
+        lineas += [f"# HELP {prefijo}_bloques_por_llamada Bloques de memoria netos por llamada "
+                   f"(muestreado).",
+                   f"# TYPE {prefijo}_bloques_por_llamada gauge"]
+        for clave, medicion in self.mediciones.items():
+            if medicion.muestras:
+                lineas.append(f"{prefijo}_bloques_por_llamada{{{etiquetas[clave]}}} "
+                              f"{medicion.bloques_por_llamada!r}")
+        return "\n".join(lineas) + "\n"
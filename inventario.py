@@ -0,0 +1,447 @@
+"""Inventario en memoria con índices para consultas por precio y especificaciones.
+
+El programa original sólo guarda tres variables sueltas. Inventario guarda
+los electrodomésticos por su id y mantiene varios índices que se actualizan
+en cada alta, cambio y baja:
+
+    - hash por id y por marca,
+    - índices ordenados por (tipo, campo) para precio y cada campo numérico,
+      que responden rangos en O(log n + k) con bisect,
+    - cubetas por (tipo, tipo_gama()) calculadas al insertar,
+    - un árbol k-d con el ancho, alto y profundidad de cada Microondas para
+      las consultas de caben_en() (ver medidas.py).
+
+Otros componentes (por ejemplo estadisticas.Estadisticas) pueden
+suscribirse para enterarse de cada alta, cambio y baja.
+
+Ejemplo:
+    inventario.buscar("Refrigerador", no_puertas=2, precio=(15000, 30000))
+    inventario.buscar("Microondas", potencia=Rango(minimo=1500, incluir_minimo=False))
+    inventario.caben_en(55, 35, 45)
+"""
+
+from bisect import bisect_left, bisect_right
+
+from catalogo import ESQUEMAS, nombre_tipo
+from medidas import IndiceMedidas
+from validacion import convertir_valor
+
+
+class Rango():
+    """Intervalo de valores para una consulta.
+
+    Atributos:
+        minimo: Límite inferior o None si no hay.
+        maximo: Límite superior o None si no hay.
+        incluir_minimo (bool): Si el límite inferior es inclusivo.
+        incluir_maximo (bool): Si el límite superior es inclusivo.
+    """
+    __slots__ = ("minimo", "maximo", "incluir_minimo", "incluir_maximo")
+
+    def __init__(self, minimo=None, maximo=None, incluir_minimo=True, incluir_maximo=True):
+        self.minimo = minimo
+        self.maximo = maximo
+        self.incluir_minimo = incluir_minimo
+        self.incluir_maximo = incluir_maximo
+
+    @classmethod
+    def desde(cls, condicion):
+        """Convierte una condición de buscar() en Rango.
+
+        Args:
+            condicion: Rango, tupla (minimo, maximo) inclusiva o un valor
+                exacto.
+        """
+        if isinstance(condicion, cls):
+            return condicion
+        if isinstance(condicion, tuple):
+            minimo, maximo = condicion
+            return cls(minimo, maximo)
+        return cls(condicion, condicion)
+
+    def contiene(self, valor):
+        """Indica si un valor cae dentro del rango."""
+        if self.minimo is not None:
+            if valor < self.minimo or (valor == self.minimo and not self.incluir_minimo):
+                return False
+        if self.maximo is not None:
+            if valor > self.maximo or (valor == self.maximo and not self.incluir_maximo):
+                return False
+        return True
+
+
+class IndiceOrdenado():
+    """Lista ordenada de (valor, id) guardada en dos listas paralelas."""
+
+    def __init__(self):
+        self.valores = []
+        self.ids = []
+
+    def __len__(self):
+        return len(self.valores)
+
+    def insertar(self, valor, id):
+        posicion = bisect_right(self.valores, valor)
+        self.valores.insert(posicion, valor)
+        self.ids.insert(posicion, id)
+
+    def eliminar(self, valor, id):
+        posicion = bisect_left(self.valores, valor)
+        while self.ids[posicion] != id:
+            posicion += 1
+        del self.valores[posicion]
+        del self.ids[posicion]
+
+    def limites(self, rango):
+        """Posiciones [inicio, fin) de los valores dentro del rango."""
+        inicio, fin = 0, len(self.valores)
+        if rango.minimo is not None:
+            buscar = bisect_left if rango.incluir_minimo else bisect_right
+            inicio = buscar(self.valores, rango.minimo)
+        if rango.maximo is not None:
+            buscar = bisect_right if rango.incluir_maximo else bisect_left
+            fin = buscar(self.valores, rango.maximo)
+        return inicio, max(inicio, fin)
+
+    def ids_en(self, rango):
+        """Ids cuyos valores caen dentro del rango, en orden de valor."""
+        inicio, fin = self.limites(rango)
+        return self.ids[inicio:fin]
+
+
+class Inventario():
+    """Repositorio de electrodomésticos indexado por id.
+
+    Los objetos guardados no deben modificarse directamente: use actualizar()
+    para que los índices se mantengan al día.
+    """
+
+    def __init__(self):
+        """Crea un inventario vacío con un índice ordenado por campo numérico."""
+        self.objetos = {}
+        self.tipos = {}
+        self.por_marca = {}
+        self.cubetas = {}
+        self.ordenados = {(nombre, campo): IndiceOrdenado()
+                          for nombre, esquema in ESQUEMAS.items() for campo in esquema.numeros}
+        self.medidas = IndiceMedidas()
+        self.oyentes = []
+
+    def __len__(self):
+        return len(self.objetos)
+
+    def __contains__(self, id):
+        return id in self.objetos
+
+    def __iter__(self):
+        return iter(self.objetos.values())
+
+    def suscribir(self, oyente):
+        """Registra una función que se llama después de cada modificación.
+
+        El oyente recibe (operacion, tipo, gama, obj, anteriores):
+        operacion es "alta", "baja" o "cambio"; gama es la gama actual (en
+        una baja, la que tenía); anteriores es None salvo en un cambio, donde
+        trae los valores previos de los campos que cambiaron y "gama" si
+        también cambió.
+        """
+        self.oyentes.append(oyente)
+
+    def cancelar_suscripcion(self, oyente):
+        """Deja de avisarle a un oyente registrado con suscribir()."""
+        self.oyentes.remove(oyente)
+
+    def obtener(self, id):
+        """Devuelve el electrodoméstico con ese id.
+
+        Raises:
+            KeyError: Si no existe.
+        """
+        return self.objetos[id]
+
+    def _indexar(self, obj, tipo):
+        self.por_marca.setdefault(obj.marca, set()).add(obj.id)
+        self.cubetas.setdefault((tipo, obj.tipo_gama()), set()).add(obj.id)
+        for campo in ESQUEMAS[tipo].numeros:
+            self.ordenados[tipo, campo].insertar(getattr(obj, campo), obj.id)
+        if tipo == "Microondas":
+            self.medidas.agregar(obj.id, obj.medidas)
+
+    def _desindexar(self, obj, tipo, gama):
+        _descartar(self.por_marca, obj.marca, obj.id)
+        _descartar(self.cubetas, (tipo, gama), obj.id)
+        for campo in ESQUEMAS[tipo].numeros:
+            self.ordenados[tipo, campo].eliminar(getattr(obj, campo), obj.id)
+        if tipo == "Microondas":
+            self.medidas.quitar(obj.id)
+
+    def agregar(self, obj):
+        """Agrega un electrodoméstico y lo registra en todos los índices.
+
+        Raises:
+            ValueError: Si ya existe un electrodoméstico con el mismo id.
+        """
+        if obj.id in self.objetos:
+            raise ValueError(f"Ya existe un electrodoméstico con id {obj.id!r}")
+        tipo = nombre_tipo(obj)
+        gama = obj.tipo_gama()
+        self.objetos[obj.id] = obj
+        self.tipos[obj.id] = (tipo, gama)
+        self._indexar(obj, tipo)
+        for oyente in self.oyentes:
+            oyente("alta", tipo, gama, obj, None)
+
+    def eliminar(self, id):
+        """Quita un electrodoméstico del inventario y de sus índices.
+
+        Returns:
+            El objeto eliminado.
+        """
+        obj = self.objetos.pop(id)
+        tipo, gama = self.tipos.pop(id)
+        self._desindexar(obj, tipo, gama)
+        for oyente in self.oyentes:
+            oyente("baja", tipo, gama, obj, None)
+        return obj
+
+    def actualizar(self, id, **cambios):
+        """Modifica campos de un electrodoméstico y actualiza sus índices.
+
+        Todos los valores se convierten y revisan antes de tocar nada (ver
+        validacion.convertir_valor); si alguno es inválido o algo falla a
+        la mitad, el objeto y sus índices quedan como estaban. Sólo se
+        tocan los índices ordenados de los campos que cambian.
+
+        Args:
+            id: Id del electrodoméstico.
+            **cambios: Campos y sus nuevos valores.
+
+        Raises:
+            ValueError: Si se intenta cambiar el id o un valor es inválido.
+            AttributeError: Si un campo no existe en el tipo.
+        """
+        if "id" in cambios and cambios["id"] != id:
+            raise ValueError("No se puede cambiar el id; elimine y vuelva a agregar")
+        obj = self.objetos[id]
+        tipo, gama = self.tipos[id]
+        campos = ESQUEMAS[tipo].campos
+        for campo in cambios:
+            if campo not in campos:
+                raise AttributeError(f"{tipo} no tiene el campo {campo!r}")
+        nuevos = {campo: convertir_valor(tipo, campo, valor)
+                  for campo, valor in cambios.items() if campo != "id"}
+        anteriores = {campo: getattr(obj, campo) for campo in nuevos}
+        aplicados = []
+        try:
+            for campo, valor in nuevos.items():
+                self._mover(tipo, id, campo, anteriores[campo], valor)
+                aplicados.append(campo)
+                setattr(obj, campo, valor)
+            nueva = obj.tipo_gama()
+        except BaseException:
+            for campo in reversed(aplicados):
+                setattr(obj, campo, anteriores[campo])
+                self._mover(tipo, id, campo, nuevos[campo], anteriores[campo])
+            raise
+        if nueva != gama:
+            _descartar(self.cubetas, (tipo, gama), id)
+            self.cubetas.setdefault((tipo, nueva), set()).add(id)
+            self.tipos[id] = (tipo, nueva)
+            anteriores["gama"] = gama
+        for oyente in self.oyentes:
+            oyente("cambio", tipo, nueva, obj, anteriores)
+        return obj
+
+    def _mover(self, tipo, id, campo, anterior, valor):
+        """Cambia la entrada de un campo en su índice; si falla no toca nada."""
+        if (tipo, campo) in self.ordenados:
+            indice = self.ordenados[tipo, campo]
+            indice.insertar(valor, id)
+            indice.eliminar(anterior, id)
+        elif campo == "marca":
+            self.por_marca.setdefault(valor, set()).add(id)
+            if valor != anterior:
+                _descartar(self.por_marca, anterior, id)
+        elif campo == "medidas":
+            self.medidas.agregar(id, valor)
+
+    def actualizar_lote(self, campo, nuevos):
+        """Cambia el mismo campo numérico en muchos electrodomésticos.
+
+        Equivale a llamar actualizar(id, campo=valor) por cada par, pero
+        cuando cambia una parte grande de un tipo su índice ordenado se
+        reconstruye una sola vez en lugar de mover cada elemento. Igual que
+        en actualizar(), los valores se convierten antes de tocar nada y si
+        algo falla a la mitad los objetos y sus índices quedan como
+        estaban. Los oyentes reciben un "cambio" por objeto después de que
+        todos los índices están al día.
+
+        Args:
+            campo (str): Campo numérico, por ejemplo "precio".
+            nuevos (dict): Id -> nuevo valor.
+
+        Returns:
+            int: Electrodomésticos modificados.
+
+        Raises:
+            KeyError: Si algún id no existe; en ese caso no se modifica nada.
+            AttributeError: Si algún tipo no tiene ese campo numérico.
+            ValueError: Si algún valor es inválido.
+        """
+        por_tipo = {}
+        convertidos = {}
+        for id, valor in nuevos.items():
+            tipo = self.tipos[id][0]
+            if (tipo, campo) not in self.ordenados:
+                raise AttributeError(f"{tipo} no tiene el campo numérico {campo!r}")
+            convertidos[id] = convertir_valor(tipo, campo, valor)
+            por_tipo.setdefault(tipo, []).append(id)
+        anteriores = {id: getattr(self.objetos[id], campo) for id in convertidos}
+        reconstruir = {tipo: len(ids) * 8 > len(self.ordenados[tipo, campo])
+                       for tipo, ids in por_tipo.items()}
+        gamas = {}
+        aplicados = []
+        movidos = []
+        try:
+            for id, valor in convertidos.items():
+                obj = self.objetos[id]
+                aplicados.append(id)
+                setattr(obj, campo, valor)
+                gamas[id] = obj.tipo_gama()
+            for tipo, ids in por_tipo.items():
+                if reconstruir[tipo]:
+                    continue
+                for id in ids:
+                    self._mover(tipo, id, campo, anteriores[id], convertidos[id])
+                    movidos.append((tipo, id))
+        except BaseException:
+            for tipo, id in reversed(movidos):
+                self._mover(tipo, id, campo, convertidos[id], anteriores[id])
+            for id in aplicados:
+                setattr(self.objetos[id], campo, anteriores[id])
+            raise
+        for tipo, ids in por_tipo.items():
+            if reconstruir[tipo]:
+                indice = self.ordenados[tipo, campo]
+                valores = [getattr(self.objetos[id], campo) for id in indice.ids]
+                orden = sorted(range(len(valores)), key=valores.__getitem__)
+                indice.valores = [valores[posicion] for posicion in orden]
+                indice.ids = [indice.ids[posicion] for posicion in orden]
+        avisos = []
+        for tipo, ids in por_tipo.items():
+            for id in ids:
+                gama, nueva = self.tipos[id][1], gamas[id]
+                cambiados = {campo: anteriores[id]}
+                if nueva != gama:
+                    _descartar(self.cubetas, (tipo, gama), id)
+                    self.cubetas.setdefault((tipo, nueva), set()).add(id)
+                    self.tipos[id] = (tipo, nueva)
+                    cambiados["gama"] = gama
+                avisos.append((tipo, nueva, self.objetos[id], cambiados))
+        for tipo, gama, obj, cambiados in avisos:
+            for oyente in self.oyentes:
+                oyente("cambio", tipo, gama, obj, cambiados)
+        return len(avisos)
+
+    def reclasificar(self):
+        """Recalcula las cubetas de gama, por ejemplo tras recargar reglas."""
+        self.cubetas = {}
+        for id, obj in self.objetos.items():
+            tipo, anterior = self.tipos[id]
+            gama = obj.tipo_gama()
+            self.tipos[id] = (tipo, gama)
+            self.cubetas.setdefault((tipo, gama), set()).add(id)
+            if gama != anterior:
+                for oyente in self.oyentes:
+                    oyente("cambio", tipo, gama, obj, {"gama": anterior})
+
+    def gama(self, gama, tipo=None):
+        """Electrodomésticos de una gama, opcionalmente de un solo tipo."""
+        tipos = [tipo] if tipo is not None else list(ESQUEMAS)
+        return [self.objetos[id] for nombre in tipos
+                for id in self.cubetas.get((nombre, gama), ())]
+
+    def caben_en(self, ancho=None, alto=None, profundidad=None):
+        """Microondas que caben en un hueco de ancho x alto x profundidad.
+
+        Las medidas se comparan en el orden en que están escritas, sin
+        girar el aparato. Los que tienen medidas ilegibles no se devuelven.
+
+        Args:
+            ancho (float): Ancho disponible; None si no importa.
+            alto (float): Alto disponible; None si no importa.
+            profundidad (float): Profundidad disponible; None si no importa.
+
+        Returns:
+            list: Microondas que caben.
+        """
+        return [self.objetos[id] for id in self.medidas.cabe_en(ancho, alto, profundidad)]
+
+    def marca(self, marca):
+        """Electrodomésticos de una marca."""
+        return [self.objetos[id] for id in self.por_marca.get(marca, ())]
+
+    def buscar(self, tipo=None, marca=None, gama=None, **condiciones):
+        """Busca electrodomésticos combinando filtros.
+
+        Se elige el índice más selectivo (el rango con menos elementos, la
+        marca o la cubeta de gama) para obtener los candidatos y el resto de
+        las condiciones se revisan directamente en esos objetos.
+
+        Args:
+            tipo (str): Limita la búsqueda a un tipo. Es obligatorio cuando
+                se filtra por campos que no son precio.
+            marca (str): Marca exacta.
+            gama (str): "Baja", "Media" o "Alta".
+            **condiciones: Campo -> valor exacto, tupla (min, max) inclusiva
+                o Rango.
+
+        Returns:
+            list: Electrodomésticos que cumplen todas las condiciones.
+        """
+        tipos = [tipo] if tipo is not None else list(ESQUEMAS)
+        rangos = {campo: Rango.desde(condicion) for campo, condicion in condiciones.items()}
+        for campo in rangos:
+            for nombre in tipos:
+                if (nombre, campo) not in self.ordenados:
+                    raise ValueError(f"{nombre} no tiene un índice para {campo!r}")
+
+        resultado = []
+        for nombre in tipos:
+            candidatos = self._candidatos(nombre, marca, gama, rangos)
+            for id in candidatos:
+                tipo_id, gama_id = self.tipos[id]
+                if tipo_id != nombre or (gama is not None and gama_id != gama):
+                    continue
+                obj = self.objetos[id]
+                if marca is not None and obj.marca != marca:
+                    continue
+                if all(rango.contiene(getattr(obj, campo)) for campo, rango in rangos.items()):
+                    resultado.append(obj)
+        return resultado
+
+    def _candidatos(self, tipo, marca, gama, rangos):
+        """Ids de partida para buscar(), tomados del índice más pequeño."""
+        opciones = []
+        if marca is not None:
+            opciones.append((len(self.por_marca.get(marca, ())), lambda: self.por_marca.get(marca, ())))
+        if gama is not None:
+            cubeta = self.cubetas.get((tipo, gama), ())
+            opciones.append((len(cubeta), lambda: cubeta))
+        for campo, rango in rangos.items():
+            indice = self.ordenados[tipo, campo]
+            inicio, fin = indice.limites(rango)
+            opciones.append((fin - inicio, lambda indice=indice, inicio=inicio, fin=fin:
+                             indice.ids[inicio:fin]))
+        if not opciones:
+            return self.ordenados[tipo, "precio"].ids
+        return min(opciones, key=lambda opcion: opcion[0])[1]()
+
+
+def _descartar(indice, clave, id):
+    """Quita un id de un índice hash y borra la clave si queda vacía."""
+    ids = indice.get(clave)
+    if ids is not None:
+        ids.discard(id)
+        if not ids:
+            del indice[clave]
@@ -0,0 +1,135 @@
+"""Medidas de microondas como números y consultas de "¿cabe en este hueco?".
+
+Microondas.medidas es un texto libre como "54x32.2x43.3" (ancho x alto x
+profundidad). parsear_medidas() lo convierte una sola vez en tres números;
+el catálogo columnar guarda el resultado en columnas array("d") al momento
+de la carga y el texto original se conserva tal cual para __str__.
+
+IndiceMedidas responde "qué modelos caben en un hueco de A x H x P" con un
+árbol k-d (indice_espacial.IndiceKD) sin recorrer el catálogo completo.
+
+Ejemplo:
+    indice = IndiceMedidas.desde_tabla(catalogo.tablas["Microondas"])
+    filas = indice.cabe_en(55, 35, 45)
+"""
+
+import math
+import re
+
+from indice_espacial import IndiceKD
+
+CAMPOS = ("ancho", "alto", "profundidad")
+
+_SEPARADOR = re.compile(r"\s*[xX×*]\s*")
+_UNIDAD = re.compile(r"\s*(cm|centímetros|centimetros)\.?\s*$", re.IGNORECASE)
+
+
+def parsear_medidas(texto):
+    """Convierte un texto de medidas en (ancho, alto, profundidad).
+
+    Se aceptan "x", "X", "×" o "*" como separador, espacios alrededor, coma
+    decimal y la unidad "cm" al final.
+
+    Args:
+        texto (str): Medidas como "54x32.2x43.3".
+
+    Returns:
+        tuple: (ancho, alto, profundidad) como float.
+
+    Raises:
+        ValueError: Si el texto no tiene exactamente tres medidas positivas.
+    """
+    partes = _SEPARADOR.split(_UNIDAD.sub("", str(texto).strip()))
+    if len(partes) != 3:
+        raise ValueError(f"Se esperaban tres medidas (ancho x alto x profundidad): {texto!r}")
+    try:
+        medidas = tuple(float(parte.replace(",", ".")) for parte in partes)
+    except ValueError:
+        raise ValueError(f"Medidas no numéricas: {texto!r}") from None
+    if not all(0 < medida < math.inf for medida in medidas):
+        raise ValueError(f"Las medidas deben ser positivas y finitas: {texto!r}")
+    return medidas
+
+
+def medidas_o_nan(texto):
+    """Como parsear_medidas(), pero devuelve NaN en las tres si el texto no es válido.
+
+    Un NaN nunca cumple una comparación, así que esas filas no aparecen en
+    ninguna consulta de ajuste.
+    """
+    try:
+        return parsear_medidas(texto)
+    except ValueError:
+        return (math.nan,) * 3
+
+
+class IndiceMedidas():
+    """Índice de ajuste por ancho, alto y profundidad.
+
+    Las claves pueden ser ids (Inventario) o posiciones de fila (catálogo
+    columnar). Las medidas que no se pueden interpretar se guardan en
+    invalidas y nunca se devuelven.
+    """
+
+    def __init__(self):
+        self.indice = IndiceKD(len(CAMPOS))
+        self.invalidas = set()
+
+    def __len__(self):
+        return len(self.indice)
+
+    @classmethod
+    def desde_tabla(cls, tabla):
+        """Construye el índice con las columnas ya interpretadas de una tabla.
+
+        Args:
+            tabla (catalogo.TablaColumnar): Tabla de Microondas.
+
+        Returns:
+            IndiceMedidas: Índice cuyas claves son posiciones de fila.
+        """
+        columnas = [tabla.derivados[campo] for campo in CAMPOS]
+        validas = [fila for fila, ancho in enumerate(columnas[0]) if not math.isnan(ancho)]
+        indice = cls()
+        indice.indice = IndiceKD.desde_columnas(
+            [[columna[fila] for fila in validas] for columna in columnas], validas)
+        indice.invalidas = set(range(len(tabla))).difference(validas)
+        return indice
+
+    def agregar(self, clave, medidas):
+        """Registra las medidas de una clave.
+
+        Args:
+            clave: Id o posición de fila.
+            medidas: Texto de medidas o tupla (ancho, alto, profundidad).
+
+        Returns:
+            bool: False si las medidas no se pudieron interpretar.
+        """
+        if isinstance(medidas, str):
+            medidas = medidas_o_nan(medidas)
+        self.quitar(clave)
+        if any(math.isnan(medida) for medida in medidas):
+            self.invalidas.add(clave)
+            return False
+        self.indice.insertar(medidas, clave)
+        return True
+
+    def quitar(self, clave):
+        """Quita una clave del índice si está registrada."""
+        self.invalidas.discard(clave)
+        if clave in self.indice:
+            self.indice.eliminar(clave)
+
+    def cabe_en(self, ancho=None, alto=None, profundidad=None):
+        """Claves de los modelos que caben en un hueco.
+
+        Args:
+            ancho (float): Ancho disponible; None si no importa.
+            alto (float): Alto disponible; None si no importa.
+            profundidad (float): Profundidad disponible; None si no importa.
+
+        Returns:
+            list: Claves con ancho, alto y profundidad menores o iguales.
+        """
+        return self.indice.en_caja(None, (ancho, alto, profundidad))
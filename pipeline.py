@@ -0,0 +1,223 @@
+"""Clasificación y renderizado de catálogos grandes en un grupo de procesos.
+
+El catálogo se parte en bloques de filas y cada bloque se envía a un proceso
+trabajador como columnas serializadas (bytes de los array("d"), la máscara
+de enteros y los textos unidos en una sola cadena con sus desplazamientos),
+no como objetos Lavadora/Refrigerador/Microondas. El trabajador reconstruye
+una TablaColumnar, calcula los códigos de gama por lotes y escribe las
+fichas con renderizado.escribir_tabla. Los resultados regresan en el mismo
+orden de entrada.
+
+Ejemplo:
+    resultado = procesar_catalogo(catalogo, trabajadores=4)
+    resultado.gamas["Lavadora"]  # array("b") con un código por fila
+    with open("fichas.txt", "w") as salida:
+        procesar_catalogo(catalogo, trabajadores=4, salida=salida)
+"""
+
+import io
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+
+import gama_vectorizada
+import renderizado
+from catalogo import ESQUEMAS, TablaColumnar
+
+TAMANO_BLOQUE = 50000
+
+_motores = {}
+
+
+def empaquetar_bloque(tabla, inicio, fin):
+    """Serializa un tramo de filas de una tabla como columnas compactas.
+
+    Args:
+        tabla (catalogo.TablaColumnar): Tabla de origen.
+        inicio (int): Primera fila (inclusiva).
+        fin (int): Última fila (exclusiva).
+
+    Returns:
+        tuple: (tipo, filas, numeros, mascara, textos) donde numeros es una
+        lista de bytes por campo numérico seguida de los campos derivados y
+        textos una lista de (desplazamientos, texto unido) por campo de texto.
+    """
+    esquema = tabla.esquema
+    numeros = [tabla.numeros[campo][inicio:fin].tobytes() for campo in esquema.numeros]
+    numeros += [columna[inicio:fin].tobytes() for columna in tabla.derivados.values()]
+    textos = []
+    for campo in esquema.textos:
+        valores = tabla.textos[campo][inicio:fin]
+        desplazamientos = array("L", accumulate(map(len, valores), initial=0))
+        textos.append((desplazamientos.tobytes(), "".join(valores)))
+    return (esquema.nombre, fin - inicio, numeros, tabla.enteros[inicio:fin].tobytes(), textos)
+
+
+def desempaquetar_bloque(bloque, tabla=None):
+    """Reconstruye una TablaColumnar a partir de empaquetar_bloque().
+
+    Args:
+        bloque (tuple): Resultado de empaquetar_bloque().
+        tabla (catalogo.TablaColumnar): Si se indica, las filas se agregan
+            al final de esa tabla (con textos sin codificar) en lugar de
+            crear una nueva.
+
+    Returns:
+        catalogo.TablaColumnar: Tabla con las filas del bloque.
+    """
+    tipo, _, numeros, mascara, textos = bloque
+    if tabla is None:
+        tabla = TablaColumnar(ESQUEMAS[tipo])
+    columnas = [tabla.numeros[campo] for campo in tabla.esquema.numeros]
+    for columna, datos in zip(columnas + list(tabla.derivados.values()), numeros):
+        columna.frombytes(datos)
+    tabla.enteros.frombytes(mascara)
+    for campo, (datos, unido) in zip(tabla.esquema.textos, textos):
+        desplazamientos = array("L")
+        desplazamientos.frombytes(datos)
+        tabla.textos[campo].extend(unido[a:b] for a, b in zip(desplazamientos, desplazamientos[1:]))
+    return tabla
+
+
+class _MotorTrabajador():
+    """Reglas compiladas dentro de un trabajador, sin instalarlas en las clases."""
+
+    def __init__(self, conjunto):
+        from reglas_gama import cargar_reglas, compilar
+        self.clasificadores = compilar(cargar_reglas()[conjunto])
+
+    def codigos_tabla(self, tabla):
+        clasificador = self.clasificadores[tabla.esquema.nombre]
+        campos = clasificador.campos or ("precio",)
+        return clasificador.codigos({campo: tabla.columna(campo) for campo in campos})
+
+
+def _motor(reglas):
+    """Compila una sola vez por proceso cada conjunto de reglas."""
+    if reglas is None:
+        return None
+    if reglas not in _motores:
+        _motores[reglas] = _MotorTrabajador(reglas)
+    return _motores[reglas]
+
+
+def procesar_bloque(bloque, reglas=None, renderizar=True):
+    """Clasifica y renderiza un bloque serializado. Corre en el trabajador.
+
+    Args:
+        bloque (tuple): Resultado de empaquetar_bloque().
+        reglas (str): Conjunto de reglas_gama.json a usar; si es None se
+            usan las reglas U4 de proyectoU4.py.
+        renderizar (bool): Si también se generan las fichas de texto.
+
+    Returns:
+        tuple: (bytes de los códigos de gama int8, texto de las fichas o None)
+    """
+    tabla = desempaquetar_bloque(bloque)
+    motor = _motor(reglas)
+    if motor is not None:
+        codigos = motor.codigos_tabla(tabla)
+    else:
+        codigos = gama_vectorizada.codigos_tabla(tabla, "U4")
+    texto = None
+    if renderizar:
+        salida = io.StringIO()
+        renderizado.escribir_tabla(tabla, salida, codigos=codigos)
+        texto = salida.getvalue()
+    return bytes(array("b", codigos)), texto
+
+
+class ResultadoPipeline():
+    """Resultado de procesar_catalogo().
+
+    Atributos:
+        gamas (dict): Tipo -> array("b") con el código de gama de cada fila.
+        fichas (list): Textos de cada bloque en orden (vacía si se usó
+            salida o renderizar=False).
+        filas (int): Total de filas procesadas.
+    """
+
+    def __init__(self):
+        self.gamas = {}
+        self.fichas = []
+        self.filas = 0
+
+    def etiquetas(self, tipo):
+        """Etiquetas "Baja"/"Media"/"Alta" de un tipo, en orden de fila."""
+        return gama_vectorizada.etiquetas(self.gamas[tipo])
+
+    def texto(self):
+        """Todas las fichas unidas en una sola cadena."""
+        return "".join(self.fichas)
+
+
+def _bloques(catalogo, tamano_bloque):
+    for tabla in catalogo.tablas.values():
+        for inicio in range(0, len(tabla), tamano_bloque):
+            yield empaquetar_bloque(tabla, inicio, min(inicio + tamano_bloque, len(tabla)))
+
+
+def procesar_catalogo(catalogo, trabajadores=None, tamano_bloque=TAMANO_BLOQUE,
+                      reglas=None, renderizar=True, salida=None):
+    """Clasifica y renderiza un catálogo completo en paralelo.
+
+    Args:
+        catalogo (catalogo.Catalogo): Catálogo a procesar.
+        trabajadores (int): Procesos a usar. None usa os.cpu_count(); 1 o
+            menos procesa todo en el proceso actual.
+        tamano_bloque (int): Filas por bloque enviado a cada trabajador.
+        reglas (str): Conjunto de reglas_gama.json, o None para las reglas U4.
+        renderizar (bool): Si se generan las fichas de texto.
+        salida: Si se indica, las fichas se escriben ahí en orden conforme
+            llegan en lugar de guardarse en el resultado.
+
+    Returns:
+        ResultadoPipeline: Códigos de gama por tipo y fichas en orden.
+    """
+    if tamano_bloque < 1:
+        raise ValueError("El tamaño del bloque debe ser al menos 1")
+    if trabajadores is None:
+        trabajadores = os.cpu_count() or 1
+    resultado = ResultadoPipeline()
+    for tipo in catalogo.tablas:
+        resultado.gamas[tipo] = array("b")
+    bloques = _bloques(catalogo, tamano_bloque)
+    if trabajadores <= 1:
+        respuestas = ((bloque[0], procesar_bloque(bloque, reglas, renderizar)) for bloque in bloques)
+        _reunir(resultado, respuestas, salida)
+    else:
+        with ProcessPoolExecutor(max_workers=trabajadores) as grupo:
+            respuestas = _en_orden(grupo, bloques, 2 * trabajadores, reglas, renderizar)
+            _reunir(resultado, respuestas, salida)
+    return resultado
+
+
+def _en_orden(grupo, bloques, ventana, reglas, renderizar):
+    """Envía bloques al grupo con a lo más `ventana` pendientes y los entrega en orden.
+
+    A diferencia de Executor.map no se serializa todo el catálogo por
+    adelantado, así que la memoria extra queda acotada por la ventana.
+    """
+    pendientes = deque()
+    for bloque in bloques:
+        pendientes.append((bloque[0], grupo.submit(procesar_bloque, bloque, reglas, renderizar)))
+        if len(pendientes) >= ventana:
+            tipo, futuro = pendientes.popleft()
+            yield tipo, futuro.result()
+    while pendientes:
+        tipo, futuro = pendientes.popleft()
+        yield tipo, futuro.result()
+
+
+def _reunir(resultado, respuestas, salida):
+    for tipo, (codigos, texto) in respuestas:
+        resultado.gamas[tipo].frombytes(codigos)
+        resultado.filas += len(codigos)
+        if texto is None:
+            continue
+        if salida is not None:
+            salida.write(texto)
+        else:
+            resultado.fichas.append(texto)
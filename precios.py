@@ -0,0 +1,358 @@
+"""Motor de precios por lotes: descuentos y conversión de moneda.
+
+Cambiar el precio de cientos de miles de artículos asignando precio objeto
+por objeto es lento y acumula errores de redondeo de float. MotorPrecios
+aplica una lista de reglas sobre la columna de precios completa:
+
+    - Descuento: porcentaje y/o monto fijo, filtrado por tipo, marca y gama.
+    - Conversion: multiplica por un tipo de cambio, con los mismos filtros.
+
+Toda la aritmética es exacta en centavos enteros: los porcentajes y tasas
+se convierten a fracciones (Decimal -> Fraction) y cada regla redondea el
+resultado al centavo con redondeo bancario (mitad al par), como
+decimal.ROUND_HALF_EVEN. Los precios de entrada también se pasan a
+centavos con ese redondeo sobre su valor decimal, sean int, float, texto,
+Decimal o Fraction. Si NumPy está instalado las reglas se evalúan sobre
+arreglos int64; si no, o si el producto pudiera desbordar int64, se usan
+enteros de Python con el mismo resultado.
+
+Las reglas se aplican en orden y se acumulan. La gama con la que se filtra
+es la que tenía cada artículo antes de aplicar el lote.
+
+Un precio que era int y termina en centavos cerrados sigue siendo int, así
+que __str__ de proyectoU3.py sigue mostrando "12,750" y no "12,750.0".
+
+Ejemplo:
+    motor = MotorPrecios([Descuento(porcentaje="15", marca="LG", gama="Alta"),
+                          Descuento(monto=500, tipo="Microondas"),
+                          Conversion("0.0583")])
+    motor.aplicar_catalogo(catalogo)
+    motor.aplicar_inventario(inventario)
+"""
+
+from decimal import Decimal
+from fractions import Fraction
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from catalogo import ESQUEMAS
+
+_LIMITE_INT64 = 2**62
+# Cota del error relativo de precio * 100 en float contra el decimal exacto
+_ERROR_RELATIVO = 1e-13
+
+
+def _fraccion(valor):
+    """Convierte un número o texto decimal a Fraction sin pasar por binario."""
+    if isinstance(valor, float):
+        valor = repr(valor)
+    if isinstance(valor, str):
+        valor = Decimal(valor.strip())
+    return Fraction(valor)
+
+
+def _cerca_de_medio(centavos, redondeados):
+    """Indica si centavos * 100 quedó tan cerca de medio centavo que el error
+    binario de float podría cambiar el redondeo (también sirve con arreglos)."""
+    return abs(centavos - redondeados) > 0.5 - (abs(centavos) * _ERROR_RELATIVO + 1e-9)
+
+
+def a_centavos(precio):
+    """Precio en pesos (int, float o Decimal) a centavos enteros.
+
+    Todos los tipos se redondean igual: el valor decimal que representa el
+    número (repr para float) por 100, mitad al par. Un float lejos de medio
+    centavo se resuelve con aritmética binaria, que da el mismo resultado.
+    """
+    if isinstance(precio, float):
+        centavos = precio * 100
+        redondeados = round(centavos)
+        if not _cerca_de_medio(centavos, redondeados):
+            return redondeados
+    return int((_fraccion(precio) * 100).__round__())
+
+
+def _centavos_arreglo(valores):
+    """a_centavos() de un arreglo float64 de NumPy; devuelve int64."""
+    centavos = valores * 100
+    redondeados = np.rint(centavos)
+    resultado = redondeados.astype(np.int64)
+    for fila in np.flatnonzero(_cerca_de_medio(centavos, redondeados)).tolist():
+        resultado[fila] = a_centavos(float(valores[fila]))
+    return resultado
+
+
+def redondear(numerador, denominador):
+    """División entera con redondeo mitad al par (denominador positivo)."""
+    cociente, resto = divmod(numerador, denominador)
+    doble = 2 * resto
+    if doble > denominador or (doble == denominador and cociente % 2):
+        cociente += 1
+    return cociente
+
+
+class Regla():
+    """Transformación de precios en centavos: precio * factor - resta.
+
+    Atributos:
+        factor (Fraction): Multiplicador exacto.
+        resta (int): Centavos que se restan después de multiplicar.
+        tipo (str): Sólo aplica a este tipo, o a todos si es None.
+        marca (str): Sólo aplica a esta marca, o a todas si es None.
+        gama (str): Sólo aplica a esta gama, o a todas si es None.
+    """
+    __slots__ = ("factor", "resta", "tipo", "marca", "gama")
+
+    def __init__(self, factor=1, resta=0, tipo=None, marca=None, gama=None):
+        if tipo is not None and tipo not in ESQUEMAS:
+            raise ValueError(f"Tipo desconocido: {tipo!r}")
+        if gama is not None and gama not in ("Baja", "Media", "Alta"):
+            raise ValueError(f"Gama desconocida: {gama!r}")
+        self.factor = _fraccion(factor)
+        if self.factor < 0:
+            raise ValueError("El factor de una regla no puede ser negativo")
+        self.resta = resta
+        self.tipo = tipo
+        self.marca = marca
+        self.gama = gama
+
+    def aplica(self, tipo, marca, gama):
+        """Indica si la regla corresponde a un artículo."""
+        return ((self.tipo is None or self.tipo == tipo)
+                and (self.marca is None or self.marca == marca)
+                and (self.gama is None or self.gama == gama))
+
+    def calcular(self, centavos):
+        """Nuevo precio en centavos de un solo artículo (nunca negativo)."""
+        nuevo = redondear(centavos * self.factor.numerator, self.factor.denominator)
+        return max(nuevo - self.resta, 0)
+
+    def calcular_arreglo(self, centavos):
+        """Igual que calcular() sobre un arreglo int64 de NumPy."""
+        numerador, denominador = self.factor.numerator, self.factor.denominator
+        cociente, resto = np.divmod(centavos * numerador, denominador)
+        doble = 2 * resto
+        cociente += (doble > denominador) | ((doble == denominador) & (cociente % 2 == 1))
+        return np.maximum(cociente - self.resta, 0)
+
+    def cabe_en_int64(self, maximo):
+        """Indica si centavos * numerador no desborda para el mayor precio dado."""
+        return (maximo + 1) * max(self.factor.numerator, self.factor.denominator) < _LIMITE_INT64
+
+
+class Descuento(Regla):
+    """Rebaja un porcentaje del precio y/o un monto fijo."""
+    __slots__ = ()
+
+    def __init__(self, porcentaje=0, monto=0, tipo=None, marca=None, gama=None):
+        """
+        Args:
+            porcentaje: Porcentaje de descuento (por ejemplo "12.5" o 15).
+            monto: Pesos que se restan después del porcentaje.
+            tipo (str): Tipo al que aplica.
+            marca (str): Marca a la que aplica.
+            gama (str): Gama a la que aplica.
+
+        Raises:
+            ValueError: Si el porcentaje no está entre 0 y 100 o el monto es
+                negativo.
+        """
+        porcentaje = _fraccion(porcentaje)
+        if not 0 <= porcentaje <= 100:
+            raise ValueError(f"Porcentaje fuera de rango: {porcentaje}")
+        resta = a_centavos(monto)
+        if resta < 0:
+            raise ValueError("El monto de descuento no puede ser negativo")
+        super().__init__(1 - porcentaje / 100, resta, tipo, marca, gama)
+
+
+class Conversion(Regla):
+    """Convierte los precios a otra moneda con un tipo de cambio."""
+    __slots__ = ()
+
+    def __init__(self, tasa, tipo=None, marca=None, gama=None):
+        """
+        Args:
+            tasa: Unidades de la moneda nueva por peso (por ejemplo "0.0583").
+        """
+        if _fraccion(tasa) <= 0:
+            raise ValueError(f"Tipo de cambio inválido: {tasa}")
+        super().__init__(tasa, 0, tipo, marca, gama)
+
+
+class MotorPrecios():
+    """Aplica una lista de reglas a tablas, catálogos e inventarios."""
+
+    def __init__(self, reglas, clasificador="U4"):
+        """
+        Args:
+            reglas (list): Reglas en el orden en que se aplican.
+            clasificador: "U3", "U4" o un reglas_gama.MotorReglas con sus
+                clasificadores cargados; sólo se usa en catálogos, para
+                filtrar por gama.
+        """
+        self.reglas = list(reglas)
+        self.clasificador = clasificador
+
+    def cotizar(self, tipo, marca, gama, precio):
+        """Precio final de un solo artículo.
+
+        Returns:
+            Precio en pesos con el mismo criterio int/float que el lote.
+        """
+        centavos = a_centavos(precio)
+        for regla in self.reglas:
+            if regla.aplica(tipo, marca, gama):
+                centavos = regla.calcular(centavos)
+        return _a_precio(centavos, isinstance(precio, int))
+
+    def _codigos_gama(self, tabla):
+        import gama_vectorizada
+        if isinstance(self.clasificador, str):
+            return gama_vectorizada.codigos_tabla(tabla, self.clasificador)
+        return self.clasificador.codigos_tabla(tabla)
+
+    def _seleccion(self, regla, tabla, gamas):
+        """Filas de la tabla a las que aplica la regla: None significa todas."""
+        filas = None
+        if regla.marca is not None:
+            columna = tabla.columna("marca")
+            if hasattr(columna, "filas"):
+                filas = columna.filas(regla.marca)
+            else:
+                filas = [fila for fila, marca in enumerate(columna) if marca == regla.marca]
+        if regla.gama is not None:
+            from gama_vectorizada import GAMAS
+            codigo = GAMAS.index(regla.gama)
+            if np is not None:
+                coincide = np.asarray(gamas) == codigo
+                if filas is None:
+                    return np.flatnonzero(coincide)
+                filas = np.asarray(filas, dtype=np.intp)
+                return filas[coincide[filas]]
+            if filas is None:
+                filas = range(len(tabla))
+            filas = [fila for fila in filas if gamas[fila] == codigo]
+        return filas
+
+    def aplicar_tabla(self, tabla):
+        """Aplica las reglas a la columna de precios de una TablaColumnar.
+
+        Returns:
+            int: Filas cuyo precio cambió.
+
+        Raises:
+            TypeError: Si la tabla es de sólo lectura (una instantánea
+                cargada sin copiar).
+        """
+        tipo = tabla.esquema.nombre
+        reglas = [regla for regla in self.reglas if regla.tipo in (None, tipo)]
+        if not reglas or not len(tabla):
+            return 0
+        precios = tabla.numeros["precio"]
+        enteros = tabla.enteros
+        if isinstance(precios, memoryview) and precios.readonly:
+            raise TypeError(f"La tabla de {tipo} es de sólo lectura")
+        gamas = None
+        if any(regla.gama is not None for regla in reglas):
+            gamas = self._codigos_gama(tabla)
+        seleccion = [(regla, self._seleccion(regla, tabla, gamas)) for regla in reglas]
+        bit = 1 << tabla.esquema.numeros.index("precio")
+        if np is not None:
+            return self._aplicar_numpy(precios, enteros, bit, seleccion)
+        return self._aplicar_python(precios, enteros, bit, seleccion)
+
+    def _aplicar_numpy(self, precios, enteros, bit, seleccion):
+        valores = np.frombuffer(precios, dtype=np.float64)
+        centavos = _centavos_arreglo(valores)
+        originales = centavos.copy()
+        for regla, filas in seleccion:
+            if not regla.cabe_en_int64(int(centavos.max())):
+                return self._aplicar_python(precios, enteros, bit, seleccion)
+            if filas is None:
+                centavos = regla.calcular_arreglo(centavos)
+            elif len(filas):
+                filas = np.asarray(filas, dtype=np.intp)
+                centavos[filas] = regla.calcular_arreglo(centavos[filas])
+        cambiadas = centavos != originales
+        mascara = np.frombuffer(enteros, dtype=np.dtype(f"u{enteros.itemsize}"))
+        # Sólo siguen siendo int los que eran int y quedaron en pesos cerrados
+        mascara[cambiadas & (centavos % 100 != 0)] &= ~np.array(bit, dtype=mascara.dtype)
+        valores[cambiadas] = centavos[cambiadas] / 100
+        return int(np.count_nonzero(cambiadas))
+
+    def _aplicar_python(self, precios, enteros, bit, seleccion):
+        centavos = [a_centavos(precio) for precio in precios]
+        originales = list(centavos)
+        for regla, filas in seleccion:
+            for fila in range(len(centavos)) if filas is None else filas:
+                centavos[fila] = regla.calcular(centavos[fila])
+        cambiadas = 0
+        for fila, (nuevo, original) in enumerate(zip(centavos, originales)):
+            if nuevo != original:
+                precios[fila] = nuevo / 100
+                if nuevo % 100:
+                    enteros[fila] &= ~bit
+                cambiadas += 1
+        return cambiadas
+
+    def aplicar_catalogo(self, catalogo):
+        """Aplica las reglas a todas las tablas de un Catalogo.
+
+        Returns:
+            dict: Tipo -> filas cuyo precio cambió.
+        """
+        return {tipo: self.aplicar_tabla(tabla) for tipo, tabla in catalogo.tablas.items()}
+
+    def aplicar_inventario(self, inventario):
+        """Aplica las reglas a un Inventario en una sola pasada.
+
+        Los candidatos de cada regla salen de los índices por marca, por
+        gama y por tipo. Los precios nuevos se escriben con
+        Inventario.actualizar_lote(), que actualiza el índice ordenado de
+        precio y las cubetas de gama y avisa a los oyentes (estadísticas,
+        bitácora, caché del servicio).
+
+        Returns:
+            int: Electrodomésticos cuyo precio cambió.
+        """
+        centavos = {}
+        candidatos = [(regla, self._candidatos(regla, inventario)) for regla in self.reglas]
+        for regla, ids in candidatos:
+            for id in ids:
+                actual = centavos.get(id)
+                if actual is None:
+                    actual = a_centavos(inventario.objetos[id].precio)
+                centavos[id] = regla.calcular(actual)
+        nuevos = {}
+        for id, nuevo in centavos.items():
+            precio = inventario.objetos[id].precio
+            original = a_centavos(precio)
+            if nuevo != original:
+                nuevos[id] = _a_precio(nuevo, isinstance(precio, int))
+        return inventario.actualizar_lote("precio", nuevos)
+
+    def _candidatos(self, regla, inventario):
+        """Ids a los que aplica una regla, según el estado antes del lote."""
+        tipos = [regla.tipo] if regla.tipo is not None else list(ESQUEMAS)
+        if regla.gama is not None:
+            ids = set().union(*(inventario.cubetas.get((tipo, regla.gama), ()) for tipo in tipos))
+        elif regla.tipo is not None:
+            ids = set(inventario.ordenados[regla.tipo, "precio"].ids)
+        elif regla.marca is not None:
+            ids = set(inventario.por_marca.get(regla.marca, ()))
+        else:
+            ids = set(inventario.objetos)
+        if regla.marca is not None:
+            ids.intersection_update(inventario.por_marca.get(regla.marca, ()))
+        return ids
+
+
+def _a_precio(centavos, era_entero):
+    """Centavos a pesos: int si el precio era int y no quedaron centavos."""
+    if era_entero and not centavos % 100:
+        return centavos // 100
+    return centavos / 100
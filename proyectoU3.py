@@ -13,6 +13,7 @@ class Gama(ABC):
     Esta clase abstracta actúa como interfaz que deben heredar todas las subclases
     de electrodomésticos, obligándolas a implementar el método tipo_gama().
     """
+    __slots__ = ()
     
     @abstractmethod
     def tipo_gama(self):
@@ -23,12 +24,23 @@ class Gama(ABC):
         """
         pass
 
+    @classmethod
+    def usar_clasificador(cls, clasificador):
+        """Reemplaza el tipo_gama de la clase por una función ya compilada.
+
+        Args:
+            clasificador (function): Función tipo_gama(self), por ejemplo la
+                generada por reglas_gama.ClasificadorCompilado.
+        """
+        cls.tipo_gama = clasificador
+
 class Electrodomestico():
     """Clase principal que define las propiedades básicas de un electrodoméstico.
     
     Esta es la clase base de la que heredarán todos los tipos de electrodomésticos.
     Contiene los atributos comunes a todos: id, marca, modelo y precio.
     """
+    __slots__ = ("id", "marca", "modelo", "precio")
     
     def __init__(self, id, marca, modelo, precio):
         """Inicializa un electrodoméstico con sus propiedades básicas.
@@ -62,6 +74,7 @@ class Lavadora(Electrodomestico, Gama):
     mediante la interfaz Gama. Incluye características específicas como capacidad
     de carga, consumo de agua y número de ciclos de lavado.
     """
+    __slots__ = ("capacidad_carga", "consumo_agua", "ciclos_lavado")
 
     def __init__(self, id, marca, modelo, precio, capacidad_carga, consumo_agua, ciclos_lavado):
         """Inicializa una lavadora con sus propiedades básicas y específicas.
@@ -117,6 +130,7 @@ class Refrigerador(Electrodomestico, Gama):
     Incluye características específicas como número de puertas, capacidad en metros
     cúbicos y pies cúbicos.
     """
+    __slots__ = ("no_puertas", "metros_cubicos", "pies_capacidad")
     
     def __init__(self, id, marca, modelo, precio, no_puertas, metros_cubicos, pies_capacidad):
         """Inicializa un refrigerador con sus propiedades básicas y específicas.
@@ -171,6 +185,7 @@ class Microondas(Electrodomestico, Gama):
     Hereda propiedades de Electrodomestico y la capacidad de determinar su gama.
     Incluye características específicas como potencia, consumo de energía y medidas.
     """
+    __slots__ = ("potencia", "consumo_energia", "medidas")
     
     def __init__(self, id, marca, modelo, precio, potencia, consumo_energia, medidas):
         """Inicializa un microondas con sus propiedades básicas y específicas.
@@ -226,40 +241,41 @@ class Microondas(Electrodomestico, Gama):
 # visualizar sus propiedades, incluyendo su clasificación automática de gama.
 # ============================================================================
 
-while True:
-    try:
-        print ("--- Menú Principal---")
-        print(f"\n1. Instanciar\n2. Desplegar\n3. Salir")
-        opcion = int(input("\nIngresa la opción 1, 2 ó 3: "))
-        if opcion == 1:
-            lavadora = Lavadora("8MWTW2224WJM", "Whirlpool", "8MWTW2224WJM", 13999, 22, 15 ,12)
-            refrigerador = Refrigerador("RF22A4010S9/EM", "Samsung", "RF22A4010S9/EM", 30000, 3, 0.623, 22)
-            microondas = Microondas ("MH1596DIR", "LG", "NeoChef", 4700, 1200, 1350, "54x32.2x43.3")
-            print("\nSe instanciaron los objetos")
-        elif opcion == 2:
-            print(f"\n\n{lavadora}")
-            print(f"\n\n{refrigerador}")
-            print(f"\n\n{microondas}")
-        elif opcion == 3:
-            print("Saliendo del programa...")
-            break
-        else:
-            print("Opción no válida. Por favor, seleccione una opción del 1 al 3.")
+if __name__ == "__main__":
+    while True:
+        try:
+            print ("--- Menú Principal---")
+            print(f"\n1. Instanciar\n2. Desplegar\n3. Salir")
+            opcion = int(input("\nIngresa la opción 1, 2 ó 3: "))
+            if opcion == 1:
+                lavadora = Lavadora("8MWTW2224WJM", "Whirlpool", "8MWTW2224WJM", 13999, 22, 15 ,12)
+                refrigerador = Refrigerador("RF22A4010S9/EM", "Samsung", "RF22A4010S9/EM", 30000, 3, 0.623, 22)
+                microondas = Microondas ("MH1596DIR", "LG", "NeoChef", 4700, 1200, 1350, "54x32.2x43.3")
+                print("\nSe instanciaron los objetos")
+            elif opcion == 2:
+                print(f"\n\n{lavadora}")
+                print(f"\n\n{refrigerador}")
+                print(f"\n\n{microondas}")
+            elif opcion == 3:
+                print("Saliendo del programa...")
+                break
+            else:
+                print("Opción no válida. Por favor, seleccione una opción del 1 al 3.")
 
-    except ValueError as error_valor:
-        print("Error: Debe ingresar un número entero.")
-        print("Detalle del error:", error_valor)
-        print("Intente de nuevo.\n")
+        except ValueError as error_valor:
+            print("Error: Debe ingresar un número entero.")
+            print("Detalle del error:", error_valor)
+            print("Intente de nuevo.\n")
     
-    except NameError as error_nombre:
-        print("Error: Intentaste acceder a un electrodoméstico que aún no ha sido creado.")
-        print("Detalle del error:", error_nombre)
-        print("Intente de nuevo.\n")
+        except NameError as error_nombre:
+            print("Error: Intentaste acceder a un electrodoméstico que aún no ha sido creado.")
+            print("Detalle del error:", error_nombre)
+            print("Intente de nuevo.\n")
         
-    except KeyboardInterrupt as interrupcion:
-        print("\nPrograma interrumpido por el usuario.")
+        except KeyboardInterrupt as interrupcion:
+            print("\nPrograma interrumpido por el usuario.")
     
-    except Exception as error_general:
-        print("Ha ocurrido un error inesperado.")
-        print("Detalle del error:", error_general)
-        print("Intente de nuevo.\n")
+        except Exception as error_general:
+            print("Ha ocurrido un error inesperado.")
+            print("Detalle del error:", error_general)
+            print("Intente de nuevo.\n")
@@ -6,6 +6,7 @@ class Gama(ABC):
     Esta clase abstracta actúa como interfaz que deben heredar todas las subclases
     de electrodomésticos, obligándolas a implementar el método tipo_gama().
     '''
+    __slots__ = ()
     @abstractmethod
     def tipo_gama(self):
         '''
@@ -15,6 +16,15 @@ class Gama(ABC):
         '''
         pass
 
+    @classmethod
+    def usar_clasificador(cls, clasificador):
+        '''
+        Reemplaza el tipo_gama de la clase por una función ya compilada
+        (ver reglas_gama.py). Se asigna directamente en la clase para que
+        cada llamada cueste lo mismo que el método escrito a mano.
+        '''
+        cls.tipo_gama = clasificador
+
 class Electrodomestico():
     '''
     Clase Base para todos los electrodomésticos.
@@ -25,6 +35,7 @@ class Electrodomestico():
         modelo (str): Nombre o código del modelo específico.
         precio (float): Precio de venta del electrodoméstico.
     '''
+    __slots__ = ("id", "marca", "modelo", "precio")
     def __init__(self, id, marca, modelo, precio):
         """Constructor  que recibe los parametros de electrodoméstico"""
         self.id = id       
@@ -52,6 +63,7 @@ class Lavadora(Electrodomestico, Gama):
         consumo_agua (int): Consumo de agua por ciclo en Litros.
         ciclos_lavado (int): Número de ciclos o programas de lavado disponibles.
     '''
+    __slots__ = ("capacidad_carga", "consumo_agua", "ciclos_lavado")
     def __init__(self, id, marca, modelo, precio, capacidad_carga, consumo_agua, ciclos_lavado):
         """
         Inicializa un objeto Lavadora con sus atributos específicos y base.
@@ -97,6 +109,7 @@ class Refrigerador(Electrodomestico,Gama):
         metros_cubicos (float): Volumen total en metros cúbicos.
         pies_capacidad (float): Volumen total en pies cúbicos.
     '''
+    __slots__ = ("no_puertas", "metros_cubicos", "pies_capacidad")
     def __init__(self, id, marca, modelo, precio, no_puertas, metros_cubicos, pies_capacidad):
         """Inicializa un objeto Refrigerador con sus atributos específicos y base."""
         super().__init__(id, marca, modelo, precio)
@@ -137,6 +150,7 @@ class Microondas(Electrodomestico, Gama):
         consumo_energia (int): Consumo de energía en Watts (W).
         medidas (str): Dimensiones (Ancho x Alto x Profundidad).
     '''
+    __slots__ = ("potencia", "consumo_energia", "medidas")
     def __init__(self, id, marca, modelo, precio, potencia, consumo_energia, medidas):
         """Inicializa un objeto Microondas con sus atributos específicos y base."""
         super().__init__(id, marca, modelo, precio)
@@ -173,44 +187,45 @@ Este programa se trata de una jerarquía de clases para gestionar electrodomést
 donde cada tipo hereda propiedades básicas y tiene la capacidad de autodefinir
 su "gama" (baja, media, alta) basándose en sus especificaciones técnicas.
 '''
-while True:
-    try:
-        print ("\n--- Menú Principal---")
-        print(f"\n1. Instanciar (Crear) electrodomésticos\n2. Desplegar (Mostrar) electrodomésticos\n3. Salir")
-        opcion = int(input("\nIngresa la opción 1, 2 ó 3: "))     
-        # Opción 1: Instanciar los objetos
-        if opcion == 1:
-            # Creación de instancias de las clases Lavadora, Refrigerador y Microondas
-            lavadora = Lavadora("8MWTW2224WJM", "Whirlpool", "8MWTW2224WJM", 13999, 22, 15 ,12)
-            refrigerador = Refrigerador("RF22A4010S9/EM", "Samsung", "RF22A4010S9/EM", 30000, 3, 0.623, 22) 
-            microondas = Microondas ("MH1596DIR", "LG", "NeoChef", 4700, 1200, 1350, "54x32.2x43.3")
-            print("\n Se instanciaron los objetos con éxito.")
-        # Opción 2: Desplegar los objetos instanciados
-        elif opcion == 2:
-            # Uso del método __str__ para desplegar la información completa
-            print("\n--- Detalles de Electrodomésticos ---")
-            print(f"\n* LAVADORA *\n{lavadora}")
-            print(f"\n* REFRIGERADOR *\n{refrigerador}")
-            print(f"\n* MICROONDAS *\n{microondas}")
-        # Opción 3: Salir del programa
-        elif opcion == 3:
-            print("\nSaliendo del programa... ¡Hasta pronto!")
-            break
-        else:
-            print("\n Opción no válida. Por favor, seleccione una opción del 1 al 3.")
-    #--- Manejo de errores ---
-    # Excepción para cuando el usuario no ingresa un número correcto
-    except ValueError as error_valor:
-        print("\nError: Debe ingresar un número entero para seleccionar una opción.")
-        print("Detalle del error:", error_valor)
-        print("Intente de nuevo.")
-    # Excepción para cuando se intenta desplegar un objeto que no ha sido instanciado (opción 2 sin haber ejecutado la 1)
-    except NameError as error_nombre:
-        print("\n Error: Intentaste desplegar un electrodoméstico que aún no ha sido creado (Opción 1).")
-        print("Detalle del error:", error_nombre)
-        print("Intente de nuevo.")
-    # Excepción general para capturar cualquier otro error inesperado
-    except Exception as error_general:
-        print("\n Ha ocurrido un error inesperado.")
-        print("Detalle del error:", error_general)
-        print("Intente de nuevo.")
\ No newline at end of file
+if __name__ == "__main__":
+    while True:
+        try:
+            print ("\n--- Menú Principal---")
+            print(f"\n1. Instanciar (Crear) electrodomésticos\n2. Desplegar (Mostrar) electrodomésticos\n3. Salir")
+            opcion = int(input("\nIngresa la opción 1, 2 ó 3: "))     
+            # Opción 1: Instanciar los objetos
+            if opcion == 1:
+                # Creación de instancias de las clases Lavadora, Refrigerador y Microondas
+                lavadora = Lavadora("8MWTW2224WJM", "Whirlpool", "8MWTW2224WJM", 13999, 22, 15 ,12)
+                refrigerador = Refrigerador("RF22A4010S9/EM", "Samsung", "RF22A4010S9/EM", 30000, 3, 0.623, 22) 
+                microondas = Microondas ("MH1596DIR", "LG", "NeoChef", 4700, 1200, 1350, "54x32.2x43.3")
+                print("\n Se instanciaron los objetos con éxito.")
+            # Opción 2: Desplegar los objetos instanciados
+            elif opcion == 2:
+                # Uso del método __str__ para desplegar la información completa
+                print("\n--- Detalles de Electrodomésticos ---")
+                print(f"\n* LAVADORA *\n{lavadora}")
+                print(f"\n* REFRIGERADOR *\n{refrigerador}")
+                print(f"\n* MICROONDAS *\n{microondas}")
+            # Opción 3: Salir del programa
+            elif opcion == 3:
+                print("\nSaliendo del programa... ¡Hasta pronto!")
+                break
+            else:
+                print("\n Opción no válida. Por favor, seleccione una opción del 1 al 3.")
+        #--- Manejo de errores ---
+        # Excepción para cuando el usuario no ingresa un número correcto
+        except ValueError as error_valor:
+            print("\nError: Debe ingresar un número entero para seleccionar una opción.")
+            print("Detalle del error:", error_valor)
+            print("Intente de nuevo.")
+        # Excepción para cuando se intenta desplegar un objeto que no ha sido instanciado (opción 2 sin haber ejecutado la 1)
+        except NameError as error_nombre:
+            print("\n Error: Intentaste desplegar un electrodoméstico que aún no ha sido creado (Opción 1).")
+            print("Detalle del error:", error_nombre)
+            print("Intente de nuevo.")
+        # Excepción general para capturar cualquier otro error inesperado
+        except Exception as error_general:
+            print("\n Ha ocurrido un error inesperado.")
+            print("Detalle del error:", error_general)
+            print("Intente de nuevo.")
\ No newline at end of file
@@ -0,0 +1,363 @@
+"""Motor de reglas declarativas para tipo_gama().
+
+Los umbrales de gama ya no tienen que vivir en cada método tipo_gama(): se
+declaran en un archivo JSON (por defecto reglas_gama.json) y se compilan en
+funciones de Python generadas. Cada conjunto de reglas (por ejemplo "U3" o
+"U4") tiene, por tipo de electrodoméstico, una lista ordenada de reglas y una
+gama por defecto:
+
+    "Lavadora": {
+        "reglas": [
+            {"gama": "Baja", "todas": [["capacidad_carga", "<=", 10], ["ciclos_lavado", "<=", 3]]},
+            {"gama": "Media", "alguna": [["capacidad_carga", "<=", 15], ["ciclos_lavado", "<=", 3]]}
+        ],
+        "defecto": "Alta"
+    }
+
+Gana la primera regla que se cumpla. "todas" une las condiciones con and y
+"alguna" con or. Las funciones generadas se instalan en las clases con
+Gama.usar_clasificador (definido en U3.py, proyectoU3.py y proyectoU4.py),
+de modo que cada llamada a tipo_gama() es una llamada directa sin
+indirección extra.
+
+Recargar las reglas reemplaza el atributo de la clase, pero no lo que ya se
+calculó con las reglas anteriores: las cubetas de gama de un Inventario, las
+Estadisticas conectadas a él o el caché de respuestas del servicio. Por eso
+el motor avisa a sus suscriptores después de cada instalación; conectar()
+hace que un inventario se reclasifique (y con él sus oyentes):
+
+    motor = MotorReglas(conjunto="U4").conectar(inventario)
+    motor.recargar()
+"""
+
+import json
+import math
+import os
+
+from catalogo import ESQUEMAS
+import gama_vectorizada
+from gama_vectorizada import GAMAS, como_arreglo, etiquetas, np
+
+RUTA_POR_DEFECTO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reglas_gama.json")
+
+OPERADORES = ("<", "<=", "==", "!=", ">=", ">")
+_UNIONES = {"todas": " and ", "alguna": " or "}
+
+
+def cargar_reglas(ruta=RUTA_POR_DEFECTO):
+    """Lee el archivo de reglas.
+
+    Args:
+        ruta (str): Ruta del archivo JSON.
+
+    Returns:
+        dict: Conjuntos de reglas indexados por nombre.
+    """
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def _validar(tipo, definicion, numericos=None):
+    """Revisa una definición de reglas y la normaliza.
+
+    Args:
+        tipo (str): Nombre del tipo.
+        definicion (dict): Definición con "reglas" y "defecto".
+        numericos (tuple): Campos numéricos del tipo; por defecto los de
+            su esquema en ESQUEMAS.
+
+    Returns:
+        tuple: (reglas, defecto) donde reglas es una lista de
+        (gama, unión, [(campo, operador, valor), ...]).
+
+    Raises:
+        ValueError: Si la definición tiene campos, operadores o gamas inválidos.
+    """
+    if numericos is None:
+        if tipo not in ESQUEMAS:
+            raise ValueError(f"Tipo de electrodoméstico desconocido: {tipo!r}")
+        numericos = ESQUEMAS[tipo].numeros
+    if not isinstance(definicion, dict):
+        raise ValueError(f"{tipo}: la definición de reglas debe ser un objeto")
+    defecto = definicion.get("defecto")
+    if defecto not in GAMAS:
+        raise ValueError(f"{tipo}: la gama por defecto debe ser una de {GAMAS}")
+    reglas = []
+    for regla in definicion.get("reglas", []):
+        if regla.get("gama") not in GAMAS:
+            raise ValueError(f"{tipo}: gama inválida {regla.get('gama')!r}")
+        uniones = [union for union in _UNIONES if union in regla]
+        if len(uniones) != 1:
+            raise ValueError(f"{tipo}: cada regla necesita 'todas' o 'alguna'")
+        condiciones = []
+        for condicion in regla[uniones[0]]:
+            campo, operador, valor = condicion
+            if campo not in numericos:
+                raise ValueError(f"{tipo}: {campo!r} no es un campo numérico")
+            if operador not in OPERADORES:
+                raise ValueError(f"{tipo}: operador inválido {operador!r}")
+            if (isinstance(valor, bool) or not isinstance(valor, (int, float))
+                    or not math.isfinite(valor)):
+                raise ValueError(f"{tipo}: el umbral de {campo} debe ser un número finito")
+            condiciones.append((campo, operador, valor))
+        if not condiciones:
+            raise ValueError(f"{tipo}: una regla no tiene condiciones")
+        reglas.append((regla["gama"], uniones[0], condiciones))
+    return reglas, defecto
+
+
+def _expresion(union, condiciones, nombres):
+    return _UNIONES[union].join(f"({nombres[campo]} {operador} {valor!r})"
+                                for campo, operador, valor in condiciones)
+
+
+class ClasificadorCompilado():
+    """Funciones generadas para un tipo de electrodoméstico.
+
+    Atributos:
+        tipo (str): Nombre del tipo.
+        tipo_gama (function): Función escalar lista para instalarse como método.
+        codigos (function): Recibe un dict campo -> columna y devuelve los
+            códigos de gama de todas las filas.
+        fuente (str): Código generado, útil para depurar.
+    """
+
+    def __init__(self, tipo, definicion, numericos=None):
+        """Valida y compila la definición de reglas de un tipo.
+
+        Args:
+            tipo (str): Nombre del tipo.
+            definicion (dict): Definición con "reglas" y "defecto".
+            numericos (tuple): Campos numéricos permitidos en las reglas; por
+                defecto los del esquema registrado. tipos.py los pasa porque
+                compila las reglas antes de registrar el tipo.
+        """
+        self.tipo = tipo
+        self.reglas, self.defecto = _validar(tipo, definicion, numericos)
+        self.campos = tuple(dict.fromkeys(campo for _, _, condiciones in self.reglas
+                                          for campo, _, _ in condiciones))
+        self.fuente = self._generar()
+        espacio = {}
+        exec(compile(self.fuente, f"<reglas {tipo}>", "exec"), espacio)
+        self.tipo_gama = espacio["tipo_gama"]
+        self.tipo_gama.__qualname__ = f"{tipo}.tipo_gama"
+        self._codigos_python = espacio["codigos"]
+
+    def _generar(self):
+        locales = {campo: campo for campo in self.campos}
+        lineas = ["def tipo_gama(self):"]
+        lineas += [f"    {campo} = self.{campo}" for campo in self.campos]
+        for gama, union, condiciones in self.reglas:
+            lineas.append(f"    if {_expresion(union, condiciones, locales)}:")
+            lineas.append(f"        return {gama!r}")
+        lineas.append(f"    return {self.defecto!r}")
+
+        variables = {campo: f"v{i}" for i, campo in enumerate(self.campos)}
+        rama = f"{GAMAS.index(self.defecto)}"
+        for gama, union, condiciones in reversed(self.reglas):
+            rama = f"{GAMAS.index(gama)} if {_expresion(union, condiciones, variables)} else {rama}"
+        if self.campos:
+            tuplas = ", ".join(variables.values()) + ","
+            columnas = ", ".join(f"columnas[{campo!r}]" for campo in self.campos)
+            lineas += ["", "def codigos(columnas):",
+                       f"    return [{rama} for ({tuplas}) in zip({columnas})]"]
+        else:
+            lineas += ["", "def codigos(columnas):",
+                       f"    return [{rama}] * len(next(iter(columnas.values()), ()))"]
+        return "\n".join(lineas) + "\n"
+
+    def codigos(self, columnas):
+        """Calcula los códigos de gama de un lote de filas.
+
+        Con NumPy se evalúan las reglas como máscaras sobre arreglos, de la
+        última a la primera para respetar el orden de prioridad.
+
+        Args:
+            columnas (dict): Campo -> columna (array, lista o arreglo NumPy).
+
+        Returns:
+            Arreglo int8 de NumPy, o lista de int si NumPy no está disponible.
+        """
+        if np is None or not self.campos:
+            return self._codigos_python(columnas)
+        arreglos = {campo: como_arreglo(columnas[campo]) for campo in self.campos}
+        filas = len(next(iter(arreglos.values())))
+        resultado = np.full(filas, GAMAS.index(self.defecto), dtype=np.int8)
+        for gama, union, condiciones in reversed(self.reglas):
+            mascara = None
+            for campo, operador, valor in condiciones:
+                parcial = _comparar(arreglos[campo], operador, valor)
+                if mascara is None:
+                    mascara = parcial
+                elif union == "todas":
+                    mascara &= parcial
+                else:
+                    mascara |= parcial
+            resultado[mascara] = GAMAS.index(gama)
+        return resultado
+
+
+def _comparar(arreglo, operador, valor):
+    if operador == "<":
+        return arreglo < valor
+    if operador == "<=":
+        return arreglo <= valor
+    if operador == "==":
+        return arreglo == valor
+    if operador == "!=":
+        return arreglo != valor
+    if operador == ">=":
+        return arreglo >= valor
+    return arreglo > valor
+
+
+def compilar(conjunto):
+    """Compila todas las definiciones de un conjunto de reglas.
+
+    Args:
+        conjunto (dict): Tipo -> definición de reglas.
+
+    Returns:
+        dict: Tipo -> ClasificadorCompilado.
+    """
+    return {tipo: ClasificadorCompilado(tipo, definicion) for tipo, definicion in conjunto.items()}
+
+
+class MotorReglas():
+    """Carga, compila e instala las reglas de gama con recarga en caliente.
+
+    Ejemplo:
+        motor = MotorReglas(conjunto="U4")
+        motor.instalar()
+        ...
+        motor.recargar()  # sólo recompila si el archivo cambió
+    """
+
+    def __init__(self, ruta=RUTA_POR_DEFECTO, conjunto="U4", clases=None):
+        """Prepara el motor sin instalar todavía ninguna regla.
+
+        Args:
+            ruta (str): Archivo JSON con los conjuntos de reglas.
+            conjunto (str): Nombre del conjunto a usar.
+            clases (dict): Tipo -> clase donde instalar las reglas; cada
+                clase necesita Gama.usar_clasificador. Por defecto son las
+                clases registradas en catalogo.ESQUEMAS (las de
+                proyectoU4.py y las de tipos.py).
+        """
+        self.ruta = ruta
+        self.conjunto = conjunto
+        self.clases = clases or {nombre: esquema.clase for nombre, esquema in ESQUEMAS.items()}
+        self.clasificadores = {}
+        self.version = 0
+        self.oyentes = []
+        self._originales = {}
+        self._modificado = None
+
+    def suscribir(self, oyente):
+        """Registra una función oyente(motor) que se llama tras instalar o restaurar reglas."""
+        self.oyentes.append(oyente)
+
+    def cancelar_suscripcion(self, oyente):
+        """Deja de avisarle a un oyente registrado con suscribir()."""
+        self.oyentes.remove(oyente)
+
+    def conectar(self, inventario):
+        """Reclasifica un Inventario cada vez que cambian las reglas instaladas.
+
+        Inventario.reclasificar() avisa a sus propios oyentes de cada gama
+        que cambia, así que las Estadisticas y el caché del servicio
+        conectados a ese inventario se actualizan con él.
+
+        Returns:
+            MotorReglas: El mismo motor, para encadenar.
+        """
+        self.suscribir(lambda motor: inventario.reclasificar())
+        return self
+
+    def _avisar(self):
+        for oyente in list(self.oyentes):
+            oyente(self)
+
+    def cargar(self):
+        """Lee y compila el conjunto de reglas sin instalarlo.
+
+        Returns:
+            dict: Tipo -> ClasificadorCompilado.
+
+        Raises:
+            KeyError: Si el archivo no tiene el conjunto solicitado.
+            ValueError: Si alguna regla es inválida.
+        """
+        modificado = os.stat(self.ruta).st_mtime_ns
+        clasificadores = compilar(cargar_reglas(self.ruta)[self.conjunto])
+        self._modificado = modificado
+        return clasificadores
+
+    def instalar(self, clasificadores=None):
+        """Instala los clasificadores compilados en las clases.
+
+        Si la compilación falla o algún tipo no tiene clase, las reglas
+        anteriores siguen instaladas en todas las clases. Después de
+        instalar se avisa a los suscriptores.
+
+        Args:
+            clasificadores (dict): Resultado de cargar(); si se omite se carga
+                el archivo.
+
+        Raises:
+            KeyError: Si algún tipo del conjunto no está en self.clases.
+        """
+        if clasificadores is None:
+            clasificadores = self.cargar()
+        faltantes = [tipo for tipo in clasificadores if tipo not in self.clases]
+        if faltantes:
+            raise KeyError(f"No hay clase para instalar las reglas de {', '.join(faltantes)}")
+        for tipo, clasificador in clasificadores.items():
+            clase = self.clases[tipo]
+            self._originales.setdefault(tipo, clase.__dict__.get("tipo_gama"))
+            clase.usar_clasificador(clasificador.tipo_gama)
+        self.clasificadores = clasificadores
+        self.version += 1
+        self._avisar()
+
+    def recargar(self, forzar=False):
+        """Vuelve a instalar las reglas si el archivo cambió.
+
+        Args:
+            forzar (bool): Recompila aunque el archivo no haya cambiado.
+
+        Returns:
+            bool: True si se instalaron reglas nuevas.
+        """
+        if not forzar and os.stat(self.ruta).st_mtime_ns == self._modificado:
+            return False
+        self.instalar(self.cargar())
+        return True
+
+    def restaurar(self):
+        """Regresa los métodos tipo_gama escritos a mano."""
+        for tipo, original in self._originales.items():
+            if original is None:
+                del self.clases[tipo].tipo_gama
+            else:
+                self.clases[tipo].usar_clasificador(original)
+        self._originales.clear()
+        self.clasificadores = {}
+        self.version += 1
+        self._avisar()
+
+    def codigos_tabla(self, tabla):
+        """Códigos de gama de todas las filas de una TablaColumnar con las reglas activas.
+
+        Los tipos que no están en el conjunto (por ejemplo los declarados
+        en tipos.py) usan su propia clasificación.
+        """
+        clasificador = self.clasificadores.get(tabla.esquema.nombre)
+        if clasificador is None:
+            return gama_vectorizada.codigos_tabla(tabla)
+        campos = clasificador.campos or ("precio",)
+        return clasificador.codigos({campo: tabla.columna(campo) for campo in campos})
+
+    def gama_tabla(self, tabla):
+        """Etiquetas de gama de todas las filas de una TablaColumnar."""
+        return etiquetas(self.codigos_tabla(tabla))
@@ -0,0 +1,271 @@
+"""Caché de __str__ y escritura masiva de fichas de electrodomésticos.
+
+Cada __str__ de proyectoU4.py vuelve a construir la cadena base, a formatear
+el precio con separadores de miles y a llamar tipo_gama(). CacheRender guarda
+el texto ya generado de cada objeto (o de cada fila de una tabla columnar)
+con una política LRU. Junto con el texto se guardan los valores de los
+campos y la función tipo_gama activa; una entrada sólo deja de servir
+cuando cambia algún campo o se recargan las reglas de gama, así que no hace
+falta avisarle al caché de cada cambio.
+
+Para generar el catálogo completo, escribir_objetos() y escribir_tabla()
+vuelcan las fichas en un solo búfer: las piezas de cada campo se unen por
+bloques con un solo "".join, sin armar una cadena intermedia por objeto. La
+salida es idéntica a llamar print(objeto) para cada uno.
+"""
+
+from collections import OrderedDict
+from itertools import chain, repeat
+from operator import attrgetter
+
+import gama_vectorizada
+from catalogo import ESQUEMAS
+
+CAPACIDAD = 10000
+TAMANO_BLOQUE = 4096
+
+# (texto previo, campo) en el mismo orden que los __str__ de proyectoU4.py
+PLANTILLA_BASE = (("ID: ", "id"), ("\nMarca: ", "marca"), ("\nmodelo: ", "modelo"),
+                  ("\nprecio: $", "precio"))
+PLANTILLAS = {
+    "Lavadora": PLANTILLA_BASE + ((" Pesos\nCapacidad De Carga: ", "capacidad_carga"),
+                                  (" kg\nConsumo De Agua: ", "consumo_agua"),
+                                  (" Litros\nCiclos De Lavado: ", "ciclos_lavado"),
+                                  ("\nTipo de gama: ", "gama")),
+    "Refrigerador": PLANTILLA_BASE + ((" Pesos\nNúmero de puertas:", "no_puertas"),
+                                      ("\nMetros cúbicos: ", "metros_cubicos"),
+                                      (" metros cúbicos\nCapacidad en pies cúbicos:", "pies_capacidad"),
+                                      (" pies cúbicos\nTipo de gama: ", "gama")),
+    "Microondas": PLANTILLA_BASE + ((" Pesos\nPotencia: ", "potencia"),
+                                    (" W\nConsumo De Energia: ", "consumo_energia"),
+                                    (" W\nMedidas (Ancho, Alto, Profundiad): ", "medidas"),
+                                    ("\nTipo de gama: ", "gama")),
+}
+# Clase -> plantilla o None (ver _plantilla)
+_PLANTILLAS_CLASE = {}
+
+
+def _plantilla(clase):
+    """Plantilla de una clase, o None si su __str__ no es el de proyectoU4.py.
+
+    nombre_tipo() también acepta las clases de U3.py y proyectoU3.py, que
+    formatean el precio de otra forma; sus fichas se generan con str().
+    """
+    try:
+        return _PLANTILLAS_CLASE[clase]
+    except KeyError:
+        pass
+    plantilla = None
+    for tipo, esquema in ESQUEMAS.items():
+        if issubclass(clase, esquema.clase):
+            if tipo in PLANTILLAS and clase.__str__ is esquema.clase.__str__:
+                plantilla = PLANTILLAS[tipo]
+            break
+    _PLANTILLAS_CLASE[clase] = plantilla
+    return plantilla
+
+
+def formatear_precio(precio):
+    """Formatea el precio igual que Electrodomestico.__str__ de proyectoU4.py."""
+    return format(precio, ",.2f")
+
+
+class CacheRender():
+    """Caché LRU de la salida de __str__ con contadores de aciertos y fallos.
+
+    Ejemplo:
+        cache = CacheRender(capacidad=50000)
+        texto = cache.render(lavadora)
+        print(cache.aciertos, cache.fallos)
+    """
+
+    def __init__(self, capacidad=CAPACIDAD):
+        """Crea un caché vacío.
+
+        Args:
+            capacidad (int): Máximo de fichas guardadas.
+        """
+        if capacidad < 1:
+            raise ValueError("La capacidad debe ser al menos 1")
+        self.capacidad = capacidad
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self._entradas = OrderedDict()
+        self._lectores = {}
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def _lector(self, clase):
+        lector = self._lectores.get(clase)
+        if lector is None:
+            for base in clase.__mro__:
+                if base.__name__ in ESQUEMAS:
+                    break
+            else:
+                raise TypeError(f"Tipo de electrodoméstico no soportado: {clase.__name__}")
+            lector = self._lectores[clase] = attrgetter(*ESQUEMAS[base.__name__].campos)
+        return lector
+
+    def render(self, obj):
+        """Devuelve str(obj), usando la copia guardada si sigue vigente.
+
+        Args:
+            obj: Lavadora, Refrigerador, Microondas o una vista de fila.
+
+        Returns:
+            str: El mismo texto que str(obj).
+        """
+        clase = type(obj)
+        valores = self._lector(clase)(obj)
+        entradas = self._entradas
+        clave, dueno = _clave(obj)
+        entrada = entradas.get(clave)
+        # Se guarda una referencia al dueño de la clave, así que su id no se
+        # puede reciclar mientras la entrada exista
+        if (entrada is not None and entrada[0] is dueno and entrada[1] is clase.tipo_gama
+                and entrada[2] == valores):
+            self.aciertos += 1
+            entradas.move_to_end(clave)
+            return entrada[3]
+        self.fallos += 1
+        texto = str(obj)
+        entradas[clave] = (dueno, clase.tipo_gama, valores, texto)
+        entradas.move_to_end(clave)
+        if len(entradas) > self.capacidad:
+            entradas.popitem(last=False)
+            self.desalojos += 1
+        return texto
+
+    def invalidar(self, obj):
+        """Descarta la ficha guardada de un objeto."""
+        self._entradas.pop(_clave(obj)[0], None)
+
+    def limpiar(self):
+        """Vacía el caché sin reiniciar los contadores."""
+        self._entradas.clear()
+
+    def estadisticas(self):
+        """Devuelve los contadores del caché.
+
+        Returns:
+            dict: entradas, capacidad, aciertos, fallos, desalojos y tasa de
+            aciertos.
+        """
+        consultas = self.aciertos + self.fallos
+        return {"entradas": len(self._entradas), "capacidad": self.capacidad,
+                "aciertos": self.aciertos, "fallos": self.fallos,
+                "desalojos": self.desalojos,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0}
+
+
+def _clave(obj):
+    """Clave del caché y objeto que la respalda.
+
+    Las vistas de fila de catalogo.TablaColumnar son temporales (fila()
+    crea una nueva cada vez), así que se identifican por su tabla y su
+    posición; los objetos normales, por su id.
+    """
+    tabla = getattr(obj, "_tabla", None)
+    if tabla is not None:
+        return (id(tabla), obj._fila), tabla
+    return id(obj), obj
+
+
+def escribir_objetos(objetos, salida, fin="\n", cache=None, tamano_bloque=TAMANO_BLOQUE):
+    """Escribe las fichas de varios objetos en un solo búfer.
+
+    Args:
+        objetos (iterable): Electrodomésticos a escribir.
+        salida: Archivo o io.StringIO con método write.
+        fin (str): Texto que sigue a cada ficha, como en print().
+        cache (CacheRender): Si se indica, se toman las fichas del caché.
+        tamano_bloque (int): Objetos que se juntan antes de cada write.
+
+    Returns:
+        int: Número de fichas escritas.
+    """
+    piezas = []
+    agregar = piezas.append
+    escritas = 0
+    for obj in objetos:
+        plantilla = _plantilla(type(obj)) if cache is None else None
+        if cache is not None:
+            agregar(cache.render(obj))
+        elif plantilla is None:
+            agregar(str(obj))
+        else:
+            for texto, campo in plantilla:
+                agregar(texto)
+                if campo == "precio":
+                    agregar(formatear_precio(obj.precio))
+                elif campo == "gama":
+                    agregar(obj.tipo_gama())
+                else:
+                    agregar(str(getattr(obj, campo)))
+        agregar(fin)
+        escritas += 1
+        if escritas % tamano_bloque == 0:
+            salida.write("".join(piezas))
+            piezas.clear()
+    if piezas:
+        salida.write("".join(piezas))
+    return escritas
+
+
+def _textos_columna(tabla, campo, inicio, fin):
+    """Convierte un tramo de columna a texto respetando int contra float."""
+    columna = tabla.columna(campo)[inicio:fin]
+    if campo in tabla.textos:
+        return [str(valor) for valor in columna]
+    if campo == "precio":
+        return [formatear_precio(valor) for valor in columna]
+    bit = 1 << tabla.esquema.numeros.index(campo)
+    return [str(int(valor)) if mascara & bit else str(valor)
+            for valor, mascara in zip(columna, tabla.enteros[inicio:fin])]
+
+
+def escribir_tabla(tabla, salida, fin="\n", motor=None, tamano_bloque=TAMANO_BLOQUE,
+                   codigos=None):
+    """Escribe todas las fichas de una TablaColumnar leyendo columnas directamente.
+
+    No se crean vistas ni objetos: cada campo de un bloque se convierte a
+    texto de una vez y las piezas se intercalan con los textos fijos de la
+    plantilla.
+
+    Args:
+        tabla (catalogo.TablaColumnar): Tabla a escribir.
+        salida: Archivo o búfer con método write.
+        fin (str): Texto que sigue a cada ficha.
+        motor (reglas_gama.MotorReglas): Si se indica, la gama sale de sus
+            reglas instaladas; si no, de las reglas U4 de proyectoU4.py.
+        tamano_bloque (int): Filas por bloque.
+        codigos: Códigos de gama ya calculados para la tabla, si se tienen.
+
+    Returns:
+        int: Número de fichas escritas.
+    """
+    plantilla = PLANTILLAS[tabla.esquema.nombre]
+    if codigos is None and motor is not None:
+        codigos = motor.codigos_tabla(tabla)
+    elif codigos is None:
+        codigos = gama_vectorizada.codigos_tabla(tabla, "U4")
+    total = len(tabla)
+    for inicio in range(0, total, tamano_bloque):
+        final = min(inicio + tamano_bloque, total)
+        columnas = []
+        for texto, campo in plantilla:
+            columnas.append(repeat(texto))
+            if campo == "gama":
+                columnas.append(gama_vectorizada.etiquetas(codigos[inicio:final]))
+            else:
+                columnas.append(_textos_columna(tabla, campo, inicio, final))
+        columnas.append(repeat(fin))
+        salida.write("".join(chain.from_iterable(zip(*columnas))))
+    return total
+
+
+def escribir_catalogo(catalogo, salida, fin="\n", motor=None):
+    """Escribe las fichas de todas las tablas de un Catalogo, tipo por tipo."""
+    return sum(escribir_tabla(tabla, salida, fin, motor) for tabla in catalogo.tablas.values())
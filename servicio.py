@@ -0,0 +1,382 @@
+"""Servicio HTTP/JSON asíncrono sobre el inventario de electrodomésticos.
+
+Sustituye el ciclo de input() de proyectoU4.py cuando el catálogo se usa
+desde otros programas. Todo corre en un solo ciclo de asyncio, así que las
+lecturas son concurrentes entre sí y nunca ven un estado a medias: las altas
+se encolan y una tarea las aplica al inventario por lotes (todas las que
+lleguen dentro de una ventana corta). El caché de respuestas de las
+consultas frecuentes se vacía con cualquier modificación del inventario,
+venga de un lote de altas o de otro componente (por ejemplo un cambio de
+precios con precios.MotorPrecios), y con cada recarga de reglas de gama.
+
+Rutas:
+    POST /electrodomesticos            alta, cuerpo JSON con "tipo" y los campos
+    GET  /electrodomesticos/{id}       consulta por id
+    GET  /electrodomesticos?tipo=...   filtro: tipo, marca, gama, <campo>,
+                                       <campo>_min y <campo>_max
+    GET  /gama/{gama}?tipo=...         electrodomésticos de una gama
+    GET  /estadisticas?tipo=...&marca= conteo, precios y gamas agregados
+
+Ejemplo:
+    python servicio.py 8080
+"""
+
+import asyncio
+import json
+import sys
+from collections import OrderedDict
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from catalogo import ESQUEMAS, buscar_tipo, nombre_tipo
+from estadisticas import Estadisticas
+from inventario import Inventario, Rango
+from validacion import convertir_numero, validar_columnas
+
+ESPERA_LOTE = 0.002
+TAMANO_LOTE = 512
+CAPACIDAD_CACHE = 1024
+
+_RAZONES = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class ErrorHTTP(Exception):
+    """Error que se responde al cliente con su código de estado."""
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+def a_dict(obj):
+    """Representación JSON de un electrodoméstico, incluida su gama."""
+    tipo = nombre_tipo(obj)
+    datos = {"tipo": tipo}
+    for campo in ESQUEMAS[tipo].campos:
+        datos[campo] = getattr(obj, campo)
+    datos["gama"] = obj.tipo_gama()
+    return datos
+
+
+def desde_dict(datos):
+    """Construye un electrodoméstico a partir del cuerpo de una petición.
+
+    Raises:
+        ErrorHTTP: 400 si falta el tipo o algún campo, o si un valor es
+            inválido o está fuera de rango (ver validacion.py).
+    """
+    if not isinstance(datos, dict):
+        raise ErrorHTTP(400, "El cuerpo debe ser un objeto JSON")
+    tipo = buscar_tipo(datos.get("tipo", ""))
+    if tipo is None:
+        raise ErrorHTTP(400, f"Tipo desconocido: {datos.get('tipo')!r}")
+    esquema = ESQUEMAS[tipo]
+    for campo in esquema.campos:
+        if campo not in datos:
+            raise ErrorHTTP(400, f"Falta el campo {campo}")
+    resultado = validar_columnas(tipo, {campo: [datos[campo]] for campo in esquema.campos})
+    if resultado.errores[0]:
+        raise ErrorHTTP(400, resultado.motivo(0))
+    valores = [columna[0] for columna in resultado.columnas.values()]
+    return esquema.clase(*valores)
+
+
+class ServicioCatalogo():
+    """Servidor HTTP/1.1 con keep-alive sobre un Inventario compartido.
+
+    Ejemplo:
+        servicio = ServicioCatalogo()
+        await servicio.iniciar("127.0.0.1", 0)
+        ...
+        await servicio.detener()
+    """
+
+    def __init__(self, inventario=None, espera_lote=ESPERA_LOTE, tamano_lote=TAMANO_LOTE,
+                 capacidad_cache=CAPACIDAD_CACHE, cambios=None, reglas=None):
+        """Configura el servicio.
+
+        Args:
+            inventario (Inventario): Inventario compartido; se crea uno vacío
+                si se omite.
+            espera_lote (float): Segundos que se espera para juntar altas.
+            tamano_lote (int): Máximo de altas aplicadas de una vez.
+            capacidad_cache (int): Respuestas GET guardadas.
+            cambios (FlujoCambios): Flujo de cambios que se conecta al
+                inventario; los lotes de altas esperan a que sus
+                suscriptores tengan espacio.
+            reglas (reglas_gama.MotorReglas): Motor de reglas de gama; cada
+                recarga reclasifica el inventario (y con él las
+                estadísticas) y vacía el caché de respuestas.
+        """
+        self.inventario = inventario if inventario is not None else Inventario()
+        self.estadisticas = Estadisticas().conectar(self.inventario)
+        self.espera_lote = espera_lote
+        self.tamano_lote = tamano_lote
+        self.capacidad_cache = capacidad_cache
+        self.cache = OrderedDict()
+        self.inventario.suscribir(self._invalidar_cache)
+        self.cambios = cambios.conectar(self.inventario) if cambios is not None else None
+        if reglas is not None:
+            reglas.conectar(self.inventario).suscribir(self._reglas_recargadas)
+        self.aciertos_cache = 0
+        self.lotes_aplicados = 0
+        self.reinicios_escritor = 0
+        self.error_escritor = None
+        self._pendientes = None
+        self._escritor = None
+        self._servidor = None
+
+    @property
+    def puerto(self):
+        """Puerto en el que escucha el servidor."""
+        return self._servidor.sockets[0].getsockname()[1]
+
+    async def iniciar(self, anfitrion="127.0.0.1", puerto=8080):
+        """Abre el socket y arranca la tarea que aplica los lotes de altas."""
+        self._pendientes = asyncio.Queue()
+        self._arrancar_escritor()
+        self._servidor = await asyncio.start_server(self._atender, anfitrion, puerto)
+        return self
+
+    async def detener(self):
+        """Cierra el servidor y termina la tarea de escritura."""
+        self._servidor.close()
+        await self._servidor.wait_closed()
+        escritor, self._escritor = self._escritor, None
+        escritor.cancel()
+        try:
+            await escritor
+        except asyncio.CancelledError:
+            pass
+
+    def _arrancar_escritor(self):
+        self._escritor = asyncio.create_task(self._aplicar_lotes())
+        self._escritor.add_done_callback(self._escritor_terminado)
+
+    def _escritor_terminado(self, tarea):
+        """Vuelve a arrancar la tarea de escritura si terminó sin que se detuviera el servicio.
+
+        Sin ella las altas encoladas esperarían para siempre.
+        """
+        if tarea is self._escritor and not tarea.cancelled():
+            self.error_escritor = tarea.exception()
+            self.reinicios_escritor += 1
+            self._arrancar_escritor()
+
+    async def _aplicar_lotes(self):
+        """Junta las altas pendientes y las aplica al inventario de una vez.
+
+        Un error al aplicar un alta sólo le llega a la petición que la pidió;
+        las peticiones cuyo cliente ya se fue (futuro cancelado) se saltan.
+        """
+        while True:
+            lote = [await self._pendientes.get()]
+            limite = asyncio.get_running_loop().time() + self.espera_lote
+            while len(lote) < self.tamano_lote:
+                restante = limite - asyncio.get_running_loop().time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self._pendientes.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                if self.cambios is not None:
+                    await self.cambios.esperar_espacio()
+            except Exception as error:
+                for _, futuro in lote:
+                    if not futuro.done():
+                        futuro.set_exception(error)
+                continue
+            for obj, futuro in lote:
+                if futuro.done():
+                    continue
+                try:
+                    self.inventario.agregar(obj)
+                except ValueError as error:
+                    futuro.set_exception(ErrorHTTP(400, str(error)))
+                except Exception as error:
+                    futuro.set_exception(error)
+                else:
+                    futuro.set_result(obj)
+            self.lotes_aplicados += 1
+
+    def _invalidar_cache(self, operacion, tipo, gama, obj, anteriores):
+        """Oyente del inventario: cualquier modificación vuelve viejas las respuestas."""
+        self.cache.clear()
+
+    def _reglas_recargadas(self, motor):
+        """Oyente del motor de reglas: las gamas en caché pueden haber cambiado."""
+        self.cache.clear()
+
+    async def crear(self, datos):
+        """Encola un alta y espera a que su lote se aplique."""
+        obj = desde_dict(datos)
+        futuro = asyncio.get_running_loop().create_future()
+        await self._pendientes.put((obj, futuro))
+        return a_dict(await futuro)
+
+    def obtener(self, id):
+        """Datos de un electrodoméstico por id."""
+        if id not in self.inventario:
+            raise ErrorHTTP(404, f"No existe el electrodoméstico {id!r}")
+        return a_dict(self.inventario.obtener(id))
+
+    def filtrar(self, parametros):
+        """Resuelve una consulta de filtro con los índices del inventario."""
+        parametros = dict(parametros)
+        tipo = parametros.pop("tipo", None)
+        if tipo is not None:
+            tipo = buscar_tipo(tipo)
+            if tipo is None:
+                raise ErrorHTTP(400, "Tipo desconocido")
+        marca = parametros.pop("marca", None)
+        gama = parametros.pop("gama", None)
+        condiciones = {}
+        for nombre, texto in parametros.items():
+            campo, limite = nombre, None
+            if nombre.endswith(("_min", "_max")):
+                campo, limite = nombre[:-4], nombre[-3:]
+            try:
+                valor = convertir_numero(texto)
+            except ValueError:
+                raise ErrorHTTP(400, f"{nombre} debe ser numérico") from None
+            rango = condiciones.setdefault(campo, Rango())
+            if limite != "max":
+                rango.minimo = valor
+            if limite != "min":
+                rango.maximo = valor
+        try:
+            encontrados = self.inventario.buscar(tipo, marca=marca, gama=gama, **condiciones)
+        except ValueError as error:
+            raise ErrorHTTP(400, str(error)) from None
+        return [a_dict(obj) for obj in encontrados]
+
+    def _consultar(self, ruta, parametros):
+        partes = [unquote(parte) for parte in ruta.strip("/").split("/")]
+        if partes == ["electrodomesticos"]:
+            return self.filtrar(parametros)
+        if len(partes) == 2 and partes[0] == "electrodomesticos":
+            return self.obtener(partes[1])
+        if partes == ["estadisticas"]:
+            parametros = dict(parametros)
+            tipo = parametros.get("tipo")
+            return self.estadisticas.consultar((buscar_tipo(tipo) or tipo) if tipo else None,
+                                               parametros.get("marca")).como_dict()
+        if len(partes) == 2 and partes[0] == "gama":
+            return self.filtrar(dict(parametros, gama=partes[1].capitalize()))
+        raise ErrorHTTP(404, f"Ruta desconocida: {ruta}")
+
+    async def responder(self, metodo, destino, cuerpo):
+        """Atiende una petición ya leída.
+
+        Returns:
+            tuple: (estado, cuerpo en bytes)
+        """
+        url = urlsplit(destino)
+        if metodo == "GET":
+            cache = self.cache
+            guardado = cache.get(destino)
+            if guardado is not None:
+                self.aciertos_cache += 1
+                cache.move_to_end(destino)
+                return 200, guardado
+            datos = self._consultar(url.path, parse_qsl(url.query))
+            respuesta = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+            cache[destino] = respuesta
+            if len(cache) > self.capacidad_cache:
+                cache.popitem(last=False)
+            return 200, respuesta
+        if metodo == "POST" and url.path.rstrip("/") == "/electrodomesticos":
+            try:
+                datos = json.loads(cuerpo or b"null")
+            except json.JSONDecodeError as error:
+                raise ErrorHTTP(400, f"JSON inválido: {error}") from None
+            return 201, json.dumps(await self.crear(datos), ensure_ascii=False).encode("utf-8")
+        raise ErrorHTTP(405, f"Método no permitido: {metodo}")
+
+    async def _atender(self, lector, escritor):
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                metodo, destino, _ = linea.decode("latin-1").split(" ", 2)
+                encabezados = {}
+                while True:
+                    linea = await lector.readline()
+                    if linea in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = linea.decode("latin-1").partition(":")
+                    encabezados[nombre.strip().lower()] = valor.strip()
+                largo = int(encabezados.get("content-length", 0))
+                cuerpo = await lector.readexactly(largo) if largo else b""
+                try:
+                    estado, respuesta = await self.responder(metodo, destino, cuerpo)
+                except ErrorHTTP as error:
+                    estado = error.estado
+                    respuesta = json.dumps({"error": str(error)}, ensure_ascii=False).encode("utf-8")
+                except Exception as error:
+                    estado = 500
+                    respuesta = json.dumps({"error": str(error)}, ensure_ascii=False).encode("utf-8")
+                cerrar = encabezados.get("connection", "").lower() == "close"
+                escritor.write(f"HTTP/1.1 {estado} {_RAZONES[estado]}\r\n"
+                               f"Content-Type: application/json; charset=utf-8\r\n"
+                               f"Content-Length: {len(respuesta)}\r\n"
+                               f"Connection: {'close' if cerrar else 'keep-alive'}\r\n\r\n"
+                               .encode("latin-1") + respuesta)
+                await escritor.drain()
+                if cerrar:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            escritor.close()
+
+
+class ClienteHTTP():
+    """Cliente mínimo con keep-alive para pruebas contra el servicio local."""
+
+    def __init__(self, anfitrion, puerto):
+        self.anfitrion = anfitrion
+        self.puerto = puerto
+        self._lector = None
+        self._escritor = None
+
+    async def conectar(self):
+        self._lector, self._escritor = await asyncio.open_connection(self.anfitrion, self.puerto)
+        return self
+
+    async def cerrar(self):
+        self._escritor.close()
+        await self._escritor.wait_closed()
+
+    async def pedir(self, metodo, destino, datos=None):
+        """Envía una petición y devuelve (estado, JSON decodificado)."""
+        cuerpo = b"" if datos is None else json.dumps(datos).encode("utf-8")
+        self._escritor.write(f"{metodo} {destino} HTTP/1.1\r\nHost: {self.anfitrion}\r\n"
+                             f"Content-Length: {len(cuerpo)}\r\n\r\n".encode("latin-1") + cuerpo)
+        await self._escritor.drain()
+        estado = int((await self._lector.readline()).split()[1])
+        largo = 0
+        while True:
+            linea = await self._lector.readline()
+            if linea in (b"\r\n", b""):
+                break
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            if nombre.lower() == "content-length":
+                largo = int(valor)
+        return estado, json.loads(await self._lector.readexactly(largo))
+
+
+async def _principal(puerto):
+    servicio = await ServicioCatalogo().iniciar("127.0.0.1", puerto)
+    print(f"Servicio escuchando en http://127.0.0.1:{servicio.puerto}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_principal(int(sys.argv[1]) if len(sys.argv) > 1 else 8080))
+    except KeyboardInterrupt:
+        print("\nServicio detenido.")
@@ -0,0 +1,241 @@
+"""Búsqueda de electrodomésticos similares para "modelos comparables".
+
+Comparar una Lavadora contra todas las demás campo por campo cuesta O(n)
+por consulta. IndiceSimilares guarda, por tipo, un vector con las
+especificaciones numéricas y el precio de cada artículo, normalizado a
+media 0 y desviación 1 por campo (más un peso opcional), en un
+indice_espacial.IndiceKD. Los k más parecidos son los k vecinos más
+cercanos en ese espacio, y la búsqueda sólo visita las ramas del árbol
+cercanas a la consulta.
+
+La escala de cada campo se calcula al construir el índice y se mantiene en
+las altas posteriores; cuando el índice duplica su tamaño desde el último
+ajuste se recalcula y se reconstruye el árbol.
+
+Similares junta un índice por tipo y se puede conectar a un Inventario para
+seguir sus altas, cambios y bajas.
+
+Ejemplo:
+    similares = Similares().conectar(inventario)
+    similares.similares("Lavadora", "8MWTW2224WJM", k=5)
+    # [(0.41, "L1021"), (0.57, "L88"), ...]
+"""
+
+from math import isnan, sqrt
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from catalogo import ESQUEMAS
+from indice_espacial import HOJA, IndiceKD
+
+
+def _media_desviacion(columna):
+    """Media y desviación estándar de una columna; la desviación nunca es 0."""
+    if np is not None:
+        arreglo = np.asarray(columna, dtype=np.float64)
+        if len(arreglo):
+            media, desviacion = float(arreglo.mean()), float(arreglo.std())
+            return media, desviacion or 1.0
+        return 0.0, 1.0
+    if not columna:
+        return 0.0, 1.0
+    media = sum(columna) / len(columna)
+    desviacion = sqrt(sum((valor - media) ** 2 for valor in columna) / len(columna))
+    return media, desviacion or 1.0
+
+
+class IndiceSimilares():
+    """Vecinos más cercanos de un solo tipo de electrodoméstico.
+
+    Atributos:
+        tipo (str): Tipo del índice.
+        campos (tuple): Campos numéricos que forman el vector.
+        pesos (tuple): Peso de cada campo en la distancia.
+        valores (dict): Id -> valores originales del vector.
+    """
+
+    def __init__(self, tipo, campos=None, pesos=None, hoja=HOJA):
+        """Crea un índice vacío.
+
+        Args:
+            tipo (str): Tipo registrado en ESQUEMAS.
+            campos (tuple): Campos del vector; por defecto todos los
+                numéricos del tipo, incluido el precio.
+            pesos (dict): Campo -> peso; los que falten pesan 1.
+            hoja (int): Puntos por hoja del árbol k-d.
+        """
+        self.tipo = tipo
+        self.campos = tuple(campos or ESQUEMAS[tipo].numeros)
+        pesos = pesos or {}
+        self.pesos = tuple(float(pesos.get(campo, 1.0)) for campo in self.campos)
+        self.hoja = hoja
+        self.valores = {}
+        self.medias = (0.0,) * len(self.campos)
+        self.escalas = self.pesos
+        self.indice = IndiceKD(len(self.campos), hoja)
+        self._ajustado = 0
+
+    def __len__(self):
+        return len(self.valores)
+
+    def __contains__(self, id):
+        return id in self.valores
+
+    @classmethod
+    def desde_tabla(cls, tabla, campos=None, pesos=None, hoja=HOJA):
+        """Construye el índice con todas las filas de una TablaColumnar.
+
+        Las filas con algún campo NaN se omiten.
+        """
+        indice = cls(tabla.esquema.nombre, campos, pesos, hoja)
+        columnas = [tabla.columna(campo) for campo in indice.campos]
+        filas = zip(tabla.columna("id"), zip(*columnas))
+        indice.valores = {id: valores for id, valores in filas
+                          if not any(map(isnan, valores))}
+        indice.reconstruir()
+        return indice
+
+    def _ajustar_escala(self):
+        """Recalcula media y escala de cada campo con los valores actuales."""
+        columnas = list(zip(*self.valores.values())) or [()] * len(self.campos)
+        medias = []
+        escalas = []
+        for columna, peso in zip(columnas, self.pesos):
+            media, desviacion = _media_desviacion(columna)
+            medias.append(media)
+            escalas.append(peso / desviacion)
+        self.medias = tuple(medias)
+        self.escalas = tuple(escalas)
+        self._ajustado = len(self.valores)
+
+    def normalizar(self, valores):
+        """Convierte los valores originales en el punto del espacio de búsqueda."""
+        return tuple((valor - media) * escala
+                     for valor, media, escala in zip(valores, self.medias, self.escalas))
+
+    def reconstruir(self):
+        """Ajusta la escala y reconstruye el árbol con un solo recorrido."""
+        self._ajustar_escala()
+        claves = list(self.valores)
+        columnas = []
+        for posicion, (media, escala) in enumerate(zip(self.medias, self.escalas)):
+            columna = [valores[posicion] for valores in self.valores.values()]
+            if np is not None:
+                columna = ((np.asarray(columna, dtype=np.float64) - media) * escala).tolist()
+            else:
+                columna = [(valor - media) * escala for valor in columna]
+            columnas.append(columna)
+        self.indice = IndiceKD.desde_columnas(columnas, claves, self.hoja)
+
+    def agregar(self, id, valores):
+        """Agrega o reemplaza un artículo.
+
+        Args:
+            id: Id del electrodoméstico.
+            valores (sequence): Valores en el orden de campos.
+
+        Raises:
+            ValueError: Si falta un valor o alguno es NaN.
+        """
+        valores = tuple(float(valor) for valor in valores)
+        if len(valores) != len(self.campos) or any(map(isnan, valores)):
+            raise ValueError(f"Valores inválidos para {self.campos}: {valores}")
+        self.valores[id] = valores
+        if len(self.valores) > 2 * max(self._ajustado, self.hoja):
+            self.reconstruir()
+        else:
+            self.indice.insertar(self.normalizar(valores), id)
+
+    def agregar_objeto(self, obj):
+        """Agrega un electrodoméstico leyendo sus campos."""
+        self.agregar(obj.id, [getattr(obj, campo) for campo in self.campos])
+
+    def quitar(self, id):
+        """Quita un artículo; no hace nada si no está."""
+        if self.valores.pop(id, None) is not None:
+            self.indice.eliminar(id)
+
+    def vecinos(self, valores, k=5, epsilon=0.0, excluir=None):
+        """Los k artículos más parecidos a unos valores dados.
+
+        Args:
+            valores (sequence): Valores en el orden de campos.
+            k (int): Cantidad de resultados.
+            epsilon (float): Margen de aproximación (ver IndiceKD.vecinos).
+            excluir: Id que no se debe devolver.
+
+        Returns:
+            list: Tuplas (distancia, id) de la más parecida a la menos.
+        """
+        return self.indice.vecinos(self.normalizar(valores), k, epsilon, excluir)
+
+    def similares(self, id, k=5, epsilon=0.0):
+        """Los k artículos más parecidos a uno del índice, sin incluirlo.
+
+        Raises:
+            KeyError: Si el id no está en el índice.
+        """
+        return self.vecinos(self.valores[id], k, epsilon, excluir=id)
+
+    def similares_lote(self, ids, k=5, epsilon=0.0):
+        """similares() para muchos ids.
+
+        Returns:
+            dict: Id -> lista de (distancia, id).
+        """
+        return {id: self.similares(id, k, epsilon) for id in ids}
+
+
+class Similares():
+    """Un IndiceSimilares por tipo.
+
+    Atributos:
+        indices (dict): Tipo -> IndiceSimilares.
+    """
+
+    def __init__(self, pesos=None, hoja=HOJA):
+        """
+        Args:
+            pesos (dict): Campo -> peso, compartido por todos los tipos.
+            hoja (int): Puntos por hoja de los árboles.
+        """
+        self.pesos = pesos
+        self.hoja = hoja
+        self.indices = {tipo: IndiceSimilares(tipo, pesos=pesos, hoja=hoja) for tipo in ESQUEMAS}
+
+    @classmethod
+    def desde_catalogo(cls, catalogo, pesos=None, hoja=HOJA):
+        """Construye los índices desde las columnas de un Catalogo."""
+        similares = cls(pesos, hoja)
+        for tipo, tabla in catalogo.tablas.items():
+            similares.indices[tipo] = IndiceSimilares.desde_tabla(tabla, pesos=pesos, hoja=hoja)
+        return similares
+
+    def conectar(self, inventario):
+        """Indexa el contenido actual del inventario y se suscribe a sus cambios."""
+        for tipo, indice in self.indices.items():
+            for id in inventario.ordenados[tipo, "precio"].ids:
+                valores = [getattr(inventario.objetos[id], campo) for campo in indice.campos]
+                indice.valores[id] = tuple(map(float, valores))
+            indice.reconstruir()
+        inventario.suscribir(self.notificar)
+        return self
+
+    def notificar(self, operacion, tipo, gama, obj, anteriores):
+        """Oyente de Inventario.suscribir()."""
+        indice = self.indices[tipo]
+        if operacion == "baja":
+            indice.quitar(obj.id)
+        elif operacion == "alta" or set(indice.campos).intersection(anteriores):
+            indice.agregar_objeto(obj)
+
+    def similares(self, tipo, id, k=5, epsilon=0.0):
+        """Los k artículos del mismo tipo más parecidos a uno dado."""
+        return self.indices[tipo].similares(id, k, epsilon)
+
+    def similares_lote(self, tipo, ids, k=5, epsilon=0.0):
+        """similares() para muchos ids de un mismo tipo."""
+        return self.indices[tipo].similares_lote(ids, k, epsilon)
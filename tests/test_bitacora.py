@@ -0,0 +1,126 @@
+import os
+import threading
+
+import pytest
+
+from bitacora import Almacen, Bitacora, codificar, leer_registros
+from proyectoU4 import Lavadora, Microondas, Refrigerador
+
+
+def _operar(almacen):
+    almacen.agregar(Lavadora("L1", "LG", "WM1", 9000, 20, 80, 10))
+    almacen.agregar(Refrigerador("R1", "Mabe", "RM", 15000, 2, 12, 420))
+    almacen.agregar(Microondas("M1", "Ñandú", "MW", 3000, 1200, 1500.5, "54x32.2x43.3"))
+    almacen.actualizar("L1", precio=8500, ciclos_lavado=4)
+    almacen.eliminar("R1")
+
+
+def _estado(inventario):
+    return sorted(str(obj) for obj in inventario)
+
+
+def _segmento(directorio):
+    nombres = sorted(nombre for nombre in os.listdir(directorio) if nombre.startswith("bitacora-"))
+    return os.path.join(directorio, nombres[-1])
+
+
+def test_registros_cortados_o_danados_se_descartan():
+    datos = codificar(["baja", "A"]) + codificar(["cambio", "B", {"precio": 10}])
+    assert leer_registros(datos) == ([["baja", "A"], ["cambio", "B", {"precio": 10}]], len(datos))
+    for corte in range(len(codificar(["baja", "A"])), len(datos)):
+        assert leer_registros(datos[:corte]) == ([["baja", "A"]], len(codificar(["baja", "A"])))
+    danado = datos[:-1] + bytes([datos[-1] ^ 1])
+    assert leer_registros(danado)[0] == [["baja", "A"]]
+
+
+def test_reabrir_recupera_el_estado(tmp_path):
+    with Almacen(str(tmp_path)) as almacen:
+        _operar(almacen)
+        esperado = _estado(almacen.inventario)
+    with Almacen(str(tmp_path)) as almacen:
+        assert _estado(almacen.inventario) == esperado
+        assert almacen.recuperadas == 5
+
+
+def test_recuperacion_tras_corte_en_cada_byte_del_ultimo_registro(tmp_path):
+    with Almacen(str(tmp_path / "base")) as almacen:
+        _operar(almacen)
+        sin_ultimo = _estado(almacen.inventario)
+        almacen.agregar(Lavadora("L2", "Mabe", "LM", 7000, 9, 50, 2))
+    ruta = _segmento(str(tmp_path / "base"))
+    with open(ruta, "rb") as archivo:
+        datos = archivo.read()
+    _, antes_del_ultimo = leer_registros(datos[:-1])
+    for corte in range(antes_del_ultimo, len(datos)):
+        directorio = tmp_path / f"corte{corte}"
+        directorio.mkdir()
+        (directorio / os.path.basename(ruta)).write_bytes(datos[:corte])
+        with Almacen(str(directorio)) as almacen:
+            assert _estado(almacen.inventario) == sin_ultimo
+            assert os.path.getsize(directorio / os.path.basename(ruta)) == antes_del_ultimo
+            # Lo que se escribe después queda tras la cola truncada y se lee bien
+            almacen.agregar(Lavadora("L3", "LG", "X", 5000, 8, 40, 1))
+        with Almacen(str(directorio)) as almacen:
+            assert "L3" in {obj.id for obj in almacen.inventario}
+            assert almacen.recuperadas == 6
+
+
+def test_compactar_y_caida_a_mitad_de_compactacion(tmp_path):
+    with Almacen(str(tmp_path)) as almacen:
+        _operar(almacen)
+        almacen.compactar()
+        almacen.actualizar("M1", precio=2800)
+        esperado = _estado(almacen.inventario)
+    assert sorted(os.listdir(tmp_path)) == ["bitacora-000001.log", "instantanea-000001.elec"]
+    with Almacen(str(tmp_path)) as almacen:
+        assert _estado(almacen.inventario) == esperado
+        assert almacen.recuperadas == 1
+        # Caída después de abrir el segmento nuevo y antes de escribir la
+        # instantánea: se usa la instantánea anterior con todos sus segmentos
+        almacen.bitacora.cerrar()
+        open(tmp_path / "bitacora-000002.log", "wb").close()
+    with Almacen(str(tmp_path)) as almacen:
+        assert _estado(almacen.inventario) == esperado
+        assert almacen.segmento == 2
+
+
+def test_commit_en_grupo_con_varios_hilos(tmp_path):
+    bitacora = Bitacora(str(tmp_path / "bitacora.log"))
+    escritores = [threading.Thread(target=lambda numero=numero: [bitacora.registrar(["baja", f"{numero}-{i}"])
+                                                                 for i in range(50)])
+                  for numero in range(8)]
+    for escritor in escritores:
+        escritor.start()
+    for escritor in escritores:
+        escritor.join()
+    bitacora.cerrar()
+    assert bitacora.durable == bitacora.ultimo == 400
+    assert 1 <= bitacora.grupos <= 400
+    with open(bitacora.ruta, "rb") as archivo:
+        operaciones, _ = leer_registros(archivo.read())
+    assert sorted(operacion[1] for operacion in operaciones) == sorted(
+        f"{numero}-{i}" for numero in range(8) for i in range(50))
+
+
+@pytest.mark.parametrize("sincrono", [True, False])
+def test_modo_asincrono_es_durable_al_sincronizar(tmp_path, sincrono):
+    almacen = Almacen(str(tmp_path), sincrono=sincrono)
+    _operar(almacen)
+    almacen.sincronizar()
+    with open(_segmento(str(tmp_path)), "rb") as archivo:
+        assert len(leer_registros(archivo.read())[0]) == 5
+    almacen.cerrar()
+
+
+@pytest.mark.parametrize("sincrono", [True, False])
+def test_compactacion_automatica_sin_sincronizar(tmp_path, sincrono):
+    almacen = Almacen(str(tmp_path), sincrono=sincrono, compactar_bytes=1000)
+    for numero in range(40):
+        almacen.agregar(Lavadora(f"L{numero}", "LG", "WM1", 9000, 20, 80, 10))
+        # El segmento nunca crece mucho más allá del límite
+        assert almacen.bitacora.tamano < 1000
+    assert almacen.segmento > 1
+    esperado = _estado(almacen.inventario)
+    almacen.cerrar()
+    with Almacen(str(tmp_path)) as almacen:
+        assert _estado(almacen.inventario) == esperado
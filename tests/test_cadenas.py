@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+import cadenas as modulo
+import instantanea
+from cadenas import ColumnaCodificada, Diccionario
+from catalogo import Catalogo
+
+MARCAS = ("Mabe", "LG", "Ñandú", "東芝", "")
+
+
+def _catalogo(codificar, filas=200, semilla=3):
+    rng = random.Random(semilla)
+    catalogo = Catalogo(codificar=codificar)
+    for numero in range(filas):
+        modelo = f"MOD{rng.randrange(20)}"
+        id = modelo if numero % 2 else f"L{numero}"
+        catalogo.agregar_valores("Lavadora", id, rng.choice(MARCAS), modelo,
+                                 rng.randrange(1000, 40000), rng.randint(5, 25), 50, rng.randint(1, 10))
+    return catalogo
+
+
+def test_diccionario_asigna_codigos_estables():
+    diccionario = Diccionario()
+    assert [diccionario.codificar(valor) for valor in ("a", "b", "a", "", "b")] == [0, 1, 0, 2, 1]
+    assert len(diccionario) == 3 and diccionario[1] == "b"
+    primera, copia = "".join(["a", "b"]), "".join(["a", "b"])
+    assert primera is not copia
+    assert diccionario.compartida(primera) is primera
+    assert diccionario.compartida(copia) is primera
+    assert diccionario.tamano_bytes() > 0
+
+
+def test_columna_se_comporta_como_lista():
+    diccionario = Diccionario()
+    valores = ["x", "y", "x", "z"]
+    columna = ColumnaCodificada(diccionario, valores)
+    lista = list(valores)
+    columna.append("y")
+    lista.append("y")
+    anexar = columna.anexador()
+    for valor in ("w", "x"):
+        anexar(valor)
+        lista.append(valor)
+    columna[0] = "nuevo"
+    lista[0] = "nuevo"
+    assert len(columna) == len(lista)
+    assert list(columna) == lista
+    assert [columna[fila] for fila in range(len(lista))] == lista
+    assert columna[1:5] == lista[1:5] and columna[::-2] == lista[::-2]
+    # Dos columnas con el mismo diccionario comparten los textos
+    otra = ColumnaCodificada(diccionario, ["x", "nuevo"])
+    assert list(otra.codigos) == [columna.codigos[2], columna.codigos[0]]
+
+
+@pytest.mark.parametrize("con_numpy", [True, False])
+def test_filas_y_conteos_como_fuerza_bruta(monkeypatch, con_numpy):
+    if not con_numpy:
+        monkeypatch.setattr(modulo, "np", None)
+    elif modulo.np is None:
+        pytest.skip("NumPy no está instalado")
+    rng = random.Random(5)
+    valores = [rng.choice(MARCAS) for _ in range(500)]
+    columna = ColumnaCodificada(Diccionario(), valores)
+    for marca in MARCAS + ("Otra",):
+        assert columna.filas(marca) == [fila for fila, valor in enumerate(valores) if valor == marca]
+    assert columna.conteos() == {marca: valores.count(marca) for marca in set(valores)}
+    assert ColumnaCodificada(Diccionario()).conteos() == {}
+
+
+def test_catalogo_codificado_igual_al_de_listas():
+    codificado, plano = _catalogo(True), _catalogo(False)
+    assert [str(vista) for vista in codificado] == [str(vista) for vista in plano]
+    assert isinstance(codificado.columna("Lavadora", "marca"), ColumnaCodificada)
+    assert isinstance(plano.columna("Lavadora", "marca"), list)
+    for marca in MARCAS:
+        assert codificado.filas_marca("Lavadora", marca) == plano.filas_marca("Lavadora", marca)
+    # id igual a modelo se guarda una sola vez
+    vista = codificado.fila("Lavadora", 1)
+    assert vista.id is vista.modelo
+    assert codificado.tamano_bytes() < plano.tamano_bytes()
+
+
+def test_instantanea_ida_y_vuelta(tmp_path):
+    original = _catalogo(True)
+    ruta = str(tmp_path / "catalogo.elec")
+    instantanea.guardar(original, ruta)
+    # Los textos agregados después de guardar no afectan la instantánea
+    esperado = [str(vista) for vista in original]
+    original.agregar_valores("Lavadora", "nuevo", "Bosch", "WB", 9000, 8, 40, 3)
+    cargado = instantanea.cargar(ruta)
+    assert [str(vista) for vista in cargado] == esperado
+    instantanea.guardar(original, ruta)
+    assert [str(vista) for vista in instantanea.cargar(ruta, copiar=True)] == [str(vista) for vista in original]
+    assert instantanea.cargar(ruta).filas_marca("Lavadora", "Bosch") == [len(original) - 1]
@@ -0,0 +1,160 @@
+import asyncio
+import json
+
+import pytest
+
+from cambios import FlujoCambios, FlujoDesbordado
+from inventario import Inventario
+from proyectoU4 import Lavadora, Microondas
+
+
+def _lavadora(numero, capacidad=9):
+    return Lavadora(f"L{numero}", "LG", "WM", 9000, capacidad, 80, 2)
+
+
+def test_eventos_de_alta_cambio_y_baja():
+    async def probar():
+        inventario = Inventario()
+        flujo = FlujoCambios().conectar(inventario)
+        todos = flujo.suscribir()
+        gamas = flujo.suscribir(solo_gama=True)
+        microondas = flujo.suscribir(tipos=["Microondas"])
+        inventario.agregar(_lavadora(1))
+        inventario.agregar(Microondas("M1", "LG", "MW", 3000, 1200, 1500, "50x30x40"))
+        inventario.actualizar("L1", precio=8000)
+        inventario.actualizar("L1", precio=8000)
+        inventario.actualizar("L1", capacidad_carga=20)
+        inventario.eliminar("L1")
+
+        lote = await todos.siguiente()
+        assert [(evento.operacion, evento.id) for evento in lote] == [
+            ("alta", "L1"), ("alta", "M1"), ("cambio", "L1"), ("cambio", "L1"), ("baja", "L1")]
+        assert [evento.secuencia for evento in lote] == list(range(5))
+        assert lote[0].valores["capacidad_carga"] == 9 and lote[0].gama == "Baja"
+        assert lote[2].valores == {"precio": 8000} and not lote[2].cambio_gama
+        assert lote[3].valores == {"capacidad_carga": 20}
+        assert (lote[3].gama_anterior, lote[3].gama) == ("Baja", "Alta")
+        assert lote[4].a_dict() == {"secuencia": 4, "operacion": "baja", "tipo": "Lavadora",
+                                    "id": "L1", "gama": "Alta"}
+        assert [evento.secuencia for evento in await gamas.siguiente()] == [3]
+        assert [evento.id for evento in await microondas.siguiente()] == ["M1"]
+        assert flujo.retraso == 0
+    asyncio.run(probar())
+
+
+def test_lotes_limitados_y_cierre():
+    async def probar():
+        inventario = Inventario()
+        flujo = FlujoCambios(tamano_lote=3).conectar(inventario)
+        suscripcion = flujo.suscribir()
+        for numero in range(7):
+            inventario.agregar(_lavadora(numero))
+        assert [len(await suscripcion.siguiente()) for _ in range(3)] == [3, 3, 1]
+        espera = asyncio.create_task(suscripcion.siguiente())
+        await asyncio.sleep(0)
+        suscripcion.cerrar()
+        assert await espera == []
+        assert not flujo.suscripciones
+    asyncio.run(probar())
+
+
+def test_suscripcion_lenta_se_desborda_sin_afectar_a_las_demas():
+    async def probar():
+        inventario = Inventario()
+        flujo = FlujoCambios(capacidad=4, maximo=8).conectar(inventario)
+        lenta = flujo.suscribir()
+        rapida = flujo.suscribir()
+        recibidos = []
+        for numero in range(20):
+            inventario.agregar(_lavadora(numero))
+            recibidos += [evento.id for evento in await rapida.siguiente()]
+            # Nunca se guardan muchos más eventos que el máximo permitido
+            assert len(flujo._eventos) <= 2 * flujo.maximo + 1
+        assert recibidos == [f"L{numero}" for numero in range(20)]
+        assert flujo.desbordes == 1
+        assert lenta not in flujo.suscripciones
+        with pytest.raises(FlujoDesbordado):
+            await lenta.siguiente()
+        assert flujo.retraso == 0
+    asyncio.run(probar())
+
+
+def test_esperar_espacio_detiene_al_productor():
+    async def probar():
+        inventario = Inventario()
+        flujo = FlujoCambios(capacidad=5, maximo=5, tamano_lote=2).conectar(inventario)
+        suscripcion = flujo.suscribir()
+        retrasos = []
+
+        async def producir():
+            for numero in range(60):
+                await flujo.esperar_espacio()
+                inventario.agregar(_lavadora(numero))
+                retrasos.append(flujo.retraso)
+
+        async def consumir():
+            ids = []
+            while len(ids) < 60:
+                ids += [evento.id for evento in await suscripcion.siguiente()]
+                await asyncio.sleep(0)
+            return ids
+
+        productor = asyncio.create_task(producir())
+        ids = await consumir()
+        await productor
+        assert ids == [f"L{numero}" for numero in range(60)]
+        assert max(retrasos) == flujo.capacidad
+        assert flujo.desbordes == 0
+    asyncio.run(probar())
+
+
+def test_servir_por_socket():
+    async def probar():
+        inventario = Inventario()
+        flujo = FlujoCambios().conectar(inventario)
+        servidor = await flujo.servir()
+        puerto = servidor.sockets[0].getsockname()[1]
+        lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+        escritor.write(b'{"tipos": ["Lavadora"]}\n')
+        await escritor.drain()
+        while not flujo.suscripciones:
+            await asyncio.sleep(0.001)
+        inventario.agregar(Microondas("M1", "LG", "MW", 3000, 1200, 1500, "50x30x40"))
+        inventario.agregar(_lavadora(1))
+        linea = await asyncio.wait_for(lector.readline(), 5)
+        assert json.loads(linea)["id"] == "L1"
+        escritor.close()
+        await flujo.cerrar()
+    asyncio.run(probar())
+
+
+def test_tamano_lote_invalido():
+    async def probar():
+        inventario = Inventario()
+        flujo = FlujoCambios().conectar(inventario)
+        for tamano_lote in (0, -1, 2.5, "3", True):
+            with pytest.raises(ValueError):
+                flujo.suscribir(tamano_lote=tamano_lote)
+        assert not flujo.suscripciones
+        with pytest.raises(ValueError):
+            FlujoCambios(tamano_lote=0)
+        servidor = await flujo.servir()
+        puerto = servidor.sockets[0].getsockname()[1]
+        for filtro in (b'{"tamano_lote": -1}\n', b'{"tamano_lote": "muchos"}\n', b'{"tipos": 5}\n',
+                       b'{"tipos": [["Lavadora"]]}\n'):
+            lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+            escritor.write(filtro)
+            await escritor.drain()
+            linea = await asyncio.wait_for(lector.readline(), 5)
+            assert "error" in json.loads(linea), filtro
+            escritor.close()
+        # Un número en texto se convierte
+        lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+        escritor.write(b'{"tamano_lote": "2"}\n')
+        await escritor.drain()
+        while not flujo.suscripciones:
+            await asyncio.sleep(0.001)
+        assert next(iter(flujo.suscripciones)).tamano_lote == 2
+        escritor.close()
+        await flujo.cerrar()
+    asyncio.run(probar())
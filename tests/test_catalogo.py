@@ -0,0 +1,82 @@
+import math
+
+import pytest
+
+import proyectoU4
+import U3
+from catalogo import Catalogo, TablaColumnar, ESQUEMAS, buscar_tipo, nombre_tipo
+from proyectoU4 import Lavadora, Microondas, Refrigerador
+
+OBJETOS = [
+    Lavadora("8MWTW2224WJM", "Whirlpool", "8MWTW2224WJM", 13999, 22, 15, 12),
+    Lavadora("L2", "LG", "WT", 8999.5, 9, 50.25, 2),
+    Refrigerador("R1", "Mabe", "RM", 15000, 2, 12.5, 441.4),
+    Microondas("M1", "Ñandú", "MW", 3000, 1200, 1500.5, "54x32.2x43.3"),
+    Microondas("M2", "LG", "MS", 2500.0, 900, 1100, "sin medidas"),
+]
+
+
+@pytest.mark.parametrize("codificar", [True, False])
+def test_vistas_muestran_lo_mismo_que_los_objetos(codificar):
+    catalogo = Catalogo(codificar=codificar)
+    ubicaciones = [catalogo.agregar(obj) for obj in OBJETOS]
+    for obj, (tipo, fila) in zip(OBJETOS, ubicaciones):
+        vista = catalogo.fila(tipo, fila)
+        assert isinstance(vista, type(obj))
+        assert str(vista) == str(obj)
+        assert vista.tipo_gama() == obj.tipo_gama()
+        for campo in ESQUEMAS[tipo].campos:
+            assert getattr(vista, campo) == getattr(obj, campo)
+            assert type(getattr(vista, campo)) is type(getattr(obj, campo))
+    assert [str(vista) for vista in catalogo.tablas["Microondas"]] == [str(OBJETOS[3]), str(OBJETOS[4])]
+    assert catalogo.filas_marca("Lavadora", "LG") == [1]
+    assert catalogo.tamano_bytes() > 0
+
+
+def test_columnas_y_derivados():
+    catalogo = Catalogo()
+    for obj in OBJETOS:
+        catalogo.agregar(obj)
+    assert list(catalogo.columna("Lavadora", "precio")) == [13999.0, 8999.5]
+    tabla = catalogo.tablas["Microondas"]
+    assert list(tabla.columna("ancho"))[0] == 54.0
+    assert math.isnan(tabla.columna("ancho")[1])
+    vista = tabla.fila(-1)
+    vista.medidas = "40x30x30"
+    vista.precio = 2400.5
+    assert (vista.ancho, vista.alto, vista.profundidad) == (40.0, 30.0, 30.0)
+    assert tabla.valor("precio", 1) == 2400.5
+    vista.precio = 2400
+    assert type(tabla.valor("precio", 1)) is int
+    with pytest.raises(IndexError):
+        tabla.fila(2)
+
+
+def test_fila_invalida_no_deja_columnas_disparejas():
+    tabla = TablaColumnar(ESQUEMAS["Lavadora"])
+    tabla.agregar(OBJETOS[0])
+    for valores in [("L9", "LG", "X", "caro", 9, 50, 2), ("L9", "LG", "X", 9000, True, 50, 2),
+                    ("L9", "LG", "X", 9000)]:
+        with pytest.raises(TypeError):
+            tabla.agregar_valores(valores)
+    assert len(tabla) == 1
+    assert {len(columna) for columna in list(tabla.numeros.values()) + list(tabla.textos.values())} == {1}
+
+
+@pytest.mark.parametrize("modulo", [proyectoU4, U3])
+def test_clases_sin_dict_por_objeto(modulo):
+    for clase in (modulo.Lavadora, modulo.Refrigerador, modulo.Microondas):
+        assert "__slots__" in clase.__dict__
+        obj = clase("X", "LG", "M", 1000, 1, 1, "10x10x10" if clase.__name__ == "Microondas" else 1)
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.otro = 1
+
+
+def test_nombres_de_tipo():
+    assert buscar_tipo("lavadora") == "Lavadora"
+    assert buscar_tipo("Secadora") is None
+    assert nombre_tipo(OBJETOS[2]) == "Refrigerador"
+    catalogo = Catalogo()
+    catalogo.agregar(OBJETOS[3])
+    assert nombre_tipo(catalogo.fila("Microondas", 0)) == "Microondas"
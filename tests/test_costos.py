@@ -0,0 +1,130 @@
+import random
+
+import pytest
+
+import costos as modulo
+from catalogo import Catalogo
+from costos import Escenario, MotorCostos
+from proyectoU4 import Lavadora, Refrigerador
+
+ESCENARIOS = [Escenario("CDMX", tarifa_luz=1.1, tarifa_agua=25),
+              Escenario("Intensivo", tarifa_luz=3.2, tarifa_agua=40, ciclos_anuales=400,
+                        horas_anuales=180, anios=12, incremento_anual=0.04)]
+
+
+def _catalogo(codificar=True, filas=300, semilla=4):
+    rng = random.Random(semilla)
+    catalogo = Catalogo(codificar=codificar)
+    for numero in range(filas):
+        modelo = f"MOD{rng.randrange(15)}"
+        precio = rng.choice((10000, 12000, rng.randrange(5000, 40000)))
+        if rng.random() < 0.5:
+            catalogo.agregar_valores("Lavadora", f"L{numero}", "LG", modelo, precio, rng.randint(5, 25),
+                                     rng.choice((40, 50, 62.5)), rng.randint(1, 10))
+        elif rng.random() < 0.7:
+            catalogo.agregar_valores("Microondas", f"M{numero}", "LG", modelo, precio, rng.randint(600, 2200),
+                                     rng.choice((900, 1200.5)), "sin medidas")
+        else:
+            catalogo.agregar_valores("Refrigerador", f"R{numero}", "LG", modelo, precio, 2, 12, 400)
+    return catalogo
+
+
+def _costo(tipo, vista, escenario):
+    vida = sum((1 + escenario.incremento_anual) ** anio for anio in range(escenario.anios))
+    if tipo == "Lavadora":
+        return vista.consumo_agua * escenario.ciclos_anuales / 1000 * escenario.tarifa_agua * vida
+    return vista.consumo_energia * escenario.horas_anuales / 1000 * escenario.tarifa_luz * vida
+
+
+def _consumo(tipo, vista):
+    return vista.consumo_agua if tipo == "Lavadora" else vista.consumo_energia
+
+
+def _sin_numpy(monkeypatch, con_numpy):
+    if not con_numpy:
+        monkeypatch.setattr(modulo, "np", None)
+    elif modulo.np is None:
+        pytest.skip("NumPy no está instalado")
+
+
+@pytest.mark.parametrize("codificar", [True, False])
+@pytest.mark.parametrize("con_numpy", [True, False])
+def test_proyectar_como_fuerza_bruta(monkeypatch, con_numpy, codificar):
+    _sin_numpy(monkeypatch, con_numpy)
+    catalogo = _catalogo(codificar)
+    proyeccion = MotorCostos().proyectar(catalogo, ESCENARIOS)
+    assert set(proyeccion) == {"Lavadora", "Microondas"}
+    for tipo, por_escenario in proyeccion.items():
+        for escenario in ESCENARIOS:
+            esperado = [_costo(tipo, vista, escenario) for vista in catalogo.tablas[tipo]]
+            assert list(por_escenario[escenario.nombre]) == pytest.approx(esperado)
+
+
+@pytest.mark.parametrize("con_numpy", [True, False])
+def test_mas_baratos_como_fuerza_bruta(monkeypatch, con_numpy):
+    _sin_numpy(monkeypatch, con_numpy)
+    catalogo = _catalogo()
+    ranking = MotorCostos().mas_baratos(catalogo, ESCENARIOS, cantidad=4)
+    for escenario in ESCENARIOS:
+        esperado = {}
+        for tipo in ("Lavadora", "Microondas"):
+            for fila, vista in enumerate(catalogo.tablas[tipo]):
+                total = vista.precio + _costo(tipo, vista, escenario)
+                esperado.setdefault((tipo, vista.tipo_gama()), []).append((round(total, 6), fila, vista.id))
+        obtenido = ranking[escenario.nombre]
+        assert set(obtenido) == set(esperado)
+        for clave, opciones in esperado.items():
+            assert [opcion.id for opcion in obtenido[clave]] == [id for _, _, id in sorted(opciones)[:4]], clave
+            assert all(opcion.gama == clave[1] for opcion in obtenido[clave])
+    with pytest.raises(ValueError):
+        MotorCostos().mas_baratos(catalogo, ESCENARIOS, cantidad=0)
+
+
+def test_memoiza_por_modelo_y_escenario():
+    catalogo = _catalogo()
+    motor = MotorCostos()
+    primera = motor.proyectar(catalogo, ESCENARIOS[:1])
+    calculados = motor.calculados
+    distintos = {(tipo, vista.modelo, float(_consumo(tipo, vista)))
+                 for tipo in ("Lavadora", "Microondas") for vista in catalogo.tablas[tipo]}
+    assert calculados == len(distintos) == len(motor)
+    # Cambiar precios no invalida nada; repetir sólo usa el caché
+    catalogo.tablas["Lavadora"].asignar("precio", 0, 1)
+    segunda = motor.proyectar(catalogo, ESCENARIOS[:1])
+    assert list(segunda["Lavadora"]["CDMX"]) == list(primera["Lavadora"]["CDMX"])
+    assert motor.calculados == calculados and motor.aciertos == calculados
+    # Un escenario con los mismos valores comparte resultados; uno nuevo no
+    motor.proyectar(catalogo, [Escenario("Otro nombre", tarifa_luz=1.1, tarifa_agua=25)])
+    assert motor.calculados == calculados
+    motor.proyectar(catalogo, ESCENARIOS)
+    assert motor.calculados == 2 * calculados
+    # Sólo el modelo con consumo cambiado se vuelve a calcular
+    catalogo.tablas["Lavadora"].asignar("consumo_agua", 0, 999)
+    motor.proyectar(catalogo, ESCENARIOS[:1])
+    assert motor.calculados == 2 * calculados + 1
+    assert motor.estadisticas()["tasa_aciertos"] > 0.5
+
+
+def test_capacidad_y_costo_individual():
+    motor = MotorCostos(capacidad=3)
+    catalogo = _catalogo(filas=100)
+    motor.proyectar(catalogo, ESCENARIOS)
+    assert len(motor) == 3
+    assert motor.desalojos == motor.calculados - 3
+    lavadora = Lavadora("L", "LG", "WT", 9000, 9, 50, 2)
+    assert motor.costo(lavadora, ESCENARIOS[1]) == pytest.approx(_costo("Lavadora", lavadora, ESCENARIOS[1]))
+    with pytest.raises(TypeError):
+        motor.costo(Refrigerador("R", "LG", "RM", 9000, 2, 12, 400), ESCENARIOS[0])
+    with pytest.raises(TypeError):
+        motor.proyectar_tabla(catalogo.tablas["Refrigerador"], ESCENARIOS)
+    motor.limpiar()
+    assert len(motor) == 0
+    with pytest.raises(ValueError):
+        MotorCostos(capacidad=0)
+
+
+@pytest.mark.parametrize("valores", [dict(tarifa_luz=-1, tarifa_agua=1), dict(tarifa_luz=1, tarifa_agua=1, anios=0),
+                                     dict(tarifa_luz=1, tarifa_agua=1, incremento_anual=-1)])
+def test_escenario_invalido(valores):
+    with pytest.raises(ValueError):
+        Escenario("x", **valores)
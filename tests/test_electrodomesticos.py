@@ -0,0 +1,125 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import electrodomesticos
+from exportacion import LectorColumnar
+from proyectoU4 import Lavadora, Microondas, Refrigerador
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CSV = """tipo,id,marca,modelo,precio,capacidad_carga,consumo_agua,ciclos_lavado,no_puertas,metros_cubicos,pies_capacidad,potencia,consumo_energia,medidas
+Lavadora,L1,Whirlpool,WW,13999,22,15,12,,,,,,
+Lavadora,L2,LG,WT,7999,9,50,2,,,,,,
+Refrigerador,R1,Mabe,RM,15000.50,,,,2,12.5,441.4,,,
+Refrigerador,R2,Samsung,RS,32000,,,,3,15,500,,,
+Microondas,M1,Ñandú,"MW, 2",3000,,,,,,,1200,1500.5,54x32.2x43.3
+Secadora,S1,LG,X,100,,,,,,,,,
+"""
+
+OBJETOS = [
+    Lavadora("L1", "Whirlpool", "WW", 13999, 22, 15, 12),
+    Lavadora("L2", "LG", "WT", 7999, 9, 50, 2),
+    Refrigerador("R1", "Mabe", "RM", 15000.5, 2, 12.5, 441.4),
+    Refrigerador("R2", "Samsung", "RS", 32000, 3, 15, 500),
+    Microondas("M1", "Ñandú", "MW, 2", 3000, 1200, 1500.5, "54x32.2x43.3"),
+]
+
+
+@pytest.fixture
+def archivos(tmp_path, capsys):
+    csv = tmp_path / "catalogo.csv"
+    csv.write_text(CSV, encoding="utf-8")
+    rechazos = tmp_path / "rechazos.jsonl"
+    elec = tmp_path / "catalogo.elec"
+    assert electrodomesticos.main(["importar", str(csv), "--rechazos", str(rechazos),
+                                   "--instantanea", str(elec)]) == 0
+    salida = capsys.readouterr().out
+    assert "Instantánea" in salida
+    assert [json.loads(linea)["fila"]["id"] for linea in rechazos.read_text(encoding="utf-8").splitlines()] == ["S1"]
+    return str(csv), str(elec)
+
+
+@pytest.mark.parametrize("indice", [0, 1])
+def test_clasificar_con_detalle(archivos, capsys, indice):
+    assert electrodomesticos.main(["clasificar", archivos[indice], "--detalle"]) == 0
+    lineas = capsys.readouterr().out.splitlines()
+    assert sorted(lineas) == sorted(f"{obj.id}\t{type(obj).__name__}\t{obj.tipo_gama()}" for obj in OBJETOS)
+
+
+def test_clasificar_resumen(archivos, capsys):
+    assert electrodomesticos.main(["clasificar", archivos[1], "--tipo", "lavadora"]) == 0
+    salida = capsys.readouterr().out
+    conteo = {gama: sum(1 for obj in OBJETOS[:2] if obj.tipo_gama() == gama) for gama in ("Baja", "Media", "Alta")}
+    assert salida.startswith("Lavadora")
+    assert "  ".join(f"{gama}: {cantidad}" for gama, cantidad in conteo.items()) in salida
+
+
+def test_mostrar_como_el_menu(archivos, capsys):
+    assert electrodomesticos.main(["mostrar", archivos[1]]) == 0
+    assert capsys.readouterr().out == "".join(f"{obj}\n" for obj in OBJETOS)
+    assert electrodomesticos.main(["mostrar", archivos[1], "--limite", "3"]) == 0
+    assert capsys.readouterr().out == "".join(f"{obj}\n" for obj in OBJETOS[:3])
+
+
+def test_consultar(archivos, capsys):
+    argumentos = ["consultar", archivos[1], "--tipo", "Refrigerador", "--donde", "precio=:20000", "--json"]
+    assert electrodomesticos.main(argumentos) == 0
+    salida = capsys.readouterr()
+    filas = [json.loads(linea) for linea in salida.out.splitlines()]
+    assert [(fila["tipo"], fila["id"], fila["precio"]) for fila in filas] == [("Refrigerador", "R1", 15000.5)]
+    assert "1 encontrados" in salida.err
+
+    gama = OBJETOS[0].tipo_gama()
+    assert electrodomesticos.main(["consultar", archivos[0], "--gama", gama.lower(), "--marca", "Whirlpool"]) == 0
+    assert capsys.readouterr().out == f"{OBJETOS[0]}\n"
+
+    assert electrodomesticos.main(["consultar", archivos[1], "--donde", "marca=1"]) == 2
+    assert "Error" in capsys.readouterr().err
+
+
+def test_exportar(archivos, tmp_path, capsys):
+    destino = str(tmp_path / "catalogo.elco")
+    assert electrodomesticos.main(["exportar", archivos[1], destino, "--ordenar", "precio"]) == 0
+    assert "5 filas" in capsys.readouterr().out
+    with LectorColumnar(destino) as lector:
+        precios = lector.leer_columnas("Refrigerador", ("precio",))["precio"]
+        assert list(precios) == [15000.5, 32000]
+        assert lector.contar() == len(OBJETOS)
+
+
+def test_errores(tmp_path, capsys):
+    assert electrodomesticos.main(["mostrar", str(tmp_path / "no_existe.elec")]) == 1
+    assert "Error" in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        electrodomesticos.main(["mostrar", "x.elec", "--tipo", "Secadora"])
+    with pytest.raises(SystemExit):
+        electrodomesticos.main(["consultar", "x.elec", "--donde", "precio"])
+
+
+@pytest.mark.parametrize("argumentos, codigo", [
+    (["clasificar", "{csv}", "--reglas", "XX"], 1),
+    (["consultar", "{csv}", "--gama", "Alta", "--reglas", "XX"], 2),
+    (["exportar", "{csv}", "{destino}", "--reglas", "XX"], 1),
+])
+def test_reglas_desconocidas(archivos, tmp_path, capsys, argumentos, codigo):
+    destino = str(tmp_path / "catalogo.elco")
+    argumentos = [argumento.format(csv=archivos[0], destino=destino) for argumento in argumentos]
+    assert electrodomesticos.main(argumentos) == codigo
+    error = capsys.readouterr().err
+    assert "'XX'" in error and "U3, U4" in error
+    assert not os.path.exists(destino)
+
+
+def test_arranque_sin_modulos_pesados():
+    codigo = ("import sys, electrodomesticos\n"
+              "pesados = {'numpy', 'catalogo', 'instantanea', 'importador', 'exportacion', 'json'}\n"
+              "print(sorted(pesados & set(sys.modules)))\n")
+    resultado = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True, text=True, check=True)
+    assert resultado.stdout.strip() == "[]"
+    version = subprocess.run([sys.executable, "electrodomesticos.py", "--version"], cwd=RAIZ,
+                             capture_output=True, text=True, check=True)
+    assert version.stdout.strip() == f"electrodomesticos {electrodomesticos.VERSION}"
@@ -0,0 +1,106 @@
+import random
+
+import pytest
+
+import estadisticas as modulo
+from catalogo import Catalogo
+from estadisticas import Agregado, Estadisticas
+from inventario import Inventario
+from proyectoU4 import Lavadora, Microondas, Refrigerador
+
+MARCAS = ("Mabe", "LG", "Samsung")
+
+
+def _nuevo(rng, numero):
+    tipo = rng.choice((Lavadora, Refrigerador, Microondas))
+    precio = rng.choice((rng.randrange(1000, 1100, 10), round(rng.uniform(1000, 1100), 2)))
+    base = (f"E{numero}", rng.choice(MARCAS), "X", precio)
+    if tipo is Lavadora:
+        return Lavadora(*base, rng.randint(5, 20), 50, rng.randint(1, 8))
+    if tipo is Refrigerador:
+        return Refrigerador(*base, rng.randint(1, 3), rng.randint(8, 15), 400)
+    return Microondas(*base, rng.randint(800, 1800), 1200, "50x30x40")
+
+
+def _fuerza_bruta(objetos):
+    grupos = {}
+    for obj in objetos:
+        tipo = type(obj).__name__
+        for clave in ((tipo, obj.marca), (tipo, None), (None, obj.marca), (None, None)):
+            grupos.setdefault(clave, []).append((obj.precio, obj.tipo_gama()))
+    return {clave: {"cantidad": len(valores), "promedio": sum(p for p, _ in valores) / len(valores),
+                    "minimo": min(p for p, _ in valores), "maximo": max(p for p, _ in valores),
+                    "gamas": {gama: sum(1 for _, g in valores if g == gama) for gama in ("Baja", "Media", "Alta")}}
+            for clave, valores in grupos.items()}
+
+
+def _revisar(estadisticas, objetos):
+    esperado = _fuerza_bruta(objetos)
+    assert set(estadisticas.grupos) == set(esperado)
+    for clave, datos in esperado.items():
+        obtenido = estadisticas.consultar(*clave).como_dict()
+        assert obtenido["promedio"] == pytest.approx(datos.pop("promedio"))
+        del obtenido["promedio"]
+        assert obtenido == datos, clave
+
+
+def test_incremental_como_fuerza_bruta():
+    rng = random.Random(1)
+    inventario = Inventario()
+    for numero in range(30):
+        inventario.agregar(_nuevo(rng, numero))
+    estadisticas = Estadisticas().conectar(inventario)
+    for paso in range(600):
+        ids = sorted(inventario.objetos)
+        accion = rng.random()
+        if accion < 0.3 or len(ids) < 5:
+            inventario.agregar(_nuevo(rng, 100 + paso))
+        elif accion < 0.5:
+            inventario.eliminar(rng.choice(ids))
+        elif accion < 0.7:
+            inventario.actualizar(rng.choice(ids), precio=rng.randrange(1000, 1100, 10))
+        elif accion < 0.85:
+            inventario.actualizar(rng.choice(ids), marca=rng.choice(MARCAS), precio=1050.5)
+        else:
+            id = rng.choice(ids)
+            if isinstance(inventario.objetos[id], Lavadora):
+                inventario.actualizar(id, capacidad_carga=rng.randint(5, 20))
+        if paso % 25 == 0:
+            _revisar(estadisticas, inventario.objetos.values())
+    _revisar(estadisticas, inventario.objetos.values())
+    assert estadisticas.consultar("Lavadora", "Otra").cantidad == 0
+    assert set(estadisticas.marcas("Lavadora")) <= set(MARCAS)
+
+
+@pytest.mark.parametrize("con_numpy", [True, False])
+def test_desde_catalogo_como_fuerza_bruta(monkeypatch, con_numpy):
+    if not con_numpy:
+        monkeypatch.setattr(modulo, "np", None)
+    elif modulo.np is None:
+        pytest.skip("NumPy no está instalado")
+    rng = random.Random(2)
+    objetos = [_nuevo(rng, numero) for numero in range(400)]
+    catalogo = Catalogo()
+    for obj in objetos:
+        catalogo.agregar(obj)
+    estadisticas = Estadisticas.desde_catalogo(catalogo)
+    _revisar(estadisticas, objetos)
+    # Y sigue siendo correcto al quitar artículos después
+    for obj in objetos[:200]:
+        estadisticas.retirar(type(obj).__name__, obj.marca, obj.precio, obj.tipo_gama())
+    _revisar(estadisticas, objetos[200:])
+
+
+def test_minimo_y_maximo_tras_quitar_los_extremos():
+    grupo = Agregado()
+    for precio in (5, 1, 9, 1, 7):
+        grupo.agregar(precio, "Baja")
+    grupo.quitar(1, "Baja")
+    assert (grupo.minimo, grupo.maximo) == (1, 9)
+    grupo.quitar(1, "Baja")
+    grupo.quitar(9, "Baja")
+    assert (grupo.minimo, grupo.maximo, grupo.cantidad) == (5, 7, 2)
+    with pytest.raises(KeyError):
+        grupo.quitar(100, "Baja")
+    vacio = Agregado()
+    assert (vacio.promedio, vacio.minimo, vacio.maximo) == (None, None, None)
@@ -0,0 +1,158 @@
+import math
+import random
+import struct
+
+import pytest
+
+import exportacion
+from catalogo import Catalogo, filtrar_filas
+from exportacion import EscritorColumnar, LectorColumnar, exportar
+from gama_vectorizada import codigos_gama, etiquetas
+
+MARCAS = ("Mabe", "LG", "Samsung", "Ñandú", "Whirlpool")
+FILTROS = [
+    {},
+    {"tipo": "Lavadora"},
+    {"marca": "Ñandú"},
+    {"gama": "Alta"},
+    {"tipo": "Refrigerador", "gama": "media", "condiciones": [("precio", 10000, 12000)]},
+    {"condiciones": [("precio", None, 4000)]},
+    {"tipo": "Microondas", "condiciones": [("ancho", 40, 50), ("potencia", 1000, None)]},
+    {"tipo": "Lavadora", "marca": "LG", "condiciones": [("capacidad_carga", 16, 16)]},
+    {"marca": "no existe"},
+]
+
+
+def _catalogo(filas=900, semilla=4):
+    rng = random.Random(semilla)
+    catalogo = Catalogo()
+    for numero in range(filas):
+        marca = rng.choice(MARCAS)
+        precio = rng.choice((rng.randrange(1000, 40000), round(rng.uniform(1000, 40000), 2)))
+        tipo = rng.choice(("Lavadora", "Refrigerador", "Microondas"))
+        if tipo == "Lavadora":
+            especificos = (rng.randint(5, 25), rng.randint(20, 80), rng.randint(1, 10))
+        elif tipo == "Refrigerador":
+            especificos = (rng.randint(1, 3), rng.randint(5, 20), rng.randint(200, 600))
+        else:
+            medidas = rng.choice(("sin medidas", f"{rng.randint(30, 60)}x{rng.randint(25, 40)}x40"))
+            especificos = (rng.randint(600, 2200), rng.randint(800, 2500), medidas)
+        catalogo.agregar_valores(tipo, f"{tipo[0]}{numero}", marca, f"Modelo {numero}", precio, *especificos)
+    return catalogo
+
+
+def _igual(a, b):
+    return a == b or (isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b))
+
+
+def _esperado(catalogo, tipo=None, marca=None, gama=None, condiciones=()):
+    ids = set()
+    for nombre, tabla in catalogo.tablas.items():
+        if tipo is not None and nombre != tipo:
+            continue
+        columna = tabla.columna("id")
+        ids.update(columna[fila] for fila in filtrar_filas(tabla, marca, gama, condiciones))
+    return ids
+
+
+@pytest.mark.parametrize("tamano_grupo, comprimir, ordenar_por", [
+    (64, False, None), (100, True, "precio"), (10000, False, "marca"), (1, True, None)])
+def test_ida_y_vuelta(tmp_path, tamano_grupo, comprimir, ordenar_por):
+    catalogo = _catalogo(300)
+    ruta = str(tmp_path / "catalogo.elco")
+    exportar(catalogo, ruta, tamano_grupo, ordenar_por=ordenar_por, comprimir=comprimir)
+    with LectorColumnar(ruta) as lector:
+        assert len(lector) == sum(len(tabla) for tabla in catalogo.tablas.values())
+        for tipo, tabla in catalogo.tablas.items():
+            leidas = lector.leer_columnas(tipo)
+            columnas = tabla.esquema.campos + tuple(tabla.derivados)
+            assert set(leidas) == set(columnas) | {"gama"}
+            filas = {leidas["id"][fila]: fila for fila in range(len(leidas["id"]))}
+            assert len(filas) == len(tabla)
+            gamas = etiquetas(codigos_gama(tabla))
+            for fila, id in enumerate(tabla.columna("id")):
+                leida = filas[id]
+                for campo in columnas:
+                    original = tabla.derivados[campo][fila] if campo in tabla.derivados else tabla.valor(campo, fila)
+                    assert _igual(leidas[campo][leida], original if isinstance(original, str) else float(original))
+                assert leidas["gama"][leida] == gamas[fila]
+            if ordenar_por == "precio":
+                assert list(leidas["precio"]) == sorted(leidas["precio"])
+
+
+@pytest.mark.parametrize("ordenar_por", [None, "precio"])
+def test_consultas_con_poda_como_fuerza_bruta(tmp_path, ordenar_por):
+    catalogo = _catalogo()
+    ruta = str(tmp_path / "catalogo.elco")
+    exportar(catalogo, ruta, tamano_grupo=50, ordenar_por=ordenar_por)
+    with LectorColumnar(ruta) as lector:
+        for filtro in FILTROS:
+            esperado = _esperado(catalogo, **filtro)
+            ids = [id for _, columnas in lector.leer(columnas=("id",), **filtro) for id in columnas["id"]]
+            assert len(ids) == len(set(ids))
+            assert set(ids) == esperado, filtro
+            assert lector.contar(**filtro) == len(esperado), filtro
+        if ordenar_por == "precio":
+            antes = lector.saltados
+            lector.contar(condiciones=[("precio", 10000, 10500)])
+            assert lector.saltados > antes
+
+
+def _leer_todo(ruta):
+    with LectorColumnar(ruta) as lector:
+        columnas = {(tipo, campo): [None if valor != valor else valor for valor in valores]
+                    for tipo in lector.tipos() for campo, valores in lector.leer_columnas(tipo).items()}
+        return columnas, [lector.contar(**filtro) for filtro in FILTROS]
+
+
+@pytest.mark.parametrize("comprimir", [False, True])
+def test_secciones_en_little_endian(tmp_path, monkeypatch, comprimir):
+    catalogo = _catalogo(200)
+    ruta = str(tmp_path / "catalogo.elco")
+    exportar(catalogo, ruta, tamano_grupo=64, ordenar_por="precio")
+    with LectorColumnar(ruta) as lector:
+        grupo = lector.grupos[0]
+        posicion, largo = grupo["columnas"]["precio"]["secciones"][0]
+        precios = struct.unpack_from(f"<{largo // 8}d", lector._memoria, posicion)
+        assert list(precios) == list(lector._numeros(grupo, "precio"))
+    esperado = _leer_todo(ruta)
+    # Simula un equipo big endian: se invierte al escribir y al leer
+    monkeypatch.setattr(exportacion, "_INVERTIR", True)
+    invertido = str(tmp_path / "invertido.elco")
+    exportar(catalogo, invertido, tamano_grupo=64, ordenar_por="precio", comprimir=comprimir)
+    assert _leer_todo(invertido) == esperado
+
+
+def test_escritor_por_registro(tmp_path):
+    catalogo = _catalogo(200)
+    ruta = str(tmp_path / "catalogo.elco")
+    with EscritorColumnar(ruta, tamano_grupo=16) as escritor:
+        for tabla in catalogo.tablas.values():
+            for obj in tabla:
+                escritor.agregar(obj)
+    with LectorColumnar(ruta) as lector:
+        for filtro in FILTROS:
+            assert lector.contar(**filtro) == len(_esperado(catalogo, **filtro)), filtro
+
+
+def test_error_al_escribir_no_deja_archivo(tmp_path):
+    ruta = tmp_path / "catalogo.elco"
+    with pytest.raises(RuntimeError):
+        with EscritorColumnar(str(ruta)) as escritor:
+            escritor.agregar_valores("Lavadora", "L1", "LG", "X", 9000, 9, 50, 2)
+            raise RuntimeError("falla")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_rechaza_archivos_ajenos_o_de_otra_version(tmp_path):
+    ajeno = tmp_path / "ajeno.elco"
+    ajeno.write_bytes(b"no es columnar" * 4)
+    with pytest.raises(ValueError):
+        LectorColumnar(str(ajeno))
+    ruta = tmp_path / "catalogo.elco"
+    exportar(_catalogo(20), str(ruta))
+    datos = bytearray(ruta.read_bytes())
+    struct.pack_into("<H", datos, 4, 99)
+    ruta.write_bytes(bytes(datos))
+    with pytest.raises(ValueError, match="Versión"):
+        LectorColumnar(str(ruta))
@@ -0,0 +1,96 @@
+import json
+import os
+import random
+
+import pytest
+
+import reglas_gama
+from catalogo import Catalogo, filtrar_filas
+from fragmentos import CatalogoFragmentado, Fragmento
+from pipeline import empaquetar_bloque
+
+MARCAS = ("Mabe", "LG", "Samsung", "Whirlpool", "Ñandú")
+FILTROS = [
+    {},
+    {"marca": "LG"},
+    {"gama": "Alta"},
+    {"gama": "baja", "condiciones": [("precio", 5000, 20000)]},
+    {"tipo": "Lavadora", "gama": "Media", "reglas": "U3"},
+    {"tipo": "Refrigerador", "marca": "Mabe", "condiciones": [("no_puertas", 2, None)]},
+    {"tipo": "Microondas", "condiciones": [("potencia", None, 1500)], "reglas": "U4"},
+]
+
+
+def _catalogo(filas=600, semilla=3):
+    rng = random.Random(semilla)
+    catalogo = Catalogo()
+    for numero in range(filas):
+        marca, precio = rng.choice(MARCAS), rng.randrange(1000, 40000)
+        tipo = rng.choice(("Lavadora", "Refrigerador", "Microondas"))
+        if tipo == "Lavadora":
+            especificos = (rng.randint(5, 25), rng.randint(20, 80), rng.randint(1, 10))
+        elif tipo == "Refrigerador":
+            especificos = (rng.randint(1, 3), rng.randint(5, 20), rng.randint(200, 600))
+        else:
+            especificos = (rng.randint(600, 2200), rng.randint(800, 2500), "50x30x40")
+        catalogo.agregar_valores(tipo, f"{tipo[0]}{numero}", marca, f"M{numero}", precio, *especificos)
+    return catalogo
+
+
+def _esperado(catalogo, tipo=None, marca=None, gama=None, condiciones=(), reglas="U4"):
+    ids = set()
+    for nombre, tabla in catalogo.tablas.items():
+        if tipo is None or nombre == tipo:
+            columna = tabla.columna("id")
+            ids.update(columna[fila] for fila in filtrar_filas(tabla, marca, gama, condiciones, reglas))
+    return ids
+
+
+def _ids(registros):
+    return {valores[0] for _, valores in registros}
+
+
+@pytest.mark.parametrize("procesos", [False, True])
+def test_consultas_como_filtrar_filas(procesos):
+    catalogo = _catalogo()
+    with CatalogoFragmentado(fragmentos=2, particiones=3, tamano_lote=50, procesos=procesos) as fragmentado:
+        fragmentado.agregar_catalogo(catalogo)
+        for filtro in FILTROS:
+            esperado = _esperado(catalogo, **filtro)
+            assert {obj.id for obj in fragmentado.consultar(**filtro)} == esperado, filtro
+            assert fragmentado.contar(**filtro) == len(esperado), filtro
+
+
+def test_consultas_despues_de_rebalancear():
+    catalogo = _catalogo()
+    with CatalogoFragmentado(fragmentos=3, particiones=4, tamano_lote=40, procesos=False,
+                             rebalanceo_automatico=False) as fragmentado:
+        fragmentado.agregar_catalogo(catalogo)
+        fragmentado.rebalancear()
+        for filtro in FILTROS:
+            assert {obj.id for obj in fragmentado.consultar(**filtro)} == _esperado(catalogo, **filtro), filtro
+
+
+def _escribir_reglas(ruta, limite):
+    reglas = {"Prueba": {"Microondas": {"reglas": [{"gama": "Baja", "todas": [["potencia", "<", limite]]}],
+                                        "defecto": "Alta"}}}
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(reglas, archivo)
+
+
+def test_cache_de_gamas_sigue_la_version_de_las_reglas(tmp_path, monkeypatch):
+    ruta = str(tmp_path / "reglas.json")
+    _escribir_reglas(ruta, 1000)
+    monkeypatch.setattr(reglas_gama, "RUTA_POR_DEFECTO", ruta)
+    catalogo = Catalogo()
+    catalogo.agregar_valores("Microondas", "M1", "LG", "A", 2000, 900, 1000, "50x30x40")
+    catalogo.agregar_valores("Microondas", "M2", "LG", "B", 2000, 1800, 1000, "50x30x40")
+    fragmento = Fragmento()
+    fragmento.anexar([(0, empaquetar_bloque(catalogo.tablas["Microondas"], 0, 2))])
+
+    assert _ids(fragmento.consultar([0], gama="Baja", reglas="Prueba")[0][1]) == {"M1"}
+    _escribir_reglas(ruta, 2000)
+    estado = os.stat(ruta)
+    os.utime(ruta, ns=(estado.st_atime_ns, estado.st_mtime_ns + 10**9))
+    assert _ids(fragmento.consultar([0], gama="Baja", reglas="Prueba")[0][1]) == {"M1", "M2"}
+    assert _ids(fragmento.consultar([0], gama="Baja", reglas="U4")[0][1]) == {"M1"}
@@ -0,0 +1,63 @@
+import itertools
+from array import array
+
+import pytest
+
+import gama_vectorizada
+import proyectoU3
+import proyectoU4
+import U3
+from catalogo import Catalogo
+
+# Valores en los umbrales y a cada lado
+CARGAS = (5, 10, 10.5, 15, 15.5, 22)
+CICLOS = (1, 3, 4, 5, 6)
+PUERTAS = (1, 2, 3)
+METROS = (8, 10, 10.5, 13, 13.5)
+POTENCIAS = (700, 999, 999.5, 1000, 1500, 1500.5, 2100)
+
+MODOS = ["numpy", "python"] if gama_vectorizada.np is not None else ["python"]
+
+
+@pytest.fixture(params=MODOS)
+def modo(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(gama_vectorizada, "np", None)
+    return request.param
+
+
+def _esperadas(objetos):
+    return [obj.tipo_gama() for obj in objetos]
+
+
+@pytest.mark.parametrize("variante, modulos", [("U3", (proyectoU3, U3)), ("U4", (proyectoU4,))])
+def test_lavadoras_como_tipo_gama(modo, variante, modulos):
+    cargas, ciclos = zip(*itertools.product(CARGAS, CICLOS))
+    for modulo in modulos:
+        objetos = [modulo.Lavadora("L", "LG", "X", 1000, carga, 50, ciclo) for carga, ciclo in zip(cargas, ciclos)]
+        assert gama_vectorizada.gama_lavadoras(array("d", cargas), list(ciclos), variante) == _esperadas(objetos)
+
+
+def test_refrigeradores_y_microondas_como_tipo_gama(modo):
+    puertas, metros = zip(*itertools.product(PUERTAS, METROS))
+    objetos = [proyectoU4.Refrigerador("R", "LG", "X", 1000, p, m, 1) for p, m in zip(puertas, metros)]
+    assert gama_vectorizada.gama_refrigeradores(puertas, array("d", metros)) == _esperadas(objetos)
+    objetos = [proyectoU4.Microondas("M", "LG", "X", 1000, p, 1, "1x1x1") for p in POTENCIAS]
+    assert gama_vectorizada.gama_microondas(memoryview(array("d", POTENCIAS))) == _esperadas(objetos)
+
+
+def test_tabla_completa(modo):
+    catalogo = Catalogo()
+    for carga, ciclo in itertools.product(CARGAS, CICLOS):
+        catalogo.agregar(proyectoU4.Lavadora("L", "LG", "X", 1000, carga, 50, ciclo))
+    for potencia in POTENCIAS:
+        catalogo.agregar(proyectoU4.Microondas("M", "LG", "X", 1000, potencia, 1, "1x1x1"))
+    for tabla in catalogo.tablas.values():
+        assert gama_vectorizada.gama_tabla(tabla) == [vista.tipo_gama() for vista in tabla]
+    assert gama_vectorizada.gama_tabla(catalogo.tablas["Refrigerador"]) == []
+
+
+def test_variante_desconocida():
+    with pytest.raises(ValueError):
+        gama_vectorizada.codigos_lavadoras([10], [3], "U5")
+    assert gama_vectorizada.etiquetas([2, 0, 1]) == ["Alta", "Baja", "Media"]
@@ -0,0 +1,93 @@
+import io
+import json
+
+import pytest
+
+from importador import Importador, importar
+from proyectoU4 import Lavadora, Microondas, Refrigerador
+
+CSV = """tipo,id,marca,modelo,precio,capacidad_carga,consumo_agua,ciclos_lavado,no_puertas,metros_cubicos,pies_capacidad,potencia,consumo_energia,medidas
+Lavadora,8MWTW2224WJM,Whirlpool,8MWTW2224WJM,13999,22,15,12,,,,,,
+Refrigerador,R1,Mabe,RM,15000.50,,,,2,12.5,441.4,,,
+Secadora,S1,LG,X,100,,,,,,,,,
+microondas,M1,Ñandú,"MW, 2",3000,,,,,,,1200,1500.5,54x32.2x43.3
+Lavadora,L2,LG,WT,caro,9,50,2,,,,,,
+Lavadora,L3,LG,WT,8999,9,50,2.5,,,,,,
+Lavadora,L4, LG ,WT,7999,9,50,2,,,,,,
+"""
+
+ESPERADOS = [
+    Lavadora("8MWTW2224WJM", "Whirlpool", "8MWTW2224WJM", 13999, 22, 15, 12),
+    Refrigerador("R1", "Mabe", "RM", 15000.5, 2, 12.5, 441.4),
+    Microondas("M1", "Ñandú", "MW, 2", 3000, 1200, 1500.5, "54x32.2x43.3"),
+    Lavadora("L4", " LG ", "WT", 7999, 9, 50, 2),
+]
+
+
+def _jsonl():
+    lineas = [json.dumps({"tipo": "Lavadora", "id": "8MWTW2224WJM", "marca": "Whirlpool",
+                          "modelo": "8MWTW2224WJM", "precio": 13999, "capacidad_carga": 22,
+                          "consumo_agua": 15, "ciclos_lavado": 12}),
+              "",
+              "{no es json",
+              "[1, 2]",
+              json.dumps({"tipo": "Refrigerador", "id": "R1", "marca": "Mabe", "modelo": "RM",
+                          "precio": "15000.50", "no_puertas": 2, "metros_cubicos": 12.5,
+                          "pies_capacidad": 441.4}),
+              json.dumps({"tipo": "Microondas", "id": "M1", "marca": "Ñandú", "modelo": "MW, 2",
+                          "precio": 3000, "potencia": 1200, "consumo_energia": 1500.5}),
+              json.dumps({"tipo": "Microondas", "id": "M1", "marca": "Ñandú", "modelo": "MW, 2",
+                          "precio": 3000, "potencia": 1200, "consumo_energia": 1500.5,
+                          "medidas": "54x32.2x43.3"})]
+    return "\n".join(lineas) + "\n"
+
+
+@pytest.mark.parametrize("tamano_lote", [1, 3, 1000])
+def test_csv_en_orden_con_rechazos(tamano_lote):
+    rechazos = io.StringIO()
+    objetos = []
+    resumen = Importador(tamano_lote, rechazos).importar(io.StringIO(CSV), objetos.append, "csv")
+    assert [str(obj) for obj in objetos] == [str(obj) for obj in ESPERADOS]
+    assert [type(obj.precio) for obj in objetos] == [int, float, int, int]
+    assert (resumen.filas, resumen.aceptadas, resumen.rechazadas) == (7, 4, 3)
+    lineas = [json.loads(linea) for linea in rechazos.getvalue().splitlines()]
+    assert sorted(rechazo["linea"] for rechazo in lineas) == [4, 6, 7]
+    motivos = {rechazo["linea"]: rechazo["error"] for rechazo in lineas}
+    assert "Secadora" in motivos[4]
+    assert "precio" in motivos[6]
+    assert "ciclos_lavado" in motivos[7]
+    assert {rechazo["linea"]: rechazo["fila"]["id"] for rechazo in lineas}[6] == "L2"
+
+
+def test_jsonl_desde_archivo(tmp_path):
+    ruta = tmp_path / "catalogo.jsonl"
+    ruta.write_text(_jsonl(), encoding="utf-8")
+    rechazos = io.StringIO()
+    objetos = []
+    resumen = importar(str(ruta), objetos.append, tamano_lote=2, rechazos=rechazos)
+    assert [str(obj) for obj in objetos] == [str(obj) for obj in ESPERADOS[:3]]
+    assert (resumen.filas, resumen.aceptadas, resumen.rechazadas) == (6, 3, 3)
+    lineas = [json.loads(linea) for linea in rechazos.getvalue().splitlines()]
+    assert [rechazo["linea"] for rechazo in lineas] == [3, 4, 6]
+    assert lineas[0]["error"].startswith("JSON inválido")
+    assert "medidas" in lineas[2]["error"]
+    assert "Filas leídas: 6" in str(resumen)
+
+
+def test_formato_requerido():
+    with pytest.raises(ValueError):
+        importar(io.StringIO(CSV), print)
+    with pytest.raises(ValueError):
+        importar("catalogo.txt", print)
+    with pytest.raises(ValueError):
+        Importador(tamano_lote=0)
+
+
+def test_resumen_nuevo_en_cada_importacion():
+    importador = Importador(tamano_lote=2)
+    primero = importador.importar(io.StringIO(CSV), lambda obj: None, "csv")
+    segundo = importador.importar(io.StringIO(CSV), lambda obj: None, "csv")
+    assert segundo is not primero
+    for resumen in (primero, segundo):
+        assert (resumen.filas, resumen.aceptadas, resumen.rechazadas) == (7, 4, 3)
+        assert resumen.filas_por_segundo == pytest.approx(resumen.filas / resumen.segundos)
@@ -0,0 +1,130 @@
+import math
+import random
+
+import pytest
+
+from catalogo import Catalogo
+from indice_espacial import ArbolKD, IndiceKD
+from inventario import Inventario
+from medidas import IndiceMedidas, medidas_o_nan, parsear_medidas
+from proyectoU4 import Microondas
+
+
+def _puntos(cantidad, semilla, dimensiones=3):
+    rng = random.Random(semilla)
+    # Coordenadas enteras para que haya empates y puntos repetidos
+    return {f"p{numero}": tuple(float(rng.randint(0, 20)) for _ in range(dimensiones))
+            for numero in range(cantidad)}
+
+
+def _en_caja(puntos, inferior, superior):
+    inferior = [-math.inf if valor is None else valor for valor in inferior]
+    superior = [math.inf if valor is None else valor for valor in superior]
+    return {clave for clave, punto in puntos.items()
+            if all(bajo <= valor <= tope for valor, bajo, tope in zip(punto, inferior, superior))}
+
+
+def _cajas(semilla, cantidad=60, dimensiones=3):
+    rng = random.Random(semilla)
+    for _ in range(cantidad):
+        inferior = [rng.choice((None, rng.randint(-2, 20))) for _ in range(dimensiones)]
+        superior = [rng.choice((None, rng.randint(0, 22))) for _ in range(dimensiones)]
+        yield inferior, superior
+
+
+@pytest.mark.parametrize("hoja", [1, 4, 32])
+def test_arbol_estatico_como_fuerza_bruta(hoja):
+    puntos = _puntos(500, semilla=hoja)
+    claves = list(puntos)
+    columnas = [[puntos[clave][eje] for clave in claves] for eje in range(3)]
+    arbol = ArbolKD(columnas, claves, hoja=hoja)
+    assert sorted(arbol.claves) == sorted(claves)
+    for inferior, superior in _cajas(hoja):
+        inferior = [-math.inf if valor is None else valor for valor in inferior]
+        superior = [math.inf if valor is None else valor for valor in superior]
+        encontradas = arbol.en_caja(inferior, superior)
+        assert len(encontradas) == len(set(encontradas))
+        assert set(encontradas) == _en_caja(puntos, inferior, superior)
+
+
+def test_indice_dinamico_con_altas_bajas_y_reemplazos():
+    rng = random.Random(7)
+    indice = IndiceKD(3, hoja=4)
+    puntos = {}
+    for paso in range(1500):
+        accion = rng.random()
+        if accion < 0.6 or not puntos:
+            clave = f"p{rng.randrange(400)}"
+            puntos[clave] = tuple(float(rng.randint(0, 20)) for _ in range(3))
+            indice.insertar(puntos[clave], clave)
+        else:
+            clave = rng.choice(sorted(puntos))
+            del puntos[clave]
+            indice.eliminar(clave)
+        if paso % 100 == 0:
+            assert len(indice) == len(puntos)
+            for inferior, superior in _cajas(paso, cantidad=10):
+                encontradas = indice.en_caja(inferior, superior)
+                assert len(encontradas) == len(set(encontradas))
+                assert set(encontradas) == _en_caja(puntos, inferior, superior)
+    assert len(indice.arboles) <= 2 * math.log2(len(puntos) + 2) + 2
+    assert set(indice.en_caja()) == set(puntos)
+    with pytest.raises(KeyError):
+        indice.eliminar("no existe")
+    with pytest.raises(ValueError):
+        indice.insertar((1.0, 2.0), "corto")
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("54x32.2x43.3", (54.0, 32.2, 43.3)),
+    (" 54 X 32,2 × 43.3 cm ", (54.0, 32.2, 43.3)),
+    ("10*20*30 centímetros.", (10.0, 20.0, 30.0)),
+])
+def test_parsear_medidas(texto, esperado):
+    assert parsear_medidas(texto) == esperado
+
+
+@pytest.mark.parametrize("texto", ["sin medidas", "54x32", "54x0x10", "54xinfx10", "1x2x3x4"])
+def test_medidas_invalidas(texto):
+    with pytest.raises(ValueError):
+        parsear_medidas(texto)
+    assert all(math.isnan(valor) for valor in medidas_o_nan(texto))
+
+
+def _microondas(cantidad, semilla):
+    rng = random.Random(semilla)
+    for numero in range(cantidad):
+        medidas = rng.choice(("ilegible", "{}x{}x{}".format(*(rng.randint(30, 60) for _ in range(3)))))
+        yield Microondas(f"M{numero}", "LG", "X", 3000, 1000, 1200, medidas)
+
+
+def _caben(objetos, hueco):
+    caben = set()
+    for obj in objetos:
+        medidas = medidas_o_nan(obj.medidas)
+        if not math.isnan(medidas[0]) and all(tope is None or medida <= tope
+                                              for medida, tope in zip(medidas, hueco)):
+            caben.add(obj.id)
+    return caben
+
+
+def test_cabe_en_catalogo_e_inventario():
+    objetos = list(_microondas(300, semilla=2))
+    catalogo = Catalogo()
+    inventario = Inventario()
+    for obj in objetos:
+        catalogo.agregar(obj)
+        inventario.agregar(obj)
+    tabla = catalogo.tablas["Microondas"]
+    indice = IndiceMedidas.desde_tabla(tabla)
+    ids = tabla.columna("id")
+    for hueco in [(45, 45, 45), (None, 40, None), (60, 60, 60), (None, None, None), (29, 60, 60)]:
+        esperado = _caben(objetos, hueco)
+        assert {ids[fila] for fila in indice.cabe_en(*hueco)} == esperado
+        assert {obj.id for obj in inventario.caben_en(*hueco)} == esperado
+
+    inventario.actualizar("M0", medidas="10x10x10")
+    inventario.actualizar("M1", medidas="ilegible")
+    inventario.eliminar("M2")
+    restantes = [inventario.objetos[id] for id in inventario.objetos]
+    assert {obj.id for obj in inventario.caben_en(45, 45, 45)} == _caben(restantes, (45, 45, 45))
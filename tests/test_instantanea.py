@@ -0,0 +1,134 @@
+import json
+import struct
+
+import pytest
+
+import instantanea
+from catalogo import Catalogo
+
+
+def _catalogo():
+    catalogo = Catalogo()
+    catalogo.agregar_valores("Lavadora", "L1", "Mabe", "LM", 8000, 9, 50.5, 2)
+    catalogo.agregar_valores("Lavadora", "L2", "LG", "WT", 12500.25, 16, 70, 8)
+    catalogo.agregar_valores("Refrigerador", "R1", "Mabe", "RM", 15000, 2, 12, 420)
+    catalogo.agregar_valores("Microondas", "M1", "Ñandú", "MW", 3000, 1200, 1500.5, "54x32.2x43.3")
+    catalogo.agregar_valores("Microondas", "M2", "LG", "MS", 2500, 900, 1100, "sin medidas")
+    return catalogo
+
+
+def _fichas(catalogo):
+    return {tipo: [str(fila) for fila in tabla] for tipo, tabla in catalogo.tablas.items()}
+
+
+def _derivados(catalogo):
+    return {campo: [round(valor, 6) if valor == valor else None for valor in columna]
+            for campo, columna in catalogo.tablas["Microondas"].derivados.items()}
+
+
+@pytest.mark.parametrize("copiar", [False, True])
+def test_ida_y_vuelta(tmp_path, copiar):
+    original = _catalogo()
+    ruta = str(tmp_path / "catalogo.elec")
+    instantanea.guardar(original, ruta)
+    cargado = instantanea.cargar(ruta, copiar=copiar)
+    assert _fichas(cargado) == _fichas(original)
+    assert _derivados(cargado) == _derivados(original)
+    assert cargado.tablas["Lavadora"].valor("precio", 1) == 12500.25
+    assert type(cargado.tablas["Lavadora"].valor("precio", 0)) is int
+
+
+def test_copia_se_puede_modificar(tmp_path):
+    ruta = str(tmp_path / "catalogo.elec")
+    instantanea.guardar(_catalogo(), ruta)
+    cargado = instantanea.cargar(ruta, copiar=True)
+    cargado.agregar_valores("Lavadora", "L3", "Bosch", "WB", 9000, 8, 40, 3)
+    assert len(cargado.tablas["Lavadora"]) == 3
+
+
+def _reescribir_cabecera(ruta, version, directorio=None):
+    with open(ruta, "r+b") as archivo:
+        datos = bytearray(archivo.read())
+        magia, _, reservado, posicion, largo = instantanea._CABECERA.unpack_from(datos)
+        if directorio is not None:
+            codificado = json.dumps(directorio).encode("utf-8")
+            datos[posicion:] = codificado
+            largo = len(codificado)
+        datos[:instantanea._CABECERA.size] = instantanea._CABECERA.pack(magia, version, reservado,
+                                                                          posicion, largo)
+        archivo.seek(0)
+        archivo.truncate()
+        archivo.write(datos)
+
+
+def _directorio(ruta):
+    with open(ruta, "rb") as archivo:
+        datos = archivo.read()
+    _, _, _, posicion, largo = instantanea._CABECERA.unpack_from(datos)
+    return json.loads(datos[posicion:posicion + largo])
+
+
+def test_version_desconocida_se_rechaza(tmp_path):
+    ruta = str(tmp_path / "catalogo.elec")
+    instantanea.guardar(_catalogo(), ruta)
+    _reescribir_cabecera(ruta, instantanea.VERSION + 1)
+    with pytest.raises(ValueError, match="Versión"):
+        instantanea.cargar(ruta)
+
+
+@pytest.mark.parametrize("copiar", [False, True])
+def test_version_1_recalcula_derivados(tmp_path, copiar):
+    original = _catalogo()
+    ruta = str(tmp_path / "catalogo.elec")
+    instantanea.guardar(original, ruta)
+    directorio = _directorio(ruta)
+    for entrada in directorio["tablas"].values():
+        del entrada["derivados"]
+    _reescribir_cabecera(ruta, 1, directorio)
+    cargado = instantanea.cargar(ruta, copiar=copiar)
+    assert _fichas(cargado) == _fichas(original)
+    assert _derivados(cargado) == _derivados(original)
+
+
+def test_archivo_que_no_es_instantanea(tmp_path):
+    ruta = tmp_path / "otro.bin"
+    ruta.write_bytes(struct.pack("<4sHHQQ", b"NOPE", 2, 0, 0, 0))
+    with pytest.raises(ValueError, match="no es una instantánea"):
+        instantanea.cargar(str(ruta))
+
+
+def test_columnas_en_little_endian(tmp_path):
+    ruta = str(tmp_path / "catalogo.elec")
+    instantanea.guardar(_catalogo(), ruta)
+    directorio = _directorio(ruta)
+    inicio, tamano = directorio["secciones"][directorio["tablas"]["Lavadora"]["numeros"]["precio"]]
+    with open(ruta, "rb") as archivo:
+        datos = archivo.read()
+    assert struct.unpack_from(f"<{tamano // 8}d", datos, inicio) == (8000, 12500.25)
+
+
+@pytest.mark.parametrize("copiar", [False, True])
+def test_ida_y_vuelta_invirtiendo_bytes(tmp_path, monkeypatch, copiar):
+    # Simula un equipo big endian: se invierte al guardar y al cargar
+    monkeypatch.setattr(instantanea, "_INVERTIR", True)
+    original = _catalogo()
+    ruta = str(tmp_path / "catalogo.elec")
+    instantanea.guardar(original, ruta)
+    cargado = instantanea.cargar(ruta, copiar=copiar)
+    assert _fichas(cargado) == _fichas(original)
+    assert _derivados(cargado) == _derivados(original)
+
+
+def test_fallo_al_guardar_borra_el_temporal(tmp_path, monkeypatch):
+    ruta = tmp_path / "catalogo.elec"
+    instantanea.guardar(_catalogo(), str(ruta))
+    anterior = ruta.read_bytes()
+
+    def falla(columna, formato):
+        raise OSError("disco lleno")
+
+    monkeypatch.setattr(instantanea, "_little_endian", falla)
+    with pytest.raises(OSError):
+        instantanea.guardar(_catalogo(), str(ruta))
+    assert sorted(entrada.name for entrada in tmp_path.iterdir()) == ["catalogo.elec"]
+    assert ruta.read_bytes() == anterior
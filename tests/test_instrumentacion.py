@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from instrumentacion import LIMITES_NS, METODOS, Instrumentacion
+from proyectoU4 import Lavadora, Microondas, Refrigerador
+
+
+class Fallida(Lavadora):
+    __slots__ = ()
+
+    def tipo_gama(self):
+        raise RuntimeError("sin gama")
+
+
+class Heredada(Lavadora):
+    __slots__ = ()
+
+
+def _originales(*clases):
+    return {(clase, metodo): clase.__dict__.get(metodo) for clase in clases for metodo in METODOS}
+
+
+def test_activar_y_desactivar_deja_las_clases_intactas():
+    antes = _originales(Lavadora, Refrigerador, Microondas, Heredada)
+    medicion = Instrumentacion(clases=(Lavadora, Refrigerador, Microondas, Heredada))
+    with medicion:
+        assert medicion.activa
+        assert Lavadora.__dict__["tipo_gama"] is not antes[Lavadora, "tipo_gama"]
+        assert "tipo_gama" in Heredada.__dict__
+    assert not medicion.activa
+    assert _originales(Lavadora, Refrigerador, Microondas, Heredada) == antes
+
+
+def test_cuenta_llamadas_y_no_cambia_resultados():
+    argumentos = [("L1", "LG", "X", 9000, 9, 50, 2), ("L2", "LG", "X", 9000, 20, 50, 8)]
+    esperado = [(str(Lavadora(*valores)), Lavadora(*valores).tipo_gama()) for valores in argumentos * 50]
+    with Instrumentacion(muestreo=4) as medicion:
+        obtenido = []
+        for valores in argumentos * 50:
+            obj = Lavadora(*valores)
+            obtenido.append((str(obj), obj.tipo_gama()))
+    assert obtenido == esperado
+    for metodo in ("__init__", "__str__"):
+        datos = medicion.mediciones["Lavadora", metodo]
+        assert datos.llamadas == 100
+        assert sum(datos.cubetas) == 100
+        assert datos.muestras == 25
+        assert datos.total_ns > 0
+    # __str__ llama a tipo_gama, así que se cuenta dos veces por objeto
+    assert medicion.mediciones["Lavadora", "tipo_gama"].llamadas == 200
+    assert medicion.mediciones["Microondas", "__init__"].llamadas == 0
+    medicion.reiniciar()
+    assert medicion.mediciones["Lavadora", "__init__"].llamadas == 0
+
+
+def test_excepciones_se_propagan_y_se_cuentan():
+    with Instrumentacion(clases=(Fallida,), muestreo=0) as medicion:
+        obj = Fallida("F", "LG", "X", 1, 1, 1, 1)
+        with pytest.raises(RuntimeError):
+            obj.tipo_gama()
+    assert medicion.mediciones["Fallida", "tipo_gama"].llamadas == 1
+    assert medicion.mediciones["Fallida", "tipo_gama"].bloques_por_llamada is None
+
+
+def test_no_deshace_reemplazos_ajenos():
+    original = Microondas.__dict__["tipo_gama"]
+
+    def propia(self):
+        return "Alta"
+
+    with Instrumentacion(clases=(Microondas,)):
+        Microondas.usar_clasificador(propia)
+    try:
+        assert Microondas.__dict__["tipo_gama"] is propia
+    finally:
+        Microondas.usar_clasificador(original)
+
+
+def test_exportar():
+    with Instrumentacion(clases=(Refrigerador,), muestreo=1) as medicion:
+        for _ in range(10):
+            str(Refrigerador("R", "LG", "X", 9000, 2, 12, 400))
+    datos = {(fila["clase"], fila["metodo"]): fila for fila in json.loads(medicion.como_json())}
+    assert datos["Refrigerador", "__str__"]["llamadas"] == 10
+    assert sum(datos["Refrigerador", "__str__"]["cubetas"].values()) == 10
+    texto = medicion.como_prometheus()
+    assert 'electrodomestico_llamadas_total{clase="Refrigerador",metodo="__init__"} 10' in texto
+    cubetas = [int(linea.rsplit(" ", 1)[1]) for linea in texto.splitlines()
+               if linea.startswith('electrodomestico_duracion_segundos_bucket{clase="Refrigerador",metodo="__str__"')]
+    assert len(cubetas) == len(LIMITES_NS) + 1
+    assert cubetas == sorted(cubetas) and cubetas[-1] == 10
+    assert 'electrodomestico_bloques_por_llamada{clase="Refrigerador",metodo="__str__"}' in texto
@@ -0,0 +1,118 @@
+import pytest
+
+from inventario import Inventario
+from proyectoU4 import Refrigerador
+
+
+def _inventario():
+    inventario = Inventario()
+    inventario.agregar(Refrigerador("R1", "Mabe", "RM1", 15000, 2, 12, 420))
+    inventario.agregar(Refrigerador("R2", "LG", "GT2", 30000, 3, 20, 700))
+    return inventario
+
+
+def test_actualizar_convierte_y_reindexa():
+    inventario = _inventario()
+    inventario.actualizar("R1", precio="12000", no_puertas=1, metros_cubicos=9)
+    obj = inventario.obtener("R1")
+    assert obj.precio == 12000 and obj.no_puertas == 1
+    assert inventario.buscar("Refrigerador", precio=(10000, 13000)) == [obj]
+    assert inventario.gama("Baja") == [obj]
+
+
+@pytest.mark.parametrize("cambios", [
+    {"precio": 100, "no_puertas": "x"},
+    {"precio": 100, "no_puertas": 9},
+    {"marca": "Bosch", "precio": -5},
+])
+def test_actualizar_invalido_no_modifica_nada(cambios):
+    inventario = _inventario()
+    avisos = []
+    inventario.suscribir(lambda *aviso: avisos.append(aviso))
+    with pytest.raises(ValueError):
+        inventario.actualizar("R1", **cambios)
+    obj = inventario.obtener("R1")
+    assert (obj.marca, obj.precio, obj.no_puertas) == ("Mabe", 15000, 2)
+    assert inventario.buscar("Refrigerador", precio=100) == []
+    assert inventario.buscar("Refrigerador", no_puertas=2) == [obj]
+    assert inventario.marca("Mabe") == [obj] and inventario.marca("Bosch") == []
+    assert avisos == []
+    assert inventario.eliminar("R1") is obj
+    assert len(inventario) == 1
+    assert all(len(indice) == 1 for (tipo, _), indice in inventario.ordenados.items()
+               if tipo == "Refrigerador")
+
+
+def test_actualizar_deshace_si_falla_tipo_gama(monkeypatch):
+    inventario = _inventario()
+
+    def falla(self):
+        raise RuntimeError("regla rota")
+
+    monkeypatch.setattr(Refrigerador, "tipo_gama", falla)
+    with pytest.raises(RuntimeError):
+        inventario.actualizar("R1", precio=100, no_puertas=1)
+    monkeypatch.undo()
+    obj = inventario.obtener("R1")
+    assert (obj.precio, obj.no_puertas) == (15000, 2)
+    assert inventario.buscar("Refrigerador", precio=(0, 20000)) == [obj]
+    inventario.eliminar("R1")
+
+
+def _muchos(cantidad=20):
+    inventario = Inventario()
+    for numero in range(cantidad):
+        inventario.agregar(Refrigerador(f"R{numero}", "Mabe", "RM", 10000 + numero, 2, 12 + numero, 420))
+    return inventario
+
+
+def _revisar_indices(inventario):
+    for (tipo, campo), indice in inventario.ordenados.items():
+        assert indice.valores == sorted(indice.valores)
+        assert sorted(zip(indice.ids, indice.valores)) == sorted(
+            (id, getattr(obj, campo)) for id, obj in inventario.objetos.items()
+            if inventario.tipos[id][0] == tipo)
+    for id, obj in inventario.objetos.items():
+        tipo, gama = inventario.tipos[id]
+        assert gama == obj.tipo_gama() and id in inventario.cubetas[tipo, gama]
+
+
+@pytest.mark.parametrize("cantidad", [1, 15])
+def test_actualizar_lote_convierte_y_reindexa(cantidad):
+    inventario = _muchos()
+    nuevos = {f"R{numero}": str(30000 - numero) for numero in range(cantidad)}
+    assert inventario.actualizar_lote("precio", nuevos) == cantidad
+    assert inventario.obtener("R0").precio == 30000
+    _revisar_indices(inventario)
+    inventario.actualizar_lote("metros_cubicos", {"R0": "30.5", "R1": 1})
+    _revisar_indices(inventario)
+
+
+@pytest.mark.parametrize("cantidad", [2, 15])
+def test_actualizar_lote_invalido_no_modifica_nada(monkeypatch, cantidad):
+    inventario = _muchos()
+    avisos = []
+    inventario.suscribir(lambda *aviso: avisos.append(aviso))
+    antes = {id: obj.precio for id, obj in inventario.objetos.items()}
+    nuevos = {f"R{numero}": 5000 for numero in range(cantidad)}
+    nuevos[f"R{cantidad - 1}"] = "caro"
+    with pytest.raises(ValueError):
+        inventario.actualizar_lote("precio", nuevos)
+    nuevos[f"R{cantidad - 1}"] = 5000
+
+    original = Refrigerador.tipo_gama
+    llamadas = []
+
+    def falla(self):
+        llamadas.append(self.id)
+        if len(llamadas) == cantidad:
+            raise RuntimeError("regla rota")
+        return original(self)
+
+    monkeypatch.setattr(Refrigerador, "tipo_gama", falla)
+    with pytest.raises(RuntimeError):
+        inventario.actualizar_lote("precio", nuevos)
+    monkeypatch.undo()
+    assert {id: obj.precio for id, obj in inventario.objetos.items()} == antes
+    assert avisos == []
+    _revisar_indices(inventario)
@@ -0,0 +1,73 @@
+import io
+import math
+import random
+
+import pytest
+
+import U3
+from catalogo import Catalogo, TablaColumnar
+from pipeline import desempaquetar_bloque, empaquetar_bloque, procesar_catalogo
+
+
+def _catalogo(filas=120, semilla=8):
+    rng = random.Random(semilla)
+    catalogo = Catalogo()
+    for numero in range(filas):
+        marca = rng.choice(("Mabe", "LG", "Ñandú", "東芝"))
+        precio = rng.choice((rng.randrange(1000, 40000), round(rng.uniform(1000, 40000), 2)))
+        tipo = rng.choice(("Lavadora", "Refrigerador", "Microondas"))
+        if tipo == "Lavadora":
+            especificos = (rng.randint(5, 25), rng.choice((50, 62.5)), rng.randint(1, 10))
+        elif tipo == "Refrigerador":
+            especificos = (rng.randint(1, 3), rng.randint(5, 20), rng.randint(200, 600))
+        else:
+            especificos = (rng.randint(600, 2200), 1200.5, rng.choice(("sin medidas", "54x32.2x43.3")))
+        catalogo.agregar_valores(tipo, f"{tipo[0]}{numero}", marca, f"Mod {numero}", precio, *especificos)
+    return catalogo
+
+
+def _fichas(catalogo):
+    return "".join(f"{vista}\n" for tabla in catalogo.tablas.values() for vista in tabla)
+
+
+def test_bloques_ida_y_vuelta():
+    tabla = _catalogo().tablas["Microondas"]
+    bloque = empaquetar_bloque(tabla, 3, 17)
+    copia = desempaquetar_bloque(bloque)
+    assert len(copia) == 14
+    assert [str(vista) for vista in copia] == [str(tabla.fila(fila)) for fila in range(3, 17)]
+    for campo, columna in copia.derivados.items():
+        for fila, valor in enumerate(columna):
+            original = tabla.derivados[campo][fila + 3]
+            assert valor == original or (math.isnan(valor) and math.isnan(original))
+    # Agregar al final de una tabla existente
+    destino = TablaColumnar(tabla.esquema)
+    desempaquetar_bloque(empaquetar_bloque(tabla, 0, 3), destino)
+    desempaquetar_bloque(bloque, destino)
+    assert [str(vista) for vista in destino] == [str(tabla.fila(fila)) for fila in range(17)]
+
+
+@pytest.mark.parametrize("trabajadores, tamano_bloque", [(1, 7), (1, 10000), (2, 9)])
+def test_resultado_en_orden(trabajadores, tamano_bloque):
+    catalogo = _catalogo()
+    resultado = procesar_catalogo(catalogo, trabajadores, tamano_bloque)
+    assert resultado.filas == sum(len(tabla) for tabla in catalogo.tablas.values())
+    for tipo, tabla in catalogo.tablas.items():
+        assert resultado.etiquetas(tipo) == [vista.tipo_gama() for vista in tabla]
+    assert resultado.texto() == _fichas(catalogo)
+
+    salida = io.StringIO()
+    resultado = procesar_catalogo(catalogo, trabajadores, tamano_bloque, salida=salida)
+    assert resultado.fichas == [] and salida.getvalue() == _fichas(catalogo)
+    assert procesar_catalogo(catalogo, trabajadores, tamano_bloque, renderizar=False).texto() == ""
+
+
+def test_reglas_de_un_conjunto():
+    catalogo = _catalogo()
+    resultado = procesar_catalogo(catalogo, 1, 11, reglas="U3", renderizar=False)
+    lavadoras = catalogo.tablas["Lavadora"]
+    esperado = [U3.Lavadora(*(getattr(vista, campo) for campo in lavadoras.esquema.campos)).tipo_gama()
+                for vista in lavadoras]
+    assert resultado.etiquetas("Lavadora") == esperado
+    with pytest.raises(ValueError):
+        procesar_catalogo(catalogo, 1, 0)
@@ -0,0 +1,81 @@
+import random
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+import precios
+from catalogo import Catalogo
+from precios import Conversion, Descuento, MotorPrecios, a_centavos, redondear
+
+
+@pytest.mark.parametrize("numerador, denominador, esperado", [
+    (5, 2, 2), (7, 2, 4), (-5, 2, -2), (-7, 2, -4), (10, 4, 2), (11, 4, 3), (9, 4, 2),
+])
+def test_redondear_mitad_al_par(numerador, denominador, esperado):
+    assert redondear(numerador, denominador) == esperado
+
+
+@pytest.mark.parametrize("precio, esperado", [
+    ("10.005", 1000), ("10.015", 1002), ("0.125", 12), ("0.135", 14), ("2.675", 268),
+    ("12750", 1275000), ("1000000000000.005", 100000000000000),
+])
+def test_a_centavos_igual_para_todos_los_tipos(precio, esperado):
+    valores = [precio, Decimal(precio), Fraction(Decimal(precio)), float(precio)]
+    if "." not in precio:
+        valores.append(int(precio))
+    assert [a_centavos(valor) for valor in valores] == [esperado] * len(valores)
+
+
+def test_a_centavos_float_coincide_con_decimal():
+    rng = random.Random(17)
+    for _ in range(20000):
+        valor = round(rng.uniform(0, 100000), rng.choice((2, 3, 4)))
+        assert a_centavos(valor) == a_centavos(repr(valor))
+
+
+def test_descuento_redondea_mitad_al_par():
+    motor = MotorPrecios([Descuento(porcentaje="50")])
+    assert motor.cotizar("Lavadora", "Mabe", "Baja", 0.05) == 0.02
+    assert motor.cotizar("Lavadora", "Mabe", "Baja", 0.07) == 0.04
+    assert motor.cotizar("Lavadora", "Mabe", "Baja", 10000) == 5000
+    assert type(motor.cotizar("Lavadora", "Mabe", "Baja", 10001)) is float
+
+
+def _catalogo(semilla=3):
+    rng = random.Random(semilla)
+    catalogo = Catalogo()
+    for i in range(3000):
+        precio = rng.choice((rng.randint(1000, 40000), round(rng.uniform(1000, 40000), 3)))
+        catalogo.agregar_valores("Lavadora", f"L{i}", rng.choice(("LG", "Mabe")), "W", precio,
+                                 rng.randint(5, 20), rng.randint(30, 90), rng.randint(1, 10))
+    return catalogo
+
+
+def test_lote_numpy_python_y_cotizar_coinciden(monkeypatch):
+    reglas = [Descuento(porcentaje="12.5", marca="LG"), Descuento(monto="99.995", gama="Alta"),
+              Conversion("0.0583")]
+    motor = MotorPrecios(reglas)
+    catalogo = _catalogo()
+    tabla = catalogo.tablas["Lavadora"]
+    esperado = [motor.cotizar("Lavadora", fila.marca, fila.tipo_gama(), fila.precio) for fila in tabla]
+    resultados = []
+    for numpy in (precios.np, None):
+        if numpy is None and precios.np is None:
+            continue
+        monkeypatch.setattr(precios, "np", numpy)
+        copia = _catalogo()
+        motor.aplicar_catalogo(copia)
+        resultados.append(list(copia.tablas["Lavadora"].columna("precio")))
+    assert all(resultado == esperado for resultado in resultados)
+
+
+def test_reglas_invalidas():
+    with pytest.raises(ValueError):
+        Descuento(porcentaje=120)
+    with pytest.raises(ValueError):
+        Descuento(monto=-1)
+    with pytest.raises(ValueError):
+        Conversion(0)
+    with pytest.raises(ValueError):
+        Descuento(tipo="Tostador")
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from estadisticas import Estadisticas
+from inventario import Inventario
+from proyectoU4 import Lavadora, Refrigerador
+from reglas_gama import MotorReglas, cargar_reglas
+
+
+@pytest.fixture
+def ruta(tmp_path):
+    ruta = tmp_path / "reglas.json"
+    ruta.write_text(json.dumps({"U4": cargar_reglas()["U4"]}), encoding="utf-8")
+    return ruta
+
+
+def _reescribir(ruta, tipo, definicion):
+    reglas = json.loads(ruta.read_text(encoding="utf-8"))
+    reglas["U4"][tipo] = definicion
+    ruta.write_text(json.dumps(reglas), encoding="utf-8")
+
+
+def test_recarga_reclasifica_inventario_y_estadisticas(ruta):
+    inventario = Inventario()
+    inventario.agregar(Lavadora("L1", "Mabe", "LM", 8000, 9, 50, 2))
+    estadisticas = Estadisticas().conectar(inventario)
+    motor = MotorReglas(str(ruta)).conectar(inventario)
+    try:
+        motor.instalar()
+        assert inventario.tipos["L1"] == ("Lavadora", "Baja")
+        _reescribir(ruta, "Lavadora", {"reglas": [], "defecto": "Alta"})
+        assert motor.recargar(forzar=True)
+        assert inventario.tipos["L1"] == ("Lavadora", "Alta")
+        assert [obj.id for obj in inventario.gama("Alta")] == ["L1"]
+        assert estadisticas.consultar("Lavadora").como_dict()["gamas"] == {"Baja": 0, "Media": 0, "Alta": 1}
+    finally:
+        motor.restaurar()
+    assert inventario.tipos["L1"] == ("Lavadora", "Baja")
+
+
+def test_instalar_sin_clase_no_toca_ningun_tipo(ruta):
+    antes = Lavadora.__dict__["tipo_gama"], Refrigerador.__dict__["tipo_gama"]
+    avisos = []
+    motor = MotorReglas(str(ruta), clases={"Lavadora": Lavadora})
+    motor.suscribir(avisos.append)
+    with pytest.raises(KeyError):
+        motor.instalar()
+    assert (Lavadora.__dict__["tipo_gama"], Refrigerador.__dict__["tipo_gama"]) == antes
+    assert motor.version == 0 and avisos == []
+
+
+def test_instalar_en_clases_de_u3():
+    import U3
+
+    motor = MotorReglas(conjunto="U3", clases={"Lavadora": U3.Lavadora, "Refrigerador": U3.Refrigerador,
+                                               "Microondas": U3.Microondas})
+    motor.instalar()
+    try:
+        assert U3.Lavadora("L1", "Mabe", "LM", 8000, 9, 50, 2).tipo_gama() == "Baja"
+    finally:
+        motor.restaurar()
@@ -0,0 +1,61 @@
+import io
+
+from catalogo import Catalogo
+from proyectoU4 import Lavadora
+from renderizado import CacheRender, escribir_objetos, escribir_tabla
+
+
+def _catalogo():
+    catalogo = Catalogo()
+    catalogo.agregar_valores("Lavadora", "L1", "Mabe", "LM", 8000, 9, 50, 2)
+    catalogo.agregar_valores("Lavadora", "L2", "LG", "WT", 12500.5, 16, 70.5, 8)
+    return catalogo
+
+
+def test_cache_reconoce_vistas_nuevas_de_la_misma_fila():
+    tabla = _catalogo().tablas["Lavadora"]
+    cache = CacheRender()
+    texto = cache.render(tabla.fila(0))
+    assert cache.render(tabla.fila(0)) == texto == str(tabla.fila(0))
+    assert (cache.aciertos, cache.fallos, len(cache)) == (1, 1, 1)
+
+
+def test_cache_detecta_cambios_de_la_fila():
+    tabla = _catalogo().tablas["Lavadora"]
+    cache = CacheRender()
+    cache.render(tabla.fila(0))
+    tabla.asignar("precio", 0, 9100)
+    assert "$9,100.00" in cache.render(tabla.fila(0))
+    assert cache.fallos == 2
+
+
+def test_cache_de_objetos_e_invalidar():
+    obj = Lavadora("L1", "Mabe", "LM", 8000, 9, 50, 2)
+    cache = CacheRender()
+    assert cache.render(obj) == cache.render(obj) == str(obj)
+    cache.invalidar(obj)
+    assert len(cache) == 0
+
+
+def test_escritura_masiva_igual_a_print():
+    tabla = _catalogo().tablas["Lavadora"]
+    esperado = "".join(f"{fila}\n" for fila in tabla)
+    for escribir in (lambda salida: escribir_tabla(tabla, salida),
+                     lambda salida: escribir_objetos(tabla, salida),
+                     lambda salida: escribir_objetos(tabla, salida, cache=CacheRender())):
+        salida = io.StringIO()
+        assert escribir(salida) == 2
+        assert salida.getvalue() == esperado
+
+
+def test_escritura_de_objetos_de_otras_versiones():
+    import U3
+    import proyectoU3
+    objetos = [Lavadora("L1", "Mabe", "LM", 13999, 9, 50, 2),
+               proyectoU3.Lavadora("8MWTW2224WJM", "Whirlpool", "8MWTW2224WJM", 13999, 22, 15, 12),
+               U3.Lavadora("L3", "LG", "WT", 13999, 16, 70, 8),
+               U3.Microondas("M1", "LG", "MS", 2500.5, 900, 1100, "50x30x40")]
+    salida = io.StringIO()
+    assert escribir_objetos(objetos, salida) == 4
+    assert salida.getvalue() == "".join(f"{obj}\n" for obj in objetos)
+    assert "$13,999 Pesos" in salida.getvalue()
@@ -0,0 +1,73 @@
+import asyncio
+
+from servicio import ClienteHTTP, ServicioCatalogo, desde_dict
+
+LAVADORA = {"tipo": "Lavadora", "marca": "Mabe", "modelo": "LM", "precio": 8000,
+            "capacidad_carga": 9, "consumo_agua": 50, "ciclos_lavado": 2}
+
+
+def _correr(prueba):
+    async def principal():
+        servicio = await ServicioCatalogo(espera_lote=0.001).iniciar("127.0.0.1", 0)
+        cliente = await ClienteHTTP("127.0.0.1", servicio.puerto).conectar()
+        try:
+            await prueba(servicio, cliente)
+        finally:
+            await cliente.cerrar()
+            await servicio.detener()
+
+    asyncio.run(asyncio.wait_for(principal(), 10))
+
+
+def test_alta_consulta_y_cache():
+    async def prueba(servicio, cliente):
+        estado, datos = await cliente.pedir("POST", "/electrodomesticos", dict(LAVADORA, id="L1"))
+        assert (estado, datos["gama"]) == (201, "Baja")
+        assert await cliente.pedir("GET", "/electrodomesticos/L1") == (200, datos)
+        assert (await cliente.pedir("GET", "/electrodomesticos/L1"))[0] == 200
+        assert servicio.aciertos_cache == 1
+        estado, datos = await cliente.pedir("POST", "/electrodomesticos", dict(LAVADORA, id="L1"))
+        assert estado == 400
+
+    _correr(prueba)
+
+
+def test_error_de_un_oyente_no_bloquea_las_siguientes_altas():
+    async def prueba(servicio, cliente):
+        def oyente(operacion, tipo, gama, obj, anteriores):
+            if obj.id == "L1":
+                raise KeyError("oyente roto")
+
+        servicio.inventario.suscribir(oyente)
+        estado, datos = await cliente.pedir("POST", "/electrodomesticos", dict(LAVADORA, id="L1"))
+        assert estado == 500
+        estado, datos = await cliente.pedir("POST", "/electrodomesticos", dict(LAVADORA, id="L2"))
+        assert (estado, datos["id"]) == (201, "L2")
+
+    _correr(prueba)
+
+
+def test_futuro_cancelado_se_salta():
+    async def prueba(servicio, cliente):
+        cancelado = asyncio.get_running_loop().create_future()
+        cancelado.cancel()
+        await servicio._pendientes.put((desde_dict(dict(LAVADORA, id="L0")), cancelado))
+        estado, _ = await cliente.pedir("POST", "/electrodomesticos", dict(LAVADORA, id="L1"))
+        assert estado == 201
+        assert servicio.reinicios_escritor == 0
+
+    _correr(prueba)
+
+
+def test_escritor_se_reinicia_si_termina():
+    async def prueba(servicio, cliente):
+        anterior = servicio._escritor
+        servicio._pendientes.put_nowait(None)  # no se puede desempacar: la tarea falla
+        await asyncio.sleep(0.05)
+        assert servicio._escritor is not anterior and anterior.done()
+        assert servicio.reinicios_escritor == 1
+        assert isinstance(servicio.error_escritor, TypeError)
+        estado, _ = await cliente.pedir("POST", "/electrodomesticos", dict(LAVADORA, id="L1"))
+        assert estado == 201
+
+    _correr(prueba)
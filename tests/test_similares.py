@@ -0,0 +1,120 @@
+import math
+import random
+
+import pytest
+
+from catalogo import Catalogo
+from indice_espacial import IndiceKD
+from inventario import Inventario
+from proyectoU4 import Lavadora, Refrigerador
+from similares import IndiceSimilares, Similares
+
+
+def _cercanos(puntos, punto, k, excluir=None):
+    distancias = sorted((math.dist(otro, punto), clave) for clave, otro in puntos.items() if clave != excluir)
+    return distancias[:k]
+
+
+def _revisar(obtenidos, puntos, punto, k, excluir=None):
+    """Mismas distancias que la fuerza bruta; con empates la clave puede variar."""
+    esperados = _cercanos(puntos, punto, k, excluir)
+    assert [distancia for distancia, _ in obtenidos] == pytest.approx([distancia for distancia, _ in esperados])
+    for distancia, clave in obtenidos:
+        assert clave != excluir
+        assert math.dist(puntos[clave], punto) == pytest.approx(distancia)
+    assert len({clave for _, clave in obtenidos}) == len(obtenidos)
+
+
+@pytest.mark.parametrize("hoja", [1, 4, 32])
+def test_vecinos_como_fuerza_bruta(hoja):
+    rng = random.Random(hoja)
+    indice = IndiceKD(3, hoja=hoja)
+    puntos = {}
+    for paso in range(800):
+        if rng.random() < 0.7 or not puntos:
+            clave = f"p{rng.randrange(300)}"
+            puntos[clave] = tuple(float(rng.randint(0, 15)) for _ in range(3))
+            indice.insertar(puntos[clave], clave)
+        else:
+            clave = rng.choice(sorted(puntos))
+            del puntos[clave]
+            indice.eliminar(clave)
+        if paso % 80 == 0:
+            for _ in range(10):
+                punto = tuple(rng.uniform(-2, 17) for _ in range(3))
+                k = rng.choice((1, 5, 20, len(puntos) + 3))
+                _revisar(indice.vecinos(punto, k), puntos, punto, k)
+            clave = rng.choice(sorted(puntos))
+            _revisar(indice.vecinos(puntos[clave], 5, excluir=clave), puntos, puntos[clave], 5, clave)
+
+
+def test_vecinos_aproximados_respetan_epsilon():
+    rng = random.Random(5)
+    puntos = {numero: (rng.random(), rng.random(), rng.random()) for numero in range(2000)}
+    indice = IndiceKD.desde_columnas([[punto[eje] for punto in puntos.values()] for eje in range(3)],
+                                     list(puntos), hoja=8)
+    for _ in range(50):
+        punto = (rng.random(), rng.random(), rng.random())
+        exactos = _cercanos(puntos, punto, 10)
+        aproximados = indice.vecinos(punto, 10, epsilon=0.5)
+        assert len(aproximados) == 10
+        for (distancia, _), (exacta, _) in zip(aproximados, exactos):
+            assert distancia <= 1.5 * exacta + 1e-12
+
+
+def _catalogo(cantidad=400, semilla=11):
+    rng = random.Random(semilla)
+    catalogo = Catalogo()
+    for numero in range(cantidad):
+        catalogo.agregar(Lavadora(f"L{numero}", "LG", "X", rng.randrange(3000, 30000),
+                                  rng.randint(5, 25), rng.randint(20, 90), rng.randint(1, 12)))
+    for numero in range(50):
+        catalogo.agregar(Refrigerador(f"R{numero}", "Mabe", "X", rng.randrange(8000, 40000),
+                                      rng.randint(1, 3), rng.randint(5, 20), rng.randint(200, 600)))
+    return catalogo
+
+
+def _normalizados(indice):
+    return {id: indice.normalizar(valores) for id, valores in indice.valores.items()}
+
+
+def test_similares_desde_tabla_como_fuerza_bruta():
+    tabla = _catalogo().tablas["Lavadora"]
+    indice = IndiceSimilares.desde_tabla(tabla, pesos={"precio": 2.0}, hoja=8)
+    puntos = _normalizados(indice)
+    assert len(indice) == len(tabla)
+    # La escala es la de media 0 y desviación 1 (por el peso) de cada campo
+    for posicion, peso in enumerate(indice.pesos):
+        columna = [punto[posicion] for punto in puntos.values()]
+        media = sum(columna) / len(columna)
+        assert media == pytest.approx(0, abs=1e-9)
+        assert math.sqrt(sum((valor - media) ** 2 for valor in columna) / len(columna)) == pytest.approx(peso)
+    for id in ("L0", "L17", "L399"):
+        _revisar(indice.similares(id, k=7), puntos, puntos[id], 7, excluir=id)
+    lote = indice.similares_lote(["L1", "L2"], k=3)
+    assert lote == {id: indice.similares(id, k=3) for id in ("L1", "L2")}
+    with pytest.raises(KeyError):
+        indice.similares("no existe")
+
+
+def test_similares_sigue_al_inventario():
+    inventario = Inventario()
+    for tabla in _catalogo(cantidad=60).tablas.values():
+        for obj in tabla:
+            inventario.agregar(tabla.esquema.clase(*(getattr(obj, campo) for campo in tabla.esquema.campos)))
+    similares = Similares(hoja=4).conectar(inventario)
+    rng = random.Random(3)
+    for numero in range(200):
+        inventario.agregar(Lavadora(f"N{numero}", "LG", "X", rng.randrange(3000, 30000),
+                                    rng.randint(5, 25), rng.randint(20, 90), rng.randint(1, 12)))
+    inventario.actualizar("L3", precio=29999, capacidad_carga=25)
+    inventario.actualizar("L4", marca="Mabe")
+    inventario.eliminar("L5")
+    indice = similares.indices["Lavadora"]
+    assert set(indice.valores) == {obj.id for obj in inventario if isinstance(obj, Lavadora)}
+    actualizado = dict(zip(indice.campos, indice.valores["L3"]))
+    assert (actualizado["precio"], actualizado["capacidad_carga"]) == (29999.0, 25.0)
+    puntos = _normalizados(indice)
+    for id in ("L3", "N0", "N199"):
+        _revisar(similares.similares("Lavadora", id, k=5), puntos, puntos[id], 5, excluir=id)
+    assert "L5" not in {clave for _, clave in similares.similares("Lavadora", "L6", k=300)}
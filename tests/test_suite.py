@@ -0,0 +1,44 @@
+import json
+
+from benchmarks import suite
+
+
+def _corrida(**valores):
+    datos = {operacion: 1000.0 for operacion in suite.OPERACIONES}
+    datos.update(bytes_por_objeto=100.0, asignaciones_por_objeto=1.0, rss_pico_mb=10.0)
+    datos.update(valores)
+    return {"resultados": {"1000": datos}}
+
+
+def test_datos_reproducibles():
+    primera = suite.generar_argumentos(300)
+    assert primera == suite.generar_argumentos(300)
+    assert primera != suite.generar_argumentos(300, semilla=8)
+    assert [clase.__name__ for clase, _ in primera[:3]] == ["Lavadora", "Refrigerador", "Microondas"]
+    assert len({valores[0] for _, valores in primera}) == 300
+
+
+def test_comparar_respeta_el_umbral():
+    base = _corrida()
+    assert suite.comparar(base, _corrida(str=860.0)) == []
+    regresiones = suite.comparar(base, _corrida(str=840.0, bytes_por_objeto=120.0))
+    assert len(regresiones) == 2
+    assert regresiones[0].startswith("str con 1,000 objetos")
+    assert "bytes por objeto" in regresiones[1]
+    assert suite.comparar(base, _corrida(tipo_gama=500.0), umbral=0.6) == []
+    assert suite.comparar(base, {"resultados": {"5": _corrida()["resultados"]["1000"]}}) == []
+
+
+def test_corrida_completa_y_regresion(tmp_path):
+    salida = tmp_path / "actual.json"
+    assert suite.main(["--tamanos", "60", "--repeticiones", "1", "--salida", str(salida)]) == 0
+    corrida = json.loads(salida.read_text(encoding="utf-8"))
+    datos = corrida["resultados"]["60"]
+    assert all(datos[operacion] > 0 for operacion in suite.OPERACIONES)
+    assert datos["bytes_por_objeto"] > 0
+    # Una base 100 veces más rápida obliga a reportar regresión
+    for operacion in suite.OPERACIONES:
+        datos[operacion] *= 100
+    base = tmp_path / "base.json"
+    base.write_text(json.dumps(corrida), encoding="utf-8")
+    assert suite.main(["--tamanos", "60", "--repeticiones", "1", "--base", str(base)]) == 1
@@ -0,0 +1,98 @@
+import pytest
+
+import gama_vectorizada
+from catalogo import ESQUEMAS, Catalogo
+from inventario import Inventario
+from tipos import TIPOS, Campo, quitar_tipo, registrar_tipo
+
+CAMPOS = (Campo("cubiertos", int, "Cubiertos: ", minimo=1, maximo=20),
+          Campo("consumo_agua", float, "Consumo De Agua: ", " Litros", minimo=0),
+          Campo("color", str, "Color: "))
+GAMA = {"reglas": [{"gama": "Baja", "todas": [["cubiertos", "<=", 9]]},
+                   {"gama": "Media", "alguna": [["cubiertos", "<=", 13], ["consumo_agua", "<", 10]]}],
+        "defecto": "Alta"}
+
+
+@pytest.fixture
+def lavavajillas():
+    clase = registrar_tipo("Lavavajillas", CAMPOS, GAMA)
+    yield clase
+    quitar_tipo("Lavavajillas")
+
+
+def test_clase_generada(lavavajillas):
+    obj = lavavajillas("V1", "Bosch", "SMS", 9999.5, 12, 9.5, "blanco")
+    assert obj.tipo_gama() == "Media"
+    assert lavavajillas("V2", "Bosch", "SMS", 9999, 8, 12, "gris").tipo_gama() == "Baja"
+    assert str(obj).splitlines() == ["ID: V1", "Marca: Bosch", "modelo: SMS", "precio: $9,999.50 Pesos",
+                                     "Cubiertos: 12", "Consumo De Agua: 9.5 Litros", "Color: blanco",
+                                     "Tipo de gama: Media"]
+    assert "tipo_gama" in lavavajillas.__dict__
+    assert not hasattr(obj, "__dict__")
+
+
+@pytest.mark.parametrize("posicion, valor, error, mensaje", [
+    (0, 1, TypeError, "id debe ser texto"),
+    (3, "100", TypeError, "precio debe ser número"),
+    (3, -1, ValueError, "precio debe ser al menos 0"),
+    (4, 3.0, TypeError, "cubiertos debe ser entero"),
+    (4, True, TypeError, "cubiertos debe ser entero"),
+    (4, 0, ValueError, "cubiertos debe ser al menos 1"),
+    (4, 21, ValueError, "cubiertos debe ser a lo más 20"),
+    (5, None, TypeError, "consumo_agua debe ser número"),
+    (6, 5, TypeError, "color debe ser texto"),
+])
+def test_validacion_del_constructor(lavavajillas, posicion, valor, error, mensaje):
+    argumentos = ["V1", "Bosch", "SMS", 9999, 12, 9.5, "blanco"]
+    argumentos[posicion] = valor
+    with pytest.raises(error, match=mensaje):
+        lavavajillas(*argumentos)
+
+
+def test_sin_validar_acepta_cualquier_valor():
+    clase = registrar_tipo("Lavavajillas", CAMPOS, GAMA, validar=False)
+    try:
+        assert clase(1, 2, 3, -4, 0, None, 5).precio == -4
+    finally:
+        quitar_tipo("Lavavajillas")
+
+
+@pytest.mark.parametrize("gama", [
+    None,
+    {"reglas": []},
+    {"reglas": [{"gama": "Baja", "todas": [["color", "<=", 3]]}], "defecto": "Alta"},
+    {"reglas": [{"gama": "Baja", "todas": [["no_existe", "<=", 3]]}], "defecto": "Alta"},
+])
+def test_gama_invalida_falla_al_registrar(gama):
+    with pytest.raises(ValueError):
+        registrar_tipo("Lavavajillas", CAMPOS, gama)
+    assert "Lavavajillas" not in ESQUEMAS and "Lavavajillas" not in TIPOS
+    assert "Lavavajillas" not in gama_vectorizada.CLASIFICADORES
+
+
+def test_gama_escrita_a_mano():
+    def tipo_gama(self):
+        return "Alta" if self.cubiertos > 12 else "Baja"
+
+    clase = registrar_tipo("Lavavajillas", CAMPOS, tipo_gama)
+    try:
+        assert clase("V1", "Bosch", "SMS", 9999, 14, 12.5, "blanco").tipo_gama() == "Alta"
+    finally:
+        quitar_tipo("Lavavajillas")
+
+
+def test_tipo_repetido():
+    with pytest.raises(ValueError):
+        registrar_tipo("Lavadora", CAMPOS, GAMA)
+    assert ESQUEMAS["Lavadora"].clase.__module__ == "proyectoU4"
+
+
+def test_tipo_en_catalogo_e_inventario(lavavajillas):
+    catalogo = Catalogo()
+    catalogo.agregar_valores("Lavavajillas", "V1", "Bosch", "SMS", 9999, 14, 12.5, "blanco")
+    catalogo.agregar_valores("Lavavajillas", "V2", "LG", "DW", 7000, 8, 12, "gris")
+    tabla = catalogo.tablas["Lavavajillas"]
+    assert gama_vectorizada.gama_tabla(tabla) == ["Alta", "Baja"]
+    inventario = Inventario()
+    inventario.agregar(lavavajillas("V1", "Bosch", "SMS", 9999, 14, 12.5, "blanco"))
+    assert [obj.id for obj in inventario.gama("Alta", "Lavavajillas")] == ["V1"]
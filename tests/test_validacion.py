@@ -0,0 +1,92 @@
+import pytest
+
+import importador
+from validacion import convertir_columna, convertir_numero, convertir_valor, validar_columnas
+
+# (texto, resultado en campo numérico, resultado en campo entero); None = inválido
+CASOS = [
+    ("13999", 13999, 13999),
+    (" 12 ", 12, 12),
+    ("+7", 7, 7),
+    ("-3", -3, -3),
+    ("12.0", 12.0, 12),
+    ("0.623", 0.623, None),
+    (".5", 0.5, None),
+    ("1e3", 1000.0, 1000),
+    ("1_000", None, None),
+    ("1_000.5", None, None),
+    ("nan", None, None),
+    ("inf", None, None),
+    ("1e999", None, None),
+    ("", None, None),
+    ("abc", None, None),
+    ("12,5", None, None),
+]
+
+
+@pytest.mark.parametrize("texto, numero, entero", CASOS)
+def test_regla_unica_de_conversion(texto, numero, entero):
+    for pedido, esperado in ((False, numero), (True, entero)):
+        if esperado is None:
+            with pytest.raises(ValueError):
+                convertir_numero(texto, pedido)
+        else:
+            convertido = convertir_numero(texto, pedido)
+            assert convertido == esperado and type(convertido) is type(esperado)
+
+
+@pytest.mark.parametrize("entero", [False, True])
+def test_columna_y_valor_suelto_coinciden(entero):
+    textos = [texto for texto, _, _ in CASOS]
+    for columna in (textos, ["1", "2", "1_000"], ["1", "2", "3"]):
+        convertidos, invalidos = convertir_columna(columna, entero)
+        for texto, convertido, invalido in zip(columna, convertidos, invalidos):
+            try:
+                esperado = convertir_numero(texto, entero)
+            except ValueError:
+                assert invalido and convertido is None
+            else:
+                assert not invalido and convertido == esperado
+                assert type(convertido) is type(esperado)
+
+
+def test_numeros_que_no_son_texto():
+    assert convertir_numero(12.0, entero=True) == 12
+    assert convertir_numero(3) == 3
+    for valor in (True, None, float("nan"), 2.5j):
+        with pytest.raises(ValueError):
+            convertir_numero(valor)
+    with pytest.raises(ValueError):
+        convertir_numero(12.5, entero=True)
+
+
+def test_importador_usa_la_misma_regla():
+    assert importador.convertir_numero is convertir_numero
+
+
+def test_validar_columnas_mascaras_y_motivos():
+    resultado = validar_columnas("Refrigerador", {
+        "id": ["R1", "R2", "R3", ""],
+        "marca": ["Mabe", "LG", "LG", "LG"],
+        "modelo": ["A", "B", "C", "D"],
+        "precio": ["15000", "-1", "9000", "1_000"],
+        "no_puertas": ["2.0", "2", "2.5", "1"],
+        "metros_cubicos": ["12", "12", "12", "10"],
+        "pies_capacidad": ["424", "424", "424", "900"],
+    })
+    assert resultado.validas() == [0]
+    assert resultado.columnas["no_puertas"][0] == 2
+    assert resultado.fallidos(1) == ["precio"]
+    assert resultado.motivo(1) == "precio: debe ser al menos 0, se recibió -1"
+    assert resultado.motivo(2) == "no_puertas: se esperaba un entero, se recibió '2.5'"
+    assert set(resultado.fallidos(3)) == {"id", "precio", "unidades"}
+    assert resultado.filtradas()["id"] == ["R1"]
+
+
+def test_convertir_valor():
+    assert convertir_valor("Refrigerador", "no_puertas", "3") == 3
+    assert convertir_valor("Refrigerador", "marca", 5) == "5"
+    with pytest.raises(ValueError, match="a lo más 8"):
+        convertir_valor("Refrigerador", "no_puertas", 9)
+    with pytest.raises(ValueError, match="falta el campo marca"):
+        convertir_valor("Refrigerador", "marca", "")
@@ -0,0 +1,274 @@
+"""Registro de tipos de electrodoméstico declarados por esquema.
+
+Agregar un tipo (por ejemplo un Lavavajillas) ya no requiere copiar una
+subclase de Electrodomestico con su __init__, __str__ y tipo_gama escritos a
+mano. Basta declarar sus campos y sus reglas de gama:
+
+    Lavavajillas = registrar_tipo(
+        "Lavavajillas",
+        campos=(Campo("cubiertos", int, "Cubiertos: ", minimo=1),
+                Campo("consumo_agua", float, "Consumo De Agua: ", " Litros", minimo=0),
+                Campo("programas", int, "Programas: ")),
+        gama={"reglas": [{"gama": "Baja", "todas": [["cubiertos", "<=", 9]]},
+                         {"gama": "Media", "todas": [["cubiertos", "<=", 13], ["programas", "<=", 6]]}],
+              "defecto": "Alta"})
+
+A partir de la declaración se generan:
+
+    - una clase con __slots__ que hereda de Electrodomestico y Gama de
+      proyectoU4.py; su __init__ se genera como código Python que valida
+      tipos y rangos y asigna los atributos directamente, sin la llamada a
+      super().__init__ de las clases escritas a mano;
+    - __str__ con el mismo formato que proyectoU4.py, como una sola f-string;
+    - tipo_gama compilado con reglas_gama.py (mismo formato que
+      reglas_gama.json) y su versión por lotes para gama_vectorizada;
+    - el Esquema del almacén columnar (catalogo.ESQUEMAS), la plantilla de
+      renderizado.PLANTILLAS y las restricciones de validacion.py, así que
+      el tipo funciona en Catalogo, Inventario, instantáneas, el importador
+      y el servicio.
+
+Los tipos se registran antes de crear catálogos o inventarios. También se
+pueden declarar en un archivo JSON con cargar_tipos().
+"""
+
+import json
+
+import gama_vectorizada
+import renderizado
+import validacion
+from catalogo import Esquema, quitar_esquema, registrar_esquema
+from gama_vectorizada import GAMAS
+from proyectoU4 import Electrodomestico, Gama
+from reglas_gama import ClasificadorCompilado
+
+TIPOS = {}
+_TIPOS_DATO = {"int": int, "float": float, "str": str}
+_PALABRAS_RESERVADAS = {"id", "marca", "modelo", "precio", "gama", "self", "tipo_gama"}
+
+
+class Campo():
+    """Campo específico de un tipo de electrodoméstico.
+
+    Atributos:
+        nombre (str): Nombre del atributo.
+        tipo (type): int, float o str. Un campo float también acepta int.
+        etiqueta (str): Texto que precede al valor en __str__.
+        unidad (str): Texto que sigue al valor en __str__.
+        minimo: Valor mínimo permitido, o None.
+        maximo: Valor máximo permitido, o None.
+    """
+    __slots__ = ("nombre", "tipo", "etiqueta", "unidad", "minimo", "maximo")
+
+    def __init__(self, nombre, tipo=float, etiqueta=None, unidad="", minimo=None, maximo=None):
+        if not nombre.isidentifier() or nombre in _PALABRAS_RESERVADAS:
+            raise ValueError(f"Nombre de campo inválido: {nombre!r}")
+        tipo = _TIPOS_DATO.get(tipo, tipo)
+        if tipo not in (int, float, str):
+            raise ValueError(f"{nombre}: el tipo debe ser int, float o str")
+        if tipo is str and (minimo is not None or maximo is not None):
+            raise ValueError(f"{nombre}: un campo de texto no tiene rango")
+        self.nombre = nombre
+        self.tipo = tipo
+        self.etiqueta = etiqueta if etiqueta is not None else nombre.replace("_", " ").title() + ": "
+        self.unidad = unidad
+        self.minimo = minimo
+        self.maximo = maximo
+
+
+def _f_string(texto):
+    """Texto fijo escapado para ir dentro de una f-string generada."""
+    return texto.replace("{", "{{").replace("}", "}}")
+
+
+def _validaciones(nombre, tipo, minimo=None, maximo=None):
+    """Líneas de _revisar que validan un argumento con un mensaje por error."""
+    if tipo is str:
+        condicion = f"_type({nombre}) is not _str"
+        esperado = "texto"
+    elif tipo is int:
+        condicion = f"_type({nombre}) is not _int"
+        esperado = "entero"
+    else:
+        condicion = f"_type({nombre}) is not _float and _type({nombre}) is not _int"
+        esperado = "número"
+    lineas = [f"    if {condicion}:",
+              f"        raise TypeError(f'{nombre} debe ser {esperado}, se recibió {{{nombre}!r}}')"]
+    if minimo is not None:
+        lineas += [f"    if {nombre} < {minimo!r}:",
+                   f"        raise ValueError(f'{nombre} debe ser al menos {minimo!r}, se recibió {{{nombre}!r}}')"]
+    if maximo is not None:
+        lineas += [f"    if {nombre} > {maximo!r}:",
+                   f"        raise ValueError(f'{nombre} debe ser a lo más {maximo!r}, se recibió {{{nombre}!r}}')"]
+    return lineas
+
+
+def _condicion(nombre, tipo, minimo=None, maximo=None):
+    """Expresión que es verdadera si un argumento no cumple su tipo o su rango."""
+    if tipo is str:
+        partes = [f"_type({nombre}) is not _str"]
+    elif tipo is int:
+        partes = [f"_type({nombre}) is not _int"]
+    else:
+        partes = [f"((_tipo := _type({nombre})) is not _float and _tipo is not _int)"]
+    # El rango va después del tipo, así que nunca se compara un texto
+    if minimo is not None:
+        partes.append(f"{nombre} < {minimo!r}")
+    if maximo is not None:
+        partes.append(f"{nombre} > {maximo!r}")
+    return " or ".join(partes)
+
+
+def _generar_fuente(nombre, campos, validar):
+    """Código de __init__ y __str__ de la clase generada.
+
+    Las funciones se generan dentro de _crear() para que type, str, int y
+    float sean variables de la clausura y no búsquedas en los builtins. Con
+    validar, __init__ revisa todos los argumentos en una sola condición; sólo
+    si algo falla llama a _revisar(), que encuentra el primer error y lanza
+    la excepción con su mensaje.
+    """
+    argumentos = ["id", "marca", "modelo", "precio"] + [campo.nombre for campo in campos]
+    revisiones = [("id", str), ("marca", str), ("modelo", str), ("precio", float, 0)]
+    revisiones += [(campo.nombre, campo.tipo, campo.minimo, campo.maximo) for campo in campos]
+    cuerpo = []
+    if validar:
+        cuerpo += [f"def _revisar({', '.join(argumentos)}):",
+                   f"    '''Lanza el error del primer argumento inválido de {nombre}.'''"]
+        for revision in revisiones:
+            cuerpo += _validaciones(*revision)
+        cuerpo.append("")
+    cuerpo += [f"def __init__(self, {', '.join(argumentos)}):",
+               f"    '''Inicializa un objeto {nombre} con sus atributos base y específicos.'''"]
+    if validar:
+        condiciones = [_condicion(*revision) for revision in revisiones]
+        cuerpo.append(f"    if ({condiciones[0]}")
+        cuerpo += [f"            or {condicion}" for condicion in condiciones[1:]]
+        cuerpo[-1] += "):"
+        cuerpo.append(f"        _revisar({', '.join(argumentos)})")
+    for argumento in argumentos:
+        cuerpo.append(f"    self.{argumento} = {argumento}")
+
+    # Mismo formato que Electrodomestico.__str__ y las subclases de proyectoU4.py
+    texto = "ID: {self.id}\nMarca: {self.marca}\nmodelo: {self.modelo}\nprecio: ${self.precio:,.2f} Pesos"
+    for campo in campos:
+        texto += f"\n{_f_string(campo.etiqueta)}{{self.{campo.nombre}}}{_f_string(campo.unidad)}"
+    texto += "\nTipo de gama: {self.tipo_gama()}"
+    cuerpo += ["", "def __str__(self):",
+               f"    '''Ficha del {nombre} con sus atributos y su gama.'''",
+               f"    return f{texto!r}",
+               "", "return __init__, __str__"]
+    lineas = ["def _crear(_type, _str, _int, _float):"]
+    lineas += [f"    {linea}" if linea else "" for linea in cuerpo]
+    return "\n".join(lineas) + "\n"
+
+
+def _plantilla(campos):
+    """Plantilla de renderizado equivalente al __str__ generado."""
+    piezas = list(renderizado.PLANTILLA_BASE)
+    previo = " Pesos"
+    for campo in campos:
+        piezas.append((f"{previo}\n{campo.etiqueta}", campo.nombre))
+        previo = campo.unidad
+    piezas.append((f"{previo}\nTipo de gama: ", "gama"))
+    return tuple(piezas)
+
+
+def registrar_tipo(nombre, campos, gama, validar=True, derivados=()):
+    """Declara un tipo de electrodoméstico y genera su clase.
+
+    Args:
+        nombre (str): Nombre de la clase y del tipo, por ejemplo "Lavavajillas".
+        campos (sequence): Campo o tuplas (nombre, tipo, etiqueta, unidad,
+            minimo, maximo) en el orden del constructor.
+        gama: Definición de reglas con "reglas" y "defecto" (formato de
+            reglas_gama.json), o una función tipo_gama(self) escrita a mano.
+        validar (bool): Si el __init__ generado revisa tipos y rangos.
+        derivados (tuple): Columnas derivadas para el almacén columnar (ver
+            catalogo.Esquema).
+
+    Returns:
+        type: La clase generada.
+
+    Raises:
+        ValueError: Si el nombre ya existe o la declaración es inválida.
+    """
+    if not nombre.isidentifier():
+        raise ValueError(f"Nombre de tipo inválido: {nombre!r}")
+    campos = tuple(campo if isinstance(campo, Campo) else Campo(*campo) for campo in campos)
+    nombres = [campo.nombre for campo in campos]
+    if len(set(nombres)) != len(nombres):
+        raise ValueError(f"{nombre}: hay campos repetidos")
+
+    # El clasificador se compila antes de crear la clase, así que un tipo sin
+    # reglas válidas no llega a registrarse
+    if callable(gama):
+        tipo_gama = gama
+        clasificador = _codigos_por_fila
+    elif isinstance(gama, dict):
+        numericos = ("precio",) + tuple(campo.nombre for campo in campos if campo.tipo is not str)
+        compilado = ClasificadorCompilado(nombre, gama, numericos)
+        tipo_gama = compilado.tipo_gama
+        clasificador = lambda tabla: compilado.codigos(
+            {campo: tabla.columna(campo) for campo in compilado.campos or ("precio",)})
+    else:
+        raise ValueError(f"{nombre}: falta la gama (reglas con \"defecto\" o una función tipo_gama)")
+
+    espacio = {}
+    exec(compile(_generar_fuente(nombre, campos, validar), f"<tipo {nombre}>", "exec"), espacio)
+    inicializar, texto = espacio["_crear"](type, str, int, float)
+    atributos = "\n".join(f"        {campo.nombre} ({campo.tipo.__name__}): "
+                          f"{campo.etiqueta.strip().rstrip(':')}" for campo in campos)
+    clase = type(nombre, (Electrodomestico, Gama), {
+        "__slots__": tuple(nombres),
+        "__init__": inicializar,
+        "__str__": texto,
+        "tipo_gama": tipo_gama,
+        "__module__": __name__,
+        "__doc__": f"Clase generada para {nombre} (ver tipos.py).\n    Atributos:\n{atributos}\n",
+    })
+    for funcion in ("__init__", "__str__"):
+        getattr(clase, funcion).__qualname__ = f"{nombre}.{funcion}"
+
+    textos = tuple(campo.nombre for campo in campos if campo.tipo is str)
+    registrar_esquema(Esquema(nombre, clase, nombres, textos=textos, derivados=derivados))
+    gama_vectorizada.CLASIFICADORES[nombre] = clasificador
+    renderizado.PLANTILLAS[nombre] = _plantilla(campos)
+    validacion.RESTRICCIONES[nombre] = dict(
+        {"precio": validacion.Restriccion(minimo=0)},
+        **{campo.nombre: validacion.Restriccion(campo.tipo is int, campo.minimo, campo.maximo)
+           for campo in campos if campo.tipo is not str})
+    TIPOS[nombre] = clase
+    return clase
+
+
+def _codigos_por_fila(tabla):
+    """Códigos de gama llamando tipo_gama() de cada fila (gama escrita a mano)."""
+    return [GAMAS.index(fila.tipo_gama()) for fila in tabla]
+
+
+def quitar_tipo(nombre):
+    """Deshace registrar_tipo(); sólo para tipos declarados en este módulo."""
+    if nombre not in TIPOS:
+        raise KeyError(f"{nombre!r} no es un tipo declarado con registrar_tipo()")
+    del TIPOS[nombre]
+    quitar_esquema(nombre)
+    renderizado.PLANTILLAS.pop(nombre, None)
+    validacion.RESTRICCIONES.pop(nombre, None)
+    gama_vectorizada.CLASIFICADORES.pop(nombre, None)
+
+
+def cargar_tipos(ruta):
+    """Registra los tipos declarados en un archivo JSON.
+
+    Formato:
+        {"Lavavajillas": {"campos": [["cubiertos", "int", "Cubiertos: ", "", 1, null], ...],
+                          "gama": {"reglas": [...], "defecto": "Alta"}}}
+
+    Returns:
+        dict: Nombre -> clase generada.
+    """
+    with open(ruta, encoding="utf-8") as archivo:
+        declaraciones = json.load(archivo)
+    return {nombre: registrar_tipo(nombre, declaracion["campos"], declaracion["gama"],
+                                   declaracion.get("validar", True))
+            for nombre, declaracion in declaraciones.items() if nombre not in TIPOS}
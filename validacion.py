@@ -0,0 +1,360 @@
+"""Validación y conversión de columnas completas al importar electrodomésticos.
+
+El menú de U3.py convierte cada campo con int(input(...)) o float(input(...))
+y, si algo falla, el manejador de ValueError descarta todo el registro sin
+decir qué campo estaba mal. Este módulo revisa columnas completas de un
+lote (todas las filas de un mismo tipo a la vez):
+
+    - convierte los textos a int o float sin lanzar una excepción por cada
+      valor inválido, con la misma regla que convertir_numero() (también la
+      usan el importador, el servicio y la línea de comandos),
+    - revisa tipo y rango de cada campo (precio no negativo, número de
+      puertas entero, potencia de microondas plausible...),
+    - revisa relaciones entre columnas, como que metros_cubicos y
+      pies_capacidad describan el mismo volumen.
+
+En lugar de lanzar una excepción devuelve una Validacion con una máscara de
+errores por fila: el bit i de errores[fila] indica que falló claves[i]. Las
+filas con máscara 0 se pueden construir directamente y las demás se pueden
+explicar con motivo(fila).
+
+Ejemplo:
+    resultado = validar_columnas("Refrigerador", {"id": [...], "precio": [...], ...})
+    for fila in resultado.invalidas():
+        print(resultado.motivo(fila))
+    objetos = map(Refrigerador, *resultado.filtradas().values())
+"""
+
+import math
+import operator
+import re
+from itertools import compress
+
+from catalogo import ESQUEMAS
+
+PIES_POR_METRO = 35.3147
+# Diferencia relativa permitida entre metros_cubicos * PIES_POR_METRO y pies_capacidad
+TOLERANCIA_UNIDADES = 0.1
+
+_ENTERO = re.compile(r"\s*[-+]?\d+\s*")
+_DECIMAL = re.compile(r"\s*[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?\s*")
+
+
+class Restriccion():
+    """Tipo y rango permitidos para un campo numérico.
+
+    Atributos:
+        entero (bool): Si el valor debe ser entero.
+        minimo: Valor mínimo permitido, o None.
+        maximo: Valor máximo permitido, o None.
+    """
+    __slots__ = ("entero", "minimo", "maximo")
+
+    def __init__(self, entero=False, minimo=None, maximo=None):
+        self.entero = entero
+        self.minimo = minimo
+        self.maximo = maximo
+
+    def describir(self, valor):
+        """Explica por qué un valor ya convertido está fuera de rango, o None."""
+        if self.minimo is not None and valor < self.minimo:
+            return f"debe ser al menos {self.minimo}, se recibió {valor!r}"
+        if self.maximo is not None and valor > self.maximo:
+            return f"debe ser a lo más {self.maximo}, se recibió {valor!r}"
+        return None
+
+
+_PRECIO = Restriccion(minimo=0)
+
+# Tipo -> campo -> Restriccion. Los campos numéricos sin restricción sólo
+# se convierten; los tipos de tipos.py agregan aquí las de sus Campo.
+RESTRICCIONES = {
+    "Lavadora": {"precio": _PRECIO,
+                 "capacidad_carga": Restriccion(minimo=0),
+                 "consumo_agua": Restriccion(minimo=0),
+                 "ciclos_lavado": Restriccion(entero=True, minimo=1)},
+    "Refrigerador": {"precio": _PRECIO,
+                     "no_puertas": Restriccion(entero=True, minimo=1, maximo=8),
+                     "metros_cubicos": Restriccion(minimo=0),
+                     "pies_capacidad": Restriccion(minimo=0)},
+    "Microondas": {"precio": _PRECIO,
+                   "potencia": Restriccion(minimo=100, maximo=3000),
+                   "consumo_energia": Restriccion(minimo=0)},
+}
+
+
+def unidades_consistentes(metros, pies, tolerancia=TOLERANCIA_UNIDADES):
+    """Filas donde metros cúbicos y pies cúbicos no describen el mismo volumen.
+
+    Las filas donde falta alguno de los dos valores (None) no se marcan;
+    esas ya tienen su propio error de conversión.
+
+    Args:
+        metros (sequence): Columna metros_cubicos convertida.
+        pies (sequence): Columna pies_capacidad convertida.
+        tolerancia (float): Diferencia relativa permitida.
+
+    Returns:
+        list: Un bool por fila, True si la fila es inconsistente.
+    """
+    return [m is not None and p is not None
+            and abs(p - m * PIES_POR_METRO) > tolerancia * m * PIES_POR_METRO
+            for m, p in zip(metros, pies)]
+
+
+# Tipo -> tuplas (nombre, campos, función, motivo). La función recibe las
+# columnas convertidas y devuelve un bool por fila (True = error).
+RELACIONES = {
+    "Refrigerador": (("unidades", ("metros_cubicos", "pies_capacidad"), unidades_consistentes,
+                      f"metros_cubicos y pies_capacidad no coinciden (1 m³ = {PIES_POR_METRO} pies³)"),),
+}
+
+
+def _convertir(valor, entero):
+    """Convierte un valor suelto; devuelve None si no es válido.
+
+    Regla común de todo el proyecto: se aceptan signo, espacios alrededor,
+    punto decimal y exponente, pero no guiones bajos ("1_000") ni nan o
+    infinito. Un texto entero queda como int; en un campo entero un número
+    con decimales cero ("12.0", 12.0) también se acepta y queda como int.
+    """
+    tipo = type(valor)
+    if tipo is str:
+        # Los casos comunes ("13999", "0.623") se reconocen con métodos de
+        # str; los signos, espacios y exponentes pasan por las expresiones
+        if valor.isdecimal():
+            return int(valor)
+        if valor.replace(".", "", 1).isdecimal():
+            valor = float(valor)
+        elif _ENTERO.fullmatch(valor):
+            return int(valor)
+        elif _DECIMAL.fullmatch(valor):
+            valor = float(valor)
+        else:
+            return None
+        tipo = float
+    if tipo is int:
+        return valor
+    if tipo is float and math.isfinite(valor):
+        if entero:
+            return int(valor) if valor.is_integer() else None
+        return valor
+    return None
+
+
+def convertir_numero(valor, entero=False):
+    """Convierte un valor suelto a int o float con la regla de _convertir().
+
+    Args:
+        valor: Texto o número.
+        entero (bool): Si sólo se aceptan enteros.
+
+    Returns:
+        int | float: Valor convertido.
+
+    Raises:
+        ValueError: Si el valor no es numérico (o no es entero cuando se
+            pide).
+    """
+    convertido = _convertir(valor, entero)
+    if convertido is None:
+        esperado = "un entero" if entero else "un número"
+        raise ValueError(f"se esperaba {esperado}, se recibió {valor!r}")
+    return convertido
+
+
+def convertir_valor(tipo, campo, valor):
+    """Convierte y revisa un valor suelto con las reglas de validar_columnas().
+
+    Los campos numéricos se convierten como en convertir_columna() y se
+    revisan contra RESTRICCIONES; los de texto no pueden faltar y se
+    convierten a str. Las relaciones entre columnas no se revisan.
+
+    Args:
+        tipo (str): Tipo registrado en ESQUEMAS.
+        campo (str): Campo del tipo.
+        valor: Valor crudo.
+
+    Returns:
+        Valor convertido.
+
+    Raises:
+        ValueError: Con el mismo motivo que daría Validacion.motivo().
+    """
+    if campo not in ESQUEMAS[tipo].numeros:
+        if valor is None or valor == "":
+            raise ValueError(f"falta el campo {campo}")
+        return valor if type(valor) is str else str(valor)
+    restriccion = RESTRICCIONES.get(tipo, {}).get(campo) or Restriccion()
+    convertido = _convertir(valor, restriccion.entero)
+    if convertido is None:
+        esperado = "un entero" if restriccion.entero else "un número"
+        raise ValueError(f"{campo}: se esperaba {esperado}, se recibió {valor!r}")
+    motivo = restriccion.describir(convertido)
+    if motivo is not None:
+        raise ValueError(f"{campo}: {motivo}")
+    return convertido
+
+
+def convertir_columna(valores, entero=False):
+    """Convierte una columna de textos o números a int/float.
+
+    Los textos enteros ("13999") quedan como int para que __str__ muestre
+    lo mismo que un objeto creado a mano. Primero se intenta convertir toda
+    la columna con int() de una sola pasada (si ningún texto tiene guiones
+    bajos, que int() aceptaría); si eso falla se revisa cada valor con
+    métodos de str y expresiones regulares, sin lanzar una excepción por
+    valor.
+
+    Args:
+        valores (sequence): Valores leídos del archivo.
+        entero (bool): Si sólo se aceptan enteros.
+
+    Returns:
+        tuple: (lista convertida con None en los inválidos, lista de bool
+            con True en los inválidos)
+    """
+    if set(map(type, valores)) == {str}:
+        if "_" not in "".join(valores):
+            try:
+                return list(map(int, valores)), [False] * len(valores)
+            except ValueError:
+                pass
+        # Los casos comunes se resuelven en la misma comprensión, sin llamar
+        # a _convertir() por cada valor
+        if entero:
+            convertidos = [int(valor) if valor.isdecimal() else _convertir(valor, True)
+                           for valor in valores]
+        else:
+            convertidos = [int(valor) if valor.isdecimal()
+                           else float(valor) if valor.replace(".", "", 1).isdecimal()
+                           else _convertir(valor, False) for valor in valores]
+    else:
+        convertidos = [_convertir(valor, entero) for valor in valores]
+    if None not in convertidos:
+        return convertidos, [False] * len(convertidos)
+    return convertidos, [valor is None for valor in convertidos]
+
+
+def _fuera_de_rango(columna, restriccion):
+    """Un bool por fila: True si el valor convertido está fuera de rango."""
+    minimo, maximo = restriccion.minimo, restriccion.maximo
+    if minimo is None and maximo is None:
+        return [False] * len(columna)
+    return [valor is not None and ((minimo is not None and valor < minimo)
+                                   or (maximo is not None and valor > maximo))
+            for valor in columna]
+
+
+class Validacion():
+    """Resultado de validar las columnas de un lote.
+
+    Atributos:
+        tipo (str): Tipo validado.
+        claves (tuple): Campos seguidos de los nombres de las relaciones;
+            el bit i de una máscara corresponde a claves[i].
+        columnas (dict): Campo -> lista convertida (None donde no se pudo).
+        errores (list): Máscara de errores de cada fila; 0 si es válida.
+        originales (dict): Campo -> columna tal como se recibió.
+    """
+
+    def __init__(self, tipo, claves, columnas, errores, originales):
+        self.tipo = tipo
+        self.claves = claves
+        self.columnas = columnas
+        self.errores = errores
+        self.originales = originales
+
+    def __len__(self):
+        return len(self.errores)
+
+    def validas(self):
+        """Posiciones de las filas sin errores."""
+        return [fila for fila, mascara in enumerate(self.errores) if not mascara]
+
+    def invalidas(self):
+        """Posiciones de las filas con algún error."""
+        return [fila for fila, mascara in enumerate(self.errores) if mascara]
+
+    def fallidos(self, fila):
+        """Claves (campos o relaciones) que fallaron en una fila."""
+        mascara = self.errores[fila]
+        return [clave for bit, clave in enumerate(self.claves) if mascara >> bit & 1]
+
+    def motivo(self, fila):
+        """Explica en texto los errores de una fila, separados por "; "."""
+        restricciones = RESTRICCIONES.get(self.tipo, {})
+        relaciones = {nombre: motivo for nombre, _, _, motivo in RELACIONES.get(self.tipo, ())}
+        motivos = []
+        for clave in self.fallidos(fila):
+            if clave in relaciones:
+                motivos.append(relaciones[clave])
+                continue
+            original = self.originales[clave][fila]
+            valor = self.columnas[clave][fila]
+            restriccion = restricciones.get(clave)
+            if original is None or original == "":
+                motivos.append(f"falta el campo {clave}")
+            elif valor is None:
+                esperado = "un entero" if restriccion is not None and restriccion.entero else "un número"
+                motivos.append(f"{clave}: se esperaba {esperado}, se recibió {original!r}")
+            else:
+                motivos.append(f"{clave}: {restriccion.describir(valor)}")
+        return "; ".join(motivos)
+
+    def filtradas(self):
+        """Columnas con sólo las filas válidas, en el orden de los campos."""
+        if not any(self.errores):
+            return dict(self.columnas)
+        validas = list(map(operator.not_, self.errores))
+        return {campo: list(compress(columna, validas)) for campo, columna in self.columnas.items()}
+
+
+def validar_columnas(tipo, columnas):
+    """Convierte y revisa todas las columnas de un lote de un mismo tipo.
+
+    Args:
+        tipo (str): Tipo registrado en ESQUEMAS.
+        columnas (dict): Campo -> secuencia de valores crudos. Un campo que
+            no esté en el dict cuenta como faltante en todas las filas.
+
+    Returns:
+        Validacion: Columnas convertidas y máscara de errores por fila.
+    """
+    esquema = ESQUEMAS[tipo]
+    restricciones = RESTRICCIONES.get(tipo, {})
+    relaciones = RELACIONES.get(tipo, ())
+    claves = esquema.campos + tuple(relacion[0] for relacion in relaciones)
+    filas = max((len(columna) for columna in columnas.values()), default=0)
+    errores = [0] * filas
+    convertidas = {}
+    originales = {}
+
+    def marcar(bit, malos):
+        if any(malos):
+            for fila, malo in enumerate(malos):
+                if malo:
+                    errores[fila] |= bit
+
+    for posicion, campo in enumerate(esquema.campos):
+        bit = 1 << posicion
+        valores = columnas.get(campo)
+        if valores is None:
+            valores = [None] * filas
+        originales[campo] = valores
+        if campo in esquema.numeros:
+            restriccion = restricciones.get(campo) or Restriccion()
+            valores, invalidos = convertir_columna(valores, restriccion.entero)
+            marcar(bit, invalidos)
+            marcar(bit, _fuera_de_rango(valores, restriccion))
+        else:
+            if not all(valores) and (None in valores or "" in valores):
+                marcar(bit, [valor is None or valor == "" for valor in valores])
+            if set(map(type, valores)) != {str}:
+                valores = [valor if valor is None or type(valor) is str else str(valor)
+                           for valor in valores]
+        convertidas[campo] = valores
+
+    for posicion, (_, campos, funcion, _) in enumerate(relaciones, len(esquema.campos)):
+        marcar(1 << posicion, funcion(*[convertidas[campo] for campo in campos]))
+    return Validacion(tipo, claves, convertidas, errores, originales)